@@ -1,14 +1,13 @@
-import os
 import warnings
 
 from langchain.chains import RetrievalQA
 from langchain.prompts import ChatPromptTemplate
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from langchain_google_genai import ChatGoogleGenerativeAI
 
+from src.features.ingestion import ingest_incremental
 from src.infrastructure.config.settings import settings
+from src.infrastructure.database.index_manager import get_index_manager
+from src.infrastructure.external.embedding_cache import get_embeddings
 
 # Verify Configuration
 print("=" * 80)
@@ -21,25 +20,27 @@ print(f"GOOGLE_API_KEY: {'***' if settings.google_api_key else 'NOT SET'}")
 print(f"LLM_MODEL: {settings.llm_model}")
 print("=" * 80 + "\n")
 
+# PDF is only parsed when ingestion runs (streamed page by page in train_model)
 caminho_pdf = "Perceptron.pdf"
-loader = PyPDFLoader(caminho_pdf)
-documentos = loader.load()
 
 
 def train_model():
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-    chunk = splitter.split_documents(documentos)
+    """
+    Incrementally ingest the PDF into the FAISS index.
 
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    db_path = "banco_faiss"
-    if os.path.exists(db_path):
-        vectordb = FAISS.load_local(
-            db_path, embeddings, allow_dangerous_deserialization=True
-        )
-        vectordb.add_documents(chunk)
-    else:
-        vetorstore = FAISS.from_documents(chunk, embeddings)
-        vetorstore.save_local(db_path)
+    Only new or changed chunks are embedded; chunks that disappeared from the
+    source are removed from the index (see src.features.ingestion). Pages are
+    streamed in windows of INGESTION_PAGE_WINDOW, so memory stays bounded.
+    """
+    embeddings = get_embeddings()
+    report = ingest_incremental([caminho_pdf], embeddings, settings.vectorstore_path)
+
+    print(
+        f"[INGEST] Added {report.chunks_added} chunks, "
+        f"skipped {report.chunks_skipped}, removed {report.chunks_removed} "
+        f"({report.files_skipped} unchanged files skipped)"
+    )
+    return report
 
 
 def retrieval(pergunta: str = "Quais as limitações do Perceptron?"):
@@ -47,11 +48,8 @@ def retrieval(pergunta: str = "Quais as limitações do Perceptron?"):
     Legacy retrieval function - kept for backwards compatibility.
     For new usage, prefer using graph_rag.run_rag_query()
     """
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    db_path = "banco_faiss"
-    vectordb = FAISS.load_local(
-        db_path, embeddings, allow_dangerous_deserialization=True
-    )
+    embeddings = get_embeddings()
+    vectordb = get_index_manager(settings.vectorstore_path, embeddings).get()
     docs = vectordb.similarity_search(pergunta, k=5)
 
     contexto = "\n\n".join([f"Material: {doc.page_content}" for doc in docs])
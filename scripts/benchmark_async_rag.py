@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync and async RAG execution paths under concurrency.
+
+Each query runs the full graph (classify → retrieve → rerank → generate →
+validate) against a stub LLM that takes ``--llm-latency-ms`` per call (a
+blocking sleep on the sync path, ``asyncio.sleep`` on the async path) and a
+fixed retrieval result, so only the execution model is measured:
+
+- sync: ``run_rag_query`` on a thread pool of ``--threads`` workers (each
+  query holds a thread while it waits on the LLM; latency includes the wait
+  for a free thread)
+- async: ``arun_rag_query`` for every query on one event loop
+  (``asyncio.gather``)
+
+For each concurrency level in ``--concurrency`` the script reports
+throughput (queries/s) and p50/p95 query latency.
+
+Usage:
+    python scripts/benchmark_async_rag.py
+    python scripts/benchmark_async_rag.py --concurrency 1 10 100 --llm-latency-ms 300
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model answering every RAG prompt after a fixed latency."""
+
+    latency_s: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat-model"
+
+    @staticmethod
+    def _answer(messages: List[BaseMessage]) -> ChatResult:
+        prompt = str(messages[-1].content)
+        if "Classifique" in prompt:
+            content = "simple"
+        elif "Avalie a qualidade" in prompt:
+            content = "0.9"
+        else:
+            content = "O Perceptron é um classificador linear binário."
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content))])
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs
+    ) -> ChatResult:
+        time.sleep(self.latency_s)
+        return self._answer(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency_s)
+        return self._answer(messages)
+
+
+@contextlib.contextmanager
+def stubbed_rag(latency_s: float):
+    """Patch the RAG nodes to use the stub LLM and a fixed retrieval result."""
+    from unittest.mock import MagicMock, patch
+
+    from langchain_core.documents import Document
+
+    from src.infrastructure.config.settings import settings
+
+    documents = [Document(page_content=f"O Perceptron, trecho {i}.") for i in range(5)]
+    with patch("src.features.rag.nodes.llm", StubChatModel(latency_s=latency_s)), patch(
+        "src.features.rag.nodes.index_manager"
+    ), patch("src.features.rag.nodes.tune_search"), patch(
+        "src.features.rag.nodes.hybrid_search", MagicMock(return_value=documents)
+    ), patch.object(
+        settings, "reranker_enabled", False
+    ), patch.object(
+        settings, "complexity_classifier_enabled", False
+    ), patch.object(
+        settings, "complexity_decisions_path", ""
+    ):
+        yield
+
+
+def timed_call(submitted, function, *args):
+    """Latency of ``function(*args)`` in ms since ``submitted`` (queueing too)."""
+    function(*args)
+    return (time.perf_counter() - submitted) * 1000
+
+
+async def timed_await(function, *args):
+    """Latency of ``await function(*args)`` in ms."""
+    start = time.perf_counter()
+    await function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_sync(question: str, concurrency: int, threads: int) -> List[float]:
+    """Run ``concurrency`` queries on a thread pool; per-query latencies."""
+    from src.features.rag.graph_rag import run_rag_query
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(timed_call, time.perf_counter(), run_rag_query, question)
+            for _ in range(concurrency)
+        ]
+        return [future.result() for future in futures]
+
+
+def run_async(question: str, concurrency: int) -> List[float]:
+    """Run ``concurrency`` queries on one event loop; per-query latencies."""
+    from src.features.rag.graph_rag import arun_rag_query
+
+    async def gather() -> List[float]:
+        return list(
+            await asyncio.gather(
+                *(timed_await(arun_rag_query, question) for _ in range(concurrency))
+            )
+        )
+
+    return asyncio.run(gather())
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async RAG")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--threads", type=int, default=8, help="Sync thread pool")
+    parser.add_argument("--question", default="O que é o Perceptron?")
+    args = parser.parse_args(argv)
+
+    print(
+        f"Stub LLM latency: {args.llm_latency_ms:.0f} ms/call, "
+        f"sync thread pool: {args.threads}"
+    )
+    print(
+        f"{'mode':<6} {'concurrency':>11} {'queries/s':>10} "
+        f"{'p50 ms':>9} {'p95 ms':>9}"
+    )
+
+    with stubbed_rag(args.llm_latency_ms / 1000):
+        for concurrency in args.concurrency:
+            for mode in ("sync", "async"):
+                start = time.perf_counter()
+                # Node progress prints would swamp the table
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if mode == "sync":
+                        latencies = run_sync(args.question, concurrency, args.threads)
+                    else:
+                        latencies = run_async(args.question, concurrency)
+                wall = time.perf_counter() - start
+                print(
+                    f"{mode:<6} {concurrency:>11} {concurrency / wall:>10.2f} "
+                    f"{np.percentile(latencies, 50):>9.0f} "
+                    f"{np.percentile(latencies, 95):>9.0f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
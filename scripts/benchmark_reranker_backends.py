@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark reranker backends (torch, onnx, onnx_int8) against each other.
+
+For every backend this reports:
+- load time (including the one-off ONNX export / quantization)
+- p50/p99 latency of one request (one query x its candidate documents)
+- throughput in pairs per second
+- agreement with the torch scores: max/mean absolute difference, top-5
+  overlap and Spearman rank correlation
+
+Candidate documents per query are taken from the BM25 index of the chunk
+store (``--db-path``), so no embedding API call is needed. The exit code is
+non-zero when a backend exceeds its tolerance in
+``src.features.reranking.backends`` (documented in
+docs/RERANKER_BACKENDS.md).
+
+Usage:
+    python scripts/benchmark_reranker_backends.py --db-path banco_faiss
+    python scripts/benchmark_reranker_backends.py --backends torch onnx_int8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    "O que é o Perceptron?",
+    "Quais as limitações do algoritmo Perceptron?",
+    "Como funciona o treinamento do Perceptron?",
+    "Qual a função de ativação do Perceptron?",
+    "Explique a diferença entre Perceptron e Multilayer Perceptron.",
+    "Por que o XOR não é linearmente separável?",
+    "Qual o papel do bias no Perceptron?",
+    "Como a taxa de aprendizado afeta a convergência?",
+]
+
+
+def load_requests(db_path, candidates):
+    """Build (query, documents) requests from the lexical index."""
+    from src.infrastructure.database.chunk_store import CHUNK_STORE_FILE, ChunkStore
+
+    store = ChunkStore(os.path.join(db_path, CHUNK_STORE_FILE))
+    try:
+        requests = []
+        for query in QUERIES:
+            docs = store.search_lexical(query, candidates)
+            if docs:
+                requests.append((query, [doc.page_content for doc in docs]))
+        return requests
+    finally:
+        store.close()
+
+
+def measure(model, requests, rounds):
+    """Score every request ``rounds`` times; return (scores, latencies ms)."""
+    scores = [np.asarray(model.predict([(q, d) for d in docs])) for q, docs in requests]
+    latencies = []
+    for _ in range(rounds):
+        for query, docs in requests:
+            start = time.perf_counter()
+            model.predict([(query, doc) for doc in docs])
+            latencies.append((time.perf_counter() - start) * 1000)
+    return scores, np.array(latencies)
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark reranker backends")
+    parser.add_argument("--db-path", default="banco_faiss")
+    parser.add_argument("--model", default=None, help="Defaults to RERANKER_MODEL")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx_int8"])
+    parser.add_argument("--candidates", type=int, default=15, help="Docs per query")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from src.features.reranking.backends import (
+        SCORE_TOLERANCE,
+        TOP_K_AGREEMENT_TOLERANCE,
+        load_cross_encoder,
+        score_agreement,
+    )
+    from src.infrastructure.config.settings import settings
+
+    model_name = args.model or settings.reranker_model
+    requests = load_requests(args.db_path, args.candidates)
+    if not requests:
+        print(f"❌ No candidate documents found in {args.db_path}")
+        return 1
+    total_pairs = sum(len(docs) for _, docs in requests)
+    print(f"Model: {model_name}")
+    print(f"Requests: {len(requests)} ({total_pairs} pairs), rounds={args.rounds}\n")
+
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]
+    reference = None
+    failed = False
+
+    print(
+        f"{'backend':<10} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {'pairs/s':>8} "
+        f"{'max diff':>9} {'mean diff':>9} {'top5':>5} {'spearman':>8}"
+    )
+    print("-" * 82)
+    for backend in backends:
+        start = time.perf_counter()
+        model = load_cross_encoder(model_name, backend)
+        load_s = time.perf_counter() - start
+        if backend != "torch" and model.get_backend() != "onnx":
+            print(
+                f"{backend:<10} skipped: ONNX dependencies missing (pip install .[onnx])"
+            )
+            failed = True
+            continue
+
+        scores, latencies = measure(model, requests, args.rounds)
+        throughput = total_pairs * args.rounds / (latencies.sum() / 1000)
+        if reference is None:
+            reference = scores
+
+        agreement = [score_agreement(r, c) for r, c in zip(reference, scores)]
+        max_diff = max(a["max_abs_diff"] for a in agreement)
+        mean_diff = float(np.mean([a["mean_abs_diff"] for a in agreement]))
+        top_k = float(np.mean([a["top_k_overlap"] for a in agreement]))
+        spearman = float(np.mean([a["spearman"] for a in agreement]))
+
+        within = (
+            max_diff <= SCORE_TOLERANCE[backend]
+            and top_k >= TOP_K_AGREEMENT_TOLERANCE[backend]
+        )
+        failed = failed or not within
+        print(
+            f"{backend:<10} {load_s:>7.1f} {np.percentile(latencies, 50):>8.1f} "
+            f"{np.percentile(latencies, 99):>8.1f} {throughput:>8.0f} "
+            f"{max_diff:>9.5f} {mean_diff:>9.5f} {top_k:>5.2f} {spearman:>8.3f}"
+            f"{'' if within else '  ❌ outside tolerance'}"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
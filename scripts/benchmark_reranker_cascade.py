@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark cascade reranking: cheap prefilter to M, then the cross-encoder.
+
+For each query, ``--candidates`` chunks are taken from the BM25 index of
+``--db-path`` and scored by the cross-encoder in full (the reference). Then,
+for every first stage and every M in ``--keep``, the script reports:
+- prefilter latency (first stage) and rerank latency (cross-encoder on M)
+- the total against the full rerank (speedup)
+- recall: share of the full-rerank top-n kept by the prefilter
+- overlap: share of the full-rerank top-n in the cascade's final top-n
+
+The dense stage reads chunk vectors back from the index and embeds only the
+query (through the embedding cache), so it needs ``GOOGLE_API_KEY`` unless
+the queries are cached. Pass ``--stages lexical`` to run offline.
+
+Usage:
+    python scripts/benchmark_reranker_cascade.py --db-path banco_faiss
+    python scripts/benchmark_reranker_cascade.py --candidates 100 --keep 10 20 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(function, *args, **kwargs):
+    """Result of ``function`` and its latency in ms."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark cascade reranking")
+    parser.add_argument("--db-path", default="banco_faiss")
+    parser.add_argument("--candidates", type=int, default=50, help="Docs per query")
+    parser.add_argument("--keep", type=int, nargs="+", default=[10, 15, 20, 30])
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", default=["lexical", "dense"])
+    args = parser.parse_args(argv)
+
+    from scripts.benchmark_reranker_backends import QUERIES
+    from src.features.rag.retrieval import document_vectors, lexical_search
+    from src.features.reranking.backends import load_cross_encoder
+    from src.features.reranking.cascade import (
+        dense_scores,
+        prefilter,
+        top_n_recall,
+    )
+    from src.infrastructure.config.settings import settings
+    from src.infrastructure.database.ann_index import load_search_index
+    from src.infrastructure.external.embedding_cache import get_embeddings
+
+    vectordb = load_search_index(args.db_path, get_embeddings())
+    requests = []
+    for query in QUERIES:
+        found = lexical_search(vectordb, query, args.candidates)
+        if found:
+            vectors = document_vectors(vectordb, [doc.id for doc in found])
+            requests.append((query, [doc.page_content for doc in found], vectors))
+    if not requests:
+        print(f"❌ No candidate documents found in {args.db_path}")
+        return 1
+
+    model = load_cross_encoder(settings.reranker_model, settings.reranker_backend)
+    model.predict([(requests[0][0], requests[0][1][0])])  # warm up
+
+    # Reference: every candidate through the cross-encoder
+    reference = []
+    full_ms = []
+    for query, docs, _ in requests:
+        scores, ms = timed(model.predict, [(query, doc) for doc in docs])
+        reference.append(np.asarray(scores))
+        full_ms.append(ms)
+    full = float(np.mean(full_ms))
+
+    pairs = sum(len(docs) for _, docs, _ in requests)
+    print(f"Model: {settings.reranker_model} ({settings.reranker_backend})")
+    print(f"Queries: {len(requests)}, candidates/query: {pairs / len(requests):.1f}")
+    print(f"Full rerank: {full:.2f} ms/query")
+    print(
+        f"{'stage':<8} {'M':>4} {'prefilter ms':>12} {'rerank ms':>10} "
+        f"{'total ms':>9} {'speedup':>8} {'recall':>7} {'overlap':>8}"
+    )
+
+    for stage in args.stages:
+        if stage == "dense":
+            # prefilter() falls back to lexical on errors: check vectors first
+            try:
+                for query, _, vectors in requests:
+                    if vectors is None:
+                        raise ValueError("index cannot reconstruct chunk vectors")
+                    dense_scores(query, vectors)
+            except Exception as e:
+                print(f"{stage:<8} skipped: {type(e).__name__}: {e}")
+                continue
+
+        for keep in args.keep:
+            prefilter_ms, rerank_ms, recalls, overlaps = [], [], [], []
+            for (query, docs, vectors), full_scores in zip(requests, reference):
+                kept, ms = timed(
+                    prefilter, query, docs, keep=keep, stage=stage, vectors=vectors
+                )
+                prefilter_ms.append(ms)
+                kept_docs = [docs[i] for i in kept]
+                scores, ms = timed(model.predict, [(query, d) for d in kept_docs])
+                rerank_ms.append(ms)
+
+                full_top = set(
+                    np.argsort(-full_scores, kind="stable")[: args.top_n].tolist()
+                )
+                order = np.argsort(-np.asarray(scores), kind="stable")
+                cascade_top = {kept[i] for i in order[: args.top_n]}
+                recalls.append(top_n_recall(full_scores, kept, args.top_n))
+                overlaps.append(len(full_top & cascade_top) / len(full_top))
+
+            total = float(np.mean(prefilter_ms) + np.mean(rerank_ms))
+            print(
+                f"{stage:<8} {keep:>4} {np.mean(prefilter_ms):>12.2f} "
+                f"{np.mean(rerank_ms):>10.2f} {total:>9.2f} {full / total:>7.2f}x "
+                f"{np.mean(recalls):>7.2f} {np.mean(overlaps):>8.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
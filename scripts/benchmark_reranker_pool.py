@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark how reranking throughput scales with the replica pool.
+
+For 1..N replicas (each with ``--threads`` torch threads) the same requests
+(candidates from the BM25 index of ``--db-path``) are scored by N concurrent
+callers, and the script reports requests/s, pairs/s, p50/p95 latency and the
+speedup over one replica. For comparison, the ``intra-op`` rows score the
+requests one at a time with a single model given the same total number of
+torch threads (what a shared model gets from extra cores).
+
+N defaults to the usable CPU cores divided by ``--threads``.
+
+Usage:
+    python scripts/benchmark_reranker_pool.py --db-path banco_faiss
+    python scripts/benchmark_reranker_pool.py --threads 2 --max-replicas 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def replica_counts(max_replicas):
+    """1, 2, 4, ... up to and including ``max_replicas``."""
+    counts = [1]
+    while counts[-1] * 2 < max_replicas:
+        counts.append(counts[-1] * 2)
+    if max_replicas > 1:
+        counts.append(max_replicas)
+    return counts
+
+
+def run(scorer, requests, callers, batch_size):
+    """Score every request with ``callers`` threads; wall time and latencies."""
+
+    def score(request):
+        query, docs = request
+        start = time.perf_counter()
+        scorer.predict([(query, doc) for doc in docs], batch_size=batch_size)
+        return (time.perf_counter() - start) * 1000
+
+    # Warm up (first forward pass of each replica allocates buffers)
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        list(executor.map(score, requests[:callers]))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        latencies = list(executor.map(score, requests))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the reranker pool")
+    parser.add_argument("--db-path", default="banco_faiss")
+    parser.add_argument("--candidates", type=int, default=15, help="Docs per query")
+    parser.add_argument("--threads", type=int, default=1, help="Threads per replica")
+    parser.add_argument("--max-replicas", type=int, default=0, help="0 = CPU count")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    import torch
+
+    from scripts.benchmark_reranker_backends import load_requests
+    from src.features.reranking.backends import load_cross_encoder
+    from src.features.reranking.pool import (
+        RerankerPool,
+        build_reranker_pool,
+        pool_dimensions,
+        usable_cpus,
+    )
+    from src.infrastructure.config.settings import settings
+
+    requests = load_requests(args.db_path, args.candidates)
+    if not requests:
+        print(f"❌ No candidate documents found in {args.db_path}")
+        return 1
+    requests = [requests[i % len(requests)] for i in range(args.requests)]
+    pairs = sum(len(docs) for _, docs in requests)
+
+    max_replicas, threads = pool_dimensions(args.max_replicas, args.threads)
+    model = load_cross_encoder(settings.reranker_model)
+    full_pool = build_reranker_pool(model, size=max_replicas, threads=threads)
+
+    print(f"Model: {settings.reranker_model} ({settings.reranker_backend})")
+    print(
+        f"CPUs: {usable_cpus()}, threads per replica: {threads}, "
+        f"requests: {len(requests)} ({pairs} pairs)"
+    )
+    print(
+        f"{'mode':<9} {'replicas':>8} {'threads':>7} {'req/s':>8} {'pairs/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'speedup':>8}"
+    )
+
+    baseline = None
+    for count in replica_counts(max_replicas):
+        pool = RerankerPool(full_pool.replicas[:count], threads)
+        modes = [("pool", pool, count, threads)]
+        if count > 1:
+            # One model, the same cores as intra-op threads, one caller
+            modes.append(("intra-op", full_pool.replicas[0], 1, count * threads))
+        for mode, scorer, callers, torch_threads in modes:
+            torch.set_num_threads(torch_threads)
+            elapsed, latencies = run(scorer, requests, callers, args.batch_size)
+            throughput = len(requests) / elapsed
+            baseline = baseline or throughput  # 1 replica, 1 caller
+            print(
+                f"{mode:<9} {callers:>8} {torch_threads:>7} {throughput:>8.1f} "
+                f"{pairs / elapsed:>9.1f} {np.percentile(latencies, 50):>8.1f} "
+                f"{np.percentile(latencies, 95):>8.1f} "
+                f"{throughput / baseline:>7.2f}x"
+            )
+
+    torch.set_num_threads(threads)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark reranking from ingest-time token ids against CrossEncoder.predict.
+
+For the same requests (candidates from the BM25 index of ``--db-path``) this
+reports per call:
+- latency of ``predict`` (tokenizes every document) and of the pretokenized
+  scorer (documents read from the chunk store, pairs sorted by length)
+- the time saved per call
+- pad tokens of all pairs scored together (as the cross-request batcher
+  does) with and without length sorting
+- the maximum score difference (should be ~0)
+
+Run ingestion first so ``chunks.sqlite`` holds token ids for the reranker
+model (``RERANKER_PRETOKENIZE_ENABLED=true``).
+
+Usage:
+    python scripts/benchmark_reranker_pretokenized.py --db-path banco_faiss
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def time_calls(score, requests, rounds):
+    """Mean latency (ms) of one request and the scores of the last round."""
+    latencies = []
+    for _ in range(rounds):
+        scores = []
+        for query, docs in requests:
+            start = time.perf_counter()
+            scores.append(np.asarray(score([(query, doc) for doc in docs])))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.mean(latencies)), scores
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark pretokenized reranking")
+    parser.add_argument("--db-path", default="banco_faiss")
+    parser.add_argument("--candidates", type=int, default=15, help="Docs per query")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    from scripts.benchmark_reranker_backends import load_requests
+    from src.features.reranking.backends import load_cross_encoder
+    from src.features.reranking.pretokenized import (
+        FORWARD_BATCH_PAIRS,
+        PretokenizedScorer,
+        padding_tokens,
+    )
+    from src.infrastructure.config.settings import settings
+    from src.infrastructure.database.chunk_store import content_hash
+
+    requests = load_requests(args.db_path, args.candidates)
+    if not requests:
+        print(f"❌ No candidate documents found in {args.db_path}")
+        return 1
+
+    model = load_cross_encoder(settings.reranker_model)
+    scorer = PretokenizedScorer(model, db_path=args.db_path)
+
+    # Warm up both paths (first forward passes allocate buffers)
+    for score in (model.predict, scorer.predict):
+        score([(requests[0][0], doc) for doc in requests[0][1]])
+
+    predict_ms, reference = time_calls(
+        lambda pairs: model.predict(pairs, batch_size=args.batch_size),
+        requests,
+        args.rounds,
+    )
+    pretokenized_ms, scores = time_calls(
+        lambda pairs: scorer.predict(pairs, batch_size=args.batch_size),
+        requests,
+        args.rounds,
+    )
+
+    docs = {doc for _, request_docs in requests for doc in request_docs}
+    stored = len(
+        scorer._token_store.get(scorer.name, [content_hash(doc) for doc in docs])
+    )
+    tokenizer = model.tokenizer
+    lengths = [
+        len(tokenizer(q, d, truncation=True, max_length=scorer.max_length).input_ids)
+        for q, request_docs in requests
+        for d in request_docs
+    ]
+    # Pad tokens when all requests are scored together (cross-request batch)
+    lengths = np.array(lengths)
+    unsorted_padding = padding_tokens(lengths, FORWARD_BATCH_PAIRS)
+    sorted_padding = padding_tokens(np.sort(lengths), FORWARD_BATCH_PAIRS)
+    max_diff = max(float(np.max(np.abs(r - s))) for r, s in zip(reference, scores))
+
+    print(f"Model: {settings.reranker_model} (max_length={scorer.max_length})")
+    print(
+        f"Requests: {len(requests)}, distinct docs with stored token ids: "
+        f"{stored}/{len(docs)}"
+    )
+    print(f"predict:      {predict_ms:8.2f} ms/call")
+    print(f"pretokenized: {pretokenized_ms:8.2f} ms/call")
+    print(
+        f"saved:        {predict_ms - pretokenized_ms:8.2f} ms/call "
+        f"({(1 - pretokenized_ms / predict_ms) * 100:.1f}%)"
+    )
+    print(
+        f"pad tokens ({len(lengths)} pairs batched together): "
+        f"{unsorted_padding} unsorted -> {sorted_padding} sorted by length"
+    )
+    print(f"max score difference: {max_diff:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,10 @@ Interactive command-line interface for multi-turn conversations
 import os
 import sys
 
-from conversation_graph import run_conversational_query
 from dotenv import load_dotenv
-from memory_manager import get_conversation_config, reset_conversation
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Load environment
 venv_env_path = "c:/Users/ADMIN/Desktop/rules-base/.venv/.env"
@@ -46,6 +47,32 @@ def print_help():
     print("-" * 80 + "\n")
 
 
+def print_streamed_answer(events):
+    """
+    Print answer tokens as they arrive, then any correction.
+
+    Args:
+        events: Events from stream_conversational_query
+    """
+    print(f"\n{'='*80}")
+    print("Assistant:")
+    print("-" * 80)
+    streamed = False
+    for event in events:
+        if event["type"] == "token":
+            print(event["content"], end="", flush=True)
+            streamed = True
+        elif event["type"] == "answer":
+            if not streamed:
+                print(event["content"], end="")
+            print(f"\n\n⏱️  First token after {event['time_to_first_token_ms']:.0f} ms")
+        elif event["type"] == "correction":
+            print("-" * 80)
+            print(f"✏️  Revised answer (refinement {event['iteration']}):")
+            print(event["content"])
+    print("=" * 80 + "\n")
+
+
 def run_interactive_conversation(user_id: str = "cli_user"):
     """
     Run interactive multi-turn conversation.
@@ -53,6 +80,14 @@ def run_interactive_conversation(user_id: str = "cli_user"):
     Args:
         user_id: Unique identifier for user session
     """
+    from src.core.services.memory_manager import (
+        get_conversation_config,
+        reset_conversation,
+    )
+    from src.features.conversation.conversation_graph import (
+        stream_conversational_query,
+    )
+
     print_header()
 
     # Get initial config
@@ -99,15 +134,10 @@ def run_interactive_conversation(user_id: str = "cli_user"):
             conversation_count += 1
             print(f"\n[Turn {conversation_count}] Processing...\n")
 
-            # Run conversational query
-            answer = run_conversational_query(user_input, user_id, config)
-
-            # Print answer
-            print(f"\n{'='*80}")
-            print("Assistant:")
-            print("-" * 80)
-            print(answer)
-            print("=" * 80 + "\n")
+            # Stream the answer; validation/refinement may correct it later
+            print_streamed_answer(
+                stream_conversational_query(user_input, user_id, config)
+            )
 
         except KeyboardInterrupt:
             print("\n\n👋 Interrupted. Use '/quit' to exit gracefully.")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Report how the local groundedness scorer agrees with the LLM judge.
+
+Reads the judge scores logged by validate_quality
+(``settings.quality_judgements_path``; every judge call in "shadow" mode,
+uncertain and audited answers in "on" mode) and, for the configured
+accept/reject band and a sweep of alternatives, reports:
+
+- the share of judge calls the band would avoid (answers decided locally)
+- agreement of the local decisions with the judge (same accept/refine
+  outcome at the graph's 0.7 threshold), overall and per side
+
+The recommended band avoids the most calls while keeping agreement at or
+above ``--min-agreement``.
+
+Usage:
+    python scripts/evaluate_groundedness.py
+    python scripts/evaluate_groundedness.py --judgements log.jsonl --report report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def read_judgements(path):
+    """Logged judgement records (blank and malformed lines skipped)."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "judge_score" in record:
+                records.append(record)
+    return records
+
+
+def sweep(judgements, min_agreement):
+    """Band avoiding the most judge calls at ``min_agreement`` (or None)."""
+    from src.features.rag.groundedness import PASS_SCORE, evaluate_band
+
+    results = [
+        evaluate_band(judgements, float(accept), float(reject))
+        for accept in np.arange(PASS_SCORE, 1.0001, 0.05)
+        for reject in np.arange(0.0, PASS_SCORE - 0.0001, 0.05)
+    ]
+    eligible = [
+        result
+        for result in results
+        if result["agreement"] is not None and result["agreement"] >= min_agreement
+    ]
+    return max(
+        eligible,
+        key=lambda r: (r["llm_calls_avoided"], r["agreement"]),
+        default=None,
+    )
+
+
+def main(argv=None):
+    """Print the agreement report."""
+    from src.features.rag.groundedness import evaluate_band
+    from src.infrastructure.config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Evaluate the groundedness scorer")
+    parser.add_argument("--judgements", default=settings.quality_judgements_path)
+    parser.add_argument(
+        "--accept", type=float, default=settings.quality_heuristic_accept
+    )
+    parser.add_argument(
+        "--reject", type=float, default=settings.quality_heuristic_reject
+    )
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--report", default=None, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.judgements or not os.path.exists(args.judgements):
+        print(f"❌ No judgements log at {args.judgements!r}")
+        return 1
+    judgements = read_judgements(args.judgements)
+    if not judgements:
+        print(f"❌ No judgements in {args.judgements}")
+        return 1
+
+    def percent(value):
+        return "n/a" if value is None else f"{value:.1%}"
+
+    def describe(result):
+        return (
+            f"accept >= {result['accept']:.2f}, reject <= {result['reject']:.2f}: "
+            f"{percent(result['llm_calls_avoided'])} judge calls avoided, "
+            f"agreement {percent(result['agreement'])} "
+            f"(accept {percent(result['accept_agreement'])}, "
+            f"reject {percent(result['reject_agreement'])})"
+        )
+
+    configured = evaluate_band(judgements, args.accept, args.reject)
+    best = sweep(judgements, args.min_agreement)
+
+    print(f"Judgements: {len(judgements)} ({args.judgements})")
+    print(f"Configured band  {describe(configured)}")
+    if best is None:
+        print(f"Recommended band n/a (no band reaches {args.min_agreement:.0%})")
+    else:
+        print(f"Recommended band {describe(best)}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "judgements": len(judgements),
+                    "min_agreement": args.min_agreement,
+                    "configured": configured,
+                    "recommended": best,
+                },
+                f,
+                indent=2,
+            )
+        print(f"✅ Report saved to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Measure per-worker memory with and without memory-mapped index loading.
+
+Starts N worker processes per mode. Each worker loads the vector store
+through ``load_search_index``, runs a few searches and reports its memory
+from /proc (Linux):
+- RSS: resident pages, counting shared pages in full in every worker
+- Anon: private heap (deserialized index, SQLite page cache)
+- PSS: proportional set size, shared pages divided among their users;
+  the sum of PSS is the real footprint of the worker pool
+
+Workers stay alive until all have reported, so shared pages are counted
+while really shared. Query embeddings are faked with the index dimension,
+so no embedding API calls are made.
+
+Usage:
+    python scripts/measure_worker_rss.py --db-path banco_faiss --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def read_memory_mb():
+    """Return RSS, anonymous and proportional memory of this process in MB."""
+    values = {}
+    for file_name, keys in (
+        ("/proc/self/status", ("VmRSS", "RssAnon")),
+        ("/proc/self/smaps_rollup", ("Pss",)),
+    ):
+        try:
+            with open(file_name, encoding="utf-8") as handle:
+                for line in handle:
+                    key, _, rest = line.partition(":")
+                    if key in keys:
+                        values[key] = int(rest.split()[0]) / 1024
+        except FileNotFoundError:
+            pass
+    return values
+
+
+def worker(db_path, mmap_enabled, queries, results, barrier):
+    """Load the index in a fresh process and report memory usage."""
+    # Settings are read from the environment at import time
+    os.environ["VECTORSTORE_MMAP"] = "true" if mmap_enabled else "false"
+
+    import faiss
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from src.infrastructure.database.ann_index import load_search_index
+
+    dimension = faiss.read_index(
+        os.path.join(db_path, "index.faiss"), faiss.IO_FLAG_MMAP
+    ).d
+    vectordb = load_search_index(db_path, DeterministicFakeEmbedding(size=dimension))
+    for i in range(queries):
+        vectordb.similarity_search(f"consulta {i}", k=5)
+
+    results.put(read_memory_mb())
+    # Keep the mappings alive until every worker has measured
+    barrier.wait()
+
+
+def run_mode(args, mmap_enabled):
+    """Run one pool of workers and return their measurements."""
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    barrier = ctx.Barrier(args.workers)
+    processes = [
+        ctx.Process(
+            target=worker,
+            args=(args.db_path, mmap_enabled, args.queries, results, barrier),
+        )
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return measurements
+
+
+def main(argv=None):
+    """Run the measurement for both modes."""
+    parser = argparse.ArgumentParser(description="Per-worker memory of index loading")
+    parser.add_argument("--db-path", default="banco_faiss")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.db_path, "chunks.sqlite")):
+        print(f"Index with chunk store not found: {args.db_path}")
+        return 1
+
+    print(f"Workers: {args.workers}, index: {args.db_path}\n")
+    print(f"{'mode':<8} {'RSS/worker':>11} {'Anon/worker':>12} {'PSS total':>10}")
+    print("-" * 44)
+    for label, mmap_enabled in (("private", False), ("mmap", True)):
+        measurements = run_mode(args, mmap_enabled)
+        rss = sum(m.get("VmRSS", 0) for m in measurements) / len(measurements)
+        anon = sum(m.get("RssAnon", 0) for m in measurements) / len(measurements)
+        pss = sum(m.get("Pss", 0) for m in measurements)
+        print(f"{label:<8} {rss:>9.1f}MB {anon:>10.1f}MB {pss:>8.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
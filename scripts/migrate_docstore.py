@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Convert a legacy FAISS index (index.pkl) to the SQLite chunk store.
+
+Indexes written with ``FAISS.save_local`` keep their chunks in a pickled
+docstore, which the serving loader no longer reads. This one-time conversion
+unpickles ``index.pkl`` (only run it on indexes you built yourself), writes
+``chunks.sqlite``, rebuilds the configured ANN index and bumps the index
+version so running processes reload. No chunk is re-embedded.
+
+Usage:
+    python scripts/migrate_docstore.py
+    python scripts/migrate_docstore.py --db-path banco_faiss
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main(argv=None):
+    """Migrate the docstore and print the result."""
+    from src.features.reranking.pretokenized import precompute_doc_tokens
+    from src.infrastructure.config.settings import settings
+    from src.infrastructure.database.ann_index import build_ann_index
+    from src.infrastructure.database.chunk_store import (
+        CHUNK_STORE_FILE,
+        migrate_pickle_docstore,
+    )
+    from src.infrastructure.database.index_manager import bump_index_version
+    from src.infrastructure.external.embedding_cache import get_embeddings
+
+    parser = argparse.ArgumentParser(description="Migrate index.pkl to chunks.sqlite")
+    parser.add_argument("--db-path", default=settings.vectorstore_path)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(os.path.join(args.db_path, CHUNK_STORE_FILE)):
+        print(f"✅ {args.db_path} already uses the chunk store, nothing to do")
+        return 0
+
+    try:
+        vectors = migrate_pickle_docstore(args.db_path, get_embeddings())
+    except FileNotFoundError as e:
+        print(f"❌ {e}: rebuild it with scripts/recreate_faiss.py")
+        return 1
+
+    precompute_doc_tokens(args.db_path)
+    build_ann_index(args.db_path)
+    bump_index_version(args.db_path)
+    print(f"✅ Migrated {vectors} vectors in {args.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,56 @@
+#!/usr/bin/env python3
 """
-Script para recriar o banco FAISS com Google Embeddings
+Script para recriar o banco FAISS com Google Embeddings.
+
+Rebuilds the index from scratch with the ingestion pipeline, so it is written
+in the format the serving loader reads (``index.faiss`` + ``chunks.sqlite``)
+with a fresh manifest. The manifest is dropped first, which makes ingestion
+ignore the current index; the current files keep serving until the new ones
+are renamed into place.
+
+Usage:
+    python scripts/recreate_faiss.py
+    python scripts/recreate_faiss.py Perceptron.pdf docs/ --db-path banco_faiss
 """
 
+import argparse
 import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main(argv=None):
+    """Rebuild the FAISS index and print the result."""
+    from src.features.ingestion.manifest import MANIFEST_FILE
+    from src.features.ingestion.pipeline import run_ingestion_pipeline
+    from src.infrastructure.config.settings import settings
+    from src.infrastructure.external.embedding_cache import get_embeddings
+
+    parser = argparse.ArgumentParser(description="Recreate the FAISS index")
+    parser.add_argument(
+        "paths", nargs="*", default=["Perceptron.pdf"], help="Files or directories"
+    )
+    parser.add_argument("--db-path", default=settings.vectorstore_path)
+    args = parser.parse_args(argv)
+
+    print("[INFO] Recreating FAISS database...")
+    print(f"[INFO] Using embeddings model: {settings.embedding_model}")
+
+    manifest_path = os.path.join(args.db_path, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    report = run_ingestion_pipeline(args.paths, get_embeddings(), db_path=args.db_path)
+    if report.files_processed == 0:
+        print(f"[ERROR] No documents found in {args.paths}")
+        return 1
+
+    print(f"[SUCCESS] FAISS database created at: {args.db_path}")
+    print(f"[SUCCESS] Total vectors: {report.chunks_added}")
+    return 0
+
 
-from dotenv import load_dotenv
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-
-# Load environment variables
-venv_env_path = "c:/Users/ADMIN/Desktop/rules-base/.venv/.env"
-if os.path.exists(venv_env_path):
-    load_dotenv(venv_env_path)
-    print(f"[ENV] Loaded from: {venv_env_path}")
-
-print("[INFO] Recreating FAISS database with Google embeddings...")
-
-# Load PDF
-caminho_pdf = "Perceptron.pdf"
-loader = PyPDFLoader(caminho_pdf)
-documentos = loader.load()
-print(f"[INFO] Loaded {len(documentos)} pages from PDF")
-
-# Split documents
-splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-chunks = splitter.split_documents(documentos)
-print(f"[INFO] Created {len(chunks)} chunks")
-
-# Create embeddings with Google
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-print("[INFO] Using Google embeddings model: models/embedding-001")
-
-# Create and save FAISS vectorstore
-db_path = "banco_faiss"
-vectorstore = FAISS.from_documents(chunks, embeddings)
-vectorstore.save_local(db_path)
-
-print(f"[SUCCESS] FAISS database created at: {db_path}")
-print(f"[SUCCESS] Total vectors: {len(chunks)}")
-print("[SUCCESS] Ready to use with Google Gemini API!")
+if __name__ == "__main__":
+    sys.exit(main())
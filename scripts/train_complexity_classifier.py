@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Train the local question-complexity classifier used by classify_question.
+
+Training data:
+- labelled seed questions (``src/features/rag/complexity_questions.jsonl``)
+- LLM decisions logged by classify_question
+  (``settings.complexity_decisions_path``); for a question present in both,
+  the latest LLM decision wins, since the classifier replaces that call
+
+Before writing the artifact, the script reports (stratified k-fold, so every
+question is predicted by a model that did not see it):
+- agreement with the labels overall, and with the logged LLM decisions
+- coverage at the confidence threshold (share answered without the LLM) and
+  agreement on those questions
+- classifier latency per query against the mean logged LLM latency, i.e. the
+  latency saved per query
+
+Usage:
+    python scripts/train_complexity_classifier.py
+    python scripts/train_complexity_classifier.py --threshold 0.8 --report report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_dataset(labelled_path, decisions_path):
+    """Questions, labels and per-example source ("label" or "llm")."""
+    from src.features.rag.complexity import read_examples
+
+    examples = {}
+    for example in read_examples(labelled_path):
+        examples[example["question"].strip()] = (example["label"], "label")
+    llm_latencies = []
+    for example in read_examples(decisions_path) if decisions_path else []:
+        examples[example["question"].strip()] = (example["label"], "llm")
+        if example.get("llm_latency_ms") is not None:
+            llm_latencies.append(float(example["llm_latency_ms"]))
+
+    questions = list(examples)
+    labels = [examples[q][0] for q in questions]
+    sources = [examples[q][1] for q in questions]
+    return questions, np.array(labels), np.array(sources), llm_latencies
+
+
+def cross_validated_predictions(questions, labels, folds):
+    """Out-of-fold (label, confidence) for every question."""
+    from sklearn.model_selection import StratifiedKFold
+
+    from src.features.rag.complexity import train_classifier
+
+    predicted = np.empty(len(questions), dtype=object)
+    confidence = np.zeros(len(questions))
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    for train, test in splitter.split(questions, labels):
+        classifier = train_classifier(
+            [questions[i] for i in train], labels[train].tolist()
+        )
+        for i in test:
+            predicted[i], confidence[i] = classifier.predict(questions[i])
+    return predicted, confidence
+
+
+def agreement(predicted, labels, mask):
+    """Share of ``mask`` examples where prediction and label agree."""
+    if not mask.any():
+        return None
+    return float((predicted[mask] == labels[mask]).mean())
+
+
+def main(argv=None):
+    """Train, evaluate and save the classifier."""
+    from src.features.rag.complexity import (
+        DEFAULT_MODEL_PATH,
+        LABELLED_QUESTIONS_PATH,
+        save_classifier,
+        train_classifier,
+    )
+    from src.infrastructure.config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Train the complexity classifier")
+    parser.add_argument("--labelled", default=str(LABELLED_QUESTIONS_PATH))
+    parser.add_argument("--decisions", default=settings.complexity_decisions_path)
+    parser.add_argument(
+        "--output",
+        default=settings.complexity_classifier_path or str(DEFAULT_MODEL_PATH),
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=settings.complexity_classifier_threshold
+    )
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--report", default=None, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    questions, labels, sources, llm_latencies = load_dataset(
+        args.labelled, args.decisions
+    )
+    counts = {label: int((labels == label).sum()) for label in ("simple", "complex")}
+    if min(counts.values()) < args.folds:
+        print(f"❌ Not enough examples per class for {args.folds} folds: {counts}")
+        return 1
+
+    predicted, confidence = cross_validated_predictions(questions, labels, args.folds)
+    everything = np.ones(len(questions), dtype=bool)
+    confident = confidence >= args.threshold
+    from_llm = sources == "llm"
+
+    # Final model on everything, timed per question
+    classifier = train_classifier(questions, labels.tolist())
+    latencies_us = []
+    for question in questions:
+        start = time.perf_counter()
+        classifier.predict(question)
+        latencies_us.append((time.perf_counter() - start) * 1e6)
+    local_ms = float(np.median(latencies_us)) / 1000
+    coverage = float(confident.mean())
+    llm_ms = float(np.mean(llm_latencies)) if llm_latencies else None
+
+    report = {
+        "examples": len(questions),
+        "labelled": int((~from_llm).sum()),
+        "llm_decisions": int(from_llm.sum()),
+        "classes": counts,
+        "threshold": args.threshold,
+        "agreement": agreement(predicted, labels, everything),
+        "agreement_with_llm": agreement(predicted, labels, from_llm),
+        "coverage": coverage,
+        "agreement_when_confident": agreement(predicted, labels, confident),
+        "agreement_with_llm_when_confident": agreement(
+            predicted, labels, confident & from_llm
+        ),
+        "local_latency_us_p50": local_ms * 1000,
+        "local_latency_us_p95": float(np.percentile(latencies_us, 95)),
+        "llm_latency_ms_mean": llm_ms,
+        # Confident questions skip the LLM; every question pays the classifier
+        "latency_saved_ms_per_query": (
+            coverage * llm_ms - local_ms if llm_ms is not None else None
+        ),
+    }
+
+    def percent(value):
+        return "n/a" if value is None else f"{value:.1%}"
+
+    print(
+        f"Examples: {report['examples']} ({report['labelled']} labelled, "
+        f"{report['llm_decisions']} LLM decisions), classes: {counts}"
+    )
+    print(f"Agreement ({args.folds}-fold): {percent(report['agreement'])}")
+    print(f"Agreement with LLM decisions: {percent(report['agreement_with_llm'])}")
+    print(
+        f"Coverage at threshold {args.threshold}: {percent(coverage)} "
+        f"(agreement {percent(report['agreement_when_confident'])}, "
+        f"with LLM {percent(report['agreement_with_llm_when_confident'])})"
+    )
+    print(
+        f"Classifier latency: p50 {report['local_latency_us_p50']:.0f} µs, "
+        f"p95 {report['local_latency_us_p95']:.0f} µs"
+    )
+    if llm_ms is None:
+        print("LLM latency: n/a (no logged decisions)")
+    else:
+        print(
+            f"LLM latency: {llm_ms:.1f} ms mean; saved per query: "
+            f"{report['latency_saved_ms_per_query']:.1f} ms"
+        )
+
+    save_classifier(classifier, args.output)
+    print(f"✅ Classifier saved to {args.output}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report saved to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ Type hints with Literal and Field provide static type checking without
 runtime validation overhead (~2.5x faster than BaseModel).
 """
 
-from typing import List, Literal, Sequence, TypedDict
+from typing import Dict, List, Literal, Optional, Sequence, TypedDict
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -14,7 +14,15 @@ from pydantic import Field
 from typing_extensions import Annotated
 
 
-class RAGState(TypedDict):
+class _OptionalRAGState(TypedDict, total=False):
+    """Optional RAGState keys (absent from the initial state)."""
+
+    document_ids: List[Optional[str]]
+    retrieval_candidates: Dict[str, List[str]]
+    retrieval_candidate_ids: Dict[str, List[Optional[str]]]
+
+
+class RAGState(_OptionalRAGState):
     """
     Represents the state of the RAG graph workflow.
 
@@ -25,6 +33,11 @@ class RAGState(TypedDict):
         generation: LLM generated answer
         quality_score: Validation score (0.0-1.0 range, higher is better)
         iterations: Number of refinement iterations performed (non-negative)
+        document_ids: Vector ids of ``documents`` (same order), used to read
+            their vectors back from the index
+        retrieval_candidates: Speculative retrieval results per complexity
+            label (only set when settings.retrieval_speculative_enabled)
+        retrieval_candidate_ids: Vector ids of ``retrieval_candidates``
 
     Note:
         Field constraints (ge, le) provide documentation and static type checking
@@ -1,8 +1,22 @@
 """Convenience exports for conversational RAG nodes."""
 
-from .conversation import analyze_context, check_clarification, expand_question
+from .conversation import (
+    aanalyze_and_expand,
+    aanalyze_context,
+    acheck_clarification,
+    aexpand_question,
+    analyze_and_expand,
+    analyze_context,
+    check_clarification,
+    expand_question,
+)
 
 __all__ = [
+    "aanalyze_and_expand",
+    "aanalyze_context",
+    "acheck_clarification",
+    "aexpand_question",
+    "analyze_and_expand",
     "analyze_context",
     "check_clarification",
     "expand_question",
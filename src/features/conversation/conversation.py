@@ -1,20 +1,45 @@
 """
 Conversational Nodes for RAG System
 Handles context analysis, follow-up detection, and question expansion
+
+Every node has an async twin (``aanalyze_context``, ...) used by the graph's
+async path; both share prompts and state handling (see
+``src.features.rag.nodes``).
 """
 
-from typing import Any
+from typing import Any, Dict, Optional, Sequence
 
 from langchain.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langsmith import traceable
+from pydantic import BaseModel, Field
 
 from src.core.domain.state import ConversationalRAGState
+from src.features.conversation.followup import looks_standalone
 from src.infrastructure.config.settings import settings
+from src.infrastructure.external.llm_cache import get_llm_cache
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
 
 # Initialize LLM
-llm = ChatGoogleGenerativeAI(model=settings.llm_model, temperature=0)
+# Temperature 0: identical prompts reuse cached responses (per-node TTL)
+llm = ChatGoogleGenerativeAI(
+    model=settings.llm_model, temperature=0, cache=get_llm_cache()
+)
+
+
+class FollowupAnalysis(BaseModel):
+    """Structured answer of the combined follow-up analysis call."""
+
+    is_followup: bool = Field(
+        description="True if the question depends on the conversation history"
+    )
+    standalone_question: str = Field(
+        description="The question rewritten to be understandable without history"
+    )
 
 
 def _coerce_content(content: Any) -> str:
@@ -26,74 +51,201 @@ def _coerce_content(content: Any) -> str:
     return str(content)
 
 
-@traceable(run_type="chain", name="Analyze Context for Follow-up")
-def analyze_context(state: ConversationalRAGState) -> ConversationalRAGState:
+def _history_text(messages: Sequence[BaseMessage], window: int) -> str:
+    """Render the last ``window`` messages (or all but the current) as text."""
+    recent_messages = messages[-window:] if len(messages) > window else messages[:-1]
+    return "\n".join(
+        [
+            f"{'User' if isinstance(msg, HumanMessage) else 'Assistant'}: {_coerce_content(msg.content)}"
+            for msg in recent_messages
+        ]
+    )
+
+
+def _obviously_standalone(question: str) -> bool:
+    """Whether the local heuristic settles the turn as standalone."""
+    return settings.conversation_followup_heuristic_enabled and looks_standalone(
+        question
+    )
+
+
+ANALYZE_PROMPT = ChatPromptTemplate.from_template(
+    "Analise se a pergunta atual é uma pergunta de follow-up (continuação) "
+    "ou uma pergunta nova e independente.\n\n"
+    "HISTÓRICO RECENTE:\n{history}\n\n"
+    "PERGUNTA ATUAL: {question}\n\n"
+    "Uma pergunta de follow-up:\n"
+    "- Usa pronomes (isso, aquilo, ele, ela, disso)\n"
+    "- Usa demonstrativos (este, esse, aquele)\n"
+    "- Referencia implicitamente o tópico anterior\n"
+    "- Pede mais detalhes sobre resposta anterior\n"
+    '- Usa "E...?", "Mas...", "Também..."\n\n'
+    "Responda APENAS 'sim' (é follow-up) ou 'não' (pergunta nova):"
+)
+
+EXPAND_PROMPT = ChatPromptTemplate.from_template(
+    "Reescreva a pergunta de follow-up como uma pergunta completa e autônoma, "
+    "incorporando o contexto necessário do histórico da conversa.\n\n"
+    "HISTÓRICO DA CONVERSA:\n{history}\n\n"
+    "PERGUNTA DE FOLLOW-UP: {question}\n\n"
+    "INSTRUÇÕES:\n"
+    "- Substitua pronomes por entidades específicas\n"
+    "- Torne a pergunta compreensível sem o histórico\n"
+    "- Mantenha a intenção original da pergunta\n"
+    "- Seja conciso mas completo\n\n"
+    "PERGUNTA EXPANDIDA:"
+)
+
+ANALYZE_AND_EXPAND_PROMPT = ChatPromptTemplate.from_template(
+    "Analise se a pergunta atual é uma pergunta de follow-up (continuação) "
+    "da conversa ou uma pergunta nova e independente, e reescreva-a como "
+    "uma pergunta completa e autônoma.\n\n"
+    "HISTÓRICO DA CONVERSA:\n{history}\n\n"
+    "PERGUNTA ATUAL: {question}\n\n"
+    "Uma pergunta de follow-up:\n"
+    "- Usa pronomes (isso, aquilo, ele, ela, disso)\n"
+    "- Usa demonstrativos (este, esse, aquele)\n"
+    "- Referencia implicitamente o tópico anterior\n"
+    "- Pede mais detalhes sobre resposta anterior\n"
+    '- Usa "E...?", "Mas...", "Também..."\n\n'
+    "Para a pergunta autônoma:\n"
+    "- Substitua pronomes por entidades específicas\n"
+    "- Torne a pergunta compreensível sem o histórico\n"
+    "- Mantenha a intenção original da pergunta\n"
+    "- Se não for follow-up, repita a pergunta atual"
+)
+
+CLARIFICATION_CHECK_PROMPT = ChatPromptTemplate.from_template(
+    "Analise se a seguinte pergunta é clara o suficiente ou se precisa de clarificação.\n\n"
+    "PERGUNTA: {question}\n\n"
+    "Uma pergunta precisa de clarificação se:\n"
+    "- É muito vaga ou genérica\n"
+    "- Tem múltiplas interpretações possíveis\n"
+    "- Falta contexto essencial\n\n"
+    "Responda APENAS 'sim' (precisa clarificação) ou 'não' (está clara):"
+)
+
+CLARIFICATION_PROMPT = ChatPromptTemplate.from_template(
+    "Gere uma pergunta de clarificação educada e específica para ajudar "
+    "o usuário a reformular a pergunta de forma mais clara.\n\n"
+    "PERGUNTA VAGA: {question}\n\n"
+    "PERGUNTA DE CLARIFICAÇÃO:"
+)
+
+
+def _start_turn(state: ConversationalRAGState, window: int) -> Optional[Dict[str, Any]]:
     """
-    Analyzes if the current question is a follow-up or standalone.
+    Reset the turn fields and settle turns that need no LLM call.
 
-    Detects:
-    - Pronouns (isso, aquilo, ele, ela, etc.)
-    - Demonstratives (este, esse, aquele)
-    - Implicit references
-    - Continuation patterns
+    Args:
+        state: Conversation state.
+        window: Recent messages included in the history text.
 
     Returns:
-        Dict with is_followup, question, original_question fields
+        Follow-up prompt variables (history + question), or None when the
+        turn is settled as standalone (first message or local heuristic).
     """
     messages = state["messages"]
     current_question = _coerce_content(messages[-1].content) if messages else ""
 
-    # Store original question
-    original_question = current_question
+    # Store original question (expanded later if follow-up)
+    state["is_followup"] = False
+    state["question"] = current_question
+    state["original_question"] = current_question
 
     # If first message, can't be follow-up
     if len(messages) <= 1:
         print("[CONTEXT] First message - not a follow-up")
-        state["is_followup"] = False
-        state["question"] = current_question
-        state["original_question"] = original_question
-        return state
+        return None
 
-    # Get recent conversation history (last 4 messages)
-    recent_messages = messages[-4:] if len(messages) > 4 else messages[:-1]
-    history_text = "\n".join(
-        [
-            f"{'User' if isinstance(msg, HumanMessage) else 'Assistant'}: {_coerce_content(msg.content)}"
-            for msg in recent_messages
-        ]
-    )
+    # Obvious standalone turns need no LLM call
+    if _obviously_standalone(current_question):
+        print(f"[CONTEXT] Standalone question (heuristic): {current_question}")
+        return None
 
-    # Use LLM to detect follow-up
-    prompt = ChatPromptTemplate.from_template(
-        "Analise se a pergunta atual é uma pergunta de follow-up (continuação) "
-        "ou uma pergunta nova e independente.\n\n"
-        "HISTÓRICO RECENTE:\n{history}\n\n"
-        "PERGUNTA ATUAL: {question}\n\n"
-        "Uma pergunta de follow-up:\n"
-        "- Usa pronomes (isso, aquilo, ele, ela, disso)\n"
-        "- Usa demonstrativos (este, esse, aquele)\n"
-        "- Referencia implicitamente o tópico anterior\n"
-        "- Pede mais detalhes sobre resposta anterior\n"
-        '- Usa "E...?", "Mas...", "Também..."\n\n'
-        "Responda APENAS 'sim' (é follow-up) ou 'não' (pergunta nova):"
-    )
+    return {"history": _history_text(messages, window), "question": current_question}
 
-    chain = prompt | llm
-    response = chain.invoke({"history": history_text, "question": current_question})
 
+def _apply_followup(
+    state: ConversationalRAGState, response: BaseMessage
+) -> ConversationalRAGState:
+    """Store the LLM's follow-up decision."""
     # Safely extract content (can be str or list in some cases)
     is_followup_text = _coerce_content(response.content).lower()
 
     is_followup = "sim" in is_followup_text
 
     if is_followup:
-        print(f"[CONTEXT] Detected follow-up question: {current_question}")
+        print(f"[CONTEXT] Detected follow-up question: {state['original_question']}")
     else:
-        print(f"[CONTEXT] Standalone question: {current_question}")
+        print(f"[CONTEXT] Standalone question: {state['original_question']}")
 
     state["is_followup"] = is_followup
-    state["question"] = current_question  # Will be expanded later if follow-up
-    state["original_question"] = original_question
+    return state
+
+
+@traceable(run_type="chain", name="Analyze Context for Follow-up")
+def analyze_context(state: ConversationalRAGState) -> ConversationalRAGState:
+    """
+    Analyzes if the current question is a follow-up or standalone.
+
+    Detects:
+    - Pronouns (isso, aquilo, ele, ela, etc.)
+    - Demonstratives (este, esse, aquele)
+    - Implicit references
+    - Continuation patterns
+
+    Returns:
+        Dict with is_followup, question, original_question fields
+    """
+    # Get recent conversation history (last 4 messages)
+    inputs = _start_turn(state, window=4)
+    if inputs is None:
+        return state
+
+    # Use LLM to detect follow-up
+    chain = ANALYZE_PROMPT | llm
+    response = chain.invoke(inputs)
+    return _apply_followup(state, response)
+
+
+@traceable(run_type="chain", name="Analyze Context for Follow-up")
+async def aanalyze_context(state: ConversationalRAGState) -> ConversationalRAGState:
+    """Async ``analyze_context``."""
+    inputs = _start_turn(state, window=4)
+    if inputs is None:
+        return state
+
+    chain = ANALYZE_PROMPT | llm
+    response = await chain.ainvoke(inputs)
+    return _apply_followup(state, response)
+
+
+def _expand_inputs(state: ConversationalRAGState) -> Optional[Dict[str, Any]]:
+    """Expansion prompt variables, or None for standalone questions."""
+    if not state["is_followup"]:
+        # Not a follow-up, return as-is
+        print("[EXPAND] Standalone question - no expansion needed")
+        return None
+
+    # Get recent conversation (last 6 messages for context)
+    return {
+        "history": _history_text(state["messages"], 6),
+        "question": state["original_question"],
+    }
+
+
+def _apply_expansion(
+    state: ConversationalRAGState, response: BaseMessage
+) -> ConversationalRAGState:
+    """Store the expanded question."""
+    # Safely extract content
+    expanded_question = _coerce_content(response.content).strip()
+
+    print(f"[EXPAND] Original: {state['original_question']}")
+    print(f"[EXPAND] Expanded: {expanded_question}")
+
+    state["question"] = expanded_question
     return state
 
 
@@ -111,50 +263,134 @@ def expand_question(state: ConversationalRAGState) -> ConversationalRAGState:
     Returns:
         Dict with expanded question field
     """
-    if not state["is_followup"]:
-        # Not a follow-up, return as-is
-        print("[EXPAND] Standalone question - no expansion needed")
+    inputs = _expand_inputs(state)
+    if inputs is None:
         return state
 
-    messages = state["messages"]
-    current_question = state["original_question"]
+    # Use LLM to expand question with context
+    chain = EXPAND_PROMPT | llm
+    response = chain.invoke(inputs)
+    return _apply_expansion(state, response)
 
-    # Get recent conversation (last 6 messages for context)
-    recent_messages = messages[-6:] if len(messages) > 6 else messages[:-1]
-    history_text = "\n".join(
-        [
-            f"{'User' if isinstance(msg, HumanMessage) else 'Assistant'}: {_coerce_content(msg.content)}"
-            for msg in recent_messages
-        ]
-    )
 
-    # Use LLM to expand question with context
-    prompt = ChatPromptTemplate.from_template(
-        "Reescreva a pergunta de follow-up como uma pergunta completa e autônoma, "
-        "incorporando o contexto necessário do histórico da conversa.\n\n"
-        "HISTÓRICO DA CONVERSA:\n{history}\n\n"
-        "PERGUNTA DE FOLLOW-UP: {question}\n\n"
-        "INSTRUÇÕES:\n"
-        "- Substitua pronomes por entidades específicas\n"
-        "- Torne a pergunta compreensível sem o histórico\n"
-        "- Mantenha a intenção original da pergunta\n"
-        "- Seja conciso mas completo\n\n"
-        "PERGUNTA EXPANDIDA:"
+@traceable(run_type="chain", name="Expand Follow-up Question")
+async def aexpand_question(state: ConversationalRAGState) -> ConversationalRAGState:
+    """Async ``expand_question``."""
+    inputs = _expand_inputs(state)
+    if inputs is None:
+        return state
+
+    chain = EXPAND_PROMPT | llm
+    response = await chain.ainvoke(inputs)
+    return _apply_expansion(state, response)
+
+
+def _followup_analysis(analysis: Any) -> FollowupAnalysis:
+    """Check the structured response (anything else triggers the fallback)."""
+    if not isinstance(analysis, FollowupAnalysis):
+        raise ValueError(f"unexpected structured output: {analysis!r}")
+    return analysis
+
+
+def _log_analysis_failure(error: Exception) -> None:
+    """Log a failed combined call before falling back to two calls."""
+    logger.warning(
+        "followup_analysis_failed",
+        error_type=type(error).__name__,
+        error_message=str(error),
+        fallback="separate_calls",
     )
 
-    chain = prompt | llm
-    response = chain.invoke({"history": history_text, "question": current_question})
 
-    # Safely extract content
-    expanded_question = _coerce_content(response.content).strip()
+def _apply_analysis(
+    state: ConversationalRAGState, analysis: FollowupAnalysis
+) -> ConversationalRAGState:
+    """Store the combined follow-up decision and standalone question."""
+    current_question = state["original_question"]
+    if not analysis.is_followup:
+        print(f"[CONTEXT] Standalone question: {current_question}")
+        return state
 
-    print(f"[EXPAND] Original: {current_question}")
+    expanded_question = analysis.standalone_question.strip() or current_question
+    print(f"[CONTEXT] Detected follow-up question: {current_question}")
     print(f"[EXPAND] Expanded: {expanded_question}")
-
+    state["is_followup"] = True
     state["question"] = expanded_question
     return state
 
 
+@traceable(run_type="chain", name="Analyze and Expand Follow-up")
+def analyze_and_expand(state: ConversationalRAGState) -> ConversationalRAGState:
+    """
+    Detects follow-ups and expands them in a single LLM call.
+
+    Replaces ``analyze_context`` + ``expand_question`` when
+    ``settings.conversation_followup_mode`` is "combined": one structured
+    response carries both the follow-up decision and the standalone
+    question. Turns the local heuristic settles as standalone (and first
+    turns) make no LLM call at all. If the structured call fails, the two
+    separate calls are made instead.
+
+    Returns:
+        Dict with is_followup, question (expanded if follow-up) and
+        original_question fields
+    """
+    inputs = _start_turn(state, window=6)
+    if inputs is None:
+        return state
+
+    try:
+        chain = ANALYZE_AND_EXPAND_PROMPT | llm.with_structured_output(FollowupAnalysis)
+        analysis = _followup_analysis(chain.invoke(inputs))
+    except Exception as e:
+        _log_analysis_failure(e)
+        return expand_question(analyze_context(state))
+    return _apply_analysis(state, analysis)
+
+
+@traceable(run_type="chain", name="Analyze and Expand Follow-up")
+async def aanalyze_and_expand(
+    state: ConversationalRAGState,
+) -> ConversationalRAGState:
+    """Async ``analyze_and_expand``."""
+    inputs = _start_turn(state, window=6)
+    if inputs is None:
+        return state
+
+    try:
+        chain = ANALYZE_AND_EXPAND_PROMPT | llm.with_structured_output(FollowupAnalysis)
+        analysis = _followup_analysis(await chain.ainvoke(inputs))
+    except Exception as e:
+        _log_analysis_failure(e)
+        return await aexpand_question(await aanalyze_context(state))
+    return _apply_analysis(state, analysis)
+
+
+def _needs_clarification(response: BaseMessage) -> bool:
+    """Whether the clarity check answered "sim"."""
+    # Safely extract content
+    response_text = _coerce_content(response.content).lower()
+
+    return "sim" in response_text
+
+
+def _apply_clarification(
+    state: ConversationalRAGState, clarification_response: BaseMessage
+) -> ConversationalRAGState:
+    """Answer with the clarification question."""
+    question = state["question"]
+
+    # Safely extract clarification content
+    clarification = _coerce_content(clarification_response.content).strip()
+
+    print(f"[CLARIFY] Needs clarification: {question}")
+    print(f"[CLARIFY] Asking: {clarification}")
+
+    state["generation"] = f"Desculpe, preciso de mais informações. {clarification}"
+    state["quality_score"] = 0.5  # Medium score - needs user input
+    return state
+
+
 @traceable(run_type="chain", name="Check if Clarification Needed")
 def check_clarification(state: ConversationalRAGState) -> ConversationalRAGState:
     """
@@ -165,52 +401,33 @@ def check_clarification(state: ConversationalRAGState) -> ConversationalRAGState
     Returns:
         Dict with generation and quality_score if clarification needed, empty dict otherwise
     """
-    question = state["question"]
-    documents = state["documents"]
+    inputs = {"question": state["question"]}
 
     # If no documents retrieved, might need clarification
-    if not documents:
-        prompt = ChatPromptTemplate.from_template(
-            "Analise se a seguinte pergunta é clara o suficiente ou se precisa de clarificação.\n\n"
-            "PERGUNTA: {question}\n\n"
-            "Uma pergunta precisa de clarificação se:\n"
-            "- É muito vaga ou genérica\n"
-            "- Tem múltiplas interpretações possíveis\n"
-            "- Falta contexto essencial\n\n"
-            "Responda APENAS 'sim' (precisa clarificação) ou 'não' (está clara):"
-        )
-
-        chain = prompt | llm
-        response = chain.invoke({"question": question})
-
-        # Safely extract content
-        response_text = _coerce_content(response.content).lower()
-
-        needs_clarification = "sim" in response_text
-
-        if needs_clarification:
+    if not state["documents"]:
+        chain = CLARIFICATION_CHECK_PROMPT | llm
+        if _needs_clarification(chain.invoke(inputs)):
             # Generate clarification question
-            clarification_prompt = ChatPromptTemplate.from_template(
-                "Gere uma pergunta de clarificação educada e específica para ajudar "
-                "o usuário a reformular a pergunta de forma mais clara.\n\n"
-                "PERGUNTA VAGA: {question}\n\n"
-                "PERGUNTA DE CLARIFICAÇÃO:"
-            )
-
-            clarification_chain = clarification_prompt | llm
-            clarification_response = clarification_chain.invoke({"question": question})
-
-            # Safely extract clarification content
-            clarification = _coerce_content(clarification_response.content).strip()
-
-            print(f"[CLARIFY] Needs clarification: {question}")
-            print(f"[CLARIFY] Asking: {clarification}")
-
-            state["generation"] = (
-                f"Desculpe, preciso de mais informações. {clarification}"
-            )
-            state["quality_score"] = 0.5  # Medium score - needs user input
-            return state
+            clarification_chain = CLARIFICATION_PROMPT | llm
+            return _apply_clarification(state, clarification_chain.invoke(inputs))
+
+    print("[CLARIFY] Question is clear enough")
+    return state
+
+
+@traceable(run_type="chain", name="Check if Clarification Needed")
+async def acheck_clarification(
+    state: ConversationalRAGState,
+) -> ConversationalRAGState:
+    """Async ``check_clarification``."""
+    inputs = {"question": state["question"]}
+
+    if not state["documents"]:
+        chain = CLARIFICATION_CHECK_PROMPT | llm
+        if _needs_clarification(await chain.ainvoke(inputs)):
+            clarification_chain = CLARIFICATION_PROMPT | llm
+            clarification_response = await clarification_chain.ainvoke(inputs)
+            return _apply_clarification(state, clarification_response)
 
     print("[CLARIFY] Question is clear enough")
     return state
@@ -3,7 +3,7 @@ Conversational RAG Graph with Memory
 Integrates chat history, context analysis, and follow-up handling
 """
 
-from typing import Any, Protocol, cast
+from typing import Any, Iterator, Protocol, cast
 
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, START, StateGraph
@@ -11,18 +11,33 @@ from langgraph.graph import END, START, StateGraph
 from src.core.domain.state import ConversationalRAGState
 from src.core.services.memory_manager import get_conversation_config, get_memory_saver
 from src.features.conversation import (
+    aanalyze_and_expand,
+    aanalyze_context,
+    acheck_clarification,
+    aexpand_question,
+    analyze_and_expand,
     analyze_context,
     check_clarification,
     expand_question,
 )
+from src.features.rag.graph_registry import Topology, get_graph_registry
 from src.features.rag.nodes import (
+    aclassify_question,
+    agenerate_answer,
+    arefine_answer,
+    arerank_documents,
+    aretrieve_adaptive,
+    avalidate_quality,
     classify_question,
     generate_answer,
+    graph_node,
     refine_answer,
     rerank_documents,
     retrieve_adaptive,
     validate_quality,
 )
+from src.features.rag.streaming import StreamEvent, stream_graph
+from src.infrastructure.config.settings import settings
 
 # Maximum refinement iterations
 MAX_ITERATIONS = 2
@@ -35,6 +50,17 @@ class ConversationalGraphRunner(Protocol):
         self, state: ConversationalRAGState, config: Any | None = None
     ) -> dict[str, object]: ...
 
+    async def ainvoke(
+        self, state: ConversationalRAGState, config: Any | None = None
+    ) -> dict[str, object]: ...
+
+    def stream(
+        self,
+        state: ConversationalRAGState,
+        config: Any | None = None,
+        **kwargs: Any,
+    ) -> Iterator[Any]: ...
+
 
 def should_refine(state: ConversationalRAGState) -> str:
     """
@@ -95,9 +121,15 @@ def create_conversational_rag_graph() -> ConversationalGraphRunner:
       ↓
     [CONDITIONAL: clarify or proceed]
       ↓
-    classify → retrieve → generate → validate → [refine or END]
-                                                    ↓
-                                                validate (loop)
+    classify → retrieve → rerank → generate → validate → [refine or END]
+                                                             ↓
+                                                         validate (loop)
+
+    With ``settings.conversation_followup_mode == "combined"`` (default),
+    analyze_context detects and expands follow-ups in one LLM call and
+    expand_question is not part of the graph. The rerank node is left out
+    when ``settings.reranker_enabled`` is off. Queries should use
+    ``get_conversational_rag_graph``, which compiles each variant once.
 
     Returns:
         Compiled LangGraph StateGraph with memory
@@ -106,22 +138,38 @@ def create_conversational_rag_graph() -> ConversationalGraphRunner:
     workflow = StateGraph(ConversationalRAGState)
 
     # Add conversational nodes
-    workflow.add_node("analyze_context", analyze_context)
-    workflow.add_node("expand_question", expand_question)
-    workflow.add_node("check_clarification", check_clarification)
+    combined = settings.conversation_followup_mode == "combined"
+    if combined:
+        workflow.add_node(
+            "analyze_context", graph_node(analyze_and_expand, aanalyze_and_expand)
+        )
+    else:
+        workflow.add_node(
+            "analyze_context", graph_node(analyze_context, aanalyze_context)
+        )
+        workflow.add_node(
+            "expand_question", graph_node(expand_question, aexpand_question)
+        )
+    workflow.add_node(
+        "check_clarification", graph_node(check_clarification, acheck_clarification)
+    )
 
     # Add RAG nodes (reused from original system)
-    workflow.add_node("classify", classify_question)
-    workflow.add_node("retrieve", retrieve_adaptive)
-    workflow.add_node("rerank", rerank_documents)
-    workflow.add_node("generate", generate_answer)
-    workflow.add_node("validate", validate_quality)
-    workflow.add_node("refine", refine_answer)
+    workflow.add_node("classify", graph_node(classify_question, aclassify_question))
+    workflow.add_node("retrieve", graph_node(retrieve_adaptive, aretrieve_adaptive))
+    if settings.reranker_enabled:
+        workflow.add_node("rerank", graph_node(rerank_documents, arerank_documents))
+    workflow.add_node("generate", graph_node(generate_answer, agenerate_answer))
+    workflow.add_node("validate", graph_node(validate_quality, avalidate_quality))
+    workflow.add_node("refine", graph_node(refine_answer, arefine_answer))
 
     # Define flow
     workflow.add_edge(START, "analyze_context")
-    workflow.add_edge("analyze_context", "expand_question")
-    workflow.add_edge("expand_question", "check_clarification")
+    if combined:
+        workflow.add_edge("analyze_context", "check_clarification")
+    else:
+        workflow.add_edge("analyze_context", "expand_question")
+        workflow.add_edge("expand_question", "check_clarification")
 
     # Conditional: proceed or ask clarification
     workflow.add_conditional_edges(
@@ -132,8 +180,11 @@ def create_conversational_rag_graph() -> ConversationalGraphRunner:
 
     # Normal RAG flow
     workflow.add_edge("classify", "retrieve")
-    workflow.add_edge("retrieve", "rerank")
-    workflow.add_edge("rerank", "generate")
+    if settings.reranker_enabled:
+        workflow.add_edge("retrieve", "rerank")
+        workflow.add_edge("rerank", "generate")
+    else:
+        workflow.add_edge("retrieve", "generate")
     workflow.add_edge("generate", "validate")
 
     # Conditional: refine or end
@@ -152,6 +203,27 @@ def create_conversational_rag_graph() -> ConversationalGraphRunner:
     return cast(ConversationalGraphRunner, graph)
 
 
+def conversational_topology() -> Topology:
+    """Settings that change the conversational graph's nodes and edges."""
+    return (
+        ("conversation_followup_mode", settings.conversation_followup_mode),
+        ("reranker_enabled", settings.reranker_enabled),
+    )
+
+
+def get_conversational_rag_graph() -> ConversationalGraphRunner:
+    """
+    Compiled conversational graph for the current settings, shared across
+    queries and threads (conversation state lives in the checkpointer).
+
+    Returns:
+        Compiled graph from the graph registry (compiled on first use)
+    """
+    return get_graph_registry().get(
+        "conversational", conversational_topology(), create_conversational_rag_graph
+    )
+
+
 def run_conversational_query(
     question: str,
     user_id: str = "default",
@@ -168,7 +240,7 @@ def run_conversational_query(
     Returns:
         Generated answer string
     """
-    graph = create_conversational_rag_graph()
+    graph = get_conversational_rag_graph()
 
     # Get or create config
     if config is None:
@@ -216,3 +288,103 @@ def run_conversational_query(
     print(f"{'='*60}\n")
 
     return answer
+
+
+async def arun_conversational_query(
+    question: str,
+    user_id: str = "default",
+    config: dict[str, Any] | None = None,
+) -> str:
+    """
+    Executes conversational RAG query with memory through the async path.
+
+    Same flow and result as ``run_conversational_query``; LLM calls are
+    awaited, so one event loop can drive many concurrent conversations.
+
+    Args:
+        question: User question
+        user_id: Unique user identifier for session management
+        config: Optional config dict (will create if None)
+
+    Returns:
+        Generated answer string
+    """
+    graph = get_conversational_rag_graph()
+
+    if config is None:
+        config = get_conversation_config(user_id)
+
+    initial_state: ConversationalRAGState = {
+        "messages": [HumanMessage(content=question)],
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+        "is_followup": False,
+        "original_question": question,
+    }
+
+    print(
+        f"[QUERY] Starting async conversational RAG for: {question} "
+        f"(thread {config['configurable']['thread_id']})"
+    )
+
+    final_state = cast(
+        ConversationalRAGState,
+        await graph.ainvoke(initial_state, config),
+    )
+
+    print(
+        f"[COMPLETE] Async workflow finished (follow-up: "
+        f"{final_state['is_followup']}, quality: {final_state['quality_score']:.2f}, "
+        f"iterations: {final_state['iterations']})"
+    )
+    return final_state["generation"]
+
+
+def stream_conversational_query(
+    question: str,
+    user_id: str = "default",
+    config: dict[str, Any] | None = None,
+) -> Iterator[StreamEvent]:
+    """
+    Executes conversational RAG query with memory, streaming the answer.
+
+    Same flow as ``run_conversational_query``; answer tokens are yielded as
+    they are generated and validation/refinement continue in the background
+    (a "correction" event replaces the answer if refinement ran).
+
+    Args:
+        question: User question
+        user_id: Unique user identifier for session management
+        config: Optional config dict (will create if None)
+
+    Yields:
+        token / answer / correction / final events
+    """
+    graph = get_conversational_rag_graph()
+
+    if config is None:
+        config = get_conversation_config(user_id)
+
+    initial_state: ConversationalRAGState = {
+        "messages": [HumanMessage(content=question)],
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+        "is_followup": False,
+        "original_question": question,
+    }
+
+    print(f"\n{'='*60}")
+    print(f"[QUERY] Streaming conversational RAG for: {question}")
+    print(f"[QUERY] User ID: {user_id}")
+    print(f"[QUERY] Thread ID: {config['configurable']['thread_id']}")
+    print(f"{'='*60}\n")
+
+    yield from stream_graph(graph, dict(initial_state), config)
@@ -0,0 +1,188 @@
+"""
+Local follow-up heuristic for conversational turns.
+
+Deciding whether a turn is a follow-up used to cost an LLM call on every
+turn after the first. Most standalone questions are easy to spot locally:
+they contain no pronouns or demonstratives pointing back at the
+conversation, do not open with a continuation ("E...?", "Mas..."), and name
+their own subject. ``looks_standalone`` returns True only for those obvious
+cases; anything else (possible follow-ups) still goes to the LLM.
+
+Example:
+    >>> looks_standalone("Quais as limitações do algoritmo Perceptron?")
+    True
+    >>> looks_standalone("Quais suas limitações?")
+    False
+"""
+
+import re
+
+# Pronouns / demonstratives referring back to the conversation (pt-BR, en)
+ANAPHORA = frozenset(
+    {
+        # Portuguese
+        "isso",
+        "isto",
+        "aquilo",
+        "disso",
+        "disto",
+        "daquilo",
+        "nisso",
+        "nisto",
+        "naquilo",
+        "ele",
+        "ela",
+        "eles",
+        "elas",
+        "dele",
+        "dela",
+        "deles",
+        "delas",
+        "nele",
+        "nela",
+        "neles",
+        "nelas",
+        "este",
+        "esta",
+        "estes",
+        "estas",
+        "esse",
+        "essa",
+        "esses",
+        "essas",
+        "aquele",
+        "aquela",
+        "aqueles",
+        "aquelas",
+        "deste",
+        "desta",
+        "desse",
+        "dessa",
+        "daquele",
+        "daquela",
+        "neste",
+        "nesta",
+        "nesse",
+        "nessa",
+        "seu",
+        "sua",
+        "seus",
+        "suas",
+        "lo",
+        "la",
+        "los",
+        "las",
+        "anterior",
+        "anteriores",
+        "acima",
+        "mesmo",
+        "mesma",
+        # English
+        "it",
+        "its",
+        "this",
+        "that",
+        "these",
+        "those",
+        "they",
+        "them",
+        "their",
+        "he",
+        "she",
+        "his",
+        "her",
+        "previous",
+        "above",
+        "same",
+    }
+)
+
+# Openings that continue the previous turn
+CONTINUATIONS = frozenset(
+    {"e", "mas", "também", "então", "entao", "and", "but", "also", "so"}
+)
+
+# Function and question words that do not name a subject
+FUNCTION_WORDS = frozenset(
+    {
+        "qual",
+        "quais",
+        "como",
+        "onde",
+        "quando",
+        "quem",
+        "quanto",
+        "quantos",
+        "quantas",
+        "porque",
+        "porquê",
+        "para",
+        "pelo",
+        "pela",
+        "pelos",
+        "pelas",
+        "sobre",
+        "entre",
+        "são",
+        "está",
+        "estão",
+        "seria",
+        "seriam",
+        "pode",
+        "podem",
+        "poderia",
+        "explique",
+        "explica",
+        "descreva",
+        "fale",
+        "diga",
+        "mostre",
+        "mais",
+        "menos",
+        "muito",
+        "melhor",
+        "detalhes",
+        "exemplo",
+        "exemplos",
+        "what",
+        "which",
+        "when",
+        "where",
+        "does",
+        "explain",
+        "describe",
+        "about",
+        "with",
+        "from",
+        "more",
+        "tell",
+        "show",
+        "example",
+        "examples",
+    }
+)
+
+# Content words (4+ letters, not function words) a standalone question needs
+MIN_SUBJECT_WORDS = 2
+
+_WORD = re.compile(r"\w+")
+
+
+def looks_standalone(question: str) -> bool:
+    """
+    Whether a turn is obviously standalone (no LLM follow-up check needed).
+
+    Args:
+        question: Current user turn.
+
+    Returns:
+        True when the turn has no back-references, no continuation opening
+        and names its own subject; False means "ask the LLM".
+    """
+    words = _WORD.findall(question.lower())
+    if not words or words[0] in CONTINUATIONS:
+        return False
+    if any(word in ANAPHORA for word in words):
+        return False
+    subject = [w for w in words if len(w) >= 4 and w not in FUNCTION_WORDS]
+    return len(subject) >= MIN_SUBJECT_WORDS
@@ -0,0 +1,13 @@
+"""Convenience exports for document ingestion."""
+
+from .incremental import ingest_incremental
+from .manifest import IngestionManifest, IngestionReport
+from .pipeline import PipelineReport, run_ingestion_pipeline
+
+__all__ = [
+    "IngestionManifest",
+    "IngestionReport",
+    "PipelineReport",
+    "ingest_incremental",
+    "run_ingestion_pipeline",
+]
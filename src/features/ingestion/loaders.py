@@ -0,0 +1,150 @@
+"""
+Document loaders and splitter used by ingestion.
+
+Maps source files to LangChain loaders by extension and builds the text
+splitter from settings so every ingestion path chunks documents the same way.
+
+Documents are streamed page by page (``lazy_load``) and split in windows of
+``settings.ingestion_page_window`` pages, so peak memory is bounded by the
+window size instead of the document size. Nothing is parsed until a generator
+is consumed.
+"""
+
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter, TextSplitter
+from langchain_core.documents import Document
+
+from src.infrastructure.config.settings import settings
+
+# Extensions handled by load_source_documents
+PDF_EXTENSIONS = (".pdf",)
+TEXT_EXTENSIONS = (".md", ".markdown", ".txt")
+SUPPORTED_EXTENSIONS = PDF_EXTENSIONS + TEXT_EXTENSIONS
+
+
+def create_splitter() -> RecursiveCharacterTextSplitter:
+    """
+    Create the chunk splitter configured in settings.
+
+    Returns:
+        RecursiveCharacterTextSplitter: Splitter using ingestion chunk settings.
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.ingestion_chunk_size,
+        chunk_overlap=settings.ingestion_chunk_overlap,
+    )
+
+
+def lazy_load_source_documents(path: str) -> Iterator[Document]:
+    """
+    Stream a source file as LangChain documents (one per PDF page).
+
+    Args:
+        path: Path to a PDF, markdown or plain-text file.
+
+    Yields:
+        Document: One page (PDF) or the whole file (text) with ``source`` metadata.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PDF_EXTENSIONS:
+        from langchain_community.document_loaders import PyPDFLoader
+
+        yield from PyPDFLoader(path).lazy_load()
+    elif extension in TEXT_EXTENSIONS:
+        from langchain_community.document_loaders import TextLoader
+
+        yield from TextLoader(path, encoding="utf-8").lazy_load()
+    else:
+        raise ValueError(f"Unsupported document type: {path}")
+
+
+def load_source_documents(path: str) -> List[Document]:
+    """
+    Load a source file fully into memory (prefer ``iter_source_chunks``).
+
+    Args:
+        path: Path to a PDF, markdown or plain-text file.
+
+    Returns:
+        List[Document]: Loaded documents with ``source`` metadata.
+    """
+    return list(lazy_load_source_documents(path))
+
+
+def iter_chunk_windows(
+    pages: Iterable[Document],
+    splitter: TextSplitter,
+    window: Optional[int] = None,
+) -> Iterator[List[Document]]:
+    """
+    Split a page stream window by window, holding at most ``window`` pages.
+
+    Consumers that embed and index each window before pulling the next one
+    keep peak memory bounded by the window size.
+
+    Args:
+        pages: Page stream (typically ``lazy_load_source_documents``).
+        splitter: Text splitter.
+        window: Pages per window (defaults to ``settings.ingestion_page_window``).
+
+    Yields:
+        List[Document]: Chunks of one page window, in document order.
+    """
+    window = window or settings.ingestion_page_window
+    iterator = iter(pages)
+    while True:
+        batch = list(islice(iterator, window))
+        if not batch:
+            return
+        yield splitter.split_documents(batch)
+
+
+def split_in_windows(
+    pages: Iterable[Document],
+    splitter: TextSplitter,
+    window: Optional[int] = None,
+) -> Iterator[Document]:
+    """
+    Split a page stream into chunks, holding at most ``window`` pages at once.
+
+    Pages are split independently, so the chunks are identical to splitting
+    the fully loaded document.
+
+    Args:
+        pages: Page stream (typically ``lazy_load_source_documents``).
+        splitter: Text splitter.
+        window: Pages per window (defaults to ``settings.ingestion_page_window``).
+
+    Yields:
+        Document: Chunks in document order.
+    """
+    for chunks in iter_chunk_windows(pages, splitter, window):
+        yield from chunks
+
+
+def iter_source_chunks(
+    path: str,
+    splitter: Optional[TextSplitter] = None,
+    window: Optional[int] = None,
+) -> Iterator[Document]:
+    """
+    Stream the chunks of a source file with bounded memory.
+
+    Args:
+        path: Path to a PDF, markdown or plain-text file.
+        splitter: Text splitter (defaults to the settings-based splitter).
+        window: Pages per window (defaults to ``settings.ingestion_page_window``).
+
+    Yields:
+        Document: Chunks in document order.
+    """
+    yield from split_in_windows(
+        lazy_load_source_documents(path), splitter or create_splitter(), window
+    )
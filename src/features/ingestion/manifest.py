@@ -0,0 +1,155 @@
+"""
+Ingestion manifest keyed by source-file hash and chunk-content hash.
+
+The manifest is stored next to the FAISS index and records, for every ingested
+source file, the hash of the file bytes and the vector id of every chunk
+(keyed by the hash of the chunk text). Re-ingestion compares against it to
+skip unchanged files, embed only new chunks and delete vectors of chunks that
+disappeared.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+MANIFEST_FILE = "manifest.json"
+
+# Read files in 1 MiB blocks when hashing
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_file(path: str) -> str:
+    """
+    Compute the SHA-256 of a file without loading it fully into memory.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_chunk(text: str) -> str:
+    """
+    Compute the content hash of a chunk (whitespace-normalized).
+
+    Args:
+        text: Chunk text.
+
+    Returns:
+        Hex digest identifying the chunk content.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def make_vector_id(source: str, chunk_hash: str) -> str:
+    """
+    Derive a stable vector id for a chunk of a source file.
+
+    Args:
+        source: Source key (normalized path).
+        chunk_hash: Content hash of the chunk.
+
+    Returns:
+        Deterministic id used as the FAISS docstore id.
+    """
+    return hashlib.sha1(f"{source}:{chunk_hash}".encode("utf-8")).hexdigest()
+
+
+class SourceEntry(BaseModel):
+    """Manifest entry for one ingested source file.
+
+    Attributes:
+        file_hash: SHA-256 of the file bytes at ingestion time
+        chunks: Mapping of chunk content hash to vector id
+    """
+
+    file_hash: str
+    chunks: Dict[str, str] = Field(default_factory=dict)
+
+
+class IngestionManifest(BaseModel):
+    """Manifest of everything stored in a FAISS index directory.
+
+    Attributes:
+        sources: Mapping of source key (normalized path) to its entry
+    """
+
+    sources: Dict[str, SourceEntry] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, db_path: str) -> "IngestionManifest":
+        """
+        Load the manifest of an index directory (empty if missing).
+
+        Args:
+            db_path: FAISS index directory.
+
+        Returns:
+            IngestionManifest: Loaded or empty manifest.
+        """
+        manifest_path = os.path.join(db_path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return cls()
+        with open(manifest_path, encoding="utf-8") as handle:
+            return cls.model_validate(json.load(handle))
+
+    @staticmethod
+    def exists(db_path: str) -> bool:
+        """Return True if the index directory has a manifest."""
+        return os.path.exists(os.path.join(db_path, MANIFEST_FILE))
+
+    def save(self, db_path: str) -> None:
+        """
+        Atomically write the manifest into the index directory.
+
+        Args:
+            db_path: FAISS index directory.
+        """
+        os.makedirs(db_path, exist_ok=True)
+        manifest_path = os.path.join(db_path, MANIFEST_FILE)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.model_dump_json(indent=2))
+        os.replace(tmp_path, manifest_path)
+
+    def vector_ids(self) -> List[str]:
+        """Return every vector id recorded in the manifest."""
+        return [vid for entry in self.sources.values() for vid in entry.chunks.values()]
+
+
+class IngestionReport(BaseModel):
+    """Summary of one incremental ingestion run.
+
+    Attributes:
+        files_processed: Files that were new or changed and got re-split
+        files_skipped: Files whose hash matched the manifest (not parsed)
+        files_removed: Files dropped from the index (prune_missing)
+        chunks_added: Chunks embedded and added to the index
+        chunks_skipped: Chunks already present (no embedding call)
+        chunks_removed: Vectors deleted because their chunk disappeared
+        skipped_sources: Paths of the unchanged files
+    """
+
+    files_processed: int = 0
+    files_skipped: int = 0
+    files_removed: int = 0
+    chunks_added: int = 0
+    chunks_skipped: int = 0
+    chunks_removed: int = 0
+    skipped_sources: List[str] = Field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Return True if the index content changed."""
+        return bool(self.chunks_added or self.chunks_removed)
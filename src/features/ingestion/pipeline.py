@@ -0,0 +1,472 @@
+"""
+Parallel multi-document ingestion pipeline.
+
+Stages:
+1. Parse + split: source files are loaded and chunked in a process pool;
+   each window of ``settings.ingestion_page_window`` pages is sent to the
+   parent through a bounded queue as soon as it is split
+2. Embed: new chunks are sent to the embedder in fixed-size batches with a
+   bounded number of requests in flight (thread pool, network bound)
+3. Index: embedded batches are streamed into the FAISS index as they arrive
+
+Every stage is bounded (queued windows, pending batch, requests in flight),
+so peak memory depends on the page window, not on document or corpus size.
+
+The manifest from ``incremental.py`` is honored, so unchanged files are never
+parsed and only new chunks are embedded. Per-stage throughput (pages/s,
+chunks/s, embeddings/s) is reported to size ingestion jobs.
+
+Example:
+    >>> report = run_ingestion_pipeline(["docs/"], embeddings, batch_size=64)
+    >>> print(report.throughput())
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from langchain_core.documents import Document
+
+from src.features.ingestion.incremental import (
+    SourceDiff,
+    open_index,
+    save_index,
+    source_key,
+)
+from src.features.ingestion.loaders import (
+    SUPPORTED_EXTENSIONS,
+    iter_chunk_windows,
+    lazy_load_source_documents,
+)
+from src.features.ingestion.manifest import (
+    IngestionManifest,
+    IngestionReport,
+    hash_file,
+)
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import Embeddings
+
+# Module logger
+logger = get_logger(__name__)
+
+# Messages sent by parse workers: ("window", path, chunks) for every page
+# window, then ("done", path, (page_count, parse_seconds)) once the source is
+# fully split
+WindowMessage = Tuple[str, str, Any]
+
+# Seconds between checks for failed parse workers while waiting for windows
+_QUEUE_POLL_S = 0.5
+
+# Queue of parsed windows, set in each worker process by the pool initializer
+_window_queue: Optional["queue.Queue[WindowMessage]"] = None
+
+
+class PipelineReport(IngestionReport):
+    """Ingestion report extended with per-stage counters and timings.
+
+    Attributes:
+        pages_parsed: Pages (or text files) loaded by parse workers
+        chunks_produced: Chunks produced by the splitter (before dedup)
+        embeddings_computed: Vectors returned by the embedder
+        parse_seconds: Time parse workers spent loading and splitting, summed
+            over workers (time blocked on the window queue excluded)
+        embed_seconds: Wall time from first to last embedding batch
+        index_seconds: Time spent writing vectors into FAISS
+        total_seconds: Wall time of the whole run
+    """
+
+    pages_parsed: int = 0
+    chunks_produced: int = 0
+    embeddings_computed: int = 0
+    parse_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    index_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        Return per-stage throughput.
+
+        Parse rates are per parse-worker second, so they do not depend on how
+        long workers waited for the embedding stage.
+
+        Returns:
+            Dict with pages_per_s, chunks_per_s and embeddings_per_s.
+        """
+
+        def rate(count: int, seconds: float) -> float:
+            return count / seconds if seconds > 0 else 0.0
+
+        return {
+            "pages_per_s": rate(self.pages_parsed, self.parse_seconds),
+            "chunks_per_s": rate(self.chunks_produced, self.parse_seconds),
+            "embeddings_per_s": rate(self.embeddings_computed, self.embed_seconds),
+        }
+
+
+def discover_sources(paths: Iterable[str]) -> List[str]:
+    """
+    Expand files and directories into a sorted list of supported files.
+
+    Args:
+        paths: Files and/or directories (searched recursively).
+
+    Returns:
+        List[str]: Supported source files.
+    """
+    found: Set[str] = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                for name in files:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        found.add(os.path.join(root, name))
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            found.add(path)
+    return sorted(found)
+
+
+def _init_parse_worker(window_queue: "queue.Queue[WindowMessage]") -> None:
+    """Pool initializer: attach the shared window queue to the worker."""
+    global _window_queue
+    _window_queue = window_queue
+
+
+def parse_and_split(
+    path: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    window_queue: Optional["queue.Queue[WindowMessage]"] = None,
+) -> int:
+    """
+    Load and split one source file, streaming its chunks window by window.
+
+    Runs inside a worker process. Every page window is put on the queue as
+    soon as it is split (blocking while the queue is full), followed by a
+    ``("done", path, (page_count, parse_seconds))`` message; the parse time
+    leaves out the time spent blocked on the queue.
+
+    Args:
+        path: Source file.
+        chunk_size: Splitter chunk size.
+        chunk_overlap: Splitter chunk overlap.
+        window_queue: Destination queue (defaults to the worker's queue).
+
+    Returns:
+        Number of pages parsed.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    window_queue = window_queue if window_queue is not None else _window_queue
+    if window_queue is None:
+        raise RuntimeError("parse_and_split needs a window queue")
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    page_count = 0
+    blocked_seconds = 0.0
+    start_time = time.time()
+
+    def counted_pages() -> Iterator[Document]:
+        nonlocal page_count
+        for page in lazy_load_source_documents(path):
+            page_count += 1
+            yield page
+
+    for chunks in iter_chunk_windows(counted_pages(), splitter):
+        put_start = time.time()
+        window_queue.put(("window", path, chunks))
+        blocked_seconds += time.time() - put_start
+    parse_seconds = time.time() - start_time - blocked_seconds
+    window_queue.put(("done", path, (page_count, parse_seconds)))
+    return page_count
+
+
+class _EmbeddingStage:
+    """Batches chunks, embeds them with bounded concurrency, streams to FAISS."""
+
+    def __init__(
+        self,
+        embeddings: "Embeddings",
+        vectordb: Optional["FAISS"],
+        batch_size: int,
+        max_concurrency: int,
+        report: PipelineReport,
+    ) -> None:
+        self.embeddings = embeddings
+        self.vectordb = vectordb
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.report = report
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._in_flight: Dict[Future, Tuple[List[Document], List[str]]] = {}
+        self._pending_docs: List[Document] = []
+        self._pending_ids: List[str] = []
+        self._first_submit: Optional[float] = None
+        self._last_done: Optional[float] = None
+
+    def add(self, docs: List[Document], ids: List[str]) -> None:
+        """Queue chunks; full batches are submitted immediately."""
+        self._pending_docs.extend(docs)
+        self._pending_ids.extend(ids)
+        while len(self._pending_docs) >= self.batch_size:
+            self._submit(
+                self._pending_docs[: self.batch_size],
+                self._pending_ids[: self.batch_size],
+            )
+            del self._pending_docs[: self.batch_size]
+            del self._pending_ids[: self.batch_size]
+
+    def _submit(self, docs: List[Document], ids: List[str]) -> None:
+        # Bound in-flight requests: drain completed batches before submitting
+        while len(self._in_flight) >= self.max_concurrency:
+            self._drain(return_when=FIRST_COMPLETED)
+
+        if self._first_submit is None:
+            self._first_submit = time.time()
+        texts = [doc.page_content for doc in docs]
+        future = self._executor.submit(self.embeddings.embed_documents, texts)
+        self._in_flight[future] = (docs, ids)
+
+    def _drain(self, return_when: str) -> None:
+        done, _ = wait(list(self._in_flight), return_when=return_when)
+        for future in done:
+            docs, ids = self._in_flight.pop(future)
+            self._index(docs, ids, future.result())
+
+    def _index(
+        self, docs: List[Document], ids: List[str], vectors: List[List[float]]
+    ) -> None:
+        from langchain_community.vectorstores import FAISS
+
+        self._last_done = time.time()
+        start_time = time.time()
+        text_embeddings = [(doc.page_content, vec) for doc, vec in zip(docs, vectors)]
+        metadatas = [doc.metadata for doc in docs]
+        if self.vectordb is None:
+            self.vectordb = FAISS.from_embeddings(
+                text_embeddings, self.embeddings, metadatas=metadatas, ids=ids
+            )
+        else:
+            self.vectordb.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        self.report.index_seconds += time.time() - start_time
+        self.report.embeddings_computed += len(vectors)
+
+    def finish(self) -> Optional["FAISS"]:
+        """Flush the partial batch, wait for all requests, return the index."""
+        try:
+            if self._pending_docs:
+                self._submit(self._pending_docs, self._pending_ids)
+                self._pending_docs, self._pending_ids = [], []
+            while self._in_flight:
+                self._drain(return_when=FIRST_COMPLETED)
+        finally:
+            self._executor.shutdown(wait=True)
+
+        if self._first_submit is not None and self._last_done is not None:
+            self.report.embed_seconds = self._last_done - self._first_submit
+        return self.vectordb
+
+
+def run_ingestion_pipeline(
+    paths: Iterable[str],
+    embeddings: "Embeddings",
+    db_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    prune_missing: bool = False,
+) -> PipelineReport:
+    """
+    Ingest files and directories with parallel parsing and batched embedding.
+
+    Args:
+        paths: Files and/or directories to ingest.
+        embeddings: Embeddings used for new chunks.
+        db_path: FAISS index directory (defaults to ``settings.vectorstore_path``).
+        workers: Parse worker processes (0/None = settings, then CPU count).
+        batch_size: Chunks per embedding request (settings default).
+        max_concurrency: Embedding requests in flight (settings default).
+        prune_missing: Delete vectors of manifest sources not found in ``paths``.
+
+    Returns:
+        PipelineReport: Ingestion counters plus per-stage timings.
+    """
+    start_time = time.time()
+    db_path = db_path or settings.vectorstore_path
+    workers = workers or settings.ingestion_workers or os.cpu_count() or 1
+    batch_size = batch_size or settings.ingestion_embed_batch_size
+    max_concurrency = max_concurrency or settings.ingestion_embed_concurrency
+
+    vectordb = open_index(db_path, embeddings)
+    manifest = IngestionManifest.load(db_path) if vectordb else IngestionManifest()
+    report = PipelineReport()
+    ids_to_delete: List[str] = []
+
+    # Hash in the parent: unchanged files never reach the parse workers
+    sources = discover_sources(paths)
+    seen_keys = {source_key(path) for path in sources}
+    to_parse: List[Tuple[str, str]] = []
+    for path in sources:
+        file_hash = hash_file(path)
+        previous = manifest.sources.get(source_key(path))
+        if previous is not None and previous.file_hash == file_hash:
+            report.files_skipped += 1
+            report.chunks_skipped += len(previous.chunks)
+            report.skipped_sources.append(path)
+        else:
+            to_parse.append((path, file_hash))
+
+    logger.info(
+        "ingestion_pipeline_started",
+        sources=len(sources),
+        to_parse=len(to_parse),
+        workers=workers,
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+    )
+
+    embed_stage = _EmbeddingStage(
+        embeddings, vectordb, batch_size, max_concurrency, report
+    )
+    if to_parse:
+        ids_to_delete.extend(
+            _parse_sources(to_parse, workers, manifest, report, embed_stage)
+        )
+
+    vectordb = embed_stage.finish()
+
+    if prune_missing:
+        for key in [k for k in manifest.sources if k not in seen_keys]:
+            ids_to_delete.extend(manifest.sources.pop(key).chunks.values())
+            report.files_removed += 1
+
+    if ids_to_delete and vectordb is not None:
+        vectordb.delete(ids_to_delete)
+    report.chunks_removed = len(ids_to_delete)
+
+    save_index(vectordb, manifest, db_path, report.changed)
+
+    report.total_seconds = time.time() - start_time
+    logger.info(
+        "ingestion_pipeline_completed",
+        files_processed=report.files_processed,
+        files_skipped=report.files_skipped,
+        chunks_added=report.chunks_added,
+        chunks_skipped=report.chunks_skipped,
+        chunks_removed=report.chunks_removed,
+        total_seconds=report.total_seconds,
+        **report.throughput(),
+    )
+    return report
+
+
+def _parse_sources(
+    to_parse: List[Tuple[str, str]],
+    workers: int,
+    manifest: IngestionManifest,
+    report: PipelineReport,
+    embed_stage: _EmbeddingStage,
+) -> List[str]:
+    """
+    Parse sources in worker processes and queue their new chunks per window.
+
+    Workers block once ``workers * 2`` windows are waiting, and this loop
+    blocks while the embedding stage is saturated, so parsing never runs
+    more than a few windows ahead of embedding.
+
+    Returns:
+        Vector ids of chunks that disappeared from the parsed sources.
+    """
+    context = multiprocessing.get_context()
+    window_queue = context.Queue(maxsize=workers * 2)
+    file_hashes = dict(to_parse)
+    diffs: Dict[str, SourceDiff] = {}
+    ids_to_delete: List[str] = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_parse_worker,
+        initargs=(window_queue,),
+    ) as pool:
+        futures = [
+            pool.submit(
+                parse_and_split,
+                path,
+                settings.ingestion_chunk_size,
+                settings.ingestion_chunk_overlap,
+            )
+            for path, _file_hash in to_parse
+        ]
+        try:
+            remaining = len(to_parse)
+            while remaining:
+                try:
+                    kind, path, payload = window_queue.get(timeout=_QUEUE_POLL_S)
+                except queue.Empty:
+                    _raise_worker_error(futures)
+                    continue
+
+                key = source_key(path)
+                diff = diffs.get(path)
+                if diff is None:
+                    diff = diffs[path] = SourceDiff(
+                        key, manifest.sources.get(key), file_hashes[path], report
+                    )
+                if kind == "window":
+                    report.chunks_produced += len(payload)
+                    to_add, to_add_ids = diff.add(payload)
+                    report.chunks_added += len(to_add)
+                    embed_stage.add(to_add, to_add_ids)
+                    continue
+
+                manifest.sources[key], to_delete = diffs.pop(path).finish()
+                ids_to_delete.extend(to_delete)
+                page_count, parse_seconds = payload
+                report.pages_parsed += page_count
+                report.parse_seconds += parse_seconds
+                report.files_processed += 1
+                remaining -= 1
+        except BaseException:
+            # Unblock workers waiting on a full queue so the pool can shut down
+            for future in futures:
+                future.cancel()
+            while not all(future.done() for future in futures):
+                try:
+                    window_queue.get(timeout=_QUEUE_POLL_S)
+                except queue.Empty:
+                    pass
+            raise
+    return ids_to_delete
+
+
+def _raise_worker_error(futures: List[Future]) -> None:
+    """Re-raise the exception of the first failed parse worker, if any."""
+    for future in futures:
+        error = future.exception() if future.done() else None
+        if error is not None:
+            raise error
@@ -0,0 +1,375 @@
+"""
+Local question-complexity classifier in front of the classify LLM call.
+
+``classify_question`` spent a full Gemini round trip on every query to output
+"simple" or "complex". A small scikit-learn model (word and character n-gram
+TF-IDF + logistic regression) answers in about a hundred microseconds; only
+questions it is unsure about (probability below
+``settings.complexity_classifier_threshold``) still go to the LLM.
+
+Training data:
+- ``complexity_questions.jsonl``: labelled seed questions (this package)
+- LLM decisions logged at runtime to ``settings.complexity_decisions_path``
+  (question, LLM label, LLM latency, local prediction)
+
+``scripts/train_complexity_classifier.py`` trains the model, writes the
+artifact (``complexity_classifier.joblib`` by default) and a report of
+agreement with the labels / LLM decisions and the latency saved per query.
+
+Example:
+    >>> classifier = get_complexity_classifier()
+    >>> classifier.predict("O que é o Perceptron?")
+    ('simple', 0.93)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+Complexity = Literal["simple", "complex"]
+
+# Packaged seed data and artifact
+LABELLED_QUESTIONS_PATH = Path(__file__).with_name("complexity_questions.jsonl")
+DEFAULT_MODEL_PATH = Path(__file__).with_name("complexity_classifier.joblib")
+
+LABELS = ("simple", "complex")
+
+
+def build_pipeline() -> Any:
+    """
+    Untrained classifier: word + character n-gram TF-IDF, logistic regression.
+
+    Returns:
+        sklearn Pipeline mapping question strings to labels.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import FeatureUnion, Pipeline
+
+    features = FeatureUnion(
+        [
+            ("words", TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)),
+            (
+                "chars",
+                TfidfVectorizer(
+                    analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True
+                ),
+            ),
+        ]
+    )
+    return Pipeline(
+        [
+            ("features", features),
+            ("model", LogisticRegression(C=4.0, class_weight="balanced")),
+        ]
+    )
+
+
+def read_examples(path: "str | Path") -> List[Dict[str, Any]]:
+    """
+    Read JSONL examples with at least ``question`` and ``label``.
+
+    Lines with another label (or unreadable lines) are skipped.
+
+    Args:
+        path: JSONL file (missing file = no examples).
+
+    Returns:
+        List of example dicts.
+    """
+    if not os.path.exists(path):
+        return []
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                example = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if example.get("label") in LABELS and example.get("question"):
+                examples.append(example)
+    return examples
+
+
+class ComplexityClassifier:
+    """
+    Trained pipeline with a confidence threshold.
+
+    ``predict`` returns the label and its probability; callers ask the LLM
+    when the probability is below ``threshold``.
+
+    The fitted pipeline is what gets persisted, but ``predict`` does not call
+    it: sklearn's sparse-matrix transforms cost milliseconds per question.
+    The vocabularies, IDF weights and coefficients are flattened into one
+    dict per vectorizer instead, so a prediction is a few hundred dict lookups
+    (same probability as ``pipeline.predict_proba``).
+    """
+
+    def __init__(self, pipeline: Any, threshold: Optional[float] = None) -> None:
+        """
+        Wrap a fitted pipeline.
+
+        Args:
+            pipeline: Fitted sklearn pipeline (see ``build_pipeline``).
+            threshold: Minimum probability to answer locally (settings default).
+        """
+        self.pipeline = pipeline
+        self.threshold = (
+            settings.complexity_classifier_threshold if threshold is None else threshold
+        )
+
+        model = pipeline.named_steps["model"]
+        coefficients = model.coef_.ravel()
+        # Plain str: classes_ holds numpy strings, which end up in the graph state
+        self._classes = [str(label) for label in model.classes_]
+        self._intercept = float(model.intercept_[0])
+
+        # (analyzer, term -> (idf, coefficient)) per vectorizer
+        self._tables: List[Tuple[Callable[[str], List[str]], Dict[str, Tuple]]] = []
+        offset = 0
+        for _, vectorizer in pipeline.named_steps["features"].transformer_list:
+            table = {
+                term: (float(vectorizer.idf_[i]), float(coefficients[offset + i]))
+                for term, i in vectorizer.vocabulary_.items()
+            }
+            self._tables.append((vectorizer.build_analyzer(), table))
+            offset += len(vectorizer.vocabulary_)
+
+    def predict(self, question: str) -> Tuple[Complexity, float]:
+        """
+        Predict the complexity of a question.
+
+        Args:
+            question: User question.
+
+        Returns:
+            (label, probability of that label).
+        """
+        # Sublinear, L2-normalised TF-IDF per vectorizer, then the linear model
+        z = self._intercept
+        for analyzer, table in self._tables:
+            dot = 0.0
+            norm = 0.0
+            for term, count in Counter(analyzer(question)).items():
+                entry = table.get(term)
+                if entry is None:
+                    continue
+                weight = (1.0 + math.log(count)) * entry[0]
+                norm += weight * weight
+                dot += weight * entry[1]
+            if norm:
+                z += dot / math.sqrt(norm)
+
+        positive = 1.0 / (1.0 + math.exp(-z))
+        if positive >= 0.5:
+            return self._classes[1], positive
+        return self._classes[0], 1.0 - positive
+
+
+def train_classifier(
+    questions: Sequence[str], labels: Sequence[str]
+) -> ComplexityClassifier:
+    """
+    Fit a classifier on labelled questions.
+
+    Args:
+        questions: Question texts.
+        labels: "simple" / "complex" per question.
+
+    Returns:
+        ComplexityClassifier: Fitted classifier.
+    """
+    pipeline = build_pipeline()
+    pipeline.fit(list(questions), list(labels))
+    return ComplexityClassifier(pipeline)
+
+
+def save_classifier(classifier: ComplexityClassifier, path: "str | Path") -> None:
+    """Persist the fitted pipeline with joblib, tagged with the sklearn version."""
+    import joblib
+    import sklearn
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump(
+        {"pipeline": classifier.pipeline, "sklearn_version": sklearn.__version__},
+        path,
+    )
+
+
+def load_classifier(path: "str | Path") -> Optional[ComplexityClassifier]:
+    """
+    Load a persisted classifier.
+
+    Pickled sklearn estimators are only guaranteed to behave the same under
+    the version that trained them, so a different (or unrecorded) training
+    version is logged as an error; retrain with
+    ``scripts/train_complexity_classifier.py`` to clear it.
+
+    Args:
+        path: joblib artifact written by ``save_classifier``.
+
+    Returns:
+        ComplexityClassifier, or None if the artifact is missing or unreadable.
+    """
+    import joblib
+    import sklearn
+
+    if not os.path.exists(path):
+        logger.warning("complexity_classifier_missing", path=str(path))
+        return None
+    try:
+        artifact = joblib.load(path)
+        if isinstance(artifact, dict):
+            pipeline = artifact["pipeline"]
+            trained_with = artifact.get("sklearn_version")
+        else:
+            # Artifacts written before the version was recorded
+            pipeline, trained_with = artifact, None
+        if trained_with != sklearn.__version__:
+            logger.error(
+                "complexity_classifier_version_mismatch",
+                path=str(path),
+                trained_with=trained_with or "unknown",
+                installed=sklearn.__version__,
+                action="retrain_classifier",
+            )
+        return ComplexityClassifier(pipeline)
+    except Exception as e:
+        logger.warning(
+            "complexity_classifier_load_failed",
+            path=str(path),
+            error_type=type(e).__name__,
+            error_message=str(e),
+        )
+        return None
+
+
+# Process-wide classifier (None = not loaded yet / unavailable)
+_classifier: Optional[ComplexityClassifier] = None
+_loaded = False
+_classifier_lock = threading.Lock()
+_decisions_lock = threading.Lock()
+
+
+def get_complexity_classifier() -> Optional[ComplexityClassifier]:
+    """
+    Get the shared classifier (loaded once; None if disabled or unavailable).
+
+    Returns:
+        Optional[ComplexityClassifier]: The classifier, or None.
+    """
+    global _classifier, _loaded
+
+    if not settings.complexity_classifier_enabled:
+        return None
+    if not _loaded:
+        with _classifier_lock:
+            if not _loaded:
+                path = settings.complexity_classifier_path or DEFAULT_MODEL_PATH
+                _classifier = load_classifier(path)
+                _loaded = True
+                if _classifier is not None:
+                    logger.info(
+                        "complexity_classifier_loaded",
+                        path=str(path),
+                        threshold=_classifier.threshold,
+                    )
+    return _classifier
+
+
+def classify_locally(question: str) -> Tuple[Optional[Complexity], Dict[str, Any]]:
+    """
+    Classify a question without the LLM when the classifier is confident.
+
+    Args:
+        question: User question.
+
+    Returns:
+        (label or None to ask the LLM, details with the local prediction,
+        its confidence and latency in microseconds).
+    """
+    classifier = get_complexity_classifier()
+    if classifier is None:
+        return None, {}
+
+    start = time.perf_counter()
+    label, confidence = classifier.predict(question)
+    latency_us = (time.perf_counter() - start) * 1e6
+    details = {
+        "local_label": label,
+        "confidence": confidence,
+        "latency_us": latency_us,
+    }
+    if confidence < classifier.threshold:
+        return None, details
+    return label, details
+
+
+def log_llm_decision(
+    question: str,
+    label: str,
+    latency_ms: float,
+    local: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Append an LLM decision to the decisions log (training / agreement data).
+
+    Args:
+        question: User question.
+        label: Label the LLM returned.
+        latency_ms: LLM round-trip latency.
+        local: Local prediction details from ``classify_locally``, if any.
+    """
+    path = settings.complexity_decisions_path
+    if not path:
+        return
+    record = {
+        "question": question,
+        "label": label,
+        "source": "llm",
+        "llm_latency_ms": latency_ms,
+        **{key: value for key, value in (local or {}).items() if key != "latency_us"},
+    }
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with _decisions_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(
+            "complexity_decision_log_failed", path=path, error_message=str(e)
+        )
+
+
+def reset_complexity_classifier() -> None:
+    """
+    Drop the shared classifier (useful for testing or after retraining).
+
+    Example:
+        >>> reset_complexity_classifier()  # Next call reloads the artifact
+    """
+    global _classifier, _loaded
+
+    with _classifier_lock:
+        _classifier = None
+        _loaded = False
+    logger.debug("complexity_classifier_reset", action="will_reload_on_next_use")
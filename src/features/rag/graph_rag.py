@@ -3,19 +3,35 @@ LangGraph RAG System
 Assembles the stateful graph workflow with nodes and conditional edges
 """
 
-from typing import Any, Protocol, cast
+from typing import Any, Iterator, Protocol, cast
 
 from langgraph.graph import END, START, StateGraph
 
 from src.core.domain.state import RAGState
+from src.features.rag.graph_registry import Topology, get_graph_registry
 from src.features.rag.nodes import (
+    aclassify_complexity,
+    aclassify_question,
+    agenerate_answer,
+    arefine_answer,
+    arerank_documents,
+    aretrieve_adaptive,
+    aretrieve_speculative,
+    aselect_retrieved,
+    avalidate_quality,
+    classify_complexity,
     classify_question,
     generate_answer,
+    graph_node,
     refine_answer,
     rerank_documents,
     retrieve_adaptive,
+    retrieve_speculative,
+    select_retrieved,
     validate_quality,
 )
+from src.features.rag.streaming import StreamEvent, stream_graph
+from src.infrastructure.config.settings import settings
 
 # Maximum refinement iterations to prevent infinite loops
 MAX_ITERATIONS = 2
@@ -28,6 +44,14 @@ class RAGGraphRunner(Protocol):
         self, state: RAGState, config: Any | None = None
     ) -> dict[str, object]: ...
 
+    async def ainvoke(
+        self, state: RAGState, config: Any | None = None
+    ) -> dict[str, object]: ...
+
+    def stream(
+        self, state: RAGState, config: Any | None = None, **kwargs: Any
+    ) -> Iterator[Any]: ...
+
 
 def should_refine(state: RAGState) -> str:
     """
@@ -62,9 +86,20 @@ def create_rag_graph() -> RAGGraphRunner:
     Creates and compiles the RAG workflow graph.
 
     Graph flow:
-    START → classify → retrieve → generate → validate → [refine or END]
-                                                            ↓
-                                                        validate (loop)
+    START → classify → retrieve → rerank → generate → validate → [refine or END]
+                                                                     ↓
+                                                                 validate (loop)
+
+    The rerank node is left out when ``settings.reranker_enabled`` is off
+    (retrieve → generate). With ``settings.retrieval_speculative_enabled``,
+    classification and retrieval run in parallel and a join node keeps the
+    documents of the classified complexity (same documents and answer, one
+    classification round trip less on the critical path):
+
+    START → classify ─┐
+    START → retrieve ─┴→ select → rerank → generate → ...
+
+    Queries should use ``get_rag_graph``, which compiles each variant once.
 
     Returns:
         Compiled LangGraph StateGraph
@@ -72,19 +107,41 @@ def create_rag_graph() -> RAGGraphRunner:
     # Initialize graph with state schema
     workflow = StateGraph(RAGState)
 
-    # Add nodes
-    workflow.add_node("classify", classify_question)
-    workflow.add_node("retrieve", retrieve_adaptive)
-    workflow.add_node("rerank", rerank_documents)
-    workflow.add_node("generate", generate_answer)
-    workflow.add_node("validate", validate_quality)
-    workflow.add_node("refine", refine_answer)
+    # Add nodes (sync + async implementations: invoke and ainvoke both work)
+    speculative = settings.retrieval_speculative_enabled
+    if speculative:
+        workflow.add_node(
+            "classify", graph_node(classify_complexity, aclassify_complexity)
+        )
+        workflow.add_node(
+            "retrieve", graph_node(retrieve_speculative, aretrieve_speculative)
+        )
+        workflow.add_node("select", graph_node(select_retrieved, aselect_retrieved))
+    else:
+        workflow.add_node("classify", graph_node(classify_question, aclassify_question))
+        workflow.add_node("retrieve", graph_node(retrieve_adaptive, aretrieve_adaptive))
+    if settings.reranker_enabled:
+        workflow.add_node("rerank", graph_node(rerank_documents, arerank_documents))
+    workflow.add_node("generate", graph_node(generate_answer, agenerate_answer))
+    workflow.add_node("validate", graph_node(validate_quality, avalidate_quality))
+    workflow.add_node("refine", graph_node(refine_answer, arefine_answer))
 
     # Add edges - define flow
-    workflow.add_edge(START, "classify")
-    workflow.add_edge("classify", "retrieve")
-    workflow.add_edge("retrieve", "rerank")
-    workflow.add_edge("rerank", "generate")
+    if speculative:
+        # Fan out; "select" waits for both branches
+        workflow.add_edge(START, "classify")
+        workflow.add_edge(START, "retrieve")
+        workflow.add_edge(["classify", "retrieve"], "select")
+        retrieved = "select"
+    else:
+        workflow.add_edge(START, "classify")
+        workflow.add_edge("classify", "retrieve")
+        retrieved = "retrieve"
+    if settings.reranker_enabled:
+        workflow.add_edge(retrieved, "rerank")
+        workflow.add_edge("rerank", "generate")
+    else:
+        workflow.add_edge(retrieved, "generate")
     workflow.add_edge("generate", "validate")
 
     # Conditional edge - decide to refine or end
@@ -102,6 +159,24 @@ def create_rag_graph() -> RAGGraphRunner:
     return cast(RAGGraphRunner, graph)
 
 
+def rag_topology() -> Topology:
+    """Settings that change the RAG graph's nodes and edges."""
+    return (
+        ("reranker_enabled", settings.reranker_enabled),
+        ("retrieval_speculative_enabled", settings.retrieval_speculative_enabled),
+    )
+
+
+def get_rag_graph() -> RAGGraphRunner:
+    """
+    Compiled RAG graph for the current settings, shared across queries.
+
+    Returns:
+        Compiled graph from the graph registry (compiled on first use)
+    """
+    return get_graph_registry().get("rag", rag_topology(), create_rag_graph)
+
+
 def run_rag_query(question: str) -> str:
     """
     Executes RAG query through the LangGraph workflow.
@@ -112,7 +187,7 @@ def run_rag_query(question: str) -> str:
     Returns:
         Generated answer string
     """
-    graph = create_rag_graph()
+    graph = get_rag_graph()
 
     # Initialize state
     initial_state: RAGState = {
@@ -148,6 +223,76 @@ def run_rag_query(question: str) -> str:
     return answer
 
 
+async def arun_rag_query(question: str) -> str:
+    """
+    Executes RAG query through the graph's async path.
+
+    Same flow and result as ``run_rag_query``, but LLM calls are awaited and
+    blocking retrieval / reranking run in worker threads, so one event loop
+    can serve many concurrent queries (``asyncio.gather``).
+
+    Args:
+        question: User question to answer
+
+    Returns:
+        Generated answer string
+    """
+    graph = get_rag_graph()
+
+    initial_state: RAGState = {
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+    }
+
+    print(f"[QUERY] Starting async RAG workflow for: {question}")
+
+    final_state = cast(RAGState, await graph.ainvoke(initial_state))
+
+    print(
+        f"[COMPLETE] Async workflow finished (complexity: "
+        f"{final_state['complexity']}, quality: {final_state['quality_score']:.2f}, "
+        f"iterations: {final_state['iterations']})"
+    )
+    return final_state["generation"]
+
+
+def stream_rag_query(question: str) -> Iterator[StreamEvent]:
+    """
+    Executes RAG query, streaming the answer as it is generated.
+
+    Tokens of the generate node are yielded as they arrive; validation and
+    refinement continue in the background and a "correction" event is
+    yielded if refinement replaces the answer (see
+    ``src.features.rag.streaming``).
+
+    Args:
+        question: User question to answer
+
+    Yields:
+        token / answer / correction / final events
+    """
+    graph = get_rag_graph()
+
+    initial_state: RAGState = {
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+    }
+
+    print(f"\n{'='*60}")
+    print(f"[QUERY] Streaming RAG workflow for: {question}")
+    print(f"{'='*60}\n")
+
+    yield from stream_graph(graph, dict(initial_state))
+
+
 if __name__ == "__main__":
     # Test with sample question
     test_question = "Quais as limitações do Perceptron?"
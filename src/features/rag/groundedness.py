@@ -0,0 +1,402 @@
+"""
+Local groundedness scorer in front of the LLM-as-judge validate call.
+
+``validate_quality`` spends a Gemini round trip after every generation (and
+after every refinement) to score the answer. Most answers are clearly fine
+or clearly off, which cheap signals already show:
+
+- support: share of the answer's content words found in the retrieved chunks
+- sentence_support: share of answer sentences mostly made of chunk words
+- question_coverage: share of the question's content words in the answer
+- rerank: best cross-encoder score of the chunks for the question (from the
+  reranker's score cache, never computed here)
+
+Words are accent-folded and truncated to a 6-character prefix (a cheap
+stem: "redes"/"rede", "classificação"/"classificador"). The features are
+combined into a 0-1 score (missing features are left out of the weighted
+mean) that decides:
+
+- accept (score >= ``settings.quality_heuristic_accept``, above the graph's
+  0.7 refine threshold): no judge call
+- reject (score <= ``settings.quality_heuristic_reject``): refine, no judge
+- uncertain (in between, refusals, no context): the LLM judge decides
+
+``settings.quality_heuristic_mode``: "off", "shadow" (score and log every
+answer, the judge always decides; collects calibration data) or "on".
+Judge scores are logged with the local estimate to
+``settings.quality_judgements_path``; ``scripts/evaluate_groundedness.py``
+reports agreement with the judge and the share of judge calls avoided for
+any accept/reject band. At runtime, ``get_groundedness_stats().stats()``
+reports the same from audited decisions
+(``settings.quality_heuristic_audit_rate``).
+
+Example:
+    >>> estimate = estimate_groundedness(question, documents, answer)
+    >>> decide(estimate)
+    'accept'
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Literal, Optional, Sequence, Set
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+Verdict = Literal["accept", "reject", "uncertain"]
+
+# Quality score at which the graph stops refining (graph_rag.should_refine)
+PASS_SCORE = 0.7
+
+# Feature weights of the combined score
+WEIGHTS: Dict[str, float] = {
+    "support": 0.45,
+    "sentence_support": 0.35,
+    "question_coverage": 0.1,
+    "rerank": 0.1,
+}
+
+# A sentence is supported when this share of its words is in the context
+SENTENCE_SUPPORT_MIN = 0.6
+
+# Sentences shorter than this (in content words) are not judged alone
+MIN_SENTENCE_WORDS = 3
+
+STEM_LENGTH = 6
+
+# Portuguese + English function words (accent-folded)
+STOPWORDS = frozenset("""
+    a ao aos aquela aquele aquilo as ate com como da das de dela dele deles
+    depois do dos e ela elas ele eles em entre era essa esse esta estao este
+    eu foi for ha isso isto ja la mais mas me mesmo muito na nas nao nem no
+    nos num numa o os ou para pela pelas pelo pelos por qual quais quando que quem
+    sao se sem ser seu seus sua suas sobre tambem tem ter um uma umas uns
+    voce pode podem sendo sido cada outro outra outros outras todo toda todos
+    todas assim onde the and for are with that this from which what into its
+    """.split())
+
+# The answer says the documents do not cover the question (a valid answer
+# per the generate prompt, but overlap cannot tell a good refusal)
+REFUSAL_MARKERS = (
+    "nao esta nos documentos",
+    "nao estao nos documentos",
+    "nao encontrei",
+    "nao ha informac",
+    "nao contem informac",
+    "nao mencionam",
+    "nao e mencionad",
+    "not in the documents",
+)
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+|\n+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase without accents."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def content_words(text: str) -> List[str]:
+    """Stemmed content words of ``text`` (no function words or 1-2 letter words)."""
+    return [
+        word[:STEM_LENGTH]
+        for word in _WORD.findall(_fold(text))
+        if (len(word) > 2 or word.isdigit()) and word not in STOPWORDS
+    ]
+
+
+def _coverage(words: Sequence[str], vocabulary: Set[str]) -> Optional[float]:
+    """Share of ``words`` in ``vocabulary`` (None without words)."""
+    if not words:
+        return None
+    return sum(1 for word in words if word in vocabulary) / len(words)
+
+
+def combine_features(features: Dict[str, Any]) -> float:
+    """
+    Weighted mean of the available features (``WEIGHTS``).
+
+    Args:
+        features: Feature values; None (or missing) features are skipped.
+
+    Returns:
+        Score between 0 and 1 (0.0 without any feature).
+    """
+    total = weight_sum = 0.0
+    for name, weight in WEIGHTS.items():
+        value = features.get(name)
+        if value is None:
+            continue
+        total += weight * max(0.0, min(1.0, float(value)))
+        weight_sum += weight
+    return total / weight_sum if weight_sum else 0.0
+
+
+def estimate_groundedness(
+    question: str,
+    documents: Sequence[str],
+    answer: str,
+    rerank_scores: Optional[Sequence[Optional[float]]] = None,
+) -> Dict[str, Any]:
+    """
+    Score how well ``answer`` is grounded in ``documents``.
+
+    Args:
+        question: User question.
+        documents: Chunks the answer was generated from.
+        answer: Generated answer.
+        rerank_scores: Cross-encoder scores of the chunks (None entries
+            for pairs that were not scored).
+
+    Returns:
+        Dict with the features, ``score``, ``refusal``, ``has_context`` and
+        ``latency_us``.
+    """
+    start = time.perf_counter()
+    answer_words = content_words(answer)
+    context: Set[str] = set()
+    for document in documents:
+        context.update(content_words(document))
+
+    sentences = [
+        words
+        for words in (content_words(s) for s in _SENTENCE_END.split(answer))
+        if len(words) >= MIN_SENTENCE_WORDS
+    ]
+    sentence_support = None
+    if sentences:
+        supported = sum(
+            1
+            for words in sentences
+            if (_coverage(words, context) or 0.0) >= SENTENCE_SUPPORT_MIN
+        )
+        sentence_support = supported / len(sentences)
+
+    known_scores = [s for s in (rerank_scores or []) if s is not None]
+    features: Dict[str, Any] = {
+        "support": _coverage(answer_words, context),
+        "sentence_support": sentence_support,
+        "question_coverage": _coverage(content_words(question), set(answer_words)),
+        "rerank": max(known_scores) if known_scores else None,
+    }
+    folded = " ".join(_fold(answer).split())
+    features["score"] = combine_features(features) if answer_words else 0.0
+    features["refusal"] = any(marker in folded for marker in REFUSAL_MARKERS)
+    features["has_context"] = bool(context)
+    features["latency_us"] = (time.perf_counter() - start) * 1e6
+    return features
+
+
+def decide(
+    estimate: Dict[str, Any],
+    accept: Optional[float] = None,
+    reject: Optional[float] = None,
+) -> Verdict:
+    """
+    Accept, reject or leave to the LLM judge (see module docstring).
+
+    Args:
+        estimate: Result of ``estimate_groundedness``.
+        accept: Accept threshold (``settings.quality_heuristic_accept``).
+        reject: Reject threshold (``settings.quality_heuristic_reject``).
+
+    Returns:
+        "accept", "reject" or "uncertain".
+    """
+    accept = settings.quality_heuristic_accept if accept is None else accept
+    reject = settings.quality_heuristic_reject if reject is None else reject
+    if estimate["refusal"] or not estimate["has_context"]:
+        return "uncertain"
+    if estimate["score"] >= accept:
+        return "accept"
+    if estimate["score"] <= reject:
+        return "reject"
+    return "uncertain"
+
+
+def judge_agrees(verdict: str, judge_score: float) -> bool:
+    """Whether the judge's score leads to the same graph decision."""
+    return (verdict == "accept") == (judge_score >= PASS_SCORE)
+
+
+def should_audit() -> bool:
+    """Whether this local decision is also sent to the judge (agreement)."""
+    rate = settings.quality_heuristic_audit_rate
+    return rate > 0 and random.random() < rate
+
+
+def evaluate_band(
+    judgements: Sequence[Dict[str, Any]], accept: float, reject: float
+) -> Dict[str, Any]:
+    """
+    Agreement and avoided judge calls of an accept/reject band on logged
+    judgements (``settings.quality_judgements_path`` records).
+
+    Scores are recomputed from the logged features, so new ``WEIGHTS`` can be
+    evaluated on old logs.
+
+    Args:
+        judgements: Logged records (features + ``judge_score``).
+        accept: Accept threshold to evaluate.
+        reject: Reject threshold to evaluate.
+
+    Returns:
+        Dict with judgements, local decisions, ``llm_calls_avoided``,
+        ``agreement`` (None without local decisions) and the accept / reject
+        agreement separately.
+    """
+    outcomes: Dict[str, List[bool]] = {"accept": [], "reject": []}
+    for record in judgements:
+        estimate = {**record, "score": combine_features(record)}
+        verdict = decide(estimate, accept, reject)
+        if verdict != "uncertain":
+            outcomes[verdict].append(judge_agrees(verdict, record["judge_score"]))
+
+    def share(values: List[bool]) -> Optional[float]:
+        return sum(values) / len(values) if values else None
+
+    local = outcomes["accept"] + outcomes["reject"]
+    return {
+        "accept": accept,
+        "reject": reject,
+        "judgements": len(judgements),
+        "local": len(local),
+        "llm_calls_avoided": len(local) / len(judgements) if judgements else 0.0,
+        "agreement": share(local),
+        "accept_agreement": share(outcomes["accept"]),
+        "reject_agreement": share(outcomes["reject"]),
+    }
+
+
+class GroundednessStats:
+    """
+    Counters of local decisions and judge agreement (thread-safe).
+
+    - validations: answers scored locally
+    - local: decided without the judge
+    - judged: sent to the judge (uncertain, audited or shadow mode)
+    - compared / agreements: accept/reject verdicts that also got a judge
+      score, and how many of those the judge confirmed
+    """
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self._lock = threading.Lock()
+        self.validations = 0
+        self.local = 0
+        self.judged = 0
+        self.compared = 0
+        self.agreements = 0
+
+    def record_local(self) -> None:
+        """Count an answer decided without the judge."""
+        with self._lock:
+            self.validations += 1
+            self.local += 1
+
+    def record_judged(self, verdict: str, judge_score: float) -> None:
+        """Count a judge call (and its agreement with a local verdict)."""
+        with self._lock:
+            self.validations += 1
+            self.judged += 1
+            if verdict != "uncertain":
+                self.compared += 1
+                self.agreements += judge_agrees(verdict, judge_score)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the counters with agreement and avoided-call ratios.
+
+        Returns:
+            Dict with the counters, ``agreement`` (None before any
+            comparison) and ``llm_calls_avoided`` (share of validations).
+        """
+        with self._lock:
+            return {
+                "validations": self.validations,
+                "local": self.local,
+                "judged": self.judged,
+                "compared": self.compared,
+                "agreements": self.agreements,
+                "agreement": (
+                    self.agreements / self.compared if self.compared else None
+                ),
+                "llm_calls_avoided": (
+                    self.local / self.validations if self.validations else 0.0
+                ),
+            }
+
+
+def log_judgement(
+    question: str, estimate: Dict[str, Any], verdict: str, judge_score: float
+) -> None:
+    """
+    Append a judge score and the local estimate to the judgements log.
+
+    Args:
+        question: User question.
+        estimate: Result of ``estimate_groundedness``.
+        verdict: Local verdict for the same answer.
+        judge_score: Score the LLM judge returned.
+    """
+    path = settings.quality_judgements_path
+    if not path:
+        return
+    record = {
+        "question": question,
+        "judge_score": judge_score,
+        "verdict": verdict,
+        **{key: value for key, value in estimate.items() if key != "latency_us"},
+    }
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with _judgements_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning("quality_judgement_log_failed", path=path, error_message=str(e))
+
+
+# Process-wide counters and log lock
+_stats: Optional[GroundednessStats] = None
+_stats_lock = threading.Lock()
+_judgements_lock = threading.Lock()
+
+
+def get_groundedness_stats() -> GroundednessStats:
+    """
+    Get the shared decision counters (singleton pattern).
+
+    Returns:
+        GroundednessStats: Process-wide counters.
+    """
+    global _stats
+
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = GroundednessStats()
+    return _stats
+
+
+def reset_groundedness_stats() -> None:
+    """
+    Zero the shared decision counters (useful for testing).
+
+    Example:
+        >>> reset_groundedness_stats()  # Next validation starts new counters
+    """
+    global _stats
+
+    with _stats_lock:
+        _stats = None
+    logger.debug("groundedness_stats_reset", action="will_recreate_on_next_use")
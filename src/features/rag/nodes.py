@@ -1,23 +1,77 @@
 """
 LangGraph Nodes for RAG System
 Each node is a function that receives state and returns updated state
+
+Every node has an async twin (``aclassify_question``, ``aretrieve_adaptive``,
+...) for LangGraph's async path (``graph.ainvoke``): LLM calls are awaited
+with ``chain.ainvoke`` and blocking retrieval / reranking run in a worker
+thread, so one event loop can drive many concurrent queries. Both variants
+share prompts and state handling.
 """
 
-from typing import Literal
+import asyncio
+import re
+import time
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, cast
 
+import numpy as np
 from langchain.prompts import ChatPromptTemplate
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from langchain_core.documents import Document
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_google_genai import ChatGoogleGenerativeAI
 from langsmith import traceable
 
 from src.core.domain.state import RAGState
+from src.features.rag.complexity import classify_locally, log_llm_decision
+from src.features.rag.groundedness import (
+    decide,
+    estimate_groundedness,
+    get_groundedness_stats,
+    log_judgement,
+    should_audit,
+)
+from src.features.rag.retrieval import (
+    document_vectors,
+    hybrid_search,
+    hybrid_search_ks,
+)
+from src.features.reranking.cascade import cascade_enabled
 from src.features.reranking.reranker import rerank_documents as apply_reranking
+from src.features.reranking.score_cache import cached_scores
+from src.features.reranking.warmup import start_reranker_warmup
 from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import tune_search
+from src.infrastructure.database.index_manager import get_index_manager
+from src.infrastructure.external.embedding_cache import get_embeddings
+from src.infrastructure.external.llm_cache import get_llm_cache
 
 # Initialize components
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-db_path = "banco_faiss"
-llm = ChatGoogleGenerativeAI(model=settings.llm_model, temperature=0)
+embeddings = get_embeddings()  # Shared, disk-cached (repeat questions skip the API)
+db_path = settings.vectorstore_path
+index_manager = get_index_manager(db_path, embeddings)
+# Temperature 0: identical prompts reuse cached responses (per-node TTL)
+llm = ChatGoogleGenerativeAI(
+    model=settings.llm_model, temperature=0, cache=get_llm_cache()
+)
+
+# Bare 0-1 score in a judge reply ("0.85", "0,9", "1"); not part of "8/10" or "10"
+_SCORE_PATTERN = re.compile(r"(?<![\d/])(?:0(?:[.,]\d+)?|1(?:[.,]0+)?)(?![\d/])")
+
+# Load the reranker off the request path (first request skips the cold start);
+# a replica pool is always built here, since it sets torch's thread count
+if settings.reranker_warmup_enabled or settings.reranker_pool_size != 1:
+    start_reranker_warmup()
+
+
+def graph_node(func: Callable[..., Any], afunc: Callable[..., Any]) -> RunnableLambda:
+    """
+    Graph node with a sync and an async implementation.
+
+    LangGraph runs ``func`` on ``invoke`` / ``stream`` and ``afunc`` on
+    ``ainvoke`` / ``astream``, so one compiled graph serves both paths.
+    """
+    return RunnableLambda(func, afunc=afunc, name=func.__name__)
 
 
 def _normalize_complexity(value: str) -> Literal["simple", "complex"]:
@@ -31,29 +85,161 @@ def _normalize_complexity(value: str) -> Literal["simple", "complex"]:
     return "complex"
 
 
+CLASSIFY_PROMPT = ChatPromptTemplate.from_template(
+    "Classifique a seguinte pergunta como 'simple' ou 'complex'.\n\n"
+    "Simple: Perguntas factuais, definições, conceitos únicos.\n"
+    "Complex: Perguntas comparativas, analíticas, múltiplas partes, explicações profundas.\n\n"
+    "Pergunta: {question}\n\n"
+    "Responda APENAS com 'simple' ou 'complex':"
+)
+
+GENERATE_PROMPT = ChatPromptTemplate.from_template(
+    "Você é um assistente especializado em responder perguntas com base em documentos fornecidos.\n\n"
+    "INSTRUÇÕES:\n"
+    "- Responda APENAS com base nos documentos abaixo\n"
+    "- Se a informação não estiver nos documentos, diga claramente\n"
+    "- Seja preciso e completo\n"
+    "- Use exemplos dos documentos quando relevante\n\n"
+    "DOCUMENTOS:\n{contexto}\n\n"
+    "PERGUNTA: {pergunta}\n\n"
+    "RESPOSTA:"
+)
+
+VALIDATE_PROMPT = ChatPromptTemplate.from_template(
+    "Avalie a qualidade da resposta abaixo em uma escala de 0 a 1.\n\n"
+    "CRITÉRIOS:\n"
+    "- Relevância: A resposta responde a pergunta?\n"
+    "- Completude: A resposta é suficientemente completa?\n"
+    "- Precisão: A resposta está baseada nos documentos?\n\n"
+    "PERGUNTA: {question}\n\n"
+    "DOCUMENTOS DISPONÍVEIS:\n{contexto}\n\n"
+    "RESPOSTA:\n{generation}\n\n"
+    "Responda APENAS com um número entre 0 e 1 (ex: 0.85):"
+)
+
+REFINE_PROMPT = ChatPromptTemplate.from_template(
+    "Você precisa MELHORAR a resposta anterior que recebeu score de qualidade {score:.2f}.\n\n"
+    "RESPOSTA ANTERIOR:\n{previous}\n\n"
+    "INSTRUÇÕES PARA MELHORIA:\n"
+    "- Use mais detalhes dos documentos\n"
+    "- Seja mais preciso e completo\n"
+    "- Adicione exemplos relevantes\n"
+    "- Mantenha foco na pergunta\n\n"
+    "DOCUMENTOS:\n{contexto}\n\n"
+    "PERGUNTA: {pergunta}\n\n"
+    "RESPOSTA MELHORADA:"
+)
+
+
+def _numbered_context(documents: List[str]) -> str:
+    """Documents as "Documento i: ..." blocks for the generation prompts."""
+    return "\n\n".join([f"Documento {i+1}: {doc}" for i, doc in enumerate(documents)])
+
+
+def _classify_locally(state: RAGState) -> Tuple[bool, Dict[str, Any]]:
+    """Try the local classifier; returns (decided, local prediction details)."""
+    local_complexity, local = classify_locally(state["question"])
+    if local_complexity is None:
+        return False, local
+    print(
+        f"[CLASSIFY] Question classified as: {local_complexity} "
+        f"(local, confidence {local['confidence']:.2f})"
+    )
+    state["complexity"] = local_complexity
+    return True, local
+
+
+def _apply_llm_complexity(
+    state: RAGState, response: BaseMessage, latency_ms: float, local: Dict[str, Any]
+) -> RAGState:
+    """Store (and log) the LLM's complexity decision."""
+    complexity = _normalize_complexity(str(response.content))
+    log_llm_decision(state["question"], complexity, latency_ms, local)
+
+    print(f"[CLASSIFY] Question classified as: {complexity}")
+    state["complexity"] = complexity
+    return state
+
+
 @traceable(run_type="chain", name="Classify Question Complexity")
 def classify_question(state: RAGState) -> RAGState:
     """
     Classifies question complexity as 'simple' or 'complex'.
     Simple: Factual, definition-based questions
     Complex: Comparative, analytical, multi-part questions
+
+    A local classifier answers first (microseconds); the LLM is only called
+    when it is disabled, missing or below
+    ``settings.complexity_classifier_threshold``. LLM decisions are logged to
+    ``settings.complexity_decisions_path`` to retrain the classifier.
     """
-    question = state["question"]
-
-    prompt = ChatPromptTemplate.from_template(
-        "Classifique a seguinte pergunta como 'simple' ou 'complex'.\n\n"
-        "Simple: Perguntas factuais, definições, conceitos únicos.\n"
-        "Complex: Perguntas comparativas, analíticas, múltiplas partes, explicações profundas.\n\n"
-        "Pergunta: {question}\n\n"
-        "Responda APENAS com 'simple' ou 'complex':"
-    )
+    decided, local = _classify_locally(state)
+    if decided:
+        return state
 
-    chain = prompt | llm
-    response = chain.invoke({"question": question})
-    complexity = _normalize_complexity(str(response.content))
+    chain = CLASSIFY_PROMPT | llm
+    start = time.perf_counter()
+    response = chain.invoke({"question": state["question"]})
+    latency_ms = (time.perf_counter() - start) * 1000
+    return _apply_llm_complexity(state, response, latency_ms, local)
 
-    print(f"[CLASSIFY] Question classified as: {complexity}")
-    state["complexity"] = complexity
+
+@traceable(run_type="chain", name="Classify Question Complexity")
+async def aclassify_question(state: RAGState) -> RAGState:
+    """Async ``classify_question`` (awaits the LLM fallback)."""
+    decided, local = _classify_locally(state)
+    if decided:
+        return state
+
+    chain = CLASSIFY_PROMPT | llm
+    start = time.perf_counter()
+    response = await chain.ainvoke({"question": state["question"]})
+    latency_ms = (time.perf_counter() - start) * 1000
+    return _apply_llm_complexity(state, response, latency_ms, local)
+
+
+def _k_for_complexity(complexity: str) -> int:
+    """Documents to retrieve for a question of ``complexity``."""
+    # If reranking enabled, retrieve more docs for better reranking pool
+    if settings.reranker_enabled and settings.reranker_cascade_enabled:
+        return settings.reranker_cascade_candidates
+    if settings.reranker_enabled:
+        return 10 if complexity == "simple" else 15
+    return 3 if complexity == "simple" else 7
+
+
+def _retrieval_k(complexity: str) -> int:
+    """Adaptive k selection (``_k_for_complexity``), announced."""
+    k = _k_for_complexity(complexity)
+    if settings.reranker_enabled and settings.reranker_cascade_enabled:
+        print(
+            f"[RETRIEVE] Retrieving {k} documents for {complexity} question "
+            f"(cascade: prefilter to {settings.reranker_cascade_keep}, then rerank)"
+        )
+    elif settings.reranker_enabled:
+        print(
+            f"[RETRIEVE] Retrieving {k} documents for {complexity} question (with reranking)"
+        )
+    else:
+        print(f"[RETRIEVE] Retrieving {k} documents for {complexity} question")
+    return k
+
+
+def _search(question: str, k: int) -> List[Document]:
+    """The ``k`` best chunks for ``question`` (blocking)."""
+    # Shared in-memory index (loaded once, hot-reloaded on disk changes)
+    vectordb = index_manager.get()
+    # Runtime recall/latency knobs for IVF (nprobe) and HNSW (efSearch) indexes
+    tune_search(vectordb.index)
+    # Dense + BM25 fused with RRF (settings.retrieval_mode)
+    return hybrid_search(vectordb, question, k=k)
+
+
+def _apply_retrieved(state: RAGState, docs: List[Document]) -> RAGState:
+    """Store the retrieved contents and their vector ids."""
+    print(f"[RETRIEVE] Retrieved {len(docs)} documents")
+    state["documents"] = [doc.page_content for doc in docs]
+    state["document_ids"] = [doc.id for doc in docs]
     return state
 
 
@@ -65,36 +251,157 @@ def retrieve_adaptive(state: RAGState) -> RAGState:
     With reranking enabled:
     - Simple questions: k=10 documents (then reranked to top 5)
     - Complex questions: k=15 documents (then reranked to top 7)
+    - Cascade mode: k=settings.reranker_cascade_candidates for both (a cheap
+      first stage keeps settings.reranker_cascade_keep for the reranker)
 
     Without reranking:
     - Simple questions: k=3 documents
     - Complex questions: k=7 documents
+
+    Documents come from ``hybrid_search`` (dense, hybrid or lexical-only
+    depending on ``settings.retrieval_mode``).
+    """
+    k = _retrieval_k(state["complexity"])
+    return _apply_retrieved(state, _search(state["question"], k))
+
+
+@traceable(run_type="retriever", name="Adaptive Document Retrieval")
+async def aretrieve_adaptive(state: RAGState) -> RAGState:
+    """Async ``retrieve_adaptive`` (search runs in a worker thread)."""
+    k = _retrieval_k(state["complexity"])
+    docs = await asyncio.to_thread(_search, state["question"], k)
+    return _apply_retrieved(state, docs)
+
+
+def _speculative_search(question: str) -> Dict[str, Any]:
+    """Documents (and vector ids) per complexity label from one search."""
+    ks = {label: _k_for_complexity(label) for label in ("simple", "complex")}
+    print(
+        f"[RETRIEVE] Speculative retrieval of {max(ks.values())} documents "
+        f"while classifying"
+    )
+    vectordb = index_manager.get()
+    tune_search(vectordb.index)
+    by_k = hybrid_search_ks(vectordb, question, sorted(set(ks.values())))
+    return {
+        "retrieval_candidates": {
+            label: [doc.page_content for doc in by_k[k]] for label, k in ks.items()
+        },
+        "retrieval_candidate_ids": {
+            label: [doc.id for doc in by_k[k]] for label, k in ks.items()
+        },
+    }
+
+
+@traceable(run_type="retriever", name="Speculative Document Retrieval")
+def retrieve_speculative(state: RAGState) -> Dict[str, Any]:
+    """
+    Retrieves for both complexity labels, in parallel with classification.
+
+    Runs one search at the largest k a label can imply and keeps, per label,
+    exactly what ``retrieve_adaptive`` would return for it
+    (``hybrid_search_ks``); ``select_retrieved`` picks the classified label's
+    list. Returns only ``retrieval_candidates`` and their vector ids
+    (parallel branches must not write the same state keys).
+    """
+    return _speculative_search(state["question"])
+
+
+@traceable(run_type="retriever", name="Speculative Document Retrieval")
+async def aretrieve_speculative(state: RAGState) -> Dict[str, Any]:
+    """Async ``retrieve_speculative`` (search runs in a worker thread)."""
+    return await asyncio.to_thread(_speculative_search, state["question"])
+
+
+def classify_complexity(state: RAGState) -> Dict[str, Any]:
+    """``classify_question`` as a parallel branch: returns only the label."""
+    return {"complexity": classify_question(cast(RAGState, dict(state)))["complexity"]}
+
+
+async def aclassify_complexity(state: RAGState) -> Dict[str, Any]:
+    """Async ``classify_complexity``."""
+    classified = await aclassify_question(cast(RAGState, dict(state)))
+    return {"complexity": classified["complexity"]}
+
+
+def select_retrieved(state: RAGState) -> Dict[str, Any]:
+    """
+    Joins classification and speculative retrieval: keeps the documents of
+    the classified complexity (same as ``retrieve_adaptive`` would return).
     """
-    question = state["question"]
     complexity = state["complexity"]
+    documents = state["retrieval_candidates"][complexity]
+    document_ids = state.get("retrieval_candidate_ids", {}).get(complexity, [])
 
-    # Adaptive k selection
-    # If reranking enabled, retrieve more docs for better reranking pool
-    if settings.reranker_enabled:
-        k = 10 if complexity == "simple" else 15
-        print(
-            f"[RETRIEVE] Retrieving {k} documents for {complexity} question (with reranking)"
-        )
-    else:
-        k = 3 if complexity == "simple" else 7
-        print(f"[RETRIEVE] Retrieving {k} documents for {complexity} question")
+    print(
+        f"[RETRIEVE] Retrieved {len(documents)} documents for {complexity} "
+        f"question (speculative, k={_k_for_complexity(complexity)})"
+    )
+    return {
+        "documents": documents,
+        "document_ids": document_ids,
+        "retrieval_candidates": {},
+        "retrieval_candidate_ids": {},
+    }
+
+
+async def aselect_retrieved(state: RAGState) -> Dict[str, Any]:
+    """Async ``select_retrieved`` (no I/O)."""
+    return select_retrieved(state)
 
-    # Load vectorstore and retrieve
-    vectordb = FAISS.load_local(
-        db_path, embeddings, allow_dangerous_deserialization=True
+
+def _rerank_top_n(state: RAGState) -> Optional[int]:
+    """Documents the rerank node keeps, or None when reranking is skipped."""
+    if not settings.reranker_enabled:
+        print("[RERANK] Disabled - skipping reranking")
+        return None
+
+    documents = state["documents"]
+    if not documents:
+        print("[RERANK] No documents to rerank")
+        return None
+
+    print(f"[RERANK] Reranking {len(documents)} documents")
+
+    # Determine top_n based on complexity (override settings); in adaptive
+    # mode the reranker cuts at the score gap / score mass within it
+    return 5 if state["complexity"] == "simple" else 7
+
+
+def _rerank_vectors(state: RAGState) -> Optional[np.ndarray]:
+    """
+    Vectors of the retrieved documents for the dense cascade stage.
+
+    Read back from the loaded index by vector id (no embedding call); None
+    when the dense stage does not run or the ids are unknown, in which case
+    the cascade uses its lexical stage.
+    """
+    num_documents = len(state["documents"])
+    if settings.reranker_cascade_stage != "dense" or not cascade_enabled(num_documents):
+        return None
+    document_ids = state.get("document_ids", [])
+    if len(document_ids) != num_documents:
+        return None
+    return document_vectors(index_manager.get(), document_ids)
+
+
+def _rerank(state: RAGState, top_n: int) -> List[str]:
+    """Rerank the retrieved documents (blocking)."""
+    return apply_reranking(
+        state["question"],
+        state["documents"],
+        top_n=top_n,
+        vectors=_rerank_vectors(state),
     )
-    docs = vectordb.similarity_search(question, k=k)
 
-    # Extract document content
-    documents = [doc.page_content for doc in docs]
 
-    print(f"[RETRIEVE] Retrieved {len(documents)} documents")
-    state["documents"] = documents
+def _apply_reranked(state: RAGState, reranked_content: List[str]) -> RAGState:
+    """Store the reranked documents (and their vector ids)."""
+    before = len(state["documents"])
+    print(f"[RERANK] Reranked {before} → {len(reranked_content)} documents")
+    ids_by_content = dict(zip(state["documents"], state.get("document_ids", [])))
+    state["documents"] = reranked_content
+    state["document_ids"] = [ids_by_content.get(doc) for doc in reranked_content]
     return state
 
 
@@ -110,7 +417,8 @@ def rerank_documents(state: RAGState) -> RAGState:
     1. Check if reranking is enabled
     2. Convert document strings to LangChain Document objects
     3. Apply BGE cross-encoder reranking
-    4. Filter to top_n most relevant documents
+    4. Filter to top_n most relevant documents (fixed 5/7 by complexity, or
+       chosen from the score distribution in adaptive mode)
     5. Convert back to strings
 
     Args:
@@ -119,28 +427,39 @@ def rerank_documents(state: RAGState) -> RAGState:
     Returns:
         Dict with reranked documents, or empty dict if disabled
     """
-    if not settings.reranker_enabled:
-        print("[RERANK] Disabled - skipping reranking")
+    top_n = _rerank_top_n(state)
+    if top_n is None:
         return state
 
-    question = state["question"]
-    documents = state["documents"]
-    complexity = state["complexity"]
+    return _apply_reranked(state, _rerank(state, top_n))
 
-    if not documents:
-        print("[RERANK] No documents to rerank")
+
+@traceable(run_type="chain", name="BGE Semantic Reranking")
+async def arerank_documents(state: RAGState) -> RAGState:
+    """Async ``rerank_documents`` (the cross-encoder runs in a worker thread)."""
+    top_n = _rerank_top_n(state)
+    if top_n is None:
         return state
 
-    print(f"[RERANK] Reranking {len(documents)} documents")
+    reranked_content = await asyncio.to_thread(_rerank, state, top_n)
+    return _apply_reranked(state, reranked_content)
 
-    # Determine top_n based on complexity (override settings)
-    top_n = 5 if complexity == "simple" else 7
 
-    reranked_content = apply_reranking(question, documents, top_n=top_n)
+def _generate_inputs(state: RAGState) -> Dict[str, Any]:
+    """Prompt variables of the generate node."""
+    # Build context from documents
+    return {
+        "contexto": _numbered_context(state["documents"]),
+        "pergunta": state["question"],
+    }
 
-    print(f"[RERANK] Reranked {len(documents)} → {len(reranked_content)} documents")
 
-    state["documents"] = reranked_content
+def _apply_generation(state: RAGState, response: BaseMessage) -> RAGState:
+    """Store the generated answer."""
+    generation = str(response.content)
+
+    print(f"[GENERATE] Generated answer ({len(generation)} chars)")
+    state["generation"] = generation
     return state
 
 
@@ -150,32 +469,88 @@ def generate_answer(state: RAGState) -> RAGState:
     Generates answer based on retrieved documents and question.
     Uses optimized prompt for RAG.
     """
-    question = state["question"]
-    documents = state["documents"]
+    chain = GENERATE_PROMPT | llm
+    response = chain.invoke(_generate_inputs(state))
+    return _apply_generation(state, response)
 
-    # Build context from documents
-    contexto = "\n\n".join(
-        [f"Documento {i+1}: {doc}" for i, doc in enumerate(documents)]
-    )
 
-    prompt = ChatPromptTemplate.from_template(
-        "Você é um assistente especializado em responder perguntas com base em documentos fornecidos.\n\n"
-        "INSTRUÇÕES:\n"
-        "- Responda APENAS com base nos documentos abaixo\n"
-        "- Se a informação não estiver nos documentos, diga claramente\n"
-        "- Seja preciso e completo\n"
-        "- Use exemplos dos documentos quando relevante\n\n"
-        "DOCUMENTOS:\n{contexto}\n\n"
-        "PERGUNTA: {pergunta}\n\n"
-        "RESPOSTA:"
+@traceable(run_type="llm", name="Generate Answer")
+async def agenerate_answer(state: RAGState) -> RAGState:
+    """Async ``generate_answer``."""
+    chain = GENERATE_PROMPT | llm
+    response = await chain.ainvoke(_generate_inputs(state))
+    return _apply_generation(state, response)
+
+
+def _validate_inputs(state: RAGState) -> Dict[str, Any]:
+    """Prompt variables of the validate node."""
+    return {
+        "question": state["question"],
+        "contexto": "\n".join(state["documents"][:3]),  # First 3 docs only
+        "generation": state["generation"],
+    }
+
+
+def _estimate_quality(state: RAGState) -> Tuple[Optional[float], Dict[str, Any]]:
+    """
+    Local groundedness estimate; (score to store, estimate).
+
+    The score is None when the LLM judge has to run: heuristic off or in
+    shadow mode, an uncertain estimate, or a local decision sampled for audit.
+    """
+    if settings.quality_heuristic_mode == "off":
+        return None, {}
+
+    estimate = estimate_groundedness(
+        state["question"],
+        state["documents"],
+        state["generation"],
+        cached_scores(state["question"], state["documents"]),
     )
+    estimate["verdict"] = decide(estimate)
+    if (
+        settings.quality_heuristic_mode == "on"
+        and estimate["verdict"] != "uncertain"
+        and not should_audit()
+    ):
+        get_groundedness_stats().record_local()
+        print(
+            f"[VALIDATE] Quality score: {estimate['score']:.2f} "
+            f"(local, {estimate['verdict']})"
+        )
+        return estimate["score"], estimate
+    return None, estimate
 
-    chain = prompt | llm
-    response = chain.invoke({"contexto": contexto, "pergunta": question})
-    generation = str(response.content)
 
-    print(f"[GENERATE] Generated answer ({len(generation)} chars)")
-    state["generation"] = generation
+def _parse_score(content: str) -> Optional[float]:
+    """
+    Score in the judge's reply, or None if it has no bare 0-1 score.
+
+    Replies often restate the scale ("Score de 0 a 1: 0.85") or number their
+    criteria ("1. Relevância ... 0.3"), so the last decimal wins over bare 0/1
+    and other scales ("8/10") are rejected rather than clamped.
+    """
+    matches = [m.group() for m in _SCORE_PATTERN.finditer(content)]
+    if not matches:
+        return None
+    decimals = [m for m in matches if len(m) > 1]
+    return float((decimals or matches)[-1].replace(",", "."))
+
+
+def _apply_quality(
+    state: RAGState, response: BaseMessage, estimate: Dict[str, Any]
+) -> RAGState:
+    """Parse and store the judge's quality score."""
+    quality_score = _parse_score(str(response.content))
+    if quality_score is None:
+        # Unparseable reply: use the local estimate, else medium quality
+        quality_score = estimate.get("score", 0.6)
+    elif estimate:
+        get_groundedness_stats().record_judged(estimate["verdict"], quality_score)
+        log_judgement(state["question"], estimate, estimate["verdict"], quality_score)
+
+    print(f"[VALIDATE] Quality score: {quality_score:.2f}")
+    state["quality_score"] = quality_score
     return state
 
 
@@ -185,40 +560,53 @@ def validate_quality(state: RAGState) -> RAGState:
     Validates answer quality using LLM-as-judge.
     Returns quality score between 0 and 1.
     Criteria: Relevance, completeness, accuracy
+
+    A local groundedness estimate (answer/chunk overlap + reranker scores)
+    settles clear accepts and rejects without the judge when
+    ``settings.quality_heuristic_mode`` is "on" (see
+    ``src.features.rag.groundedness``).
     """
-    question = state["question"]
-    generation = state["generation"]
-    documents = state["documents"]
+    local_score, estimate = _estimate_quality(state)
+    if local_score is not None:
+        state["quality_score"] = local_score
+        return state
 
-    contexto = "\n".join(documents[:3])  # Use first 3 docs for validation
-
-    prompt = ChatPromptTemplate.from_template(
-        "Avalie a qualidade da resposta abaixo em uma escala de 0 a 1.\n\n"
-        "CRITÉRIOS:\n"
-        "- Relevância: A resposta responde a pergunta?\n"
-        "- Completude: A resposta é suficientemente completa?\n"
-        "- Precisão: A resposta está baseada nos documentos?\n\n"
-        "PERGUNTA: {question}\n\n"
-        "DOCUMENTOS DISPONÍVEIS:\n{contexto}\n\n"
-        "RESPOSTA:\n{generation}\n\n"
-        "Responda APENAS com um número entre 0 e 1 (ex: 0.85):"
-    )
+    chain = VALIDATE_PROMPT | llm
+    response = chain.invoke(_validate_inputs(state))
+    return _apply_quality(state, response, estimate)
 
-    chain = prompt | llm
-    response = chain.invoke(
-        {"question": question, "contexto": contexto, "generation": generation}
-    )
 
-    try:
-        quality_score = float(str(response.content).strip())
-        # Clamp between 0 and 1
-        quality_score = max(0.0, min(1.0, quality_score))
-    except ValueError:
-        # Default to medium quality if parsing fails
-        quality_score = 0.6
+@traceable(run_type="chain", name="Validate Answer Quality")
+async def avalidate_quality(state: RAGState) -> RAGState:
+    """Async ``validate_quality``."""
+    local_score, estimate = _estimate_quality(state)
+    if local_score is not None:
+        state["quality_score"] = local_score
+        return state
+
+    chain = VALIDATE_PROMPT | llm
+    response = await chain.ainvoke(_validate_inputs(state))
+    return _apply_quality(state, response, estimate)
 
-    print(f"[VALIDATE] Quality score: {quality_score:.2f}")
-    state["quality_score"] = quality_score
+
+def _refine_inputs(state: RAGState) -> Dict[str, Any]:
+    """Prompt variables of the refine node."""
+    return {
+        "score": state["quality_score"],
+        "previous": state["generation"],
+        "contexto": _numbered_context(state["documents"]),
+        "pergunta": state["question"],
+    }
+
+
+def _apply_refinement(state: RAGState, response: BaseMessage) -> RAGState:
+    """Store the refined answer and count the iteration."""
+    refined_generation = str(response.content)
+    new_iterations = state.get("iterations", 0) + 1
+
+    print(f"[REFINE] Refined answer (iteration {new_iterations})")
+    state["generation"] = refined_generation
+    state["iterations"] = new_iterations
     return state
 
 
@@ -228,43 +616,14 @@ def refine_answer(state: RAGState) -> RAGState:
     Refines answer based on validation feedback.
     Attempts to improve quality by re-generating with explicit feedback.
     """
-    question = state["question"]
-    documents = state["documents"]
-    previous_generation = state["generation"]
-    quality_score = state["quality_score"]
-    iterations = state.get("iterations", 0)
+    chain = REFINE_PROMPT | llm
+    response = chain.invoke(_refine_inputs(state))
+    return _apply_refinement(state, response)
 
-    contexto = "\n\n".join(
-        [f"Documento {i+1}: {doc}" for i, doc in enumerate(documents)]
-    )
-
-    prompt = ChatPromptTemplate.from_template(
-        "Você precisa MELHORAR a resposta anterior que recebeu score de qualidade {score:.2f}.\n\n"
-        "RESPOSTA ANTERIOR:\n{previous}\n\n"
-        "INSTRUÇÕES PARA MELHORIA:\n"
-        "- Use mais detalhes dos documentos\n"
-        "- Seja mais preciso e completo\n"
-        "- Adicione exemplos relevantes\n"
-        "- Mantenha foco na pergunta\n\n"
-        "DOCUMENTOS:\n{contexto}\n\n"
-        "PERGUNTA: {pergunta}\n\n"
-        "RESPOSTA MELHORADA:"
-    )
 
-    chain = prompt | llm
-    response = chain.invoke(
-        {
-            "score": quality_score,
-            "previous": previous_generation,
-            "contexto": contexto,
-            "pergunta": question,
-        }
-    )
-
-    refined_generation = str(response.content)
-    new_iterations = iterations + 1
-
-    print(f"[REFINE] Refined answer (iteration {new_iterations})")
-    state["generation"] = refined_generation
-    state["iterations"] = new_iterations
-    return state
+@traceable(run_type="chain", name="Refine Answer with Feedback")
+async def arefine_answer(state: RAGState) -> RAGState:
+    """Async ``refine_answer``."""
+    chain = REFINE_PROMPT | llm
+    response = await chain.ainvoke(_refine_inputs(state))
+    return _apply_refinement(state, response)
@@ -0,0 +1,252 @@
+"""
+Hybrid lexical + dense retrieval with reciprocal rank fusion (RRF).
+
+Dense search (FAISS) needs a network embedding call per query and can miss
+exact-term matches such as acronyms or formula names. The chunk store keeps
+a BM25 inverted index of the same chunks (built during ingestion), which is
+queried locally in parallel with the dense search. Both rankings are merged
+with reciprocal rank fusion:
+
+    score(doc) = sum over rankings of 1 / (rrf_k + rank)
+
+Modes (``settings.retrieval_mode``):
+- dense: FAISS only
+- hybrid: FAISS + BM25 fused with RRF; if the dense search fails or exceeds
+  ``settings.retrieval_dense_timeout_s``, lexical results are used alone
+- lexical: BM25 only, no embedding call at all
+
+``hybrid_search_ks`` serves several result sizes from one search (e.g.
+retrieval started before the question's complexity picks ``k``); with an ANN
+index the dense search is repeated for each size.
+``document_vectors`` reads the vectors of retrieved chunks back from the
+index (for the dense cascade stage, without re-embedding them).
+
+Example:
+    >>> docs = hybrid_search(index_manager.get(), "O que é XOR?", k=10)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import is_approximate
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+# Module logger
+logger = get_logger(__name__)
+
+# Dense searches run here while the lexical search runs in the caller thread
+_dense_executor = ThreadPoolExecutor(thread_name_prefix="dense-retrieval")
+
+
+def _doc_key(doc: Document) -> str:
+    """Identity used to merge rankings (vector id, else content)."""
+    return doc.id or doc.page_content
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Document]], k: int, rrf_k: Optional[int] = None
+) -> List[Document]:
+    """
+    Merge ranked lists with reciprocal rank fusion.
+
+    Args:
+        rankings: Ranked document lists, best first.
+        k: Number of documents to return.
+        rrf_k: Fusion constant (defaults to ``settings.retrieval_rrf_k``).
+
+    Returns:
+        Top ``k`` documents by fused score; ties keep first-seen order.
+    """
+    rrf_k = settings.retrieval_rrf_k if rrf_k is None else rrf_k
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = _doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [docs[key] for key in ordered[:k]]
+
+
+def lexical_search(vectordb: "FAISS", question: str, k: int) -> List[Document]:
+    """
+    BM25 search over the chunk store of a vector store.
+
+    Returns an empty list for stores without a lexical index.
+    """
+    store = getattr(vectordb.docstore, "store", None)
+    if store is None or not hasattr(store, "search_lexical"):
+        return []
+    return store.search_lexical(question, k)
+
+
+def document_vectors(
+    vectordb: "FAISS", vector_ids: Sequence[Optional[str]]
+) -> Optional[np.ndarray]:
+    """
+    Vectors of retrieved chunks, reconstructed from the loaded FAISS index.
+
+    Vector ids are resolved to positions through the chunk store loaded with
+    the index, so no embedding call is made.
+
+    Args:
+        vectordb: Loaded vector store (FAISS index + chunk store).
+        vector_ids: Ids of the chunks (``Document.id``).
+
+    Returns:
+        float32 matrix with one row per id, or None when a chunk is not in
+        this index or the index cannot reconstruct vectors (IVF indexes
+        without a direct map).
+    """
+    store = getattr(vectordb.docstore, "store", None)
+    if store is None or not hasattr(store, "positions_of") or None in vector_ids:
+        return None
+
+    positions = store.positions_of(list(vector_ids))
+    if len(positions) < len(set(vector_ids)):
+        return None
+    keys = np.array([positions[vector_id] for vector_id in vector_ids], np.int64)
+    try:
+        return vectordb.index.reconstruct_batch(keys)
+    except RuntimeError as e:
+        logger.warning(
+            "document_vectors_unavailable",
+            error_message=str(e),
+            action="none",
+        )
+        return None
+
+
+def _dense_search(
+    vectordb: "FAISS", question: str, ks: Sequence[int]
+) -> Dict[int, List[Document]]:
+    """
+    Dense rankings for each ``k`` (one query embedding).
+
+    An exact index is searched once at ``max(ks)`` and each ``k`` gets a
+    prefix. An ANN index is searched at each ``k``: its top ``k`` need not be
+    a prefix of its top ``max(ks)`` (HNSW widens its candidate list with k).
+    """
+    max_k = max(ks)
+    if len(ks) == 1 or not is_approximate(vectordb.index):
+        docs = vectordb.similarity_search(question, k=max_k)
+        return {k: docs[:k] for k in ks}
+
+    embedding = vectordb.embeddings.embed_query(question)
+    return {k: vectordb.similarity_search_by_vector(embedding, k=k) for k in ks}
+
+
+def _rankings(
+    vectordb: "FAISS", question: str, ks: Sequence[int], mode: str
+) -> Tuple[Dict[int, List[Document]], List[Document]]:
+    """
+    Dense rankings per ``k`` and the lexical ranking of ``max(ks)`` documents
+    (hybrid/lexical modes).
+
+    Dense search runs in a worker thread while BM25 runs in the caller; on a
+    dense failure or timeout the lexical ranking is used alone.
+    """
+    start_time = time.time()
+    k = max(ks)
+    dense_future = None
+    if mode == "hybrid":
+        dense_future = _dense_executor.submit(_dense_search, vectordb, question, ks)
+
+    lexical_docs = lexical_search(vectordb, question, k)
+    lexical_ms = (time.time() - start_time) * 1000
+
+    dense: Dict[int, List[Document]] = {}
+    fallback = None
+    if dense_future is not None:
+        timeout = settings.retrieval_dense_timeout_s or None
+        try:
+            dense = dense_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            fallback = "dense_timeout"
+        except Exception as e:
+            fallback = type(e).__name__
+        if fallback and not lexical_docs:
+            # Nothing to fall back to: surface the dense failure
+            if fallback == "dense_timeout":
+                return dense_future.result(), []
+            raise dense_future.exception()
+
+    dense_docs = dense.get(k, [])
+    log = logger.warning if fallback else logger.info
+    log(
+        "hybrid_retrieval_completed",
+        mode=mode,
+        k=k,
+        dense_count=len(dense_docs),
+        lexical_count=len(lexical_docs),
+        overlap=len(dense_docs)
+        + len(lexical_docs)
+        - len({_doc_key(d) for d in (*dense_docs, *lexical_docs)}),
+        lexical_ms=lexical_ms,
+        total_ms=(time.time() - start_time) * 1000,
+        fallback=fallback,
+    )
+    return dense, lexical_docs
+
+
+def hybrid_search(
+    vectordb: "FAISS", question: str, k: int, mode: Optional[str] = None
+) -> List[Document]:
+    """
+    Retrieve ``k`` documents with the configured retrieval mode.
+
+    Args:
+        vectordb: Loaded vector store (FAISS index + chunk store).
+        question: User question.
+        k: Number of documents to return.
+        mode: dense, hybrid or lexical (defaults to ``settings.retrieval_mode``).
+
+    Returns:
+        List of documents, best first.
+    """
+    return hybrid_search_ks(vectordb, question, [k], mode)[k]
+
+
+def hybrid_search_ks(
+    vectordb: "FAISS", question: str, ks: Sequence[int], mode: Optional[str] = None
+) -> Dict[int, List[Document]]:
+    """
+    ``hybrid_search`` for several ``k`` at the cost of one search.
+
+    Each ``k`` gets exactly what ``hybrid_search(..., k)`` returns: the top
+    ``k`` of each ranking fused with RRF (a plain prefix of the max-k fused
+    list would differ, since fusion scores depend on where each ranking is
+    cut). The lexical ranking is fetched once at ``max(ks)``; so is the
+    dense ranking for exact (flat) indexes. With an ANN index the dense
+    search runs once per ``k`` (one query embedding), since its top ``k``
+    is not always a prefix of its top ``max(ks)``. Used to retrieve before
+    the question's complexity (and so its ``k``) is known.
+
+    Args:
+        vectordb: Loaded vector store (FAISS index + chunk store).
+        question: User question.
+        ks: Result sizes wanted.
+        mode: dense, hybrid or lexical (defaults to ``settings.retrieval_mode``).
+
+    Returns:
+        Mapping of each ``k`` to its documents, best first.
+    """
+    mode = mode or settings.retrieval_mode
+    if mode == "dense":
+        return _dense_search(vectordb, question, ks)
+
+    dense, lexical_docs = _rankings(vectordb, question, ks, mode)
+    return {
+        k: reciprocal_rank_fusion([dense.get(k, []), lexical_docs[:k]], k) for k in ks
+    }
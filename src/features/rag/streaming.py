@@ -0,0 +1,189 @@
+"""
+Token streaming for the RAG graphs.
+
+``run_rag_query`` / ``run_conversational_query`` return only after
+generation, validation and every refinement finished, so callers see nothing
+for several LLM round trips. ``stream_graph`` runs a compiled graph with
+LangGraph's "messages" and "updates" stream modes in a background thread and
+yields events as they happen:
+
+- ``token``: a chunk of the answer, as the generate node's LLM produces it
+- ``answer``: the complete first answer (with time-to-first-token)
+- ``correction``: a refinement replaced the answer (validation scored it low)
+- ``final``: the graph finished (quality score, iterations, final state)
+
+Validation and refinement run after the ``answer`` event without blocking
+the caller: a CLI prints the answer straight away and picks up corrections
+later; a caller that stops iterating leaves the graph to finish on its own.
+
+Example:
+    >>> for event in stream_rag_query("O que é o Perceptron?"):
+    ...     if event["type"] == "token":
+    ...         print(event["content"], end="", flush=True)
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+StreamEvent = Dict[str, Any]
+
+# Nodes whose LLM tokens are the answer / whose updates replace it
+ANSWER_NODES = ("generate",)
+CORRECTION_NODES = ("refine",)
+
+_DONE = object()
+
+
+def _text(content: Any) -> str:
+    """Plain text of a message chunk (Gemini may return content parts)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return str(content)
+
+
+def _run(
+    graph: Any,
+    initial_state: Dict[str, Any],
+    config: Optional[Dict[str, Any]],
+    events: "queue.Queue[Any]",
+    answer_nodes: Sequence[str],
+    correction_nodes: Sequence[str],
+) -> None:
+    """Stream the graph into ``events`` (runs in the background thread)."""
+    start = time.perf_counter()
+    first_token_ms: Optional[float] = None
+    answer_ms: Optional[float] = None
+    corrections = 0
+    state = dict(initial_state)
+
+    def elapsed_ms() -> float:
+        return (time.perf_counter() - start) * 1000
+
+    try:
+        for mode, chunk in graph.stream(
+            initial_state, config, stream_mode=["messages", "updates"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                text = _text(message.content)
+                if text and metadata.get("langgraph_node") in answer_nodes:
+                    if first_token_ms is None:
+                        first_token_ms = elapsed_ms()
+                    events.put({"type": "token", "content": text})
+                continue
+
+            for node, update in chunk.items():
+                if not update:
+                    continue
+                state.update(update)
+                if node in answer_nodes and answer_ms is None:
+                    answer_ms = elapsed_ms()
+                    events.put(
+                        {
+                            "type": "answer",
+                            "content": state["generation"],
+                            "time_to_first_token_ms": first_token_ms or answer_ms,
+                            "latency_ms": answer_ms,
+                        }
+                    )
+                elif node in correction_nodes:
+                    corrections += 1
+                    events.put(
+                        {
+                            "type": "correction",
+                            "content": state["generation"],
+                            "iteration": state.get("iterations", corrections),
+                            "latency_ms": elapsed_ms(),
+                        }
+                    )
+
+        total_ms = elapsed_ms()
+        if answer_ms is None:
+            # Answered without the generate node (e.g. a clarification question)
+            answer_ms = total_ms
+            events.put(
+                {
+                    "type": "answer",
+                    "content": state.get("generation", ""),
+                    "time_to_first_token_ms": total_ms,
+                    "latency_ms": total_ms,
+                }
+            )
+        events.put(
+            {
+                "type": "final",
+                "content": state.get("generation", ""),
+                "quality_score": state.get("quality_score"),
+                "iterations": state.get("iterations", 0),
+                "latency_ms": total_ms,
+                "state": state,
+            }
+        )
+        logger.info(
+            "rag_stream_completed",
+            time_to_first_token_ms=first_token_ms or answer_ms,
+            answer_ms=answer_ms,
+            total_ms=total_ms,
+            corrections=corrections,
+        )
+    except Exception as e:
+        logger.error(
+            "rag_stream_failed",
+            error_type=type(e).__name__,
+            error_message=str(e),
+        )
+        events.put(e)
+    finally:
+        events.put(_DONE)
+
+
+def stream_graph(
+    graph: Any,
+    initial_state: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+    answer_nodes: Sequence[str] = ANSWER_NODES,
+    correction_nodes: Sequence[str] = CORRECTION_NODES,
+) -> Iterator[StreamEvent]:
+    """
+    Run a compiled graph in the background and yield its stream events.
+
+    Args:
+        graph: Compiled LangGraph graph.
+        initial_state: Graph input.
+        config: Graph config (e.g. the conversation thread).
+        answer_nodes: Nodes whose LLM tokens form the answer.
+        correction_nodes: Nodes whose updates replace the answer.
+
+    Yields:
+        token / answer / correction / final events (see module docstring).
+
+    Raises:
+        Exception: Whatever the graph raised, re-raised in the caller.
+    """
+    events: "queue.Queue[Any]" = queue.Queue()
+    threading.Thread(
+        target=_run,
+        args=(graph, initial_state, config, events, answer_nodes, correction_nodes),
+        name="rag-stream",
+        daemon=True,
+    ).start()
+
+    while True:
+        event = events.get()
+        if event is _DONE:
+            return
+        if isinstance(event, Exception):
+            raise event
+        yield event
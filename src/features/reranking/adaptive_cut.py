@@ -0,0 +1,135 @@
+"""
+Score-distribution based top-n for reranked documents.
+
+A fixed top-n (5 simple / 7 complex questions) sends the same number of
+chunks to the LLM whether one chunk clearly answers the question or ten are
+equally relevant. With ``settings.reranker_top_n_mode = "adaptive"`` the cut
+is chosen from the reranker scores, within [``reranker_adaptive_min_n``,
+min(fixed top-n, ``reranker_adaptive_max_n``)]:
+
+- gap (knee): cut after the largest drop between consecutive sorted scores,
+  if that drop is at least ``reranker_adaptive_min_gap``
+- mass: cut once the kept documents hold ``reranker_adaptive_mass`` of the
+  total score mass
+
+The smaller of the two cuts wins. Clear-cut queries then send fewer, denser
+chunks to ``generate_answer`` (fewer prompt tokens, lower LLM latency); flat
+score distributions keep the upper bound. Each cut is logged with the prompt
+tokens saved against the fixed top-n (estimated at ``CHARS_PER_TOKEN``
+characters per token).
+
+Example:
+    >>> adaptive_top_n(np.array([0.97, 0.94, 0.31, 0.22, 0.10]), max_n=5)
+    (2, 'gap')
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+# Rough characters per LLM token (Portuguese/English prose)
+CHARS_PER_TOKEN = 4
+
+
+def adaptive_enabled() -> bool:
+    """Whether the reranker picks top-n from the score distribution."""
+    return settings.reranker_top_n_mode == "adaptive"
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM prompt tokens of ``text``."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def adaptive_top_n(
+    sorted_scores: np.ndarray,
+    max_n: int,
+    min_n: Optional[int] = None,
+    min_gap: Optional[float] = None,
+    mass: Optional[float] = None,
+) -> Tuple[int, str]:
+    """
+    Choose how many of the best documents to keep.
+
+    Args:
+        sorted_scores: Reranker scores sorted in descending order.
+        max_n: Upper bound (documents the caller asked for).
+        min_n: Lower bound (settings default).
+        min_gap: Smallest score drop treated as a knee (settings default).
+        mass: Share of the score mass to keep (settings default).
+
+    Returns:
+        (documents to keep, reason): reason is "gap", "mass" or "max" (no
+        earlier cut found).
+    """
+    min_n = settings.reranker_adaptive_min_n if min_n is None else min_n
+    min_gap = settings.reranker_adaptive_min_gap if min_gap is None else min_gap
+    mass = settings.reranker_adaptive_mass if mass is None else mass
+
+    scores = np.asarray(sorted_scores, dtype=float)[:max_n]
+    upper = len(scores)
+    lower = min(min_n, upper)
+    if upper <= lower:
+        return upper, "max"
+
+    # Knee: largest drop after at least min_n documents
+    gaps = scores[lower - 1 : -1] - scores[lower:]
+    knee = int(np.argmax(gaps))
+    gap_n = lower + knee if gaps[knee] >= min_gap else upper
+
+    # Score mass (scores are sigmoid outputs, i.e. non-negative)
+    mass_n = upper
+    total = float(np.clip(scores, 0.0, None).sum())
+    if total > 0:
+        cumulative = np.cumsum(np.clip(scores, 0.0, None)) / total
+        mass_n = max(int(np.searchsorted(cumulative, mass - 1e-9)) + 1, lower)
+
+    n = min(gap_n, mass_n)
+    if n >= upper:
+        return upper, "max"
+    return n, "gap" if n == gap_n else "mass"
+
+
+def log_cut(
+    ranked_documents: Sequence[str],
+    sorted_scores: np.ndarray,
+    max_n: int,
+    chosen_n: int,
+    reason: str,
+) -> int:
+    """
+    Log the chosen cut and the prompt tokens it saves.
+
+    Args:
+        ranked_documents: Documents in score order (at least ``max_n``
+            when available).
+        sorted_scores: Their scores.
+        max_n: Documents a fixed cut would have kept.
+        chosen_n: Documents kept.
+        reason: Why the cut was chosen (gap, mass or max).
+
+    Returns:
+        Estimated prompt tokens saved.
+    """
+    dropped = ranked_documents[chosen_n:max_n]
+    tokens_saved = sum(estimate_tokens(doc) for doc in dropped)
+    kept = np.asarray(sorted_scores[:chosen_n], dtype=float)
+    logger.info(
+        "adaptive_cut_applied",
+        reason=reason,
+        max_n=min(max_n, len(ranked_documents)),
+        chosen_n=chosen_n,
+        dropped=len(dropped),
+        tokens_saved=tokens_saved,
+        kept_min_score=float(kept.min()) if len(kept) else None,
+        next_score=(
+            float(sorted_scores[chosen_n]) if chosen_n < len(sorted_scores) else None
+        ),
+    )
+    return tokens_saved
@@ -0,0 +1,183 @@
+"""
+Inference backends for the CrossEncoder reranker.
+
+The full-precision PyTorch forward pass is the largest local cost of the RAG
+pipeline on CPU-only nodes. ``settings.reranker_backend`` selects how the
+model configured in ``settings.reranker_model`` is executed:
+
+- torch: PyTorch CrossEncoder (reference scores)
+- onnx: same weights exported to ONNX and run with ONNX Runtime
+- onnx_int8: ONNX export with dynamic int8 quantization
+  (``settings.reranker_onnx_quantization`` picks the CPU instruction set)
+
+Exports are created on first use under ``settings.reranker_onnx_dir`` and
+reused afterwards. The ONNX backends need the optional ``onnx`` extra
+(``pip install .[onnx]``); without it the torch backend is used.
+
+Scores of the ONNX backends must stay within ``SCORE_TOLERANCE`` of the torch
+backend (see docs/RERANKER_BACKENDS.md and
+scripts/benchmark_reranker_backends.py).
+
+Example:
+    >>> model = load_cross_encoder("BAAI/bge-reranker-base", "onnx_int8")
+    >>> scores = model.predict([(query, doc) for doc in docs])
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+from sentence_transformers import CrossEncoder
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+BACKENDS = ("torch", "onnx", "onnx_int8")
+
+# Maximum absolute difference from torch sigmoid scores (0-1 range)
+SCORE_TOLERANCE: Dict[str, float] = {"torch": 0.0, "onnx": 1e-3, "onnx_int8": 0.05}
+
+# Minimum overlap of the top-5 documents with the torch ranking
+TOP_K_AGREEMENT_TOLERANCE: Dict[str, float] = {
+    "torch": 1.0,
+    "onnx": 1.0,
+    "onnx_int8": 0.8,
+}
+
+
+def onnx_export_dir(model_name: str) -> str:
+    """Return the directory holding the ONNX export of ``model_name``."""
+    return os.path.join(settings.reranker_onnx_dir, model_name.replace("/", "__"))
+
+
+def quantized_file_name(quantization: str) -> str:
+    """Return the file name sentence-transformers gives an int8 export."""
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def _load_onnx(model_name: str, quantization: Optional[str]) -> CrossEncoder:
+    """Load (exporting on first use) the ONNX or int8 ONNX model."""
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    export_dir = onnx_export_dir(model_name)
+    if not os.path.exists(os.path.join(export_dir, "onnx", "model.onnx")):
+        # sentence-transformers exports to ONNX when the repo has no ONNX file
+        start_time = time.time()
+        model = CrossEncoder(model_name, backend="onnx")
+        model.save_pretrained(export_dir)
+        logger.info(
+            "reranker_onnx_exported",
+            model=model_name,
+            path=export_dir,
+            export_time_ms=(time.time() - start_time) * 1000,
+        )
+
+    if quantization is None:
+        return CrossEncoder(
+            export_dir, backend="onnx", activation_fn=torch.nn.Sigmoid()
+        )
+
+    file_name = quantized_file_name(quantization)
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        start_time = time.time()
+        export_dynamic_quantized_onnx_model(
+            CrossEncoder(export_dir, backend="onnx"),
+            quantization_config=quantization,
+            model_name_or_path=export_dir,
+        )
+        logger.info(
+            "reranker_onnx_quantized",
+            model=model_name,
+            quantization=quantization,
+            path=os.path.join(export_dir, file_name),
+            export_time_ms=(time.time() - start_time) * 1000,
+        )
+
+    return CrossEncoder(
+        export_dir,
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+        activation_fn=torch.nn.Sigmoid(),
+    )
+
+
+def load_cross_encoder(model_name: str, backend: Optional[str] = None) -> CrossEncoder:
+    """
+    Load the reranker model with the requested backend.
+
+    Falls back to the torch backend (with a warning) when the ONNX
+    dependencies are not installed.
+
+    Args:
+        model_name: Hugging Face model id or local path.
+        backend: One of ``BACKENDS`` (defaults to ``settings.reranker_backend``).
+
+    Returns:
+        CrossEncoder: Model returning sigmoid (0-1) scores from ``predict``.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or settings.reranker_backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown reranker backend: {backend} (expected {BACKENDS})")
+
+    if backend != "torch":
+        try:
+            quantization = (
+                settings.reranker_onnx_quantization if backend == "onnx_int8" else None
+            )
+            return _load_onnx(model_name, quantization)
+        except ImportError as e:
+            logger.warning(
+                "reranker_backend_unavailable",
+                backend=backend,
+                error_message=str(e),
+                action="using_torch_backend",
+            )
+
+    return CrossEncoder(model_name, activation_fn=torch.nn.Sigmoid())
+
+
+def score_agreement(
+    reference: np.ndarray, candidate: np.ndarray, top_k: int = 5
+) -> Dict[str, float]:
+    """
+    Compare candidate scores against reference scores for one query.
+
+    Args:
+        reference: Scores of the reference backend (torch).
+        candidate: Scores of the backend under test, same documents.
+        top_k: Size of the top set compared.
+
+    Returns:
+        Dict with max/mean absolute difference, top-k overlap (0-1) and
+        Spearman rank correlation.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    candidate = np.asarray(candidate, dtype=np.float64)
+    diff = np.abs(reference - candidate)
+
+    k = min(top_k, len(reference))
+    top_reference = set(np.argsort(-reference)[:k].tolist())
+    top_candidate = set(np.argsort(-candidate)[:k].tolist())
+
+    # Spearman = Pearson correlation of the ranks
+    ref_ranks = np.argsort(np.argsort(reference))
+    cand_ranks = np.argsort(np.argsort(candidate))
+    if len(reference) > 1 and ref_ranks.std() > 0 and cand_ranks.std() > 0:
+        spearman = float(np.corrcoef(ref_ranks, cand_ranks)[0, 1])
+    else:
+        spearman = 1.0
+
+    return {
+        "max_abs_diff": float(diff.max()) if len(diff) else 0.0,
+        "mean_abs_diff": float(diff.mean()) if len(diff) else 0.0,
+        "top_k_overlap": len(top_reference & top_candidate) / k if k else 1.0,
+        "spearman": spearman,
+    }
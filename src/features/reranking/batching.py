@@ -0,0 +1,299 @@
+"""
+Cross-request micro-batching for the CrossEncoder reranker.
+
+Each RAG request scores only 10-15 (query, document) pairs. Under concurrent
+load that means many tiny forward passes that leave the CPU poorly utilized.
+``RerankBatcher`` sits in front of the model: concurrent callers enqueue their
+pairs, a single worker thread collects them for up to
+``settings.reranker_batch_max_wait_ms`` or until
+``settings.reranker_batch_max_pairs`` pairs are queued, runs one ``predict``
+and scatters the scores back to each caller.
+
+A request is never split across batches; a request larger than the pair
+limit runs as a batch of its own. With a wait of 0 ms the worker dispatches
+whatever is queued immediately (requests still batch while the model is
+busy with the previous batch). Models that can score several batches at once
+(``RerankerPool``) get one worker per replica.
+
+Example:
+    >>> scores = score_pairs(get_reranker(), [(query, doc) for doc in docs])
+    >>> get_batcher(get_reranker()).stats()["avg_batch_pairs"]
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+Pair = Tuple[str, str]
+
+
+class _Request:
+    """Pairs of one caller and the future its scores are delivered to."""
+
+    __slots__ = ("pairs", "future", "enqueued_at")
+
+    def __init__(self, pairs: List[Pair]) -> None:
+        self.pairs = pairs
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class RerankBatcher:
+    """
+    Batching scheduler in front of a model exposing ``predict(pairs)``.
+
+    Features:
+    - Collects pairs from concurrent callers (max wait / max pairs)
+    - One ``predict`` per batch, scores scattered back per caller
+    - Model errors are delivered to every caller of the failed batch
+    - One worker per replica for models exposing ``concurrency``
+    - Queue-depth and batch-size metrics via ``stats()``
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_batch_pairs: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Start the batching workers for ``model``.
+
+        Args:
+            model: Object with ``predict(pairs, batch_size=...)`` (CrossEncoder).
+            max_batch_pairs: Pairs per batch (settings default).
+            max_wait_ms: Longest wait for more pairs (settings default).
+            workers: Batches scored at once (``model.concurrency`` or 1).
+        """
+        self.model = model
+        self.max_batch_pairs = (
+            settings.reranker_batch_max_pairs
+            if max_batch_pairs is None
+            else max_batch_pairs
+        )
+        self.max_wait_s = (
+            settings.reranker_batch_max_wait_ms if max_wait_ms is None else max_wait_ms
+        ) / 1000
+
+        self._queue: Deque[_Request] = deque()
+        self._queued_pairs = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Metrics
+        self._requests = 0
+        self._batches = 0
+        self._pairs = 0
+        self._largest_batch = 0
+        self._max_queue_depth = 0
+        self._total_wait_s = 0.0
+        self._total_predict_s = 0.0
+
+        concurrency = getattr(model, "concurrency", 1)
+        self.workers = workers or (concurrency if isinstance(concurrency, int) else 1)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"rerank-batcher-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def predict(self, pairs: Sequence[Pair]) -> np.ndarray:
+        """
+        Score pairs as part of the next batch (blocks until scored).
+
+        Args:
+            pairs: (query, document) pairs of one caller.
+
+        Returns:
+            np.ndarray: One score per pair, in input order.
+
+        Raises:
+            RuntimeError: If the batcher was closed.
+            Exception: Whatever the model raised for the batch.
+        """
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+
+        request = _Request(list(pairs))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Rerank batcher is closed")
+            self._queue.append(request)
+            self._queued_pairs += len(request.pairs)
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify()
+        return request.future.result()
+
+    def _next_batch(self) -> List[_Request]:
+        """Wait for requests, then collect until the pair or time limit."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+
+            deadline = self._queue[0].enqueued_at + self.max_wait_s
+            while self._queued_pairs < self.max_batch_pairs and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch: List[_Request] = []
+            batch_pairs = 0
+            while self._queue and (
+                not batch
+                or batch_pairs + len(self._queue[0].pairs) <= self.max_batch_pairs
+            ):
+                request = self._queue.popleft()
+                batch.append(request)
+                batch_pairs += len(request.pairs)
+            self._queued_pairs -= batch_pairs
+            return batch
+
+    def _run(self) -> None:
+        """Worker loop: one ``predict`` per collected batch."""
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            self._execute(batch)
+
+    def _execute(self, batch: List[_Request]) -> None:
+        """Score one batch and deliver results (or the error) to its callers."""
+        pairs = [pair for request in batch for pair in request.pairs]
+        started = time.monotonic()
+        try:
+            scores = np.asarray(self.model.predict(pairs, batch_size=len(pairs)))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        predict_s = time.monotonic() - started
+
+        offset = 0
+        for request in batch:
+            size = len(request.pairs)
+            request.future.set_result(scores[offset : offset + size])
+            offset += size
+
+        with self._cond:
+            queue_depth = len(self._queue)
+            self._batches += 1
+            self._pairs += len(pairs)
+            self._largest_batch = max(self._largest_batch, len(pairs))
+            self._total_wait_s += sum(started - r.enqueued_at for r in batch)
+            self._total_predict_s += predict_s
+
+        logger.debug(
+            "rerank_batch_completed",
+            batch_pairs=len(pairs),
+            batch_requests=len(batch),
+            queue_depth=queue_depth,
+            predict_time_ms=predict_s * 1000,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return batching metrics.
+
+        Returns:
+            Dict with queue depth, batch sizes, wait and predict times.
+        """
+        with self._cond:
+            batches = self._batches or 1
+            return {
+                "queue_depth": len(self._queue),
+                "queued_pairs": self._queued_pairs,
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "pairs": self._pairs,
+                "avg_batch_pairs": self._pairs / batches,
+                "avg_batch_requests": self._requests / batches,
+                "largest_batch_pairs": self._largest_batch,
+                "avg_wait_ms": self._total_wait_s / max(self._requests, 1) * 1000,
+                "avg_predict_ms": self._total_predict_s / batches * 1000,
+            }
+
+    def close(self) -> None:
+        """Stop accepting requests; queued requests are still scored."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+
+
+# Process-wide batcher for the loaded reranker model
+_batcher: Optional[RerankBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher(model: Any) -> RerankBatcher:
+    """
+    Get the shared batcher for ``model`` (a new model replaces the batcher).
+
+    Args:
+        model: Loaded reranker model.
+
+    Returns:
+        RerankBatcher: Batcher scoring with ``model``.
+    """
+    global _batcher
+
+    batcher = _batcher
+    if batcher is not None and batcher.model is model:
+        return batcher
+
+    with _batcher_lock:
+        if _batcher is None or _batcher.model is not model:
+            if _batcher is not None:
+                _batcher.close()
+            _batcher = RerankBatcher(model)
+        return _batcher
+
+
+def score_pairs(model: Any, pairs: Sequence[Pair]) -> np.ndarray:
+    """
+    Score (query, document) pairs, batched across requests when enabled.
+
+    Args:
+        model: Loaded reranker model.
+        pairs: Pairs of the current request.
+
+    Returns:
+        np.ndarray: One score per pair.
+    """
+    if not settings.reranker_batching_enabled:
+        return model.predict(pairs)
+    return get_batcher(model).predict(pairs)
+
+
+def reset_batcher() -> None:
+    """
+    Stop and drop the shared batcher (useful for testing or config changes).
+
+    Example:
+        >>> reset_batcher()  # Next score_pairs() starts a fresh batcher
+    """
+    global _batcher
+
+    with _batcher_lock:
+        if _batcher is not None:
+            _batcher.close()
+        _batcher = None
+    logger.debug("rerank_batcher_reset", action="will_restart_on_next_use")
@@ -0,0 +1,192 @@
+"""
+Two-stage cascade reranking: a cheap prefilter in front of the cross-encoder.
+
+Cross-encoder cost grows linearly with the candidates scored, so retrieving
+50-100 chunks for recall would make reranking 5-10x slower. With
+``settings.reranker_cascade_enabled`` retrieval fetches
+``settings.reranker_cascade_candidates`` chunks and a cheap first stage
+keeps the best ``settings.reranker_cascade_keep`` (M) of them; only those M
+reach the cross-encoder.
+
+First stages (``settings.reranker_cascade_stage``):
+- lexical: BM25 of the question terms over the candidate set (pure Python,
+  well under a millisecond for 100 chunks)
+- dense: bi-encoder cosine between the question and chunk embeddings; chunk
+  vectors are read back from the loaded FAISS index (no embedding call), the
+  question embedding comes from the embedding cache filled at retrieval.
+  Without vectors (chunks not in the index, IVF indexes without a direct
+  map) the lexical stage is used
+
+Both stages log their latency. Recall of the prefilter (share of the
+full-rerank top-n it kept) is measured on a sample of requests
+(``settings.reranker_cascade_audit_rate``) by also scoring every candidate;
+``scripts/benchmark_reranker_cascade.py`` reports it offline.
+
+Example:
+    >>> kept = prefilter("O que é XOR?", documents, keep=15)
+    >>> candidates = [documents[i] for i in kept]
+"""
+
+import math
+import random
+from collections import Counter
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.chunk_store import lexical_terms, query_terms
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+# BM25 parameters (same defaults as SQLite FTS5)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def lexical_scores(query: str, documents: Sequence[str]) -> np.ndarray:
+    """
+    BM25 scores of the question terms, with IDF taken over ``documents``.
+
+    Args:
+        query: Search query.
+        documents: Candidate texts.
+
+    Returns:
+        np.ndarray: One score per document (0 without shared terms).
+    """
+    terms = query_terms(query)
+    doc_terms = [Counter(lexical_terms(doc)) for doc in documents]
+    lengths = np.array([sum(counts.values()) for counts in doc_terms], dtype=float)
+    avg_length = float(lengths.mean()) if len(lengths) and lengths.any() else 1.0
+
+    scores = np.zeros(len(documents))
+    for term in terms:
+        tf = np.array([counts.get(term, 0) for counts in doc_terms], dtype=float)
+        df = int(np.count_nonzero(tf))
+        if not df:
+            continue
+        idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths / avg_length)
+        scores += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+    return scores
+
+
+def dense_scores(
+    query: str, vectors: np.ndarray, embeddings: Optional[Any] = None
+) -> np.ndarray:
+    """
+    Cosine similarity between the question embedding and chunk vectors.
+
+    Args:
+        query: Search query.
+        vectors: Candidate vectors (one row per candidate), e.g. from
+            ``retrieval.document_vectors``.
+        embeddings: Embeddings object (defaults to the shared cached one).
+
+    Returns:
+        np.ndarray: One cosine similarity per candidate.
+    """
+    if embeddings is None:
+        from src.infrastructure.external.embedding_cache import get_embeddings
+
+        embeddings = get_embeddings()
+    query_vector = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+    doc_vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(query_vector)
+    return doc_vectors @ query_vector / np.maximum(norms, 1e-12)
+
+
+def cascade_enabled(num_documents: int) -> bool:
+    """Whether a request with ``num_documents`` candidates is prefiltered."""
+    return (
+        settings.reranker_cascade_enabled
+        and num_documents > settings.reranker_cascade_keep
+    )
+
+
+def prefilter(
+    query: str,
+    documents: Sequence[str],
+    keep: Optional[int] = None,
+    stage: Optional[str] = None,
+    vectors: Optional[np.ndarray] = None,
+) -> List[int]:
+    """
+    First cascade stage: indices of the ``keep`` best candidates.
+
+    Ties keep the retrieval order, so candidates without any signal from the
+    cheap stage are kept by rank. If the dense stage has no candidate
+    vectors or fails (embedding API error on the question) the lexical stage
+    is used instead.
+
+    Args:
+        query: Search query.
+        documents: Candidate texts, in retrieval order.
+        keep: Candidates passed on to the cross-encoder (M, settings default).
+        stage: lexical or dense (defaults to ``settings.reranker_cascade_stage``).
+        vectors: Candidate vectors for the dense stage, one row per document.
+
+    Returns:
+        Indices into ``documents``, best first.
+
+    Raises:
+        ValueError: If ``stage`` is unknown.
+    """
+    keep = settings.reranker_cascade_keep if keep is None else keep
+    stage = stage or settings.reranker_cascade_stage
+    if stage not in ("lexical", "dense"):
+        raise ValueError(f"Unknown cascade stage: {stage!r}")
+    if len(documents) <= keep:
+        return list(range(len(documents)))
+
+    if stage == "dense" and (vectors is None or len(vectors) != len(documents)):
+        logger.warning(
+            "cascade_vectors_unavailable",
+            candidates=len(documents),
+            action="using_lexical_stage",
+        )
+        stage = "lexical"
+
+    if stage == "dense":
+        try:
+            scores = dense_scores(query, vectors)
+        except Exception as e:
+            logger.warning(
+                "cascade_dense_stage_failed",
+                error_type=type(e).__name__,
+                error_message=str(e),
+                action="using_lexical_stage",
+            )
+            scores = lexical_scores(query, documents)
+    else:
+        scores = lexical_scores(query, documents)
+    # Stable sort on the negated scores: ties stay in retrieval order
+    order = np.argsort(-scores, kind="stable")
+    return [int(i) for i in order[:keep]]
+
+
+def top_n_recall(full_scores: np.ndarray, kept: Sequence[int], top_n: int) -> float:
+    """
+    Share of the full-rerank top-n that survived the prefilter.
+
+    Args:
+        full_scores: Cross-encoder scores of every candidate.
+        kept: Indices kept by the first stage.
+        top_n: Documents the reranker returns.
+
+    Returns:
+        Recall in [0, 1].
+    """
+    top = np.argsort(-np.asarray(full_scores), kind="stable")[:top_n]
+    if not len(top):
+        return 1.0
+    return len(set(top.tolist()) & set(kept)) / len(top)
+
+
+def should_audit() -> bool:
+    """Whether this request also scores every candidate to measure recall."""
+    rate = settings.reranker_cascade_audit_rate
+    return rate > 0 and random.random() < rate
@@ -0,0 +1,279 @@
+"""
+Pool of reranker replicas for multi-core serving.
+
+A single CrossEncoder shared by all request threads runs one forward pass at
+a time per caller, and concurrent passes fight over torch's intra-op thread
+pool. ``RerankerPool`` holds N replicas of the loaded model instead; each
+caller checks one out from a ``queue.SimpleQueue`` (no Python-level lock on
+the checkout path), scores its pairs and hands it back. Every replica runs
+with a fixed torch thread budget so N replicas x budget matches the cores.
+
+Sizing (``settings.reranker_pool_size`` / ``settings.reranker_pool_threads``):
+- threads per replica: ``reranker_pool_threads``
+- replicas: ``reranker_pool_size`` (default 1), or usable CPU cores / threads
+  per replica when 0 (at least 1)
+
+With one replica (the default) the model is used directly and torch keeps
+its own thread count. Every replica is a full copy of the model, so size the
+pool explicitly and benchmark it (``scripts/benchmark_reranker_pool.py``)
+before enabling it. A configured pool is built by the reranker warm-up at
+startup, which also sets torch's process-wide thread count, so no request
+thread pays for the copies. The cross-request batcher runs one worker per
+replica, so batches are scored concurrently.
+
+Example:
+    >>> pool = get_reranker_pool(get_reranker())
+    >>> scores = pool.predict([(query, doc) for doc in docs])
+    >>> pool.stats()["avg_checkout_wait_ms"]
+"""
+
+import copy
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.features.reranking.backends import load_cross_encoder
+from src.features.reranking.pretokenized import (
+    PretokenizedScorer,
+    get_pretokenized_scorer,
+)
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+Pair = Tuple[str, str]
+
+
+def usable_cpus() -> int:
+    """CPU cores this process may run on (affinity-aware)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def pool_dimensions(
+    size: Optional[int] = None, threads: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Resolve the number of replicas and torch threads per replica.
+
+    Args:
+        size: Replicas (settings default, 0 = CPU cores / threads per replica).
+        threads: Torch threads per replica (settings default).
+
+    Returns:
+        (replicas, threads per replica).
+    """
+    threads = settings.reranker_pool_threads if threads is None else threads
+    size = settings.reranker_pool_size if size is None else size
+    if size <= 0:
+        size = max(1, usable_cpus() // threads)
+    return size, threads
+
+
+def replicate(model: Any) -> Any:
+    """
+    Create an independent copy of a loaded CrossEncoder.
+
+    Torch models are deep-copied (no disk load); other backends reload the
+    configured model (inference sessions cannot be copied).
+
+    Args:
+        model: Loaded CrossEncoder.
+
+    Returns:
+        A new CrossEncoder with its own weights and tokenizer.
+    """
+    get_backend = getattr(model, "get_backend", None)
+    if get_backend is None or get_backend() == "torch":
+        return copy.deepcopy(model)
+    return load_cross_encoder(settings.reranker_model, settings.reranker_backend)
+
+
+class RerankerPool:
+    """
+    ``predict``-compatible pool of model replicas.
+
+    Features:
+    - One caller per replica at a time (checkout through a SimpleQueue)
+    - Callers block only while every replica is busy
+    - ``concurrency`` tells the batcher how many batches can run at once
+    - Checkout and busy-time metrics via ``stats()``
+    """
+
+    def __init__(self, replicas: Sequence[Any], threads: int) -> None:
+        """
+        Create a pool over already built replicas.
+
+        Args:
+            replicas: Objects with ``predict(pairs, batch_size=...)``.
+            threads: Torch threads each replica runs with.
+        """
+        if not replicas:
+            raise ValueError("Reranker pool needs at least one replica")
+        self.replicas = list(replicas)
+        self.size = len(self.replicas)
+        self.concurrency = self.size
+        self.threads = threads
+        self._idle: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        for replica in self.replicas:
+            self._idle.put(replica)
+
+        # Metrics (updated after the replica is handed back)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._waited = 0
+        self._total_wait_s = 0.0
+        self._total_busy_s = 0.0
+
+    def predict(self, pairs: Sequence[Pair], batch_size: int = 32) -> np.ndarray:
+        """
+        Score pairs on the next idle replica (blocks while all are busy).
+
+        Args:
+            pairs: (query, document) pairs.
+            batch_size: Forward batch size passed to the replica.
+
+        Returns:
+            np.ndarray: One score per pair, in input order.
+        """
+        started = time.monotonic()
+        try:
+            replica = self._idle.get_nowait()
+            waited = False
+        except queue.Empty:
+            replica = self._idle.get()
+            waited = True
+        checked_out = time.monotonic()
+        try:
+            return replica.predict(pairs, batch_size=batch_size)
+        finally:
+            self._idle.put(replica)
+            busy_s = time.monotonic() - checked_out
+            with self._stats_lock:
+                self._checkouts += 1
+                self._waited += waited
+                self._total_wait_s += checked_out - started
+                self._total_busy_s += busy_s
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool metrics.
+
+        Returns:
+            Dict with size, threads, checkouts, share of checkouts that had
+            to wait, and average wait and busy times.
+        """
+        with self._stats_lock:
+            checkouts = max(self._checkouts, 1)
+            return {
+                "size": self.size,
+                "threads_per_replica": self.threads,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waited_ratio": self._waited / checkouts,
+                "avg_checkout_wait_ms": self._total_wait_s / checkouts * 1000,
+                "avg_busy_ms": self._total_busy_s / checkouts * 1000,
+            }
+
+
+def build_reranker_pool(
+    model: Any, size: Optional[int] = None, threads: Optional[int] = None
+) -> RerankerPool:
+    """
+    Build a pool of ``model`` and its replicas, scoring from stored doc tokens.
+
+    Sets torch's intra-op thread count to the per-replica budget (the setting
+    is process-wide; every replica runs with the same budget), so it runs at
+    startup from the reranker warm-up rather than on a request thread.
+
+    Args:
+        model: Loaded CrossEncoder (becomes the first replica).
+        size: Replicas (settings default, 0 = sized from CPU count).
+        threads: Torch threads per replica (settings default).
+
+    Returns:
+        RerankerPool: Pool of ``size`` replicas.
+    """
+    import torch
+
+    size, threads = pool_dimensions(size, threads)
+    start_time = time.time()
+    torch.set_num_threads(threads)
+
+    first = get_pretokenized_scorer(model)
+    replicas: List[Any] = [first]
+    for _ in range(size - 1):
+        replica = replicate(model)
+        # Same model as the first replica: wrap it the same way
+        if isinstance(first, PretokenizedScorer):
+            replica = PretokenizedScorer(replica)
+        replicas.append(replica)
+
+    logger.info(
+        "reranker_pool_built",
+        replicas=size,
+        threads_per_replica=threads,
+        cpus=usable_cpus(),
+        build_time_ms=(time.time() - start_time) * 1000,
+    )
+    return RerankerPool(replicas, threads)
+
+
+# Process-wide pool for the loaded reranker model
+_pool: Optional[RerankerPool] = None
+_pool_model: Any = None
+_pool_lock = threading.Lock()
+
+
+def get_reranker_pool(model: Any) -> Any:
+    """
+    Get the shared pool of ``model`` (a new model replaces the pool).
+
+    Returns the (pretokenized) model itself when the pool has one replica or
+    the model is not a CrossEncoder (e.g. test doubles).
+
+    Args:
+        model: Loaded reranker model.
+
+    Returns:
+        Object with ``predict(pairs, batch_size=...)``.
+    """
+    global _pool, _pool_model
+
+    from sentence_transformers import CrossEncoder
+
+    if not isinstance(model, CrossEncoder) or pool_dimensions()[0] <= 1:
+        return get_pretokenized_scorer(model)
+
+    pool = _pool
+    if pool is not None and _pool_model is model:
+        return pool
+
+    with _pool_lock:
+        if _pool is None or _pool_model is not model:
+            _pool = build_reranker_pool(model)
+            _pool_model = model
+        return _pool
+
+
+def reset_reranker_pool() -> None:
+    """
+    Drop the shared pool (useful for testing or config changes).
+
+    Example:
+        >>> reset_reranker_pool()  # Next call replicates the current model
+    """
+    global _pool, _pool_model
+
+    with _pool_lock:
+        _pool = None
+        _pool_model = None
+    logger.debug("reranker_pool_reset", action="will_rebuild_on_next_use")
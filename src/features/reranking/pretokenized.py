@@ -0,0 +1,451 @@
+"""
+Doc-side tokenization precomputed at ingest for the CrossEncoder reranker.
+
+Chunk texts never change after ingestion, yet every rerank call tokenized the
+full text of every retrieved chunk again. Ingestion now stores each chunk's
+reranker token ids (no special tokens, truncated to the longest document part
+a (query, document) input can hold) in the chunk store, keyed by
+(tokenizer, chunk text hash). ``PretokenizedScorer`` then:
+
+1. tokenizes each distinct query once
+2. looks up the document ids by text hash (chunks without stored ids are
+   tokenized on the fly)
+3. assembles ``[CLS] query [SEP] document [SEP]``-style inputs with the
+   tokenizer's own special-token layout
+4. sorts the pairs by length so each forward batch pads as little as possible
+5. runs the model and returns the scores in input order
+
+Results match ``CrossEncoder.predict`` (which truncates longest-first: with
+a query shorter than half the budget only the document is cut). Requests
+with longer queries use ``predict`` directly.
+
+Each call logs ``rerank_inputs_prepared`` with the tokenization time saved,
+estimated from the measured cost per character of on-the-fly tokenization.
+
+Example:
+    >>> precompute_doc_tokens("banco_faiss")  # at the end of ingestion
+    >>> scorer = get_pretokenized_scorer(get_reranker())
+    >>> scores = scorer.predict([(query, doc) for doc in docs])
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.chunk_store import (
+    CHUNK_STORE_FILE,
+    ChunkStore,
+    content_hash,
+)
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from transformers import PreTrainedTokenizerBase
+
+# Module logger
+logger = get_logger(__name__)
+
+Pair = Tuple[str, str]
+
+# Texts per tokenizer call when precomputing at ingest
+_TOKENIZE_BATCH = 256
+
+# Largest forward pass: length-sorted pairs are split so that short inputs
+# are not padded to the longest input of a large (cross-request) batch
+FORWARD_BATCH_PAIRS = 32
+
+
+def tokenizer_id(model_name: str, max_length: int) -> str:
+    """Identity of the token ids stored for a reranker model."""
+    return f"{model_name}@{max_length}"
+
+
+def doc_token_budget(tokenizer: "PreTrainedTokenizerBase", max_length: int) -> int:
+    """Tokens left for query + document once special tokens are added."""
+    return max_length - tokenizer.num_special_tokens_to_add(pair=True)
+
+
+def _model_max_length(tokenizer: "PreTrainedTokenizerBase") -> int:
+    """Maximum input length used by CrossEncoder for ``tokenizer``."""
+    # Tokenizers without a limit report a huge sentinel value
+    return min(tokenizer.model_max_length, 8192)
+
+
+def tokenize_documents(
+    tokenizer: "PreTrainedTokenizerBase", texts: List[str], budget: int
+) -> List[List[int]]:
+    """Token ids of document texts (no special tokens, cut to ``budget``)."""
+    ids: List[List[int]] = []
+    for start in range(0, len(texts), _TOKENIZE_BATCH):
+        encoded = tokenizer(
+            texts[start : start + _TOKENIZE_BATCH],
+            add_special_tokens=False,
+            truncation=True,
+            max_length=budget,
+        )
+        ids.extend(encoded["input_ids"])
+    return ids
+
+
+def precompute_doc_tokens(
+    db_path: str, tokenizer: Optional["PreTrainedTokenizerBase"] = None
+) -> int:
+    """
+    Store reranker token ids for chunks of an index that have none yet.
+
+    Token ids of chunk texts no longer in the store are removed. Failures
+    (e.g. the tokenizer cannot be downloaded) are logged and leave the
+    reranker tokenizing on the fly.
+
+    Args:
+        db_path: Index directory containing ``chunks.sqlite``.
+        tokenizer: Reranker tokenizer (loaded from ``settings.reranker_model``
+            when omitted).
+
+    Returns:
+        int: Number of chunks tokenized.
+    """
+    if not settings.reranker_pretokenize_enabled:
+        return 0
+
+    start_time = time.time()
+    try:
+        if tokenizer is None:
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(settings.reranker_model)
+        max_length = _model_max_length(tokenizer)
+        name = tokenizer_id(settings.reranker_model, max_length)
+        budget = doc_token_budget(tokenizer, max_length)
+
+        store = ChunkStore(os.path.join(db_path, CHUNK_STORE_FILE), read_only=False)
+        try:
+            stored = store.doc_token_hashes(name)
+            current = set()
+            missing: Dict[str, str] = {}
+            for text in store.iter_contents():
+                key = content_hash(text)
+                current.add(key)
+                if key not in stored:
+                    missing[key] = text
+
+            if missing:
+                ids = tokenize_documents(tokenizer, list(missing.values()), budget)
+                store.put_doc_tokens(name, dict(zip(missing, ids)))
+            store.delete_doc_tokens(name, stored - current)
+        finally:
+            store.close()
+    except Exception as e:
+        logger.warning(
+            "doc_tokens_precompute_failed",
+            path=db_path,
+            error_type=type(e).__name__,
+            error_message=str(e),
+            action="tokenize_at_query_time",
+        )
+        return 0
+
+    logger.info(
+        "doc_tokens_precomputed",
+        path=db_path,
+        tokenizer=name,
+        tokenized=len(missing),
+        removed=len(stored - current),
+        total=len(current),
+        time_ms=(time.time() - start_time) * 1000,
+    )
+    return len(missing)
+
+
+class PairTemplate:
+    """
+    Special-token layout of a (query, document) input for one tokenizer.
+
+    Derived by encoding a probe pair, so it works for any tokenizer
+    (``[CLS] A [SEP] B [SEP]``, ``<s> A </s></s> B </s>``, ...).
+    """
+
+    def __init__(self, tokenizer: "PreTrainedTokenizerBase") -> None:
+        """
+        Probe ``tokenizer`` for its pair layout.
+
+        Raises:
+            ValueError: If the probe does not split into two text segments.
+        """
+        encoded = tokenizer(
+            "a",
+            "b",
+            return_special_tokens_mask=True,
+            return_token_type_ids=True,
+        )
+        ids = encoded["input_ids"]
+        types = encoded["token_type_ids"]
+        special = encoded["special_tokens_mask"]
+
+        # Specials before, between and after the two text segments
+        parts: List[List[int]] = [[]]
+        part_types: List[List[int]] = [[]]
+        segment_types: List[int] = []
+        for token, token_type, is_special in zip(ids, types, special):
+            if is_special:
+                if len(parts) == len(segment_types):
+                    parts.append([])
+                    part_types.append([])
+                parts[-1].append(token)
+                part_types[-1].append(token_type)
+            elif len(segment_types) < len(parts):
+                segment_types.append(token_type)
+        if len(segment_types) != 2:
+            raise ValueError("Tokenizer pair layout has no two text segments")
+        while len(parts) < 3:
+            parts.append([])
+            part_types.append([])
+
+        self.prefix, self.middle, self.suffix = parts
+        self.prefix_types, self.middle_types, self.suffix_types = part_types
+        self.query_type, self.doc_type = segment_types
+
+    def build(self, query_ids: List[int], doc_ids: List[int]) -> Dict[str, List[int]]:
+        """Input ids and token type ids of one pair."""
+        return {
+            "input_ids": self.prefix + query_ids + self.middle + doc_ids + self.suffix,
+            "token_type_ids": self.prefix_types
+            + [self.query_type] * len(query_ids)
+            + self.middle_types
+            + [self.doc_type] * len(doc_ids)
+            + self.suffix_types,
+        }
+
+
+class _TokenStore:
+    """Read-only chunk store of the serving index, reopened when replaced."""
+
+    def __init__(self, db_path: str) -> None:
+        self.path = os.path.join(db_path, CHUNK_STORE_FILE)
+        self._store: Optional[ChunkStore] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def get(self, tokenizer: str, hashes: Sequence[str]) -> Dict[str, List[int]]:
+        """Token ids of the given text hashes (empty if there is no store)."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return {}
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if signature != self._signature:
+                # Ingestion renames a new file into place: open the new one
+                self._store = ChunkStore(self.path)
+                self._signature = signature
+            store = self._store
+        return store.get_doc_tokens(tokenizer, hashes)
+
+
+class PretokenizedScorer:
+    """
+    ``predict``-compatible wrapper scoring pairs from precomputed doc tokens.
+
+    Features:
+    - Document token ids read from the chunk store (tokenized on a miss)
+    - Query tokenized once per call
+    - Pairs sorted by length to minimize padding per forward batch
+    - Tokenization time saved reported per call
+    """
+
+    def __init__(self, model: Any, db_path: Optional[str] = None) -> None:
+        """
+        Wrap a loaded CrossEncoder.
+
+        Args:
+            model: CrossEncoder with ``tokenizer`` and a transformers model.
+            db_path: Index directory (defaults to ``settings.vectorstore_path``).
+        """
+        self.model = model
+        self.tokenizer = model.tokenizer
+        self.max_length = model.max_length or _model_max_length(self.tokenizer)
+        self.budget = doc_token_budget(self.tokenizer, self.max_length)
+        self.name = tokenizer_id(settings.reranker_model, self.max_length)
+        self._token_store = _TokenStore(db_path or settings.vectorstore_path)
+        self._transformer = getattr(model, "transformers_model", None) or model.model
+        self._activation = getattr(model, "activation_fn", None)
+        self._template = PairTemplate(self.tokenizer)
+        self._with_token_types = "token_type_ids" in self.tokenizer.model_input_names
+
+        # Cost of on-the-fly document tokenization (for the time-saved estimate)
+        self._tokenized_chars = 0
+        self._tokenize_s = 0.0
+
+    def _tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize documents on the fly, recording the cost per character."""
+        start = time.perf_counter()
+        ids = tokenize_documents(self.tokenizer, texts, self.budget)
+        self._tokenize_s += time.perf_counter() - start
+        self._tokenized_chars += sum(len(text) for text in texts)
+        return ids
+
+    def _doc_ids(self, documents: List[str]) -> Tuple[Dict[str, List[int]], Set[str]]:
+        """Token ids per distinct document text, and the texts found stored."""
+        hashes = {doc: content_hash(doc) for doc in documents}
+        stored = self._token_store.get(self.name, list(set(hashes.values())))
+        ids = {doc: stored[key] for doc, key in hashes.items() if key in stored}
+        reused = set(ids)
+
+        missing = [doc for doc in hashes if doc not in ids]
+        if missing:
+            ids.update(zip(missing, self._tokenize(missing)))
+        elif not self._tokenized_chars:
+            # Calibrate the per-character cost once for the time-saved estimate
+            self._tokenize(list(ids)[:32])
+        return ids, reused
+
+    def _assemble(self, query_ids: List[int], doc_ids: List[int]) -> Dict[str, Any]:
+        """Model input of one pair, truncating the document like ``predict``."""
+        features = self._template.build(
+            query_ids, doc_ids[: self.budget - len(query_ids)]
+        )
+        if not self._with_token_types:
+            del features["token_type_ids"]
+        return features
+
+    def _forward(self, inputs: List[Dict[str, Any]]) -> np.ndarray:
+        """Pad one batch and score it."""
+        import torch
+
+        features = self.tokenizer.pad(inputs, return_tensors="pt")
+        device = getattr(self._transformer, "device", None)
+        if device is not None:
+            features = {key: value.to(device) for key, value in features.items()}
+        with torch.inference_mode():
+            logits = self._transformer(**features).logits
+            if self._activation is not None:
+                logits = self._activation(logits)
+        scores = logits.float().cpu().numpy()
+        return scores[:, 0] if scores.ndim > 1 and scores.shape[1] == 1 else scores
+
+    def predict(self, pairs: Sequence[Pair], batch_size: int = 32) -> np.ndarray:
+        """
+        Score (query, document) pairs.
+
+        Args:
+            pairs: Pairs to score (may mix several queries).
+            batch_size: Pairs per forward pass (capped at
+                ``FORWARD_BATCH_PAIRS``).
+
+        Returns:
+            np.ndarray: One score per pair, in input order.
+        """
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+
+        start = time.perf_counter()
+        queries = {
+            query: self.tokenizer(query, add_special_tokens=False)["input_ids"]
+            for query in dict.fromkeys(query for query, _ in pairs)
+        }
+        if any(len(ids) > self.budget // 2 for ids in queries.values()):
+            # Long queries get truncated too: keep predict's exact behavior
+            return self.model.predict(list(pairs), batch_size=batch_size)
+
+        doc_ids, reused = self._doc_ids([doc for _, doc in pairs])
+        inputs = [self._assemble(queries[q], doc_ids[d]) for q, d in pairs]
+        lengths = np.array([len(features["input_ids"]) for features in inputs])
+        order = np.argsort(lengths, kind="stable")
+        prepare_ms = (time.perf_counter() - start) * 1000
+
+        batch_size = min(batch_size, FORWARD_BATCH_PAIRS)
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for offset in range(0, len(order), batch_size):
+            batch = order[offset : offset + batch_size]
+            scores[batch] = self._forward([inputs[i] for i in batch])
+
+        reused_chars = sum(len(doc) for _, doc in pairs if doc in reused)
+        cost_per_char = self._tokenize_s / max(self._tokenized_chars, 1)
+        logger.debug(
+            "rerank_inputs_prepared",
+            pairs=len(pairs),
+            pretokenized_docs=sum(1 for _, doc in pairs if doc in reused),
+            prepare_ms=prepare_ms,
+            tokenize_saved_ms=reused_chars * cost_per_char * 1000,
+            padding_tokens=padding_tokens(lengths[order], batch_size),
+            padding_tokens_unsorted=padding_tokens(lengths, batch_size),
+            total_ms=(time.perf_counter() - start) * 1000,
+        )
+        return scores
+
+
+def padding_tokens(lengths: np.ndarray, batch_size: int) -> int:
+    """Pad tokens needed to batch inputs of ``lengths`` in the given order."""
+    total = 0
+    for offset in range(0, len(lengths), batch_size):
+        batch = lengths[offset : offset + batch_size]
+        total += int(batch.max() * len(batch) - batch.sum())
+    return total
+
+
+# Process-wide scorer for the loaded reranker model
+_scorer: Optional[PretokenizedScorer] = None
+# Model whose tokenizer layout could not be probed (scored with predict)
+_unsupported_model: Any = None
+_scorer_lock = threading.Lock()
+
+
+def get_pretokenized_scorer(model: Any) -> Any:
+    """
+    Get the shared pretokenized scorer of ``model``.
+
+    Returns ``model`` itself when pre-tokenization is disabled or the model
+    has no Hugging Face tokenizer (e.g. test doubles).
+
+    Args:
+        model: Loaded reranker model.
+
+    Returns:
+        Object with ``predict(pairs, batch_size=...)``.
+    """
+    global _scorer, _unsupported_model
+
+    from transformers import PreTrainedTokenizerBase
+
+    if not settings.reranker_pretokenize_enabled or not isinstance(
+        getattr(model, "tokenizer", None), PreTrainedTokenizerBase
+    ):
+        return model
+    scorer = _scorer
+    if scorer is not None and scorer.model is model:
+        return scorer
+    if _unsupported_model is model:
+        return model
+
+    with _scorer_lock:
+        if _scorer is None or _scorer.model is not model:
+            try:
+                _scorer = PretokenizedScorer(model)
+            except ValueError as e:
+                _unsupported_model = model
+                logger.warning(
+                    "pretokenized_scorer_unavailable",
+                    error_message=str(e),
+                    action="using_model_predict",
+                )
+                return model
+        return _scorer
+
+
+def reset_pretokenized_scorer() -> None:
+    """
+    Drop the shared scorer (useful for testing or config changes).
+
+    Example:
+        >>> reset_pretokenized_scorer()  # Next call wraps the current model
+    """
+    global _scorer, _unsupported_model
+
+    with _scorer_lock:
+        _scorer = None
+        _unsupported_model = None
+    logger.debug("pretokenized_scorer_reset", action="will_restart_on_next_use")
@@ -11,6 +11,7 @@ Example:
     >>> reranked = rerank_documents(query="What is AI?", documents=docs, top_n=5)
 """
 
+import threading
 import time
 
 from typing import List
@@ -19,23 +20,45 @@ from typing import Tuple
 
 import langsmith
 import numpy as np
-import torch
 
 from langchain_core.documents import Document
 from langsmith import traceable
 from sentence_transformers import CrossEncoder
 from structlog.contextvars import bind_contextvars
 
+from src.features.reranking.adaptive_cut import (
+    adaptive_enabled,
+    adaptive_top_n,
+    log_cut,
+)
+from src.features.reranking.backends import load_cross_encoder
+from src.features.reranking.batching import reset_batcher
+from src.features.reranking.cascade import (
+    cascade_enabled,
+    prefilter,
+    should_audit,
+    top_n_recall,
+)
+from src.features.reranking.pool import get_reranker_pool, reset_reranker_pool
+from src.features.reranking.pretokenized import reset_pretokenized_scorer
+from src.features.reranking.score_cache import reset_score_cache, score_documents
+from src.features.reranking.warmup import (
+    reranker_readiness,
+    reset_warmup,
+    wait_for_reranker,
+    warmup_started,
+)
 from src.infrastructure.config.settings import settings
 from src.infrastructure.logging.logger import get_logger
 
-
 # Module logger
 logger = get_logger(__name__)
 
 
 # Global singleton to avoid reloading model multiple times
 _reranker_instance: Optional[CrossEncoder] = None
+# Serializes loading (background warm-up and requests may race)
+_reranker_lock = threading.Lock()
 
 
 @traceable(run_type="tool", name="Load BGE Reranker Model")
@@ -49,6 +72,7 @@ def get_reranker() -> Optional[CrossEncoder]:
 
     Uses sentence_transformers.CrossEncoder directly for score access and threshold filtering.
     Activation function set to Sigmoid for 0-1 score range (threshold compatible).
+    The inference backend (torch, onnx, onnx_int8) follows settings.reranker_backend.
 
     Returns:
         Optional[CrossEncoder]: The reranker instance, or None if disabled.
@@ -63,49 +87,99 @@ def get_reranker() -> Optional[CrossEncoder]:
     if not settings.reranker_enabled:
         return None
 
-    if _reranker_instance is None:
-        start_time = time.time()
-        logger.info(
-            "model_loading_started",
-            model=settings.reranker_model,
-            threshold=settings.reranker_score_threshold,
-        )
-        _reranker_instance = CrossEncoder(
-            settings.reranker_model,
-            activation_fn=torch.nn.Sigmoid(),  # 0-1 scores for threshold filtering
-        )
-        load_time_ms = (time.time() - start_time) * 1000
-        logger.info(
-            "model_loaded_successfully",
-            model=settings.reranker_model,
-            threshold=settings.reranker_score_threshold,
-            load_time_ms=load_time_ms,
-        )
+    if _reranker_instance is not None:
+        return _reranker_instance
+
+    with _reranker_lock:
+        if _reranker_instance is None:
+            start_time = time.time()
+            logger.info(
+                "model_loading_started",
+                model=settings.reranker_model,
+                backend=settings.reranker_backend,
+                threshold=settings.reranker_score_threshold,
+            )
+            # Sigmoid activation (0-1 scores for threshold filtering), any backend
+            _reranker_instance = load_cross_encoder(
+                settings.reranker_model, settings.reranker_backend
+            )
+            load_time_ms = (time.time() - start_time) * 1000
+            logger.info(
+                "model_loaded_successfully",
+                model=settings.reranker_model,
+                backend=settings.reranker_backend,
+                threshold=settings.reranker_score_threshold,
+                load_time_ms=load_time_ms,
+            )
 
     return _reranker_instance
 
 
+def _reranker_warmed_up(num_documents: int) -> bool:
+    """
+    Apply the warm-up policy while a background warm-up is in progress.
+
+    Without a background warm-up the model is loaded on first use, as before.
+    Otherwise the request waits up to ``settings.reranker_warmup_timeout_s``
+    (policy ``wait``) or not at all (policy ``skip``).
+
+    Args:
+        num_documents: Documents in the request (for logging).
+
+    Returns:
+        True if the request can rerank, False to skip reranking.
+    """
+    if not settings.reranker_enabled or not warmup_started():
+        return True
+
+    if settings.reranker_warmup_policy == "wait":
+        wait_start = time.time()
+        ready = wait_for_reranker(settings.reranker_warmup_timeout_s)
+        waited_ms = (time.time() - wait_start) * 1000
+    else:
+        ready = wait_for_reranker(0)
+        waited_ms = 0.0
+
+    if not ready:
+        logger.warning(
+            "reranker_not_ready",
+            state=reranker_readiness()["state"],
+            policy=settings.reranker_warmup_policy,
+            waited_ms=waited_ms,
+            num_documents=num_documents,
+            action="skipping_reranking",
+        )
+    return ready
+
+
 @traceable(
     run_type="chain",
     name="BGE Semantic Reranking with Threshold",
     metadata={"component": "reranker", "model": "BAAI/bge-reranker-base"},
 )
 def rerank_documents(
-    query: str, documents: List[str], top_n: Optional[int] = None
+    query: str,
+    documents: List[str],
+    top_n: Optional[int] = None,
+    vectors: Optional[np.ndarray] = None,
 ) -> List[str]:
     """
     Rerank documents by relevance to query using BGE cross-encoder with threshold filtering.
 
     This function uses sentence_transformers.CrossEncoder directly to:
+    0. Keep the best candidates by a cheap first stage (cascade mode only)
     1. Calculate individual relevance scores for each document
     2. Apply threshold filtering (if configured)
     3. Sort by score descending
-    4. Return top-N most relevant documents
+    4. Return top-N most relevant documents (in adaptive mode, N is cut at the
+       score gap / mass, with top_n as the upper bound)
 
     Args:
         query: The search query to rank documents against.
         documents: List of document texts to rerank.
         top_n: Number of top documents to return (overrides settings if provided).
+        vectors: Document vectors from the FAISS index, one row per document
+            (dense cascade stage only; without them it uses the lexical stage).
 
     Returns:
         List[str]: Top-N reranked documents as strings, sorted by relevance.
@@ -116,6 +190,11 @@ def rerank_documents(
         >>> print(reranked)
         ['ML is cool', 'AI is great']
     """
+    if documents and not _reranker_warmed_up(len(documents)):
+        # Model still loading in the background - keep the retrieval order
+        effective_top_n = top_n if top_n is not None else settings.reranker_top_n
+        return documents[:effective_top_n]
+
     reranker = get_reranker()
 
     if reranker is None or not documents:
@@ -134,11 +213,42 @@ def rerank_documents(
     )
 
     try:
-        # Batch predict scores for all (query, document) pairs (timed)
+        # Cascade: a cheap first stage keeps the best M of many candidates,
+        # only those reach the cross-encoder
+        candidates = documents
+        kept: List[int] = []
+        prefilter_time_ms = 0.0
+        if cascade_enabled(len(candidates)):
+            prefilter_start = time.time()
+            kept = prefilter(query, candidates, vectors=vectors)
+            prefilter_time_ms = (time.time() - prefilter_start) * 1000
+            documents = [candidates[i] for i in kept]
+
+        # Score all (query, document) pairs (timed); cached pairs skip the
+        # model, misses are batched with concurrent requests and scored from
+        # token ids precomputed at ingest on the next idle model replica
         scoring_start = time.time()
-        pairs = [(query, doc) for doc in documents]
-        scores = reranker.predict(pairs)  # Returns numpy.ndarray of float scores
+        scorer = get_reranker_pool(reranker)
+        scores, cache_hits = score_documents(scorer, query, documents)
         scoring_time_ms = (time.time() - scoring_start) * 1000
+        cache_hit_ratio = cache_hits / len(documents)
+
+        if kept:
+            # Prefilter recall, measured on a sample of requests by also
+            # scoring every candidate
+            recall = None
+            if should_audit():
+                full_scores, _ = score_documents(scorer, query, candidates)
+                recall = top_n_recall(full_scores, kept, effective_top_n)
+            logger.info(
+                "cascade_rerank_completed",
+                stage=settings.reranker_cascade_stage,
+                candidates=len(candidates),
+                kept=len(kept),
+                prefilter_time_ms=prefilter_time_ms,
+                scoring_time_ms=scoring_time_ms,
+                recall=recall,
+            )
 
         # Preserve scores before threshold for metadata
         scores_before_threshold = scores.copy()
@@ -179,8 +289,23 @@ def rerank_documents(
         # Sort by score descending (highest scores first)
         sorted_indices = np.argsort(filtered_scores)[::-1]
 
-        # Apply top_n limit
-        top_n_indices = sorted_indices[:effective_top_n]
+        # Apply top_n limit (adaptive mode: cut at the score gap / mass, at
+        # most top_n and reranker_adaptive_max_n; savings are against top_n)
+        cut_n = effective_top_n
+        if adaptive_enabled():
+            sorted_scores = filtered_scores[sorted_indices]
+            cut_n, reason = adaptive_top_n(
+                sorted_scores,
+                min(effective_top_n, settings.reranker_adaptive_max_n),
+            )
+            log_cut(
+                [filtered_docs[i] for i in sorted_indices[:effective_top_n]],
+                sorted_scores,
+                effective_top_n,
+                cut_n,
+                reason,
+            )
+        top_n_indices = sorted_indices[:cut_n]
 
         # Extract reranked documents
         reranked_docs = [filtered_docs[i] for i in top_n_indices]
@@ -195,6 +320,8 @@ def rerank_documents(
                 "num_filtered": len(documents) - len(filtered_docs),
                 "threshold_value": threshold,
                 "scoring_time_ms": scoring_time_ms,
+                "prefilter_time_ms": prefilter_time_ms,
+                "cache_hits": cache_hits,
                 "score_distribution": {
                     "max": float(np.max(scores_before_threshold)),
                     "min": float(np.min(scores_before_threshold)),
@@ -214,6 +341,8 @@ def rerank_documents(
             score_min=float(reranked_scores[-1]),
             score_mean=float(np.mean(reranked_scores)),
             scoring_time_ms=scoring_time_ms,
+            cache_hits=cache_hits,
+            cache_hit_ratio=cache_hit_ratio,
         )
 
         return reranked_docs
@@ -243,4 +372,9 @@ def reset_reranker() -> None:
     """
     global _reranker_instance
     _reranker_instance = None
+    reset_batcher()
+    reset_score_cache()
+    reset_pretokenized_scorer()
+    reset_reranker_pool()
+    reset_warmup()
     logger.debug("reranker_instance_reset", action="will_reload_on_next_use")
@@ -0,0 +1,271 @@
+"""
+Bounded LRU/TTL cache of cross-encoder scores.
+
+Conversational follow-ups and repeated FAQ-style questions retrieve the same
+chunks for the same (or an identical) question, so ``rerank_documents`` would
+re-score pairs it has already scored. Scores are cached under
+(model, query hash, document hash); only misses reach the model (through the
+cross-request batcher), and cached and fresh scores are merged in input
+order before threshold filtering and top-n selection.
+
+The cache is bounded by ``settings.reranker_score_cache_max_entries``
+(least-recently-used eviction) and entries expire after
+``settings.reranker_score_cache_ttl_s`` (0 = never). It belongs to the loaded
+model instance: reloading the reranker (new model or backend) starts an
+empty cache.
+
+Example:
+    >>> scores, hits = score_documents(get_reranker(), query, documents)
+    >>> get_score_cache(get_reranker()).stats()["hit_ratio"]
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.features.reranking.batching import score_pairs
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+ScoreKey = Tuple[str, str, str]
+
+
+def _digest(text: str) -> str:
+    """Short content hash (keys stay small for large caches)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def score_key(model: str, query: str, document: str) -> ScoreKey:
+    """
+    Build the cache key of a (query, document) pair.
+
+    Args:
+        model: Model identity (name and backend).
+        query: Query text (whitespace is normalized before hashing).
+        document: Document text (hashed as-is, it is what the model scores).
+
+    Returns:
+        (model, query hash, document hash) tuple.
+    """
+    return (model, _digest(" ".join(query.split())), _digest(document))
+
+
+class RerankScoreCache:
+    """
+    In-memory LRU cache of pair scores with a time-to-live.
+
+    Features:
+    - Thread-safe (lock around the ordered dict)
+    - Least-recently-used eviction beyond ``max_entries``
+    - Entries expire ``ttl_s`` seconds after being stored (0 = never)
+    - Hit/miss counters
+    """
+
+    def __init__(
+        self, max_entries: Optional[int] = None, ttl_s: Optional[float] = None
+    ) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Maximum cached pairs (settings default).
+            ttl_s: Seconds an entry stays valid (settings default, 0 = never).
+        """
+        self.max_entries = (
+            settings.reranker_score_cache_max_entries
+            if max_entries is None
+            else max_entries
+        )
+        self.ttl_s = settings.reranker_score_cache_ttl_s if ttl_s is None else ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[ScoreKey, Tuple[float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get_many(
+        self, keys: Sequence[ScoreKey], count: bool = True
+    ) -> Dict[ScoreKey, float]:
+        """
+        Look up several pairs, dropping expired entries.
+
+        Args:
+            keys: Pair keys.
+            count: Update the hit/miss counters (False for lookups that are
+                not reranking requests).
+
+        Returns:
+            Mapping of found keys to scores.
+        """
+        now = time.monotonic()
+        found: Dict[ScoreKey, float] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl_s and entry[1] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += count
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+                self.hits += count
+        return found
+
+    def put_many(self, items: Dict[ScoreKey, float]) -> None:
+        """
+        Store scores, evicting least-recently-used entries if needed.
+
+        Args:
+            items: Mapping of pair keys to scores.
+        """
+        if self.max_entries <= 0 or not items:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key, score in items.items():
+                self._entries[key] = (score, now + self.ttl_s)
+                self._entries.move_to_end(key)
+            excess = len(self._entries) - self.max_entries
+            for _ in range(max(excess, 0)):
+                self._entries.popitem(last=False)
+            self.evictions += max(excess, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters.
+
+        Returns:
+            Dict with hits, misses, hit_ratio, expirations, evictions and size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache for the loaded reranker model
+_cache: Optional[RerankScoreCache] = None
+_cache_model: Any = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache(model: Any) -> RerankScoreCache:
+    """
+    Get the shared score cache of ``model`` (a new model starts a new cache).
+
+    Args:
+        model: Loaded reranker model.
+
+    Returns:
+        RerankScoreCache: Cache of scores computed by ``model``.
+    """
+    global _cache, _cache_model
+
+    with _cache_lock:
+        if _cache is None or _cache_model is not model:
+            _cache = RerankScoreCache()
+            _cache_model = model
+        return _cache
+
+
+def score_documents(
+    model: Any, query: str, documents: List[str]
+) -> Tuple[np.ndarray, int]:
+    """
+    Score documents against a query, reusing cached pair scores.
+
+    Only cache misses (each distinct document once) are sent to the model.
+
+    Args:
+        model: Loaded reranker model.
+        query: Search query.
+        documents: Document texts.
+
+    Returns:
+        (scores in input order, number of documents served from the cache).
+    """
+    if not settings.reranker_score_cache_enabled:
+        return score_pairs(model, [(query, doc) for doc in documents]), 0
+
+    cache = get_score_cache(model)
+    model_id = f"{settings.reranker_model}:{settings.reranker_backend}"
+    keys = [score_key(model_id, query, doc) for doc in documents]
+    found = cache.get_many(keys)
+    hits = sum(1 for key in keys if key in found)
+
+    # Score each distinct missing document once, preserving input order
+    missing: Dict[ScoreKey, str] = {}
+    for key, doc in zip(keys, documents):
+        if key not in found and key not in missing:
+            missing[key] = doc
+
+    if missing:
+        fresh = score_pairs(model, [(query, doc) for doc in missing.values()])
+        computed = {key: float(score) for key, score in zip(missing, fresh)}
+        cache.put_many(computed)
+        found.update(computed)
+
+    return np.array([found[key] for key in keys]), hits
+
+
+def cached_scores(query: str, documents: List[str]) -> List[Optional[float]]:
+    """
+    Scores of (query, document) pairs already in the cache, without the model.
+
+    Lets later pipeline stages reuse the reranker's judgement of the context
+    (e.g. answer validation) without loading or calling the cross-encoder.
+
+    Args:
+        query: Query the documents were reranked against.
+        documents: Document texts.
+
+    Returns:
+        Score per document, None where the pair was not scored (or the cache
+        is disabled / empty).
+    """
+    with _cache_lock:
+        cache = _cache
+    if cache is None or not settings.reranker_score_cache_enabled:
+        return [None] * len(documents)
+
+    model_id = f"{settings.reranker_model}:{settings.reranker_backend}"
+    keys = [score_key(model_id, query, doc) for doc in documents]
+    found = cache.get_many(keys, count=False)
+    return [found.get(key) for key in keys]
+
+
+def reset_score_cache() -> None:
+    """
+    Drop the shared score cache (useful for testing or config changes).
+
+    Example:
+        >>> reset_score_cache()  # Next score_documents() starts empty
+    """
+    global _cache, _cache_model
+
+    with _cache_lock:
+        _cache = None
+        _cache_model = None
+    logger.debug("rerank_score_cache_reset", action="will_restart_on_next_use")
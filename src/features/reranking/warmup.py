@@ -0,0 +1,191 @@
+"""
+Background warm-up of the reranker with a readiness probe.
+
+Loading the cross-encoder (and its first forward pass, which allocates
+buffers) takes seconds, so the first reranked request pays a cold-start
+spike. With ``settings.reranker_warmup_enabled`` (or a replica pool
+configured via ``settings.reranker_pool_size``) the model is loaded, the pool
+built and the model run once on a dummy pair in a daemon thread at startup,
+off the request path.
+
+Until warm-up finishes, ``rerank_documents`` follows
+``settings.reranker_warmup_policy``:
+- ``wait``: block up to ``settings.reranker_warmup_timeout_s``, then skip
+  reranking if the model is still not ready
+- ``skip``: return the retrieval order right away
+
+Readiness is exposed as a flag (``reranker_ready()``) and a probe dict
+(``reranker_readiness()``) for health checks.
+
+Example:
+    >>> start_reranker_warmup()
+    >>> reranker_readiness()["state"]
+    'loading'
+    >>> wait_for_reranker(timeout=30)
+    True
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+# Dummy pair scored once so the first request does not allocate buffers
+WARMUP_PAIR = ("warm up", "warm up")
+
+# Warm-up state: idle (not started), loading, ready or failed
+_state = "idle"
+_error: Optional[str] = None
+_load_ms: Optional[float] = None
+_warmup_ms: Optional[float] = None
+_ready = threading.Event()
+_generation = 0
+_lock = threading.Lock()
+
+
+def _warm_up(generation: int, ready: threading.Event) -> None:
+    """Load the reranker and score the dummy pair (runs in the warm-up thread)."""
+    global _state, _error, _load_ms, _warmup_ms
+
+    # Imported here: reranker.py imports this module
+    from src.features.reranking.pool import get_reranker_pool
+    from src.features.reranking.reranker import get_reranker
+
+    try:
+        start = time.perf_counter()
+        model = get_reranker()
+        load_ms = (time.perf_counter() - start) * 1000
+        if model is not None:
+            # Builds the replica pool too (when sized above one replica)
+            get_reranker_pool(model).predict([WARMUP_PAIR])
+        warmup_ms = (time.perf_counter() - start) * 1000 - load_ms
+    except Exception as e:
+        with _lock:
+            if generation != _generation:
+                return  # reset while loading
+            _state = "failed"
+            _error = f"{type(e).__name__}: {e}"
+        # Wake waiting requests: they skip reranking instead of timing out
+        ready.set()
+        logger.error(
+            "reranker_warmup_failed",
+            error_type=type(e).__name__,
+            error_message=str(e),
+            exc_info=True,
+        )
+        return
+
+    with _lock:
+        if generation != _generation:
+            return  # reset while loading
+        _state = "ready"
+        _load_ms = load_ms
+        _warmup_ms = warmup_ms
+    ready.set()
+    logger.info(
+        "reranker_warmup_completed",
+        model=settings.reranker_model,
+        load_time_ms=load_ms,
+        warmup_time_ms=warmup_ms,
+    )
+
+
+def start_reranker_warmup() -> bool:
+    """
+    Start loading the reranker in a background thread (idempotent).
+
+    Returns:
+        True if a warm-up thread was started, False if reranking is disabled
+        or warm-up already started.
+    """
+    global _state
+
+    if not settings.reranker_enabled:
+        return False
+
+    with _lock:
+        if _state != "idle":
+            return False
+        _state = "loading"
+        threading.Thread(
+            target=_warm_up,
+            args=(_generation, _ready),
+            name="reranker-warmup",
+            daemon=True,
+        ).start()
+
+    logger.info("reranker_warmup_started", model=settings.reranker_model)
+    return True
+
+
+def warmup_started() -> bool:
+    """Whether a warm-up was started (requests then honour the warm-up policy)."""
+    return _state != "idle"
+
+
+def reranker_ready() -> bool:
+    """Readiness flag: the reranker is loaded and warmed up."""
+    return _state == "ready"
+
+
+def wait_for_reranker(timeout: Optional[float] = None) -> bool:
+    """
+    Block until warm-up ends or ``timeout`` seconds pass.
+
+    Args:
+        timeout: Seconds to wait (None = until warm-up ends).
+
+    Returns:
+        True if the reranker is ready.
+    """
+    _ready.wait(timeout)
+    return reranker_ready()
+
+
+def reranker_readiness() -> Dict[str, Any]:
+    """
+    Readiness probe of the reranker.
+
+    Returns:
+        Dict with state (idle, loading, ready, failed), ready flag, error
+        message and load/warm-up times in ms.
+
+    Example:
+        >>> reranker_readiness()
+        {'state': 'ready', 'ready': True, 'error': None, 'load_time_ms': 5120.4,
+         'warmup_time_ms': 210.7}
+    """
+    with _lock:
+        return {
+            "state": _state,
+            "ready": _state == "ready",
+            "error": _error,
+            "load_time_ms": _load_ms,
+            "warmup_time_ms": _warmup_ms,
+        }
+
+
+def reset_warmup() -> None:
+    """
+    Forget the warm-up state (useful for testing or config changes).
+
+    A running warm-up thread is not stopped, but its result is discarded.
+
+    Example:
+        >>> reset_warmup()  # Next start_reranker_warmup() loads again
+    """
+    global _state, _error, _load_ms, _warmup_ms, _ready, _generation
+
+    with _lock:
+        _generation += 1
+        _state = "idle"
+        _error = None
+        _load_ms = None
+        _warmup_ms = None
+        _ready = threading.Event()
+    logger.debug("reranker_warmup_reset", action="will_warm_up_on_next_start")
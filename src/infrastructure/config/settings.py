@@ -10,6 +10,8 @@ Example:
     'gemini-2.0-flash-exp'
 """
 
+from typing import Dict, Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
@@ -29,6 +31,61 @@ class Settings(BaseSettings):
         langsmith_project: LangSmith project name (default: rag-conversational)
         langsmith_tracing: Enable LangSmith tracing (default: True)
         langsmith_endpoint: LangSmith API endpoint URL
+        llm_cache_enabled: Cache temperature-0 LLM responses (SQLite + LRU)
+        llm_cache_path: SQLite file backing the LLM response cache
+        llm_cache_memory_size: Responses in the in-memory LRU front
+        llm_cache_max_entries: Disk entries before LRU eviction
+        llm_cache_ttl_s / llm_cache_node_ttls: Response lifetime, per graph node
+        complexity_classifier_enabled: Classify questions locally before the LLM
+        complexity_classifier_path: Classifier artifact ("" = packaged model)
+        complexity_classifier_threshold: Confidence below which the LLM decides
+        complexity_decisions_path: JSONL log of LLM decisions (training data)
+        conversation_followup_mode: Follow-up analysis + expansion (combined, separate)
+        conversation_followup_heuristic_enabled: Settle obvious standalone turns locally
+        quality_heuristic_mode: Local groundedness scoring (off, shadow, on)
+        quality_heuristic_accept / quality_heuristic_reject: Local decision band
+        quality_heuristic_audit_rate: Local decisions also sent to the LLM judge
+        quality_judgements_path: JSONL log of LLM judge scores (calibration data)
+        reranker_backend: Reranker inference backend (torch, onnx, onnx_int8)
+        reranker_onnx_quantization: CPU target of the int8 ONNX export
+        reranker_onnx_dir: Directory of the exported ONNX reranker models
+        reranker_score_cache_enabled: Cache pair scores (LRU + TTL)
+        reranker_score_cache_max_entries / reranker_score_cache_ttl_s: Cache bounds
+        reranker_pretokenize_enabled: Precompute chunk token ids at ingest
+        reranker_batching_enabled: Micro-batch reranker pairs across requests
+        reranker_batch_max_pairs / reranker_batch_max_wait_ms: Batch limits
+        reranker_pool_size: Reranker replicas (1 = no pool, 0 = sized from CPU count)
+        reranker_pool_threads: Torch threads per reranker replica
+        reranker_cascade_enabled: Prefilter a larger candidate pool before reranking
+        reranker_cascade_candidates / reranker_cascade_keep: Retrieved / reranked
+        reranker_cascade_stage: Cascade first stage (lexical, dense)
+        reranker_cascade_audit_rate: Requests sampled to measure prefilter recall
+        reranker_top_n_mode: Reranked documents kept (fixed 5/7 or adaptive)
+        reranker_adaptive_min_n / reranker_adaptive_max_n: Adaptive cut bounds
+        reranker_adaptive_min_gap / reranker_adaptive_mass: Adaptive cut rules
+        reranker_warmup_enabled: Load and warm up the reranker in the background
+        reranker_warmup_policy / reranker_warmup_timeout_s: Requests before ready
+        embedding_model: Google embedding model identifier
+        embedding_cache_enabled: Cache embeddings on disk with an LRU front
+        embedding_cache_path: SQLite file backing the embedding cache
+        embedding_cache_memory_size: Entries in the in-memory LRU front
+        embedding_cache_max_entries: Disk entries before LRU eviction
+        vectorstore_path: Directory of the persisted FAISS index
+        vectorstore_reload_interval_s: Interval between index hot-reload checks
+        vectorstore_index_type: FAISS search index (flat, ivf_flat, hnsw, ivf_pq)
+        vectorstore_nprobe / vectorstore_ef_search: Runtime recall/latency knobs
+        vectorstore_mmap: Memory-map index and chunk store so workers share pages
+        vectorstore_chunk_compression: Chunk text compression (none, zstd)
+        retrieval_mode: dense, hybrid (dense + BM25 fused with RRF) or lexical
+        retrieval_rrf_k: Reciprocal rank fusion constant
+        retrieval_dense_timeout_s: Hybrid fallback to lexical when dense is slow
+        retrieval_speculative_enabled: Retrieve in parallel with classification
+        ingestion_chunk_size: Characters per chunk when splitting documents
+        ingestion_chunk_overlap: Overlapping characters between chunks
+        ingestion_page_window: Pages held in memory while streaming a document
+        ingestion_workers: Parse/split worker processes (0 = CPU count)
+        ingestion_embed_batch_size: Chunks per embedding request
+        ingestion_embed_concurrency: Maximum embedding requests in flight
     """
 
     # LangSmith Configuration (required)
@@ -63,6 +120,111 @@ class Settings(BaseSettings):
         description="LangSmith trace sampling rate (0.0=disabled, 1.0=all requests)",
     )
 
+    # LLM Response Cache Configuration
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse responses of identical temperature-0 LLM calls",
+    )
+
+    llm_cache_path: str = Field(
+        default=".cache/llm_responses.sqlite",
+        description="SQLite file backing the LLM response cache",
+    )
+
+    llm_cache_memory_size: int = Field(
+        default=1024, ge=0, description="Responses kept in the in-memory LRU front"
+    )
+
+    llm_cache_max_entries: int = Field(
+        default=100_000,
+        ge=1,
+        description="Maximum responses on disk before least-recently-used eviction",
+    )
+
+    llm_cache_ttl_s: float = Field(
+        default=86400.0,
+        ge=0.0,
+        description="Seconds a cached response stays valid (0 = never expires)",
+    )
+
+    llm_cache_node_ttls: Dict[str, float] = Field(
+        default={
+            "classify": 2_592_000.0,
+            "analyze_context": 3600.0,
+            "expand_question": 3600.0,
+            "check_clarification": 3600.0,
+        },
+        description="Per graph node TTL overrides in seconds (JSON object)",
+    )
+
+    # Question Classification Configuration
+    complexity_classifier_enabled: bool = Field(
+        default=True,
+        description="Classify question complexity locally before asking the LLM",
+    )
+
+    complexity_classifier_path: str = Field(
+        default="",
+        description='Complexity classifier artifact ("" = packaged model)',
+    )
+
+    complexity_classifier_threshold: float = Field(
+        default=0.75,
+        ge=0.5,
+        le=1.0,
+        description="Local confidence below which the LLM classifies the question",
+    )
+
+    complexity_decisions_path: str = Field(
+        default=".cache/complexity_decisions.jsonl",
+        description='JSONL log of LLM complexity decisions ("" = disabled)',
+    )
+
+    # Conversation Configuration
+    conversation_followup_mode: Literal["combined", "separate"] = Field(
+        default="combined",
+        description="Follow-up detection and expansion in one LLM call or two",
+    )
+
+    conversation_followup_heuristic_enabled: bool = Field(
+        default=True,
+        description="Decide obvious standalone turns locally (no LLM call)",
+    )
+
+    # Answer Validation Configuration
+    quality_heuristic_mode: Literal["off", "shadow", "on"] = Field(
+        default="shadow",
+        description="Local groundedness scorer: off, shadow (score and log, the "
+        "LLM judge decides) or on (clear cases skip the LLM judge)",
+    )
+
+    quality_heuristic_accept: float = Field(
+        default=0.8,
+        ge=0.7,
+        le=1.0,
+        description="Local score at or above which an answer is accepted",
+    )
+
+    quality_heuristic_reject: float = Field(
+        default=0.3,
+        ge=0.0,
+        lt=0.7,
+        description="Local score at or below which an answer is refined",
+    )
+
+    quality_heuristic_audit_rate: float = Field(
+        default=0.05,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of local decisions also sent to the LLM judge "
+        "(measures agreement)",
+    )
+
+    quality_judgements_path: str = Field(
+        default=".cache/quality_judgements.jsonl",
+        description='JSONL log of LLM judge scores and local estimates ("" = disabled)',
+    )
+
     # Reranker Configuration (BGE)
     reranker_enabled: bool = Field(
         default=True, description="Enable BGE semantic reranking"
@@ -73,6 +235,23 @@ class Settings(BaseSettings):
         description="BGE reranker model: base, large, or v2-m3",
     )
 
+    reranker_backend: Literal["torch", "onnx", "onnx_int8"] = Field(
+        default="torch",
+        description="Reranker backend: PyTorch, ONNX Runtime, or int8 ONNX",
+    )
+
+    reranker_onnx_quantization: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = (
+        Field(
+            default="avx2",
+            description="Instruction set targeted by int8 dynamic quantization",
+        )
+    )
+
+    reranker_onnx_dir: str = Field(
+        default=".cache/reranker_onnx",
+        description="Directory where ONNX reranker exports are stored",
+    )
+
     reranker_top_n: int = Field(
         default=5,
         ge=1,
@@ -87,6 +266,264 @@ class Settings(BaseSettings):
         description="Minimum relevance score threshold (0.0 = no filtering)",
     )
 
+    reranker_score_cache_enabled: bool = Field(
+        default=True,
+        description="Cache cross-encoder scores by (model, query, document) hash",
+    )
+
+    reranker_score_cache_max_entries: int = Field(
+        default=50_000,
+        ge=0,
+        description="Maximum cached pair scores before least-recently-used eviction",
+    )
+
+    reranker_score_cache_ttl_s: float = Field(
+        default=3600.0,
+        ge=0.0,
+        description="Seconds a cached score stays valid (0 = no expiry)",
+    )
+
+    reranker_pretokenize_enabled: bool = Field(
+        default=True,
+        description="Store chunk token ids at ingest and reuse them when reranking",
+    )
+
+    reranker_batching_enabled: bool = Field(
+        default=True,
+        description="Batch (query, document) pairs across concurrent requests",
+    )
+
+    reranker_batch_max_pairs: int = Field(
+        default=128, ge=1, description="Maximum pairs per batched forward pass"
+    )
+
+    reranker_batch_max_wait_ms: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Longest wait for more pairs before running a batch",
+    )
+
+    reranker_pool_size: int = Field(
+        default=1,
+        ge=0,
+        description=(
+            "Reranker model replicas (1 = shared model, "
+            "0 = CPU cores / threads per replica)"
+        ),
+    )
+
+    reranker_pool_threads: int = Field(
+        default=4, ge=1, description="Torch intra-op threads per reranker replica"
+    )
+
+    reranker_cascade_enabled: bool = Field(
+        default=False,
+        description="Retrieve more candidates and prefilter them before reranking",
+    )
+
+    reranker_cascade_candidates: int = Field(
+        default=50,
+        ge=1,
+        le=200,
+        description="Chunks retrieved for the cascade (first-stage input)",
+    )
+
+    reranker_cascade_keep: int = Field(
+        default=15,
+        ge=1,
+        description="Candidates kept by the first stage and scored by the reranker",
+    )
+
+    reranker_cascade_stage: Literal["lexical", "dense"] = Field(
+        default="lexical",
+        description="Cascade first stage: BM25 overlap or cosine with index vectors",
+    )
+
+    reranker_cascade_audit_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of cascade requests fully reranked to measure recall",
+    )
+
+    reranker_top_n_mode: Literal["fixed", "adaptive"] = Field(
+        default="fixed",
+        description="fixed: 5/7 by complexity; adaptive: cut at the score gap/mass",
+    )
+
+    reranker_adaptive_min_n: int = Field(
+        default=2, ge=1, description="Fewest documents an adaptive cut keeps"
+    )
+
+    reranker_adaptive_max_n: int = Field(
+        default=7,
+        ge=1,
+        description="Most documents an adaptive cut keeps (capped at the fixed 5/7)",
+    )
+
+    reranker_adaptive_min_gap: float = Field(
+        default=0.2,
+        ge=0.0,
+        le=1.0,
+        description="Smallest drop between consecutive scores treated as a knee",
+    )
+
+    reranker_adaptive_mass: float = Field(
+        default=0.9,
+        gt=0.0,
+        le=1.0,
+        description="Share of the total score mass the kept documents must hold",
+    )
+
+    reranker_warmup_enabled: bool = Field(
+        default=False,
+        description="Load the reranker and run a dummy pass in a background thread",
+    )
+
+    reranker_warmup_policy: Literal["wait", "skip"] = Field(
+        default="wait",
+        description="Requests before warm-up ends: wait (up to the timeout) or skip",
+    )
+
+    reranker_warmup_timeout_s: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="Longest a request waits for warm-up before skipping reranking",
+    )
+
+    # Embedding Configuration
+    embedding_model: str = Field(
+        default="models/embedding-001", description="Google embedding model"
+    )
+
+    embedding_cache_enabled: bool = Field(
+        default=True, description="Cache embeddings on disk (SQLite + LRU)"
+    )
+
+    embedding_cache_path: str = Field(
+        default=".cache/embeddings.sqlite",
+        description="SQLite file backing the embedding cache",
+    )
+
+    embedding_cache_memory_size: int = Field(
+        default=2048, ge=0, description="Entries kept in the in-memory LRU front"
+    )
+
+    embedding_cache_max_entries: int = Field(
+        default=200_000,
+        ge=1,
+        description="Maximum entries on disk before least-recently-used eviction",
+    )
+
+    # Vector Store Configuration (FAISS)
+    vectorstore_path: str = Field(
+        default="banco_faiss",
+        description="Directory holding the persisted FAISS index",
+    )
+
+    vectorstore_reload_interval_s: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Seconds between on-disk change checks (0.0 = check every query)",
+    )
+
+    vectorstore_index_type: Literal["flat", "ivf_flat", "hnsw", "ivf_pq"] = Field(
+        default="flat",
+        description="FAISS search index: flat (exact), ivf_flat, hnsw or ivf_pq",
+    )
+
+    vectorstore_ivf_nlist: int = Field(
+        default=0, ge=0, description="IVF centroids (0 = 4*sqrt(N), capped by N/39)"
+    )
+
+    vectorstore_nprobe: int = Field(
+        default=16, ge=1, description="IVF lists probed per query (recall/latency)"
+    )
+
+    vectorstore_hnsw_m: int = Field(
+        default=32, ge=4, description="HNSW neighbors per node"
+    )
+
+    vectorstore_hnsw_ef_construction: int = Field(
+        default=200, ge=8, description="HNSW candidate list size while building"
+    )
+
+    vectorstore_ef_search: int = Field(
+        default=64, ge=1, description="HNSW candidate list size per query"
+    )
+
+    vectorstore_pq_m: int = Field(
+        default=0,
+        ge=0,
+        description="IVF-PQ sub-quantizers (0 = dimension/8; must divide dimension)",
+    )
+
+    vectorstore_pq_nbits: int = Field(
+        default=8, ge=4, le=16, description="Bits per IVF-PQ sub-quantizer code"
+    )
+
+    vectorstore_mmap: bool = Field(
+        default=False,
+        description="Memory-map index and chunk store read-only (shared across workers)",
+    )
+
+    vectorstore_chunk_compression: Literal["none", "zstd"] = Field(
+        default="none",
+        description="Chunk text compression in the chunk store (zstd needs zstandard)",
+    )
+
+    # Retrieval Configuration
+    retrieval_mode: Literal["dense", "hybrid", "lexical"] = Field(
+        default="hybrid",
+        description="dense (FAISS), hybrid (FAISS + BM25 with RRF) or lexical (BM25)",
+    )
+
+    retrieval_rrf_k: int = Field(
+        default=60, ge=1, description="Reciprocal rank fusion constant"
+    )
+
+    retrieval_dense_timeout_s: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Hybrid mode: seconds to wait for dense search before using "
+        "lexical results only (0.0 = no limit)",
+    )
+
+    retrieval_speculative_enabled: bool = Field(
+        default=False,
+        description="RAG graph: retrieve for every complexity label in parallel "
+        "with classification, then keep the classified label's documents",
+    )
+
+    # Ingestion Configuration
+    ingestion_chunk_size: int = Field(
+        default=500, ge=1, description="Characters per chunk when splitting documents"
+    )
+
+    ingestion_chunk_overlap: int = Field(
+        default=100, ge=0, description="Overlapping characters between chunks"
+    )
+
+    ingestion_page_window: int = Field(
+        default=16,
+        ge=1,
+        description="Pages held in memory at once while streaming a document",
+    )
+
+    ingestion_workers: int = Field(
+        default=0,
+        ge=0,
+        description="Parse/split worker processes (0 = CPU count)",
+    )
+
+    ingestion_embed_batch_size: int = Field(
+        default=100, ge=1, description="Chunks sent per embedding request"
+    )
+
+    ingestion_embed_concurrency: int = Field(
+        default=4, ge=1, description="Maximum embedding requests in flight"
+    )
+
     # Logging Configuration
     log_level: str = Field(
         default="INFO",
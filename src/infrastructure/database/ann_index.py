@@ -0,0 +1,433 @@
+"""
+Approximate nearest-neighbor (ANN) index types for the FAISS vector store.
+
+Ingestion always persists the exact flat index (``index.faiss``); it is the
+source of truth for incremental updates and the ground truth for recall
+benchmarks. When ``settings.vectorstore_index_type`` selects an ANN type, a
+derived search index is trained from the flat vectors and written next to it
+(``index_<type>.faiss``). Queries load the derived index together with the
+chunk store, so search cost no longer grows linearly with corpus size.
+
+Every ``.faiss`` file has a ``<file>.generation`` sidecar holding the id of
+the ingestion run that wrote it; the chunk store records the same id. Loading
+refuses a flat index from another run and ignores a stale ANN index, even
+when the vector counts happen to agree.
+
+Supported types:
+- flat: exact search (IndexFlat)
+- ivf_flat: inverted lists over trained centroids, tuned with ``nprobe``
+- hnsw: navigable small-world graph, tuned with ``efSearch``
+- ivf_pq: inverted lists with product-quantized codes (compact, lossy)
+
+Example:
+    >>> build_ann_index("banco_faiss", index_type="hnsw")
+    >>> vectordb = load_search_index("banco_faiss", embeddings)
+    >>> tune_search(vectordb.index, nprobe=32, ef_search=128)
+"""
+
+import math
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    import faiss
+    import numpy as np
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import Embeddings
+
+# Module logger
+logger = get_logger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# Sidecar next to each .faiss file holding its generation id
+GENERATION_SUFFIX = ".generation"
+
+# (temporary path, final path) pairs renamed into place in order
+StagedFiles = List[Tuple[str, str]]
+
+# Training points per IVF centroid (FAISS warns below 39)
+_TRAIN_POINTS_PER_LIST = 256
+_MIN_POINTS_PER_LIST = 39
+
+
+def ann_index_filename(index_type: str) -> str:
+    """Return the file name of the derived index for ``index_type``."""
+    return f"index_{index_type}.faiss"
+
+
+def new_generation_id() -> str:
+    """Return a fresh id for the files written by one ingestion run."""
+    return uuid.uuid4().hex
+
+
+def read_generation_id(file_path: str) -> Optional[str]:
+    """Generation id of a ``.faiss`` file (None if it has no sidecar)."""
+    try:
+        with open(file_path + GENERATION_SUFFIX, encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def stage_faiss_index(
+    index: "faiss.Index", file_path: str, generation_id: str
+) -> StagedFiles:
+    """
+    Write an index and its generation id under temporary names.
+
+    Args:
+        index: FAISS index to write.
+        file_path: Final path of the ``.faiss`` file.
+        generation_id: Id of the ingestion run writing the index.
+
+    Returns:
+        Renames for ``commit_staged``. The sidecar comes first: a reader that
+        sees the new id next to the old index refuses it, while the opposite
+        order would let it accept the new index under the old id.
+    """
+    import faiss
+
+    faiss.write_index(index, file_path + ".tmp")
+    sidecar = file_path + GENERATION_SUFFIX
+    with open(sidecar + ".tmp", "w", encoding="utf-8") as handle:
+        handle.write(generation_id)
+    return [(sidecar + ".tmp", sidecar), (file_path + ".tmp", file_path)]
+
+
+def commit_staged(staged: StagedFiles) -> None:
+    """Rename staged files into place, in order."""
+    for tmp_path, final_path in staged:
+        os.replace(tmp_path, final_path)
+
+
+def default_nlist(num_vectors: int) -> int:
+    """
+    Pick the number of IVF centroids for a corpus size.
+
+    Uses the common ``4 * sqrt(N)`` rule, capped so every centroid gets
+    enough training points.
+    """
+    nlist = int(4 * math.sqrt(num_vectors))
+    return max(1, min(nlist, num_vectors // _MIN_POINTS_PER_LIST))
+
+
+def factory_string(index_type: str, dimension: int, num_vectors: int) -> str:
+    """
+    Build the ``faiss.index_factory`` description for an index type.
+
+    Args:
+        index_type: One of ``INDEX_TYPES``.
+        dimension: Vector dimension.
+        num_vectors: Number of vectors the index will hold.
+
+    Returns:
+        Factory string, e.g. ``"IVF256,Flat"``.
+
+    Raises:
+        ValueError: If the type is unknown or PQ parameters do not fit.
+    """
+    nlist = settings.vectorstore_ivf_nlist or default_nlist(num_vectors)
+
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if index_type == "hnsw":
+        return f"HNSW{settings.vectorstore_hnsw_m},Flat"
+    if index_type == "ivf_pq":
+        pq_m = settings.vectorstore_pq_m or max(1, dimension // 8)
+        if dimension % pq_m != 0:
+            raise ValueError(
+                f"vectorstore_pq_m={pq_m} must divide the dimension {dimension}"
+            )
+        return f"IVF{nlist},PQ{pq_m}x{settings.vectorstore_pq_nbits}"
+    raise ValueError(f"Unknown index type: {index_type} (expected {INDEX_TYPES})")
+
+
+def train_index(
+    vectors: "np.ndarray", index_type: str, metric: Optional[int] = None
+) -> "faiss.Index":
+    """
+    Create, train and fill a FAISS index of the requested type.
+
+    Args:
+        vectors: float32 matrix of shape (N, d).
+        index_type: One of ``INDEX_TYPES``.
+        metric: FAISS metric (defaults to L2, as used by the LangChain store).
+
+    Returns:
+        faiss.Index: Trained index containing ``vectors`` in input order.
+    """
+    import faiss
+    import numpy as np
+
+    metric = faiss.METRIC_L2 if metric is None else metric
+    num_vectors, dimension = vectors.shape
+    index = faiss.index_factory(
+        dimension, factory_string(index_type, dimension, num_vectors), metric
+    )
+
+    if index_type == "hnsw":
+        index.hnsw.efConstruction = settings.vectorstore_hnsw_ef_construction
+
+    if not index.is_trained:
+        ivf = faiss.extract_index_ivf(index)
+        sample_size = min(num_vectors, ivf.nlist * _TRAIN_POINTS_PER_LIST)
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(num_vectors, sample_size, replace=False)]
+        index.train(sample)
+
+    index.add(vectors)
+    tune_search(index)
+    return index
+
+
+def tune_search(
+    index: Any, nprobe: Optional[int] = None, ef_search: Optional[int] = None
+) -> None:
+    """
+    Apply runtime recall/latency knobs to a search index.
+
+    Flat indexes are left untouched; IVF indexes get ``nprobe`` and HNSW
+    indexes get ``efSearch`` (settings defaults when not given).
+
+    Args:
+        index: FAISS index.
+        nprobe: IVF lists probed per query.
+        ef_search: HNSW candidate list size per query.
+    """
+    import faiss
+
+    nprobe = nprobe or settings.vectorstore_nprobe
+    ef_search = ef_search or settings.vectorstore_ef_search
+
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        ivf = None
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    elif hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+
+
+def is_approximate(index: Any) -> bool:
+    """Whether a search index is an ANN (IVF or HNSW) index rather than exact."""
+    import faiss
+
+    if hasattr(index, "hnsw"):
+        return True
+    try:
+        faiss.extract_index_ivf(index)
+    except (RuntimeError, TypeError):
+        return False
+    return True
+
+
+def stage_ann_index(
+    flat: "faiss.Index", db_path: str, index_type: str, generation_id: str
+) -> StagedFiles:
+    """
+    Train an ANN index from flat vectors and write it under temporary names.
+
+    Args:
+        flat: Exact index holding every vector, in position order.
+        db_path: FAISS index directory.
+        index_type: ANN type to train (not "flat").
+        generation_id: Id shared with the flat index and chunk store.
+
+    Returns:
+        Renames for ``commit_staged``.
+    """
+    start_time = time.time()
+    vectors = flat.reconstruct_n(0, flat.ntotal)
+    index = train_index(vectors, index_type, flat.metric_type)
+
+    target = os.path.join(db_path, ann_index_filename(index_type))
+    staged = stage_faiss_index(index, target, generation_id)
+    logger.info(
+        "ann_index_built",
+        path=target,
+        index_type=index_type,
+        num_vectors=int(flat.ntotal),
+        build_time_ms=(time.time() - start_time) * 1000,
+    )
+    return staged
+
+
+def ann_index_current(db_path: str, index_type: str) -> bool:
+    """Return whether the ANN index exists and matches the flat index."""
+    target = os.path.join(db_path, ann_index_filename(index_type))
+    if not os.path.exists(target):
+        return False
+    flat_path = os.path.join(db_path, "index.faiss")
+    return read_generation_id(target) == read_generation_id(flat_path)
+
+
+def build_ann_index(
+    db_path: Optional[str] = None, index_type: Optional[str] = None
+) -> Optional[str]:
+    """
+    Train the configured ANN index from the persisted flat index.
+
+    Used when the index type changes without new chunks; saves build the ANN
+    index before swapping in the flat index (see
+    ``chunk_store.save_vectorstore``). The ANN index is tagged with the
+    generation id of the flat index it was trained from.
+
+    Args:
+        db_path: FAISS index directory (defaults to ``settings.vectorstore_path``).
+        index_type: Index type (defaults to ``settings.vectorstore_index_type``).
+
+    Returns:
+        Path of the written index file, or None for the flat type.
+    """
+    import faiss
+
+    db_path = db_path or settings.vectorstore_path
+    index_type = index_type or settings.vectorstore_index_type
+    if index_type == "flat":
+        return None
+
+    flat_path = os.path.join(db_path, "index.faiss")
+    generation_id = read_generation_id(flat_path)
+    flat = faiss.read_index(flat_path)
+    if read_generation_id(flat_path) != generation_id:
+        raise RuntimeError(f"{flat_path} replaced while building the ANN index")
+
+    # Stores written before generation ids keep an empty (untagged) sidecar
+    staged = stage_ann_index(flat, db_path, index_type, generation_id or "")
+    commit_staged(staged)
+    return staged[-1][1]
+
+
+def read_faiss_index(file_path: str) -> "faiss.Index":
+    """
+    Read a FAISS index, memory-mapped when ``settings.vectorstore_mmap`` is on.
+
+    Memory-mapped indexes are read-only and their vectors/codes live in the
+    OS page cache, shared by every process that maps the same file.
+
+    Args:
+        file_path: Path of the ``.faiss`` file.
+
+    Returns:
+        faiss.Index: The loaded index.
+    """
+    import faiss
+
+    if not settings.vectorstore_mmap:
+        return faiss.read_index(file_path)
+
+    # IO_FLAG_MMAP_IFC (faiss >= 1.8) also maps flat/HNSW storage zero-copy
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    return faiss.read_index(file_path, mmap_flag | faiss.IO_FLAG_READ_ONLY)
+
+
+def read_tagged_index(file_path: str) -> Tuple["faiss.Index", Optional[str]]:
+    """
+    Read a FAISS index together with its generation id.
+
+    The sidecar is read before and after the index; ``stage_faiss_index``
+    renames the sidecar first, so equal ids mean the index is the one tagged.
+
+    Raises:
+        RuntimeError: If the file was replaced while it was being read.
+    """
+    generation_id = read_generation_id(file_path)
+    index = read_faiss_index(file_path)
+    if read_generation_id(file_path) != generation_id:
+        raise RuntimeError(
+            f"{file_path} replaced while loading: retry after ingestion completes"
+        )
+    return index, generation_id
+
+
+def _current_ann_index(
+    path: str, generation_id: Optional[str], num_positions: int
+) -> Optional["faiss.Index"]:
+    """Load the configured ANN index, or None if it is missing or stale."""
+    index_type = settings.vectorstore_index_type
+    ann_path = os.path.join(path, ann_index_filename(index_type))
+    if not os.path.exists(ann_path):
+        logger.warning(
+            "ann_index_missing",
+            path=ann_path,
+            index_type=index_type,
+            action="using_flat_index",
+        )
+        return None
+
+    index, ann_generation_id = read_tagged_index(ann_path)
+    if ann_generation_id == generation_id and index.ntotal == num_positions:
+        return index
+    logger.warning(
+        "ann_index_stale",
+        path=ann_path,
+        ann_generation_id=ann_generation_id,
+        generation_id=generation_id,
+        ann_vectors=int(index.ntotal),
+        docstore_vectors=num_positions,
+        action="using_flat_index",
+    )
+    return None
+
+
+def load_search_index(path: str, embeddings: "Embeddings") -> "FAISS":
+    """
+    Load the vector store using the configured search index type.
+
+    Falls back to the exact flat index when the derived ANN index is missing
+    or out of date (generation id or vector count differs from the chunk
+    store). Chunks are read lazily from the chunk store; with
+    ``settings.vectorstore_mmap`` the index and chunk store are memory-mapped.
+
+    Args:
+        path: FAISS index directory.
+        embeddings: Embeddings for query encoding.
+
+    Returns:
+        FAISS: Vector store backed by the selected index.
+
+    Raises:
+        FileNotFoundError: If the index has no chunk store yet.
+        RuntimeError: If the flat index and chunk store belong to different
+            ingestion runs (a hot reload keeps the previous index and retries).
+    """
+    from langchain_community.vectorstores import FAISS
+
+    from src.infrastructure.database.chunk_store import open_search_docstore
+
+    docstore, index_to_docstore_id = open_search_docstore(path)
+    generation_id = docstore.store.generation_id()
+    flat_path = os.path.join(path, "index.faiss")
+
+    index = None
+    if settings.vectorstore_index_type != "flat":
+        index = _current_ann_index(path, generation_id, len(index_to_docstore_id))
+
+    if index is None:
+        # The chunk store generation is pinned when opened; a flat index from
+        # a different ingestion run would map positions to the wrong chunks
+        index, flat_generation_id = read_tagged_index(flat_path)
+        if flat_generation_id != generation_id:
+            raise RuntimeError(
+                f"index.faiss (generation {flat_generation_id}) does not match "
+                f"the chunk store (generation {generation_id}) in {path}: the "
+                "index is being replaced, retry after ingestion completes"
+            )
+        if index.ntotal != len(index_to_docstore_id):
+            raise RuntimeError(
+                f"index.faiss ({index.ntotal} vectors) does not match the chunk "
+                f"store ({len(index_to_docstore_id)} positions) in {path}: the "
+                "index is being replaced, retry after ingestion completes"
+            )
+
+    tune_search(index)
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
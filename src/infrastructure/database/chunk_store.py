@@ -0,0 +1,812 @@
+"""
+Compact, lazily-read chunk store for the FAISS vector store.
+
+Replaces the pickled LangChain docstore (``index.pkl``), which had to be
+unpickled in full, with ``allow_dangerous_deserialization=True``, before the
+first query. Chunks live in a SQLite file (``chunks.sqlite``) next to
+``index.faiss``:
+
+- ``chunks``: one row per vector id with the chunk text (optionally
+  zstd-compressed) and its JSON metadata
+- ``positions``: FAISS vector position -> chunk row, rewritten on every save
+- ``chunks_fts``: contentless FTS5 inverted index of the chunk text, queried
+  with BM25 ranking for lexical retrieval (no embedding call needed)
+- ``doc_tokens``: reranker token ids per (tokenizer, chunk text hash),
+  precomputed at ingest so reranking does not re-tokenize unchanged chunks
+- ``meta``: the generation id shared with the FAISS files of the same save
+
+Opening the store reads no chunk at all; a query fetches only the k rows it
+hit by primary key, so load time and memory no longer grow with corpus text.
+With ``settings.vectorstore_mmap`` SQLite reads pages through ``mmap`` and
+worker processes share them in the OS page cache.
+
+Writes go to a copy of the store (created on first change) that is renamed
+into place on save, so processes serving the previous index keep a
+consistent snapshot until they reload. A read-only store pins the file it
+opened: threads that connect after a new store was renamed into place keep
+reading the generation that matches the FAISS index loaded with it.
+
+Example:
+    >>> vectordb = open_vectorstore_for_update("banco_faiss", embeddings)
+    >>> vectordb.add_documents(docs, ids=ids)
+    >>> save_vectorstore(vectordb, "banco_faiss")
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections.abc import Mapping
+from contextlib import nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import (
+    commit_staged,
+    new_generation_id,
+    stage_ann_index,
+    stage_faiss_index,
+)
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import Embeddings
+
+# zstandard is optional: without it chunks are stored uncompressed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Module logger
+logger = get_logger(__name__)
+
+CHUNK_STORE_FILE = "chunks.sqlite"
+
+# Pickled LangChain docstore written by ``FAISS.save_local`` (legacy format)
+LEGACY_DOCSTORE_FILE = "index.pkl"
+
+# Bytes of the store SQLite may map when settings.vectorstore_mmap is on
+_MMAP_SIZE = 1 << 34
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    vector_id TEXT NOT NULL UNIQUE,
+    codec TEXT NOT NULL,
+    content BLOB NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS positions (
+    position INTEGER PRIMARY KEY,
+    chunk_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS positions_by_chunk ON positions (chunk_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    content, content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS doc_tokens (
+    tokenizer TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    ids BLOB NOT NULL,
+    PRIMARY KEY (tokenizer, content_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# PRAGMA user_version of stores whose lexical index is complete
+_SCHEMA_VERSION = 1
+
+# Rows per batched IN (...) lookup, below SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+# Attempts to open a reader while the store is being replaced
+_OPEN_ATTEMPTS = 3
+
+# (st_dev, st_ino) identifying one generation of the store file
+FileId = tuple[int, int]
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Question words and articles that only add noise to BM25 (pt and en)
+_STOPWORDS = frozenset("""
+    a o as os um uma uns umas de do da dos das em no na nos nas por para com
+    sem e ou que qual quais quem como onde quando porque é são ser foi se ao
+    aos à às sobre entre mais menos muito isso isto esse essa este esta
+    the an of to in on for with and or is are was what which who how why
+    """.split())
+
+
+def lexical_terms(text: str) -> List[str]:
+    """Lowercased word tokens of ``text``, in order (duplicates kept)."""
+    return [t.lower() for t in _TOKEN_PATTERN.findall(text)]
+
+
+def query_terms(text: str) -> List[str]:
+    """Distinct terms of a question; stopwords dropped unless nothing is left."""
+    terms = list(dict.fromkeys(lexical_terms(text)))
+    return [t for t in terms if t not in _STOPWORDS] or terms
+
+
+def lexical_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching any of its terms.
+
+    Stopwords are dropped (unless nothing else is left) and terms are quoted,
+    so operators and punctuation in the question are never interpreted as
+    query syntax.
+    """
+    return " OR ".join(f'"{term}"' for term in query_terms(text))
+
+
+def content_hash(text: str) -> str:
+    """Hash identifying a chunk text (keys the precomputed token ids)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _encode(text: str, compression: str) -> tuple[str, bytes]:
+    """Encode chunk text, compressing it when requested and available."""
+    data = text.encode("utf-8")
+    if compression == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+    return "raw", data
+
+
+def _decode(codec: str, data: bytes) -> str:
+    """Decode chunk text written by ``_encode``."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Chunk store is zstd-compressed: install zstandard")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return bytes(data).decode("utf-8")
+
+
+class ChunkStore:
+    """
+    SQLite-backed chunk storage addressed by vector id and vector position.
+
+    Read-only stores open one connection per thread, all on the file
+    generation present when the store was opened; writable stores use a
+    single connection guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        read_only: bool = True,
+        compression: Optional[str] = None,
+        mmap_size: int = 0,
+    ) -> None:
+        """
+        Open (and for writable stores, create) the store.
+
+        Args:
+            path: SQLite file path.
+            read_only: Open without write access.
+            compression: "zstd" or "none" (defaults to settings).
+            mmap_size: Bytes SQLite may memory-map (0 = disabled).
+        """
+        self.path = path
+        self.read_only = read_only
+        self.compression = (
+            settings.vectorstore_chunk_compression
+            if compression is None
+            else compression
+        )
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        # Readers use per-thread connections; only the shared writer needs a lock
+        self._lock = nullcontext() if read_only else threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._pinned: Optional[sqlite3.Connection] = None
+        self._generation: Optional[FileId] = None
+
+        if self.compression == "zstd" and zstandard is None and not read_only:
+            logger.warning(
+                "chunk_compression_unavailable",
+                compression=self.compression,
+                action="storing_uncompressed",
+            )
+
+        if not read_only:
+            self._writer = sqlite3.connect(path, check_same_thread=False)
+            self._writer.executescript(_SCHEMA)
+            self._backfill_lexical_index()
+        else:
+            self._pin_generation()
+
+    def _file_id(self) -> Optional[FileId]:
+        """Identify the file currently at ``self.path`` (None if missing)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection on the file currently at ``self.path``."""
+        conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        if self.mmap_size:
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return conn
+
+    def _pin_generation(self) -> None:
+        """
+        Open the pinned connection and record which file it reads.
+
+        The open connection keeps that file readable after a rename replaces
+        it, and keeps its inode from being reused.
+        """
+        for _ in range(_OPEN_ATTEMPTS):
+            before = self._file_id()
+            conn = self._open_reader()
+            if before is not None and self._file_id() == before:
+                self._pinned, self._generation = conn, before
+                return
+            conn.close()
+        raise RuntimeError(f"Chunk store {self.path} replaced while opening")
+
+    def _backfill_lexical_index(self) -> None:
+        """Index the text of stores written before the lexical index existed."""
+        conn = self._writer
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        with conn:
+            conn.execute("DELETE FROM chunks_fts")
+            cursor = conn.execute("SELECT id, codec, content FROM chunks")
+            while rows := cursor.fetchmany(_LOOKUP_BATCH):
+                conn.executemany(
+                    "INSERT INTO chunks_fts (rowid, content) VALUES (?, ?)",
+                    [(row_id, _decode(codec, data)) for row_id, codec, data in rows],
+                )
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection for the calling thread."""
+        if self._writer is not None:
+            return self._writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_reader()
+            if self._file_id() != self._generation:
+                # A newer store was renamed into place after this one was
+                # opened: its positions belong to another FAISS index, so
+                # read the pinned generation (shared, SQLite serializes it)
+                conn.close()
+                conn = self._pinned
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        """Number of vector positions (positions are contiguous from 0)."""
+        with self._lock:
+            row = self._connection().execute("SELECT MAX(position) FROM positions")
+            last = row.fetchone()[0]
+        return 0 if last is None else last + 1
+
+    def _to_document(self, row: tuple) -> Document:
+        vector_id, codec, content, metadata = row
+        return Document(
+            id=vector_id,
+            page_content=_decode(codec, content),
+            metadata=json.loads(metadata),
+        )
+
+    def get_by_position(self, position: int) -> Optional[Document]:
+        """Fetch the chunk stored for a FAISS vector position."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT c.vector_id, c.codec, c.content, c.metadata "
+                    "FROM positions p JOIN chunks c ON c.id = p.chunk_id "
+                    "WHERE p.position = ?",
+                    (position,),
+                )
+                .fetchone()
+            )
+        return self._to_document(row) if row else None
+
+    def get(self, vector_id: str) -> Optional[Document]:
+        """Fetch a chunk by vector id."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT vector_id, codec, content, metadata FROM chunks "
+                    "WHERE vector_id = ?",
+                    (vector_id,),
+                )
+                .fetchone()
+            )
+        return self._to_document(row) if row else None
+
+    def positions(self) -> Dict[int, str]:
+        """Return the full position -> vector id mapping (ids only, no text)."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT p.position, c.vector_id FROM positions p "
+                "JOIN chunks c ON c.id = p.chunk_id ORDER BY p.position"
+            )
+            return dict(rows.fetchall())
+
+    def positions_of(self, vector_ids: Sequence[str]) -> Dict[str, int]:
+        """
+        Look up the FAISS vector positions of chunks by vector id.
+
+        Args:
+            vector_ids: Vector ids of stored chunks.
+
+        Returns:
+            Mapping of found vector ids to their positions.
+        """
+        found: Dict[str, int] = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(vector_ids), _LOOKUP_BATCH):
+                batch = list(vector_ids[start : start + _LOOKUP_BATCH])
+                rows = conn.execute(
+                    "SELECT c.vector_id, p.position FROM chunks c "
+                    "JOIN positions p ON p.chunk_id = c.id WHERE c.vector_id IN "
+                    f"({','.join('?' * len(batch))})",
+                    batch,
+                )
+                found.update(rows.fetchall())
+        return found
+
+    def _unindex(self, conn: sqlite3.Connection, vector_ids: List[str]) -> None:
+        """Remove chunks from the contentless lexical index (needs their text)."""
+        for start in range(0, len(vector_ids), _LOOKUP_BATCH):
+            batch = vector_ids[start : start + _LOOKUP_BATCH]
+            rows = conn.execute(
+                "SELECT id, codec, content FROM chunks WHERE vector_id IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            conn.executemany(
+                "INSERT INTO chunks_fts (chunks_fts, rowid, content) "
+                "VALUES ('delete', ?, ?)",
+                [(row_id, _decode(codec, data)) for row_id, codec, data in rows],
+            )
+
+    def put_many(self, documents: Dict[str, Document]) -> None:
+        """Insert or replace chunks keyed by vector id (and index their text)."""
+        rows = []
+        for vector_id, doc in documents.items():
+            codec, content = _encode(doc.page_content, self.compression)
+            rows.append(
+                (
+                    vector_id,
+                    codec,
+                    content,
+                    json.dumps(doc.metadata, ensure_ascii=False),
+                )
+            )
+        with self._lock, self._connection() as conn:
+            self._unindex(conn, list(documents))
+            conn.executemany(
+                "INSERT INTO chunks (vector_id, codec, content, metadata) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(vector_id) DO UPDATE SET "
+                "codec = excluded.codec, content = excluded.content, "
+                "metadata = excluded.metadata",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO chunks_fts (rowid, content) "
+                "SELECT id, ? FROM chunks WHERE vector_id = ?",
+                [(doc.page_content, vid) for vid, doc in documents.items()],
+            )
+
+    def delete_many(self, vector_ids: Iterable[str]) -> None:
+        """Delete chunks by vector id."""
+        vector_ids = list(vector_ids)
+        with self._lock, self._connection() as conn:
+            self._unindex(conn, vector_ids)
+            conn.executemany(
+                "DELETE FROM chunks WHERE vector_id = ?", [(v,) for v in vector_ids]
+            )
+
+    def search_lexical(self, text: str, k: int) -> List[Document]:
+        """
+        Rank chunks against free text with BM25 over the lexical index.
+
+        Args:
+            text: Query text (any punctuation is ignored).
+            k: Maximum number of chunks to return.
+
+        Returns:
+            Best-matching chunks first; empty if nothing matches or the store
+            has no lexical index yet.
+        """
+        query = lexical_query(text)
+        if not query:
+            return []
+        try:
+            with self._lock:
+                rows = (
+                    self._connection()
+                    .execute(
+                        "SELECT c.vector_id, c.codec, c.content, c.metadata "
+                        "FROM chunks_fts JOIN chunks c ON c.id = chunks_fts.rowid "
+                        "WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+                        (query, k),
+                    )
+                    .fetchall()
+                )
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                "lexical_search_unavailable",
+                path=self.path,
+                error_message=str(e),
+                action="dense_only",
+            )
+            return []
+        return [self._to_document(row) for row in rows]
+
+    def iter_contents(self) -> Iterator[str]:
+        """Yield the text of every chunk (decoded, in storage order)."""
+        with self._lock:
+            rows = self._connection().execute("SELECT codec, content FROM chunks")
+            while batch := rows.fetchmany(_LOOKUP_BATCH):
+                for codec, data in batch:
+                    yield _decode(codec, data)
+
+    def get_doc_tokens(
+        self, tokenizer: str, hashes: Sequence[str]
+    ) -> Dict[str, List[int]]:
+        """
+        Fetch precomputed token ids by chunk text hash.
+
+        Args:
+            tokenizer: Tokenizer identity the ids were computed with.
+            hashes: ``content_hash`` of the chunk texts.
+
+        Returns:
+            Mapping of found hashes to token ids; empty for stores written
+            before token ids were precomputed.
+        """
+        found: Dict[str, List[int]] = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                for start in range(0, len(hashes), _LOOKUP_BATCH):
+                    batch = list(hashes[start : start + _LOOKUP_BATCH])
+                    rows = conn.execute(
+                        "SELECT content_hash, ids FROM doc_tokens WHERE tokenizer = ? "
+                        f"AND content_hash IN ({','.join('?' * len(batch))})",
+                        [tokenizer, *batch],
+                    )
+                    for key, blob in rows:
+                        found[key] = array("i", blob).tolist()
+        except sqlite3.OperationalError:
+            return {}
+        return found
+
+    def doc_token_hashes(self, tokenizer: str) -> Set[str]:
+        """Return the chunk text hashes that have token ids for ``tokenizer``."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT content_hash FROM doc_tokens WHERE tokenizer = ?", (tokenizer,)
+            )
+            return {row[0] for row in rows}
+
+    def put_doc_tokens(self, tokenizer: str, items: Dict[str, List[int]]) -> None:
+        """Store token ids keyed by chunk text hash."""
+        with self._lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO doc_tokens (tokenizer, content_hash, ids) "
+                "VALUES (?, ?, ?)",
+                [
+                    (tokenizer, key, array("i", ids).tobytes())
+                    for key, ids in items.items()
+                ],
+            )
+
+    def delete_doc_tokens(self, tokenizer: str, hashes: Iterable[str]) -> None:
+        """Drop token ids of chunk texts that are no longer stored."""
+        with self._lock, self._connection() as conn:
+            conn.executemany(
+                "DELETE FROM doc_tokens WHERE tokenizer = ? AND content_hash = ?",
+                [(tokenizer, key) for key in hashes],
+            )
+
+    def generation_id(self) -> Optional[str]:
+        """Id of the save that wrote the store (None for older stores)."""
+        try:
+            with self._lock:
+                row = (
+                    self._connection()
+                    .execute("SELECT value FROM meta WHERE key = 'generation'")
+                    .fetchone()
+                )
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def set_generation_id(self, generation_id: str) -> None:
+        """Record the id shared with the FAISS files written alongside."""
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                (generation_id,),
+            )
+
+    def write_positions(self, index_to_docstore_id: Mapping) -> None:
+        """Replace the position mapping with the vector store's current one."""
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM positions")
+            conn.executemany(
+                "INSERT INTO positions (position, chunk_id) "
+                "SELECT ?, id FROM chunks WHERE vector_id = ?",
+                index_to_docstore_id.items(),
+            )
+
+    def backup_to(self, path: str) -> None:
+        """Copy the store to ``path`` with SQLite's online backup."""
+        target = sqlite3.connect(path)
+        try:
+            with self._lock:
+                self._connection().backup(target)
+        finally:
+            target.close()
+
+    def close(self) -> None:
+        """Close the writer, or the pinned connection of a read-only store."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._pinned is not None:
+            self._pinned.close()
+            self._pinned = None
+
+
+class PositionIds(Mapping):
+    """
+    ``index_to_docstore_id`` replacement mapping each position to itself.
+
+    Avoids holding one id string per vector in every worker.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self._size:
+            raise KeyError(position)
+        return position
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._size))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class ChunkDocstore(Docstore, AddableMixin):
+    """
+    LangChain docstore over a ``ChunkStore``.
+
+    Integer keys are vector positions (read path, with ``PositionIds``);
+    string keys are vector ids (update path, with the real id mapping).
+    Updates are written to a working copy created on the first change.
+    """
+
+    def __init__(self, db_path: str, writable: bool = False) -> None:
+        """
+        Open the chunk store of an index directory.
+
+        Args:
+            db_path: FAISS index directory.
+            writable: Allow ``add``/``delete`` (copy-on-write).
+        """
+        self.db_path = db_path
+        self.writable = writable
+        self.store = ChunkStore(
+            os.path.join(db_path, CHUNK_STORE_FILE),
+            mmap_size=_MMAP_SIZE if settings.vectorstore_mmap else 0,
+        )
+        self.working: Optional[ChunkStore] = None
+
+    def _working_store(self) -> ChunkStore:
+        """Return the writable copy, creating it on first use."""
+        if not self.writable:
+            raise RuntimeError("Chunk store opened read-only")
+        if self.working is None:
+            working_path = os.path.join(self.db_path, CHUNK_STORE_FILE + ".tmp")
+            if os.path.exists(working_path):
+                os.remove(working_path)
+            self.store.backup_to(working_path)
+            self.working = ChunkStore(working_path, read_only=False)
+        return self.working
+
+    def search(self, search: Union[int, str]) -> Union[str, Document]:
+        """
+        Return the chunk for a vector position or vector id.
+
+        Returns:
+            Document, or an error message string like ``InMemoryDocstore``.
+        """
+        store = self.working or self.store
+        if isinstance(search, str):
+            doc = store.get(search)
+        else:
+            doc = store.get_by_position(int(search))
+        return doc if doc is not None else f"ID {search} not found."
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """Add or replace chunks keyed by vector id."""
+        self._working_store().put_many(texts)
+
+    def delete(self, ids: List) -> None:
+        """Delete chunks by vector id."""
+        self._working_store().delete_many(ids)
+
+
+def open_search_docstore(db_path: str) -> tuple[ChunkDocstore, PositionIds]:
+    """
+    Open the chunk store for serving queries.
+
+    Args:
+        db_path: FAISS index directory.
+
+    Returns:
+        Tuple of (docstore, index_to_docstore_id).
+
+    Raises:
+        FileNotFoundError: If the index has no chunk store (re-run ingestion,
+            or migrate a legacy ``index.pkl`` store).
+    """
+    if not os.path.exists(os.path.join(db_path, CHUNK_STORE_FILE)):
+        if os.path.exists(os.path.join(db_path, LEGACY_DOCSTORE_FILE)):
+            raise FileNotFoundError(
+                f"{db_path} uses the legacy pickled docstore "
+                f"({LEGACY_DOCSTORE_FILE}): convert it once with "
+                f"'python scripts/migrate_docstore.py --db-path {db_path}' "
+                "or re-run ingestion"
+            )
+        raise FileNotFoundError(
+            f"Chunk store not found in {db_path}: re-run ingestion to build it"
+        )
+    docstore = ChunkDocstore(db_path)
+    return docstore, PositionIds(len(docstore.store))
+
+
+def open_vectorstore_for_update(db_path: str, embeddings: "Embeddings") -> "FAISS":
+    """
+    Open the flat index and chunk store for incremental updates.
+
+    Only vector ids are loaded into memory; chunk text stays on disk.
+
+    Args:
+        db_path: FAISS index directory.
+        embeddings: Embeddings for new chunks.
+
+    Returns:
+        FAISS: Vector store whose changes are persisted by ``save_vectorstore``.
+    """
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+    docstore = ChunkDocstore(db_path, writable=True)
+    index = faiss.read_index(os.path.join(db_path, "index.faiss"))
+    return FAISS(embeddings, index, docstore, docstore.store.positions())
+
+
+def save_vectorstore(vectordb: "FAISS", db_path: str) -> None:
+    """
+    Persist the flat index and chunk store of a vector store.
+
+    Both files are written under temporary names and renamed into place, so
+    processes that have the previous files open (or memory-mapped) are never
+    exposed to a partial write. When ``settings.vectorstore_index_type``
+    selects an ANN type, its index is trained and written before any rename.
+    All files share a new generation id; the chunk store is renamed last, so
+    a reader that opens it finds the matching indexes already in place.
+
+    Args:
+        vectordb: Vector store opened with ``open_vectorstore_for_update`` or
+            freshly built (in-memory docstore).
+        db_path: FAISS index directory.
+    """
+    os.makedirs(db_path, exist_ok=True)
+    generation_id = new_generation_id()
+    store_path = os.path.join(db_path, CHUNK_STORE_FILE)
+    docstore = vectordb.docstore
+
+    if isinstance(docstore, ChunkDocstore):
+        store = docstore._working_store()
+    else:
+        # Freshly built store: copy the in-memory docstore over
+        working_path = store_path + ".tmp"
+        if os.path.exists(working_path):
+            os.remove(working_path)
+        store = ChunkStore(working_path, read_only=False)
+        store.put_many(
+            {
+                doc_id: docstore.search(doc_id)
+                for doc_id in vectordb.index_to_docstore_id.values()
+            }
+        )
+
+    store.write_positions(vectordb.index_to_docstore_id)
+    store.set_generation_id(generation_id)
+    store.close()
+
+    staged = []
+    index_type = settings.vectorstore_index_type
+    if index_type != "flat":
+        staged += stage_ann_index(vectordb.index, db_path, index_type, generation_id)
+    index_path = os.path.join(db_path, "index.faiss")
+    staged += stage_faiss_index(vectordb.index, index_path, generation_id)
+    commit_staged(staged)
+    os.replace(store.path, store_path)
+
+    if isinstance(docstore, ChunkDocstore):
+        # Later changes start a new working copy from the saved store
+        docstore.store = ChunkStore(store_path, mmap_size=docstore.store.mmap_size)
+        docstore.working = None
+
+    logger.info(
+        "chunk_store_saved",
+        path=store_path,
+        generation_id=generation_id,
+        vectors=len(vectordb.index_to_docstore_id),
+        compression=store.compression,
+    )
+
+
+def migrate_pickle_docstore(db_path: str, embeddings: "Embeddings") -> int:
+    """
+    Convert a legacy ``FAISS.save_local`` store into the chunk store format.
+
+    Unpickles ``index.pkl`` once (only run this on indexes you built), then
+    writes ``chunks.sqlite`` and ``index.faiss`` with ``save_vectorstore``.
+    The pickle is left in place and is ignored from then on.
+
+    Args:
+        db_path: FAISS index directory holding ``index.faiss`` and ``index.pkl``.
+        embeddings: Embeddings the index was built with (not called).
+
+    Returns:
+        Number of migrated vectors.
+
+    Raises:
+        FileNotFoundError: If the directory has no legacy docstore.
+    """
+    from langchain_community.vectorstores import FAISS
+
+    if not os.path.exists(os.path.join(db_path, LEGACY_DOCSTORE_FILE)):
+        raise FileNotFoundError(f"No {LEGACY_DOCSTORE_FILE} to migrate in {db_path}")
+
+    vectordb = FAISS.load_local(
+        db_path, embeddings, allow_dangerous_deserialization=True
+    )
+    save_vectorstore(vectordb, db_path)
+    logger.info(
+        "legacy_docstore_migrated",
+        path=db_path,
+        vectors=len(vectordb.index_to_docstore_id),
+    )
+    return len(vectordb.index_to_docstore_id)
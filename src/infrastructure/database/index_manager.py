@@ -0,0 +1,290 @@
+"""
+Process-wide FAISS index manager with hot reload.
+
+Loading a FAISS vector store reads the whole index file and opens the chunk
+store, which costs far more than the similarity search itself. This module
+keeps one loaded index per directory for the lifetime of the process and
+serves every query from memory.
+
+Changes on disk (index files or the ``VERSION`` marker written by ingestion)
+are detected by comparing file signatures at most once per
+``settings.vectorstore_reload_interval_s``. The new index is loaded outside of
+any lock and swapped in with a single reference assignment, so in-flight
+queries keep using the index they already hold and never wait for a reload.
+
+Example:
+    >>> from src.infrastructure.database.index_manager import get_index_manager
+    >>> manager = get_index_manager("banco_faiss", embeddings)
+    >>> docs = manager.get().similarity_search("O que é Perceptron?", k=5)
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import ann_index_filename
+from src.infrastructure.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import Embeddings
+
+# Module logger
+logger = get_logger(__name__)
+
+# Files whose change triggers a reload (plus the configured ANN index)
+INDEX_FILES = ("index.faiss", "chunks.sqlite")
+VERSION_FILE = "VERSION"
+
+FileSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+IndexLoader = Callable[[str, "Embeddings"], "FAISS"]
+
+
+def load_faiss_index(path: str, embeddings: "Embeddings") -> "FAISS":
+    """
+    Load a persisted FAISS vector store from disk.
+
+    Uses the search index selected by ``settings.vectorstore_index_type``
+    (see ``ann_index.load_search_index``).
+
+    Args:
+        path: Directory written by ``chunk_store.save_vectorstore``.
+        embeddings: Embeddings used to embed queries against the index.
+
+    Returns:
+        FAISS: The loaded vector store.
+    """
+    from src.infrastructure.database.ann_index import load_search_index
+
+    return load_search_index(path, embeddings)
+
+
+def read_index_signature(path: str) -> FileSignature:
+    """
+    Build a cheap signature of the on-disk index (mtime and size per file).
+
+    Args:
+        path: Index directory.
+
+    Returns:
+        Tuple of (file name, mtime_ns, size); missing files yield ``None`` values.
+    """
+    names = [*INDEX_FILES, VERSION_FILE]
+    if settings.vectorstore_index_type != "flat":
+        names.append(ann_index_filename(settings.vectorstore_index_type))
+
+    parts = []
+    for name in names:
+        try:
+            stat = os.stat(os.path.join(path, name))
+            parts.append((name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            parts.append((name, None, None))
+    return tuple(parts)
+
+
+def bump_index_version(path: str) -> str:
+    """
+    Write a new ``VERSION`` marker so running processes reload the index.
+
+    The marker is written to a temporary file and renamed into place, which is
+    atomic on POSIX and Windows.
+
+    Args:
+        path: Index directory that was just written.
+
+    Returns:
+        The version string that was written.
+    """
+    version = str(time.time_ns())
+    os.makedirs(path, exist_ok=True)
+    tmp_path = os.path.join(path, f".{VERSION_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(version)
+    os.replace(tmp_path, os.path.join(path, VERSION_FILE))
+    logger.info("index_version_bumped", path=path, version=version)
+    return version
+
+
+class FAISSIndexManager:
+    """
+    Holds one loaded FAISS index and reloads it when the files change.
+
+    Features:
+    - Single load per process, shared by all callers
+    - Throttled on-disk change detection
+    - Non-blocking atomic swap on reload (readers never wait)
+    - Load/reload counters for monitoring
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embeddings: "Embeddings",
+        reload_interval_s: Optional[float] = None,
+        loader: IndexLoader = load_faiss_index,
+    ) -> None:
+        """
+        Initialize the manager without loading anything.
+
+        Args:
+            path: Index directory.
+            embeddings: Embeddings used for query encoding.
+            reload_interval_s: Seconds between change checks (settings default).
+            loader: Callable that loads the index from ``path``.
+        """
+        self.path = path
+        self.embeddings = embeddings
+        self.reload_interval_s = (
+            settings.vectorstore_reload_interval_s
+            if reload_interval_s is None
+            else reload_interval_s
+        )
+        self._loader = loader
+        self._store: Optional["FAISS"] = None
+        self._signature: Optional[FileSignature] = None
+        self._last_check = 0.0
+        self._load_lock = threading.Lock()
+        self._loads = 0
+        self._failed_reloads = 0
+        self._last_load_ms = 0.0
+
+    def get(self) -> "FAISS":
+        """
+        Return the current index, loading or reloading it if needed.
+
+        Returns:
+            FAISS: The vector store to query.
+        """
+        store = self._store
+        if store is None:
+            return self._initial_load()
+
+        now = time.monotonic()
+        if now - self._last_check >= self.reload_interval_s:
+            self._last_check = now
+            self._maybe_reload()
+            store = self._store
+        return store  # type: ignore[return-value]
+
+    def _initial_load(self) -> "FAISS":
+        """Load the index once; concurrent first callers wait for one load."""
+        with self._load_lock:
+            if self._store is None:
+                self._load()
+        return self._store  # type: ignore[return-value]
+
+    def _maybe_reload(self) -> None:
+        """Reload if the signature changed and no other reload is running."""
+        if read_index_signature(self.path) == self._signature:
+            return
+
+        # Another thread is already reloading: keep serving the current index
+        if not self._load_lock.acquire(blocking=False):
+            return
+        try:
+            if read_index_signature(self.path) == self._signature:
+                return
+            self._load()
+        except Exception as e:
+            # Files may be mid-write; keep the old index and retry next check
+            self._failed_reloads += 1
+            logger.warning(
+                "index_reload_failed",
+                path=self.path,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
+        finally:
+            self._load_lock.release()
+
+    def _load(self) -> None:
+        """Load the index and swap it in (caller holds ``_load_lock``)."""
+        signature = read_index_signature(self.path)
+        start_time = time.time()
+        store = self._loader(self.path, self.embeddings)
+        self._last_load_ms = (time.time() - start_time) * 1000
+
+        # Single reference assignment: readers see either old or new index
+        self._store = store
+        self._signature = signature
+        self._last_check = time.monotonic()
+        self._loads += 1
+
+        logger.info(
+            "index_loaded" if self._loads == 1 else "index_reloaded",
+            path=self.path,
+            load_time_ms=self._last_load_ms,
+            loads=self._loads,
+        )
+
+    def invalidate(self) -> None:
+        """Drop the cached index so the next ``get()`` loads it again."""
+        with self._load_lock:
+            self._store = None
+            self._signature = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return load statistics.
+
+        Returns:
+            Dict with loads, failed_reloads, last_load_ms and loaded flag.
+        """
+        return {
+            "path": self.path,
+            "loaded": self._store is not None,
+            "loads": self._loads,
+            "failed_reloads": self._failed_reloads,
+            "last_load_ms": self._last_load_ms,
+        }
+
+
+# Process-wide managers, one per index directory
+_managers: Dict[str, FAISSIndexManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_index_manager(
+    path: Optional[str] = None, embeddings: Optional["Embeddings"] = None
+) -> FAISSIndexManager:
+    """
+    Get or create the shared manager for an index directory.
+
+    Args:
+        path: Index directory (defaults to ``settings.vectorstore_path``).
+        embeddings: Embeddings for query encoding; required on first call.
+
+    Returns:
+        FAISSIndexManager: The process-wide manager for ``path``.
+
+    Raises:
+        ValueError: If the manager does not exist yet and no embeddings are given.
+    """
+    key = os.path.abspath(path or settings.vectorstore_path)
+    manager = _managers.get(key)
+    if manager is not None:
+        return manager
+
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            if embeddings is None:
+                raise ValueError(f"Embeddings required to create index manager: {key}")
+            manager = FAISSIndexManager(path or settings.vectorstore_path, embeddings)
+            _managers[key] = manager
+    return manager
+
+
+def reset_index_managers() -> None:
+    """
+    Drop all shared managers (useful for testing or config changes).
+
+    Example:
+        >>> reset_index_managers()  # Next get_index_manager() starts fresh
+    """
+    with _managers_lock:
+        _managers.clear()
+    logger.debug("index_managers_reset", action="will_reload_on_next_use")
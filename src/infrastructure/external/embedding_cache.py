@@ -0,0 +1,355 @@
+"""
+Persistent embedding cache shared by ingestion and query paths.
+
+Wraps any LangChain ``Embeddings`` object so that each text is sent to the
+embedding API at most once. Entries are keyed by (model name, task, normalized
+text hash) and stored in SQLite, with an in-memory LRU in front for hot keys
+such as repeated user questions. The disk store is bounded by
+``settings.embedding_cache_max_entries`` with least-recently-used eviction.
+
+Query and document embeddings are cached separately because Google embedding
+models use different task types for each.
+
+Example:
+    >>> from src.infrastructure.external.embedding_cache import get_embeddings
+    >>> embeddings = get_embeddings()
+    >>> embeddings.embed_query("O que é Perceptron?")  # network call
+    >>> embeddings.embed_query("O que é  Perceptron?")  # cache hit
+    >>> embeddings.stats()["hit_ratio"]
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+# Extra fraction removed when the disk store overflows (amortizes eviction)
+_EVICTION_SLACK = 0.1
+
+# Keys per SELECT (stays below SQLite's bound-parameter limit)
+_LOOKUP_BATCH = 500
+
+
+def cache_key(model: str, task: str, text: str) -> str:
+    """
+    Build the cache key for a text.
+
+    Args:
+        model: Embedding model name.
+        task: "query" or "document".
+        text: Raw text (whitespace is normalized before hashing).
+
+    Returns:
+        Hex digest identifying the embedding.
+    """
+    normalized = " ".join(text.split())
+    payload = f"{model}\0{task}\0{normalized}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCacheStore:
+    """
+    SQLite-backed vector store with an in-memory LRU front.
+
+    Features:
+    - Thread-safe (single connection guarded by a lock)
+    - LRU front for hot keys, no disk access on memory hits
+    - Size-bounded disk store with least-recently-used eviction
+    - Hit/miss counters
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_size: int = 2048,
+        max_entries: int = 200_000,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file (":memory:" for a process-local cache).
+            memory_size: Entries kept in the LRU front.
+            max_entries: Maximum rows on disk.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+        self._disk_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up several keys (memory first, then disk).
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Mapping of found keys to vectors.
+        """
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            disk_keys = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+                else:
+                    disk_keys.append(key)
+
+            if disk_keys:
+                rows = []
+                for start in range(0, len(disk_keys), _LOOKUP_BATCH):
+                    batch = disk_keys[start : start + _LOOKUP_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(
+                        self._conn.execute(
+                            "SELECT key, vector FROM embeddings "
+                            f"WHERE key IN ({placeholders})",
+                            batch,
+                        ).fetchall()
+                    )
+                if rows:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+                    self._conn.commit()
+                for key, blob in rows:
+                    vector = array("f", blob).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+                self.disk_hits += len(rows)
+                self.misses += len(disk_keys) - len(rows)
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        """
+        Store vectors in memory and on disk, evicting old entries if needed.
+
+        Args:
+            items: Mapping of keys to vectors.
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_access) "
+                "VALUES (?, ?, ?)",
+                [
+                    (key, array("f", vector).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            )
+            self._disk_entries += self._conn.total_changes - before
+            if self._disk_entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Insert into the LRU front (caller holds the lock)."""
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least-recently-used rows (caller holds the lock)."""
+        target = int(self.max_entries * (1 - _EVICTION_SLACK))
+        excess = self._disk_entries - target
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+            (excess,),
+        )
+        self._disk_entries -= excess
+        self.evictions += excess
+        logger.info(
+            "embedding_cache_evicted",
+            evicted=excess,
+            remaining=self._disk_entries,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters.
+
+        Returns:
+            Dict with memory_hits, disk_hits, misses, hit_ratio and sizes.
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (
+                (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            ),
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_entries,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Transparent caching wrapper around an ``Embeddings`` instance.
+
+    Only cache misses reach the wrapped object; hits skip the network round
+    trip entirely. Works anywhere LangChain expects ``Embeddings`` (FAISS
+    queries, ``from_documents``, ingestion pipeline).
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        store: EmbeddingCacheStore,
+        model_name: Optional[str] = None,
+    ) -> None:
+        """
+        Wrap an embeddings object.
+
+        Args:
+            underlying: Embeddings that compute cache misses.
+            store: Cache store.
+            model_name: Model name used in cache keys (read from ``underlying``).
+        """
+        self.underlying = underlying
+        self.store = store
+        self.model_name = model_name or str(
+            getattr(underlying, "model", type(underlying).__name__)
+        )
+
+    def _embed(self, texts: List[str], task: str) -> List[List[float]]:
+        keys = [cache_key(self.model_name, task, text) for text in texts]
+        found = self.store.get_many(keys)
+
+        # Embed each distinct missing text once, preserving input order
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            missing_texts = list(missing.values())
+            if task == "query":
+                vectors = [self.underlying.embed_query(missing_texts[0])]
+            else:
+                vectors = self.underlying.embed_documents(missing_texts)
+            computed = dict(zip(missing, vectors))
+            self.store.put_many(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, computing only cache misses."""
+        return self._embed(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, skipping the API call on repeat questions."""
+        return self._embed([text], "query")[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache hit/miss counters."""
+        return self.store.stats()
+
+
+# Process-wide embeddings instance shared by ingestion and retrieval
+_embeddings_instance: Optional[Embeddings] = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings() -> Embeddings:
+    """
+    Get the shared embeddings instance (singleton pattern).
+
+    Returns the Google embedding model wrapped in ``CachedEmbeddings`` when
+    ``settings.embedding_cache_enabled`` is set, the bare model otherwise.
+
+    Returns:
+        Embeddings: Shared embeddings object.
+    """
+    global _embeddings_instance
+
+    if _embeddings_instance is None:
+        with _embeddings_lock:
+            if _embeddings_instance is None:
+                from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+                embeddings: Embeddings = GoogleGenerativeAIEmbeddings(
+                    model=settings.embedding_model
+                )
+                if settings.embedding_cache_enabled:
+                    store = EmbeddingCacheStore(
+                        settings.embedding_cache_path,
+                        memory_size=settings.embedding_cache_memory_size,
+                        max_entries=settings.embedding_cache_max_entries,
+                    )
+                    embeddings = CachedEmbeddings(
+                        embeddings, store, model_name=settings.embedding_model
+                    )
+                    logger.info(
+                        "embedding_cache_enabled",
+                        model=settings.embedding_model,
+                        path=settings.embedding_cache_path,
+                        disk_entries=store.stats()["disk_entries"],
+                    )
+                _embeddings_instance = embeddings
+
+    return _embeddings_instance
+
+
+def reset_embeddings() -> None:
+    """
+    Reset the shared embeddings instance (useful for testing or config changes).
+    """
+    global _embeddings_instance
+    _embeddings_instance = None
+    logger.debug("embeddings_instance_reset", action="will_reload_on_next_use")
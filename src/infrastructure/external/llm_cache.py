@@ -0,0 +1,352 @@
+"""
+Persistent response cache for deterministic (temperature-0) LLM calls.
+
+Every LLM call in the RAG and conversational graphs runs at temperature 0,
+so an identical prompt to the same model returns the same answer: repeated
+question classifications, follow-up expansions over the same history, or a
+validation of an answer already judged. ``LLMResponseCache`` is a LangChain
+``BaseCache`` passed to the shared ``ChatGoogleGenerativeAI`` instances
+(``cache=get_llm_cache()``), so hits skip the network round trip inside
+``invoke`` / ``ainvoke`` / ``stream`` with no change to the nodes.
+
+Entries are keyed by a hash of LangChain's ``llm_string`` (model name and
+every generation parameter, e.g. ``"model": "models/gemini-2.0-flash-exp",
+"temperature": 0.0``) and the serialized prompt messages, and stored in
+SQLite with an in-memory LRU in front. The disk store is bounded by
+``settings.llm_cache_max_entries`` with least-recently-used eviction.
+
+Each graph node has its own time-to-live (``settings.llm_cache_node_ttls``,
+``settings.llm_cache_ttl_s`` for the rest); the node is read from the
+LangGraph run config of the calling node (calls outside a graph count as
+"default"). Hit/miss counters are kept per node.
+
+Only attach the cache to temperature-0 models: sampled responses would be
+frozen at their first draw.
+
+Example:
+    >>> llm = ChatGoogleGenerativeAI(model=..., temperature=0, cache=get_llm_cache())
+    >>> get_llm_cache().stats()["nodes"]["classify"]["hit_ratio"]
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.runnables.config import var_child_runnable_config
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.logging.logger import get_logger
+
+# Module logger
+logger = get_logger(__name__)
+
+# Extra fraction removed when the disk store overflows (amortizes eviction)
+_EVICTION_SLACK = 0.1
+
+# Node name of LLM calls made outside a LangGraph node
+DEFAULT_NODE = "default"
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Build the cache key of an LLM call.
+
+    Args:
+        prompt: Serialized prompt messages (as passed by LangChain).
+        llm_string: Model name and generation parameters.
+
+    Returns:
+        Hex digest identifying the response.
+    """
+    payload = f"{llm_string}\0{prompt}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def current_node() -> str:
+    """LangGraph node running the current LLM call ("default" outside graphs)."""
+    config = var_child_runnable_config.get() or {}
+    node = config.get("metadata", {}).get("langgraph_node")
+    return str(node) if node else DEFAULT_NODE
+
+
+class LLMResponseCache(BaseCache):
+    """
+    SQLite-backed LLM response cache with an in-memory LRU front.
+
+    Features:
+    - Thread-safe (single connection guarded by a lock)
+    - LRU front for hot prompts, no disk access on memory hits
+    - Per-node TTL, checked on lookup (expired entries are deleted)
+    - Size-bounded disk store with least-recently-used eviction
+    - Hit/miss/expiry counters per node
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_size: int = 1024,
+        max_entries: int = 100_000,
+        ttl_s: float = 86400.0,
+        node_ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file (":memory:" for a process-local cache).
+            memory_size: Responses kept in the LRU front.
+            max_entries: Maximum rows on disk.
+            ttl_s: Seconds a response stays valid (0 = never expires).
+            node_ttls: TTL overrides per graph node.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.node_ttls = dict(node_ttls or {})
+        self._lock = threading.Lock()
+        # key -> (serialized generations, created_at)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, node TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_last_access "
+            "ON llm_responses(last_access)"
+        )
+        self._conn.commit()
+        self._disk_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM llm_responses"
+        ).fetchone()[0]
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    def ttl_for(self, node: str) -> float:
+        """TTL in seconds of responses for ``node`` (0 = never expires)."""
+        return self.node_ttls.get(node, self.ttl_s)
+
+    def _count(self, node: str, counter: str) -> None:
+        """Increment a node counter (caller holds the lock)."""
+        counters = self._counters.setdefault(
+            node, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0}
+        )
+        counters[counter] += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Look up a response (memory first, then disk).
+
+        Args:
+            prompt: Serialized prompt messages.
+            llm_string: Model name and generation parameters.
+
+        Returns:
+            Cached generations, or None on a miss or an expired entry.
+        """
+        key = cache_key(prompt, llm_string)
+        node = current_node()
+        ttl = self.ttl_for(node)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            source = "memory_hits"
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                entry = (row[0], row[1]) if row else None
+                source = "disk_hits"
+
+            if entry is None:
+                self._count(node, "misses")
+                return None
+            if ttl and entry[1] + ttl <= now:
+                self._memory.pop(key, None)
+                cursor = self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key = ?", (key,)
+                )
+                self._conn.commit()
+                self._disk_entries -= cursor.rowcount
+                self._count(node, "expired")
+                self._count(node, "misses")
+                return None
+
+            if source == "disk_hits":
+                self._conn.execute(
+                    "UPDATE llm_responses SET last_access = ? WHERE key = ?",
+                    (now, key),
+                )
+                self._conn.commit()
+            self._remember(key, entry)
+            self._count(node, source)
+        # Fresh objects on every hit (callers may mutate the messages)
+        return loads(entry[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Store a response in memory and on disk, evicting old entries if needed.
+
+        Args:
+            prompt: Serialized prompt messages.
+            llm_string: Model name and generation parameters.
+            return_val: Generations returned by the model.
+        """
+        key = cache_key(prompt, llm_string)
+        node = current_node()
+        payload = dumps(list(return_val))
+        now = time.time()
+        with self._lock:
+            self._remember(key, (payload, now))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, node, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, node, payload, now, now),
+            )
+            self._disk_entries += 1
+            if self._disk_entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Async ``lookup`` (local SQLite, no executor hop)."""
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        """Async ``update`` (local SQLite, no executor hop)."""
+        self.update(prompt, llm_string, return_val)
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        """Insert into the LRU front (caller holds the lock)."""
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least-recently-used rows (caller holds the lock)."""
+        # Replaced keys were counted as inserts: recount before evicting
+        self._disk_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM llm_responses"
+        ).fetchone()[0]
+        target = int(self.max_entries * (1 - _EVICTION_SLACK))
+        excess = self._disk_entries - target
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM llm_responses WHERE key IN ("
+            "SELECT key FROM llm_responses ORDER BY last_access LIMIT ?)",
+            (excess,),
+        )
+        self._disk_entries -= excess
+        self.evictions += excess
+        logger.info("llm_cache_evicted", evicted=excess, remaining=self._disk_entries)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every cached response (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._disk_entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters per node and overall.
+
+        Returns:
+            Dict with ``nodes`` (per-node memory_hits, disk_hits, misses,
+            expired, hit_ratio), the overall hit_ratio and sizes.
+        """
+        with self._lock:
+            nodes = {}
+            hits = lookups = 0
+            for node, counters in self._counters.items():
+                node_hits = counters["memory_hits"] + counters["disk_hits"]
+                node_lookups = node_hits + counters["misses"]
+                nodes[node] = {
+                    **counters,
+                    "hit_ratio": node_hits / node_lookups if node_lookups else 0.0,
+                }
+                hits += node_hits
+                lookups += node_lookups
+            return {
+                "nodes": nodes,
+                "hits": hits,
+                "lookups": lookups,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Process-wide cache shared by every temperature-0 LLM instance
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the shared LLM response cache (singleton pattern).
+
+    Returns:
+        LLMResponseCache, or None when ``settings.llm_cache_enabled`` is off
+        (``cache=None`` leaves the model uncached).
+    """
+    global _llm_cache
+
+    if not settings.llm_cache_enabled:
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    settings.llm_cache_path,
+                    memory_size=settings.llm_cache_memory_size,
+                    max_entries=settings.llm_cache_max_entries,
+                    ttl_s=settings.llm_cache_ttl_s,
+                    node_ttls=settings.llm_cache_node_ttls,
+                )
+                logger.info(
+                    "llm_cache_enabled",
+                    path=settings.llm_cache_path,
+                    disk_entries=_llm_cache.stats()["disk_entries"],
+                )
+    return _llm_cache
+
+
+def reset_llm_cache() -> None:
+    """
+    Drop the shared cache (useful for testing or config changes).
+
+    Models created earlier keep the old instance; recreate them to pick up
+    the new one.
+    """
+    global _llm_cache
+
+    with _llm_cache_lock:
+        _llm_cache = None
+    logger.debug("llm_cache_reset", action="will_reopen_on_next_use")
@@ -0,0 +1,178 @@
+"""
+Unit tests for pluggable ANN index types (database/ann_index.py).
+
+Tests cover:
+- Factory strings per index type
+- Recall of trained IVF/HNSW indexes against exact search
+- Runtime knobs (nprobe, efSearch)
+- Loading the derived index with the chunk store
+- Saves build the derived index up front; a stale one is never served
+"""
+
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import faiss
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import (
+    ann_index_filename,
+    build_ann_index,
+    factory_string,
+    is_approximate,
+    load_search_index,
+    read_generation_id,
+    train_index,
+    tune_search,
+)
+from src.infrastructure.database.chunk_store import (
+    open_vectorstore_for_update,
+    save_vectorstore,
+)
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Clustered float32 vectors."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 16))
+    labels = rng.integers(0, 20, 2000)
+    return (centers[labels] + 0.1 * rng.normal(size=(2000, 16))).astype("float32")
+
+
+def _recall(index, vectors: np.ndarray, k: int = 5) -> float:
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    queries = vectors[:50]
+    _, truth = exact.search(queries, k)
+    _, found = index.search(queries, k)
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+class TestFactory:
+    """Test index descriptions."""
+
+    def test_factory_strings(self) -> None:
+        """Test that each type maps to the expected FAISS factory string."""
+        with patch("src.infrastructure.database.ann_index.settings") as mock_settings:
+            mock_settings.vectorstore_ivf_nlist = 64
+            mock_settings.vectorstore_hnsw_m = 32
+            mock_settings.vectorstore_pq_m = 0
+            mock_settings.vectorstore_pq_nbits = 8
+
+            assert factory_string("flat", 768, 10_000) == "Flat"
+            assert factory_string("ivf_flat", 768, 10_000) == "IVF64,Flat"
+            assert factory_string("hnsw", 768, 10_000) == "HNSW32,Flat"
+            assert factory_string("ivf_pq", 768, 10_000) == "IVF64,PQ96x8"
+        print("✅ PASS - Factory strings per index type")
+
+    def test_invalid_pq_m_rejected(self) -> None:
+        """Test that PQ sub-quantizers must divide the dimension."""
+        with patch("src.infrastructure.database.ann_index.settings") as mock_settings:
+            mock_settings.vectorstore_ivf_nlist = 0
+            mock_settings.vectorstore_pq_m = 7
+            mock_settings.vectorstore_pq_nbits = 8
+
+            with pytest.raises(ValueError):
+                factory_string("ivf_pq", 16, 1000)
+        print("✅ PASS - Invalid PQ parameters rejected")
+
+
+class TestRecall:
+    """Test trained indexes against exact search."""
+
+    def test_ivf_full_probe_is_exact(self, vectors: np.ndarray) -> None:
+        """Test that probing every list gives exact recall."""
+        index = train_index(vectors, "ivf_flat")
+        tune_search(index, nprobe=faiss.extract_index_ivf(index).nlist)
+
+        assert _recall(index, vectors) == pytest.approx(1.0)
+        print("✅ PASS - IVF with full probe is exact")
+
+    def test_hnsw_high_recall(self, vectors: np.ndarray) -> None:
+        """Test that HNSW reaches high recall with a large efSearch."""
+        index = train_index(vectors, "hnsw")
+        tune_search(index, ef_search=128)
+
+        assert index.hnsw.efSearch == 128
+        assert _recall(index, vectors) >= 0.9
+        print("✅ PASS - HNSW high recall")
+
+    def test_nprobe_knob(self, vectors: np.ndarray) -> None:
+        """Test that nprobe is applied and capped by nlist."""
+        index = train_index(vectors, "ivf_flat")
+        tune_search(index, nprobe=10_000)
+
+        ivf = faiss.extract_index_ivf(index)
+        assert ivf.nprobe == ivf.nlist
+        print("✅ PASS - nprobe knob applied")
+
+
+class TestLoading:
+    """Test building and loading the derived index."""
+
+    def test_build_and_load(self, tmp_path: Path) -> None:
+        """Test that the derived index is loaded with the chunk store."""
+        embeddings = DeterministicFakeEmbedding(size=16)
+        texts = [f"documento {i}" for i in range(400)]
+        save_vectorstore(FAISS.from_texts(texts, embeddings), str(tmp_path))
+
+        with patch("src.infrastructure.database.ann_index.settings") as mock_settings:
+            mock_settings.vectorstore_index_type = "hnsw"
+            mock_settings.vectorstore_hnsw_m = 16
+            mock_settings.vectorstore_hnsw_ef_construction = 64
+            mock_settings.vectorstore_ivf_nlist = 0
+            mock_settings.vectorstore_nprobe = 8
+            mock_settings.vectorstore_ef_search = 64
+            mock_settings.vectorstore_mmap = False
+
+            build_ann_index(str(tmp_path))
+            assert (tmp_path / ann_index_filename("hnsw")).exists()
+
+            vectordb = load_search_index(str(tmp_path), embeddings)
+
+        assert isinstance(vectordb.index, faiss.IndexHNSWFlat)
+        assert is_approximate(vectordb.index)
+        docs = vectordb.similarity_search("documento 7", k=1)
+        assert docs[0].page_content == "documento 7"
+        print("✅ PASS - Derived index loaded with chunk store")
+
+    def test_stale_index_of_same_size_ignored(self, tmp_path: Path) -> None:
+        """Test that an ANN index from an earlier save falls back to flat."""
+        embeddings = DeterministicFakeEmbedding(size=16)
+        texts = [f"documento {i}" for i in range(50)]
+        ann_path = tmp_path / ann_index_filename("hnsw")
+        files = (ann_path.name, ann_path.name + ".generation")
+        stale = tmp_path / "stale"
+        stale.mkdir()
+
+        with patch.object(settings, "vectorstore_index_type", "hnsw"), patch.object(
+            settings, "vectorstore_mmap", False
+        ):
+            vectordb = FAISS.from_texts(texts, embeddings, ids=texts)
+            save_vectorstore(vectordb, str(tmp_path))
+            assert read_generation_id(str(ann_path)) == read_generation_id(
+                str(tmp_path / "index.faiss")
+            )
+            for name in files:
+                shutil.copy(tmp_path / name, stale / name)
+
+            writer = open_vectorstore_for_update(str(tmp_path), embeddings)
+            writer.delete(["documento 0"])
+            writer.add_texts(["substituto"], ids=["substituto"])
+            save_vectorstore(writer, str(tmp_path))
+            for name in files:
+                (stale / name).replace(tmp_path / name)
+
+            vectordb = load_search_index(str(tmp_path), embeddings)
+
+        assert not isinstance(vectordb.index, faiss.IndexHNSWFlat)
+        assert not is_approximate(vectordb.index)
+        docs = vectordb.similarity_search("substituto", k=1)
+        assert docs[0].page_content == "substituto"
+        print("✅ PASS - Stale derived index of the same size ignored")
@@ -0,0 +1,82 @@
+"""
+Unit tests for the async RAG execution path (arun_rag_query and friends).
+
+Tests cover:
+- arun_rag_query returns the same answer as run_rag_query
+- Concurrent async queries overlap their LLM waits on one event loop
+- arun_conversational_query runs every node through the async path
+"""
+
+import asyncio
+import time
+from typing import Any, List
+from unittest.mock import patch
+
+from scripts.benchmark_async_rag import StubChatModel, stubbed_rag
+from src.features.conversation.conversation_graph import arun_conversational_query
+from src.features.rag.graph_rag import arun_rag_query, run_rag_query
+
+
+class AsyncOnlyStub(StubChatModel):
+    """Stub LLM that fails if the blocking path is used."""
+
+    def _generate(self, messages: List[Any], stop: Any = None, **kwargs: Any) -> Any:
+        raise AssertionError("sync LLM call on the async path")
+
+
+class TestAsyncRagQuery:
+    """Test arun_rag_query."""
+
+    def test_same_answer_as_sync(self) -> None:
+        """Test that the async path produces the sync path's answer."""
+        with stubbed_rag(latency_s=0.0):
+            expected = run_rag_query("O que é o Perceptron?")
+            answer = asyncio.run(arun_rag_query("O que é o Perceptron?"))
+
+        assert answer == expected == "O Perceptron é um classificador linear binário."
+        print("✅ PASS - Same answer as sync")
+
+    def test_concurrent_queries_overlap(self) -> None:
+        """Test that concurrent queries wait on the LLM at the same time."""
+        latency_s = 0.2
+        queries = 20
+
+        async def run_all() -> List[str]:
+            return list(
+                await asyncio.gather(
+                    *(arun_rag_query("O que é o Perceptron?") for _ in range(queries))
+                )
+            )
+
+        with stubbed_rag(latency_s), patch(
+            "src.features.rag.nodes.llm", AsyncOnlyStub(latency_s=latency_s)
+        ):
+            start = time.perf_counter()
+            answers = asyncio.run(run_all())
+            elapsed = time.perf_counter() - start
+
+        sequential = queries * 3 * latency_s  # classify, generate, validate
+        assert len(answers) == queries
+        assert elapsed < sequential / 4
+        print(
+            f"✅ PASS - {queries} queries in {elapsed:.2f}s ({sequential:.0f}s serial)"
+        )
+
+
+class TestAsyncConversationalQuery:
+    """Test arun_conversational_query."""
+
+    def test_conversation_nodes_async(self) -> None:
+        """Test a conversational turn with every LLM call awaited."""
+        with stubbed_rag(latency_s=0.0), patch(
+            "src.features.conversation.conversation.llm", AsyncOnlyStub()
+        ), patch("src.features.rag.nodes.llm", AsyncOnlyStub()):
+            answer = asyncio.run(
+                arun_conversational_query(
+                    "O que é o Perceptron?",
+                    config={"configurable": {"thread_id": "async-test"}},
+                )
+            )
+
+        assert answer == "O Perceptron é um classificador linear binário."
+        print("✅ PASS - Conversational turn on the async path")
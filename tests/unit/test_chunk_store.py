@@ -0,0 +1,215 @@
+"""
+Unit tests for the lazily-read chunk store (database/chunk_store.py).
+
+Tests cover:
+- Saving a freshly built vector store and searching it without a pickle
+- Incremental add/delete through the update path
+- Readers keep a consistent snapshot while a new version is saved, also
+  on threads that connect after the save
+- Flat indexes from another save are rejected by their generation id
+- Legacy pickled stores are rejected with a migration hint and migrated
+- Optional zstd compression and memory-mapped reads
+"""
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.infrastructure.database.ann_index import load_search_index
+from src.infrastructure.database.chunk_store import (
+    CHUNK_STORE_FILE,
+    ChunkStore,
+    migrate_pickle_docstore,
+    open_vectorstore_for_update,
+    save_vectorstore,
+)
+
+
+@pytest.fixture
+def embeddings() -> DeterministicFakeEmbedding:
+    """Deterministic fake embeddings."""
+    return DeterministicFakeEmbedding(size=16)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, embeddings: DeterministicFakeEmbedding) -> str:
+    """Index directory holding a saved vector store of 20 chunks."""
+    vectordb = FAISS.from_texts(
+        [f"trecho {i} sobre perceptron" for i in range(20)],
+        embeddings,
+        metadatas=[{"page": i} for i in range(20)],
+        ids=[f"vid{i}" for i in range(20)],
+    )
+    save_vectorstore(vectordb, str(tmp_path))
+    return str(tmp_path)
+
+
+class TestChunkStore:
+    """Test saving and reading the chunk store."""
+
+    def test_search_without_pickle(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that queries are served from index.faiss and the chunk store."""
+        vectordb = load_search_index(db_path, embeddings)
+
+        docs = vectordb.similarity_search("trecho 3 sobre perceptron", k=2)
+
+        assert not (Path(db_path) / "index.pkl").exists()
+        assert docs[0].page_content == "trecho 3 sobre perceptron"
+        assert docs[0].metadata == {"page": 3}
+        assert docs[0].id == "vid3"
+        print("✅ PASS - Search served from chunk store")
+
+    def test_update_add_and_delete(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that updates only touch changed chunks and keep positions."""
+        vectordb = open_vectorstore_for_update(db_path, embeddings)
+        vectordb.delete(["vid0", "vid5"])
+        vectordb.add_texts(["novo trecho"], ids=["vid20"])
+        save_vectorstore(vectordb, db_path)
+
+        reloaded = load_search_index(db_path, embeddings)
+        contents = [
+            reloaded.docstore.search(i).page_content
+            for i in reloaded.index_to_docstore_id
+        ]
+
+        assert len(contents) == reloaded.index.ntotal == 19
+        assert "trecho 0 sobre perceptron" not in contents
+        assert "novo trecho" in contents
+        assert reloaded.similarity_search("novo trecho", k=1)[0].id == "vid20"
+        print("✅ PASS - Incremental add/delete")
+
+    def test_reader_snapshot_survives_save(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that a loaded store keeps reading its version after a save."""
+        reader = load_search_index(db_path, embeddings)
+
+        writer = open_vectorstore_for_update(db_path, embeddings)
+        writer.delete([f"vid{i}" for i in range(10)])
+        save_vectorstore(writer, db_path)
+
+        docs = reader.similarity_search("trecho 2 sobre perceptron", k=1)
+        assert docs[0].page_content == "trecho 2 sobre perceptron"
+        print("✅ PASS - Reader snapshot consistent across save")
+
+    def test_new_thread_reads_loaded_generation(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that threads connecting after a save read the loaded store."""
+        reader = load_search_index(db_path, embeddings)
+
+        writer = open_vectorstore_for_update(db_path, embeddings)
+        writer.delete([f"vid{i}" for i in range(10)])
+        writer.add_texts(["substituto"] * 5, ids=[f"new{i}" for i in range(5)])
+        save_vectorstore(writer, db_path)
+
+        def search(query: str) -> str:
+            return reader.similarity_search(query, k=1)[0].page_content
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            queries = [f"trecho {i} sobre perceptron" for i in range(8)]
+            results = list(pool.map(search, queries))
+
+        assert results == queries
+        print("✅ PASS - New threads read the generation loaded with the index")
+
+    def test_mismatched_index_rejected(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that a flat index from another run is not served."""
+        other = FAISS.from_texts(["a", "b"], embeddings)
+        other.save_local(str(Path(db_path) / "other"))
+        (Path(db_path) / "other" / "index.faiss").replace(Path(db_path) / "index.faiss")
+
+        with pytest.raises(RuntimeError, match="does not match the chunk store"):
+            load_search_index(db_path, embeddings)
+        print("✅ PASS - Mismatched index rejected")
+
+    def test_same_size_index_from_other_run_rejected(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that the generation id catches an index with the same count."""
+        files = ("index.faiss", "index.faiss.generation")
+        stale = Path(db_path) / "stale"
+        stale.mkdir()
+        for name in files:
+            shutil.copy(Path(db_path) / name, stale / name)
+
+        writer = open_vectorstore_for_update(db_path, embeddings)
+        writer.delete(["vid0"])
+        writer.add_texts(["substituto"], ids=["new0"])
+        save_vectorstore(writer, db_path)
+        for name in files:
+            (stale / name).replace(Path(db_path) / name)
+
+        with pytest.raises(RuntimeError, match="does not match the chunk store"):
+            load_search_index(db_path, embeddings)
+        print("✅ PASS - Same-size index from another run rejected")
+
+
+class TestLegacyDocstore:
+    """Test indexes written with FAISS.save_local."""
+
+    def test_pickle_store_rejected_then_migrated(
+        self, tmp_path: Path, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test the migration hint and the one-time conversion."""
+        texts = [f"trecho {i} sobre perceptron" for i in range(5)]
+        FAISS.from_texts(texts, embeddings).save_local(str(tmp_path))
+
+        with pytest.raises(FileNotFoundError, match="migrate_docstore.py"):
+            load_search_index(str(tmp_path), embeddings)
+
+        assert migrate_pickle_docstore(str(tmp_path), embeddings) == 5
+        docs = load_search_index(str(tmp_path), embeddings).similarity_search(
+            "trecho 4 sobre perceptron", k=1
+        )
+        assert docs[0].page_content == "trecho 4 sobre perceptron"
+        assert (tmp_path / CHUNK_STORE_FILE).exists()
+        print("✅ PASS - Legacy pickle store migrated")
+
+
+class TestStorageOptions:
+    """Test compression and memory-mapped reads."""
+
+    def test_zstd_round_trip(self, tmp_path: Path) -> None:
+        """Test that compressed chunks decode to the original text."""
+        pytest.importorskip("zstandard")
+        from langchain_core.documents import Document
+
+        store = ChunkStore(
+            str(tmp_path / CHUNK_STORE_FILE), read_only=False, compression="zstd"
+        )
+        text = "Perceptron é um classificador linear. " * 50
+        store.put_many({"vid": Document(page_content=text, metadata={"p": 1})})
+
+        assert store.get("vid").page_content == text
+        print("✅ PASS - zstd round trip")
+
+    def test_mmap_mode_matches(
+        self, db_path: str, embeddings: DeterministicFakeEmbedding
+    ) -> None:
+        """Test that memory-mapped loading returns the same results."""
+        query = "trecho 7 sobre perceptron"
+        expected = load_search_index(db_path, embeddings).similarity_search(query, k=3)
+
+        with patch(
+            "src.infrastructure.database.ann_index.settings.vectorstore_mmap", True
+        ), patch(
+            "src.infrastructure.database.chunk_store.settings.vectorstore_mmap", True
+        ):
+            mapped = load_search_index(db_path, embeddings).similarity_search(
+                query, k=3
+            )
+
+        assert [d.page_content for d in mapped] == [d.page_content for d in expected]
+        print("✅ PASS - Memory-mapped loading matches")
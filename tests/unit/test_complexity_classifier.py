@@ -0,0 +1,169 @@
+"""
+Unit tests for the local question-complexity classifier (rag/complexity.py).
+
+Tests cover:
+- The fast prediction path matches the sklearn pipeline, with plain str labels
+- Confident predictions answer locally; unsure ones fall back to the LLM
+- LLM decisions are logged as training data
+- The packaged artifact loads and classifies the seed questions
+- Artifacts record their sklearn version; a mismatch is logged as an error
+"""
+
+import json
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import joblib
+import pytest
+import sklearn
+
+from src.features.rag.complexity import (
+    DEFAULT_MODEL_PATH,
+    LABELLED_QUESTIONS_PATH,
+    classify_locally,
+    get_complexity_classifier,
+    load_classifier,
+    log_llm_decision,
+    read_examples,
+    reset_complexity_classifier,
+    save_classifier,
+    train_classifier,
+)
+from src.infrastructure.config.settings import settings
+
+SIMPLE = [
+    "O que é o Perceptron?",
+    "Quem criou o Perceptron?",
+    "Qual é a função de ativação do Perceptron?",
+    "O que significa bias?",
+    "Em que ano o Perceptron foi proposto?",
+]
+COMPLEX = [
+    "Compare o Perceptron com o Multilayer Perceptron e explique as vantagens.",
+    "Por que o Perceptron não resolve o XOR e como as redes profundas superam isso?",
+    "Analise as limitações do Perceptron e discuta alternativas modernas.",
+    "Explique em detalhes como o treinamento converge e quais são os riscos.",
+    "Quais as diferenças entre gradiente descendente e a regra do Perceptron?",
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_classifier() -> Generator[None, None, None]:
+    """Reload the shared classifier in every test."""
+    reset_complexity_classifier()
+    yield
+    reset_complexity_classifier()
+
+
+class TestComplexityClassifier:
+    """Test training and prediction."""
+
+    def test_fast_path_matches_pipeline(self) -> None:
+        """Test that predict returns the pipeline's label and probability."""
+        classifier = train_classifier(
+            SIMPLE + COMPLEX, ["simple"] * 5 + ["complex"] * 5
+        )
+        for question in SIMPLE + COMPLEX + ["Uma pergunta nova sobre redes"]:
+            label, confidence = classifier.predict(question)
+            probabilities = classifier.pipeline.predict_proba([question])[0]
+            expected = classifier.pipeline.classes_[probabilities.argmax()]
+
+            assert label == expected and type(label) is str
+            assert confidence == pytest.approx(probabilities.max())
+        print("✅ PASS - Fast path matches pipeline")
+
+    def test_threshold_falls_back_to_llm(self, tmp_path: Path) -> None:
+        """Test that only predictions above the threshold are answered locally."""
+        path = tmp_path / "classifier.joblib"
+        save_classifier(
+            train_classifier(SIMPLE + COMPLEX, ["simple"] * 5 + ["complex"] * 5),
+            path,
+        )
+        question = SIMPLE[0]
+
+        with patch.object(settings, "complexity_classifier_path", str(path)):
+            confidence = get_complexity_classifier().predict(question)[1]
+            reset_complexity_classifier()
+            with patch.object(
+                settings, "complexity_classifier_threshold", confidence - 0.01
+            ):
+                confident = classify_locally(question)
+            reset_complexity_classifier()
+            with patch.object(
+                settings, "complexity_classifier_threshold", confidence + 0.01
+            ):
+                unsure = classify_locally(question)
+
+        assert confident[0] == "simple"
+        assert unsure[0] is None and unsure[1]["local_label"] == "simple"
+        print("✅ PASS - Threshold falls back to the LLM")
+
+    def test_disabled_or_missing(self, tmp_path: Path) -> None:
+        """Test that a disabled or missing classifier always defers to the LLM."""
+        with patch.object(settings, "complexity_classifier_enabled", False):
+            assert classify_locally(SIMPLE[0]) == (None, {})
+        with patch.object(
+            settings, "complexity_classifier_path", str(tmp_path / "missing.joblib")
+        ):
+            assert classify_locally(SIMPLE[0]) == (None, {})
+        print("✅ PASS - Disabled or missing classifier")
+
+
+class TestDecisionsAndArtifact:
+    """Test the LLM decision log and the packaged artifact."""
+
+    def test_llm_decisions_logged(self, tmp_path: Path) -> None:
+        """Test that LLM decisions are appended as training examples."""
+        path = tmp_path / "decisions.jsonl"
+        with patch.object(settings, "complexity_decisions_path", str(path)):
+            log_llm_decision(
+                SIMPLE[0],
+                "simple",
+                412.5,
+                {"local_label": "complex", "confidence": 0.6},
+            )
+            log_llm_decision(COMPLEX[0], "complex", 380.0)
+
+        examples = read_examples(path)
+        record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+        assert [e["label"] for e in examples] == ["simple", "complex"]
+        assert record["llm_latency_ms"] == 412.5
+        assert record["local_label"] == "complex" and record["confidence"] == 0.6
+        print("✅ PASS - LLM decisions logged")
+
+    def test_packaged_artifact(self) -> None:
+        """Test that the shipped classifier loads and fits its seed labels."""
+        classifier = load_classifier(DEFAULT_MODEL_PATH)
+        examples = read_examples(LABELLED_QUESTIONS_PATH)
+        correct = sum(
+            classifier.predict(e["question"])[0] == e["label"] for e in examples
+        )
+
+        assert correct / len(examples) >= 0.95
+        print("✅ PASS - Packaged artifact")
+
+    def test_sklearn_version_checked(self, tmp_path: Path) -> None:
+        """Test that a training version other than the installed one is logged."""
+        classifier = train_classifier(
+            SIMPLE + COMPLEX, ["simple"] * 5 + ["complex"] * 5
+        )
+        path = tmp_path / "classifier.joblib"
+        save_classifier(classifier, path)
+        assert joblib.load(path)["sklearn_version"] == sklearn.__version__
+
+        with patch("src.features.rag.complexity.logger") as mock_logger:
+            assert load_classifier(path) is not None
+            mock_logger.error.assert_not_called()
+
+            joblib.dump(
+                {"pipeline": classifier.pipeline, "sklearn_version": "0.1"}, path
+            )
+            assert load_classifier(path) is not None
+            mock_logger.error.assert_called_once()
+            assert mock_logger.error.call_args.kwargs["trained_with"] == "0.1"
+
+            joblib.dump(classifier.pipeline, path)
+            assert load_classifier(path) is not None
+            assert mock_logger.error.call_args.kwargs["trained_with"] == "unknown"
+        print("✅ PASS - sklearn version recorded and checked")
@@ -0,0 +1,120 @@
+"""
+Unit tests for follow-up analysis (conversation/followup.py, conversation.py).
+
+Tests cover:
+- The local heuristic settles obvious standalone turns only
+- Standalone turns make no LLM call
+- Combined mode detects and expands a follow-up in one LLM call
+- A failed structured call falls back to the two separate calls
+"""
+
+from typing import Any, List
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.core.domain.state import ConversationalRAGState
+from src.features.conversation.conversation import (
+    FollowupAnalysis,
+    analyze_and_expand,
+)
+from src.features.conversation.followup import looks_standalone
+
+HISTORY = [
+    HumanMessage(content="O que é o Perceptron?"),
+    AIMessage(content="É o modelo de neurônio artificial de Rosenblatt."),
+]
+
+
+class StructuredLLM(FakeListChatModel):
+    """Fake chat model answering structured calls from a fixed analysis."""
+
+    analysis: Any = None
+    structured_calls: List[Any] = []
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Any:
+        def answer(prompt: Any) -> Any:
+            self.structured_calls.append(prompt)
+            return self.analysis
+
+        return RunnableLambda(answer)
+
+
+def make_state(question: str) -> ConversationalRAGState:
+    """Conversation state with HISTORY followed by ``question``."""
+    return {
+        "messages": HISTORY + [HumanMessage(content=question)],
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+        "is_followup": False,
+        "original_question": question,
+    }
+
+
+class TestFollowupHeuristic:
+    """Test the local standalone heuristic."""
+
+    def test_obvious_standalone_and_possible_followups(self) -> None:
+        """Test that only self-contained questions are settled locally."""
+        assert looks_standalone("Quais as vantagens das redes neurais profundas?")
+        assert looks_standalone("How does backpropagation update the weights?")
+
+        assert not looks_standalone("Quais suas limitações?")
+        assert not looks_standalone("E o Multilayer Perceptron?")
+        assert not looks_standalone("Explique isso melhor")
+        assert not looks_standalone("Quais as vantagens?")
+        assert not looks_standalone("What are its limitations?")
+        print("✅ PASS - Heuristic settles obvious standalone turns")
+
+
+class TestAnalyzeAndExpand:
+    """Test the combined follow-up node."""
+
+    def test_standalone_turn_skips_llm(self) -> None:
+        """Test that a heuristic standalone turn makes no LLM call."""
+        model = StructuredLLM(responses=[])
+        question = "Qual a diferença entre redes convolucionais e recorrentes?"
+        with patch("src.features.conversation.conversation.llm", model):
+            state = analyze_and_expand(make_state(question))
+
+        assert state["is_followup"] is False
+        assert state["question"] == question
+        assert model.structured_calls == []
+        print("✅ PASS - Standalone turn skips the LLM")
+
+    def test_followup_expanded_in_one_call(self) -> None:
+        """Test that detection and expansion come from one structured call."""
+        model = StructuredLLM(
+            responses=[],
+            analysis=FollowupAnalysis(
+                is_followup=True,
+                standalone_question="Quais as limitações do Perceptron?",
+            ),
+            structured_calls=[],
+        )
+        with patch("src.features.conversation.conversation.llm", model):
+            state = analyze_and_expand(make_state("Quais suas limitações?"))
+
+        assert len(model.structured_calls) == 1
+        assert state["is_followup"] is True
+        assert state["question"] == "Quais as limitações do Perceptron?"
+        assert state["original_question"] == "Quais suas limitações?"
+        print("✅ PASS - Follow-up expanded in one call")
+
+    def test_fallback_to_separate_calls(self) -> None:
+        """Test that models without structured output use the two calls."""
+        model = FakeListChatModel(
+            responses=["sim", "Quais as limitações do Perceptron?"]
+        )
+        with patch("src.features.conversation.conversation.llm", model):
+            state = analyze_and_expand(make_state("Quais suas limitações?"))
+
+        assert state["is_followup"] is True
+        assert state["question"] == "Quais as limitações do Perceptron?"
+        print("✅ PASS - Fallback to separate calls")
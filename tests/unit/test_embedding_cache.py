@@ -0,0 +1,129 @@
+"""
+Unit tests for the persistent embedding cache (external/embedding_cache.py).
+
+Tests cover:
+- Repeat queries skip the wrapped embeddings entirely
+- Only cache misses are sent to embed_documents
+- Persistence across store instances (disk hits)
+- Size-bounded LRU eviction
+- Query and document embeddings are cached separately
+"""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.infrastructure.external.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCacheStore,
+    cache_key,
+)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record every text sent to them."""
+
+    seen: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.seen.extend(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self.seen.append(text)
+        return super().embed_query(text)
+
+
+@pytest.fixture
+def underlying() -> CountingEmbeddings:
+    """Counting fake embeddings."""
+    return CountingEmbeddings(size=8, seen=[])
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> str:
+    """Temporary SQLite file."""
+    return str(tmp_path / "embeddings.sqlite")
+
+
+class TestCachedEmbeddings:
+    """Test the transparent caching wrapper."""
+
+    def test_repeat_query_skips_api(
+        self, underlying: CountingEmbeddings, cache_path: str
+    ) -> None:
+        """Test that a repeated question is served from cache."""
+        cached = CachedEmbeddings(underlying, EmbeddingCacheStore(cache_path), "m")
+
+        first = cached.embed_query("O que é Perceptron?")
+        second = cached.embed_query("O que é   Perceptron? ")
+
+        assert underlying.seen == ["O que é Perceptron?"]
+        assert first == pytest.approx(second)
+        assert cached.stats()["memory_hits"] == 1
+        print("✅ PASS - Repeat question skipped embedding call")
+
+    def test_only_misses_are_embedded(
+        self, underlying: CountingEmbeddings, cache_path: str
+    ) -> None:
+        """Test that embed_documents sends only unseen texts."""
+        cached = CachedEmbeddings(underlying, EmbeddingCacheStore(cache_path), "m")
+        cached.embed_documents(["a", "b"])
+        underlying.seen = []
+
+        vectors = cached.embed_documents(["a", "c", "b", "c"])
+
+        assert underlying.seen == ["c"]
+        assert len(vectors) == 4
+        assert vectors[1] == vectors[3]
+        print("✅ PASS - Only misses embedded")
+
+    def test_persists_across_instances(
+        self, underlying: CountingEmbeddings, cache_path: str
+    ) -> None:
+        """Test that a new store reads previous entries from disk."""
+        CachedEmbeddings(
+            underlying, EmbeddingCacheStore(cache_path), "m"
+        ).embed_documents(["alpha"])
+        underlying.seen = []
+
+        store = EmbeddingCacheStore(cache_path)
+        CachedEmbeddings(underlying, store, "m").embed_documents(["alpha"])
+
+        assert underlying.seen == []
+        assert store.stats()["disk_hits"] == 1
+        print("✅ PASS - Cache persisted on disk")
+
+    def test_query_and_document_keys_differ(self) -> None:
+        """Test that task type is part of the key."""
+        assert cache_key("m", "query", "x") != cache_key("m", "document", "x")
+        assert cache_key("m1", "query", "x") != cache_key("m2", "query", "x")
+        print("✅ PASS - Keys include model and task")
+
+
+class TestEviction:
+    """Test size-bounded eviction."""
+
+    def test_disk_store_bounded(self, cache_path: str) -> None:
+        """Test that the disk store never exceeds max_entries."""
+        store = EmbeddingCacheStore(cache_path, memory_size=0, max_entries=10)
+
+        for i in range(25):
+            store.put_many({f"key{i}": [float(i)]})
+
+        assert store.stats()["disk_entries"] <= 10
+        assert store.stats()["evictions"] > 0
+        # Most recent entries survive
+        assert "key24" in store.get_many(["key24"])
+        print("✅ PASS - Disk store bounded with LRU eviction")
+
+    def test_memory_front_bounded(self, cache_path: str) -> None:
+        """Test that the LRU front keeps at most memory_size entries."""
+        store = EmbeddingCacheStore(cache_path, memory_size=3)
+
+        store.put_many({f"key{i}": [float(i)] for i in range(5)})
+
+        assert store.stats()["memory_entries"] == 3
+        print("✅ PASS - Memory front bounded")
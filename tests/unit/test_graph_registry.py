@@ -0,0 +1,112 @@
+"""
+Unit tests for the compile-once graph registry (rag/graph_registry.py).
+
+Tests cover:
+- A workflow variant is compiled once and reused across queries
+- Changing a topology setting compiles a new variant
+- Concurrent first use compiles a single graph
+- stats() reports compile time and reuse counts
+"""
+
+import threading
+from typing import Generator, List
+from unittest.mock import patch
+
+import pytest
+
+from src.features.rag.graph_rag import get_rag_graph
+from src.features.rag.graph_registry import (
+    GraphRegistry,
+    get_graph_registry,
+    reset_graph_registry,
+)
+from src.infrastructure.config.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry() -> Generator[None, None, None]:
+    """Start every test with no compiled graphs."""
+    reset_graph_registry()
+    yield
+    reset_graph_registry()
+
+
+class TestGraphRegistry:
+    """Test GraphRegistry."""
+
+    def test_compiles_once(self) -> None:
+        """Test that the build function runs only on first use."""
+        registry = GraphRegistry()
+        builds: List[int] = []
+
+        def build() -> object:
+            builds.append(1)
+            return object()
+
+        first = registry.get("rag", (("reranker_enabled", True),), build)
+        second = registry.get("rag", (("reranker_enabled", True),), build)
+
+        assert first is second
+        assert len(builds) == 1
+        print("✅ PASS - Compiled once")
+
+    def test_concurrent_first_use(self) -> None:
+        """Test that threads racing on a new variant share one compile."""
+        registry = GraphRegistry()
+        builds: List[int] = []
+        barrier = threading.Barrier(8)
+        graphs: List[object] = []
+
+        def build() -> object:
+            builds.append(1)
+            return object()
+
+        def worker() -> None:
+            barrier.wait()
+            graphs.append(registry.get("rag", (), build))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        assert len({id(graph) for graph in graphs}) == 1
+        assert registry.stats()[0]["reuses"] == 7
+        print("✅ PASS - One compile under concurrent first use")
+
+
+class TestRagGraphVariants:
+    """Test the RAG graph through the shared registry."""
+
+    def test_reused_across_queries(self) -> None:
+        """Test that repeated lookups return the same compiled graph."""
+        with patch.object(settings, "reranker_enabled", True):
+            graph = get_rag_graph()
+            assert get_rag_graph() is graph
+            assert get_rag_graph() is graph
+
+        [stats] = get_graph_registry().stats()
+        assert stats["name"] == "rag"
+        assert stats["topology"]["reranker_enabled"] is True
+        assert stats["reuses"] == 2
+        assert stats["compile_ms"] > 0
+        print(f"✅ PASS - Compiled in {stats['compile_ms']:.1f} ms, reused twice")
+
+    def test_topology_setting_changes_variant(self) -> None:
+        """Test that toggling the reranker compiles a graph without rerank."""
+        with patch.object(settings, "reranker_enabled", True):
+            with_rerank = get_rag_graph()
+        with patch.object(settings, "reranker_enabled", False):
+            without_rerank = get_rag_graph()
+        with patch.object(settings, "reranker_enabled", True):
+            assert get_rag_graph() is with_rerank
+
+        assert without_rerank is not with_rerank
+        assert "rerank" in with_rerank.get_graph().nodes  # type: ignore[attr-defined]
+        assert (
+            "rerank" not in without_rerank.get_graph().nodes  # type: ignore[attr-defined]
+        )
+        assert len(get_graph_registry().stats()) == 2
+        print("✅ PASS - One variant per reranker setting")
@@ -0,0 +1,251 @@
+"""
+Unit tests for the local groundedness scorer (rag/groundedness.py).
+
+Tests cover:
+- Grounded answers are accepted, unrelated ones rejected, refusals left
+  to the LLM judge
+- validate_quality skips the judge for clear cases in "on" mode
+- Shadow mode always asks the judge and logs the judgement
+- Band evaluation and the agreement report script
+- Judge replies with extra text are parsed; other scales are rejected
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Generator, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from scripts.evaluate_groundedness import main as evaluate_main
+from src.core.domain.state import RAGState
+from src.features.rag.groundedness import (
+    decide,
+    estimate_groundedness,
+    evaluate_band,
+    get_groundedness_stats,
+    reset_groundedness_stats,
+)
+from src.features.rag.nodes import _parse_score, validate_quality
+from src.features.reranking.score_cache import (
+    cached_scores,
+    get_score_cache,
+    reset_score_cache,
+    score_key,
+)
+from src.infrastructure.config.settings import settings
+
+QUESTION = "Quais as limitações do Perceptron?"
+DOCUMENTS = [
+    "O Perceptron é um classificador linear binário proposto por Frank "
+    "Rosenblatt em 1958. Ele ajusta os pesos a cada erro de classificação.",
+    "O Perceptron não consegue resolver problemas não linearmente separáveis, "
+    "como o XOR, limitação apontada por Minsky e Papert em 1969.",
+]
+GROUNDED = (
+    "O Perceptron é um classificador linear e não resolve problemas que não "
+    "são linearmente separáveis, como o XOR. Essa limitação foi apontada por "
+    "Minsky e Papert em 1969."
+)
+UNRELATED = (
+    "Redes convolucionais usam filtros para extrair características de "
+    "imagens e são treinadas com retropropagação em GPUs modernas."
+)
+REFUSAL = "A informação não está nos documentos fornecidos."
+
+
+class FailingJudge(FakeListChatModel):
+    """Judge that must not be called."""
+
+    def _call(self, *args: Any, **kwargs: Any) -> str:
+        raise AssertionError("LLM judge called for a clear case")
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats() -> Generator[None, None, None]:
+    """Zero the decision counters in every test."""
+    reset_groundedness_stats()
+    yield
+    reset_groundedness_stats()
+
+
+def make_state(answer: str) -> RAGState:
+    """Validate-node input for ``answer``."""
+    return {
+        "question": QUESTION,
+        "complexity": "simple",
+        "documents": list(DOCUMENTS),
+        "generation": answer,
+        "quality_score": 0.0,
+        "iterations": 0,
+    }
+
+
+class TestEstimateGroundedness:
+    """Test the local estimate and decision."""
+
+    def test_clear_cases(self) -> None:
+        """Test accept / reject / uncertain on clear examples."""
+        grounded = estimate_groundedness(QUESTION, DOCUMENTS, GROUNDED)
+        unrelated = estimate_groundedness(QUESTION, DOCUMENTS, UNRELATED)
+        refusal = estimate_groundedness(QUESTION, DOCUMENTS, REFUSAL)
+
+        assert decide(grounded) == "accept"
+        assert decide(unrelated) == "reject"
+        assert decide(refusal) == "uncertain"
+        assert grounded["rerank"] is None
+        print(
+            f"✅ PASS - Scores {grounded['score']:.2f} / {unrelated['score']:.2f} "
+            f"in {grounded['latency_us']:.0f} µs"
+        )
+
+    def test_rerank_scores_from_cache(self) -> None:
+        """Test that cached reranker scores are read without counting hits."""
+        reset_score_cache()
+        cache = get_score_cache(MagicMock())
+        model_id = f"{settings.reranker_model}:{settings.reranker_backend}"
+        cache.put_many({score_key(model_id, QUESTION, DOCUMENTS[1]): 0.92})
+
+        scores = cached_scores(QUESTION, DOCUMENTS)
+        estimate = estimate_groundedness(QUESTION, DOCUMENTS, GROUNDED, scores)
+
+        assert scores == [None, 0.92]
+        assert estimate["rerank"] == 0.92
+        assert cache.stats()["hits"] == 0
+        reset_score_cache()
+        print("✅ PASS - Reranker scores reused")
+
+
+class TestValidateQuality:
+    """Test the validate node with the heuristic in front of the judge."""
+
+    @pytest.mark.parametrize("answer, passed", [(GROUNDED, True), (UNRELATED, False)])
+    def test_on_mode_skips_judge(self, answer: str, passed: bool) -> None:
+        """Test that clear cases are scored without the LLM judge."""
+        with patch("src.features.rag.nodes.llm", FailingJudge(responses=[])), patch(
+            "src.features.rag.nodes.cached_scores", return_value=[]
+        ), patch.object(settings, "quality_heuristic_mode", "on"), patch.object(
+            settings, "quality_heuristic_audit_rate", 0.0
+        ):
+            state = validate_quality(make_state(answer))
+
+        assert (state["quality_score"] >= 0.7) is passed
+        stats = get_groundedness_stats().stats()
+        assert stats["local"] == 1 and stats["llm_calls_avoided"] == 1.0
+        print(f"✅ PASS - Local score {state['quality_score']:.2f}")
+
+    def test_on_mode_uncertain_asks_judge(self) -> None:
+        """Test that a refusal goes to the judge."""
+        with patch(
+            "src.features.rag.nodes.llm", FakeListChatModel(responses=["0.8"])
+        ), patch("src.features.rag.nodes.cached_scores", return_value=[]), patch.object(
+            settings, "quality_heuristic_mode", "on"
+        ), patch.object(
+            settings, "quality_judgements_path", ""
+        ):
+            state = validate_quality(make_state(REFUSAL))
+
+        assert state["quality_score"] == 0.8
+        stats = get_groundedness_stats().stats()
+        assert stats["judged"] == 1 and stats["compared"] == 0
+        print("✅ PASS - Uncertain answer judged by the LLM")
+
+    def test_shadow_mode_logs_judgements(self, tmp_path: Path) -> None:
+        """Test that shadow mode asks the judge and records agreement."""
+        log = tmp_path / "judgements.jsonl"
+        with patch(
+            "src.features.rag.nodes.llm",
+            FakeListChatModel(responses=["Nota: 0,9", "0.2"]),
+        ), patch("src.features.rag.nodes.cached_scores", return_value=[]), patch.object(
+            settings, "quality_heuristic_mode", "shadow"
+        ), patch.object(
+            settings, "quality_judgements_path", str(log)
+        ):
+            grounded = validate_quality(make_state(GROUNDED))
+            unrelated = validate_quality(make_state(UNRELATED))
+
+        records = [json.loads(line) for line in log.read_text().splitlines()]
+        assert grounded["quality_score"] == 0.9
+        assert unrelated["quality_score"] == 0.2
+        assert [r["verdict"] for r in records] == ["accept", "reject"]
+        assert [r["judge_score"] for r in records] == [0.9, 0.2]
+        stats = get_groundedness_stats().stats()
+        assert stats["local"] == 0 and stats["agreement"] == 1.0
+        print("✅ PASS - Shadow judgements logged, full agreement")
+
+
+class TestAgreementReport:
+    """Test band evaluation and the report script."""
+
+    @staticmethod
+    def records() -> List[dict]:
+        """Logged judgements: two clear accepts (one wrong), a reject, a mid."""
+        base = {"refusal": False, "has_context": True}
+        return [
+            {**base, "support": 1.0, "sentence_support": 1.0, "judge_score": 0.9},
+            {**base, "support": 0.9, "sentence_support": 1.0, "judge_score": 0.5},
+            {**base, "support": 0.1, "sentence_support": 0.0, "judge_score": 0.1},
+            {**base, "support": 0.6, "sentence_support": 0.5, "judge_score": 0.8},
+        ]
+
+    def test_evaluate_band(self) -> None:
+        """Test avoided calls and agreement for a band."""
+        result = evaluate_band(self.records(), accept=0.8, reject=0.3)
+
+        assert result["local"] == 3
+        assert result["llm_calls_avoided"] == 0.75
+        assert result["agreement"] == pytest.approx(2 / 3)
+        assert result["accept_agreement"] == 0.5
+        assert result["reject_agreement"] == 1.0
+        print("✅ PASS - Band evaluated")
+
+    def test_report_script(self, tmp_path: Path) -> None:
+        """Test the report script end to end."""
+        log = tmp_path / "judgements.jsonl"
+        log.write_text("\n".join(json.dumps(r) for r in self.records()) + "\n")
+        report = tmp_path / "report.json"
+
+        assert evaluate_main(["--judgements", str(log), "--report", str(report)]) == 0
+        data = json.loads(report.read_text())
+        assert data["judgements"] == 4
+        assert data["recommended"]["agreement"] >= 0.95
+        assert evaluate_main(["--judgements", str(tmp_path / "missing")]) == 1
+        print("✅ PASS - Report written")
+
+
+class TestParseScore:
+    """Test parsing of the judge's reply."""
+
+    @pytest.mark.parametrize(
+        "reply, score",
+        [
+            ("0.85", 0.85),
+            ("Nota: 0,9", 0.9),
+            ("1", 1.0),
+            ("Score de 0 a 1: 0.85", 0.85),
+            ("Nota (0-1): 0.4", 0.4),
+            ("1. Relevância: boa. Nota final: 0.3", 0.3),
+            ("8/10", None),
+            ("Nota 10", None),
+            ("Sem nota", None),
+        ],
+    )
+    def test_parse_score(self, reply: str, score: Optional[float]) -> None:
+        """Test that only a bare 0-1 score is accepted (last decimal wins)."""
+        assert _parse_score(reply) == score
+        print(f"✅ PASS - {reply!r} -> {score}")
+
+    def test_unparseable_reply_falls_back(self) -> None:
+        """Test that a reply on another scale is not logged as a judgement."""
+        with patch(
+            "src.features.rag.nodes.llm", FakeListChatModel(responses=["8/10"])
+        ), patch("src.features.rag.nodes.cached_scores", return_value=[]), patch.object(
+            settings, "quality_heuristic_mode", "shadow"
+        ):
+            state = validate_quality(make_state(GROUNDED))
+
+        estimate = estimate_groundedness(QUESTION, DOCUMENTS, GROUNDED)
+        assert state["quality_score"] == pytest.approx(estimate["score"])
+        assert get_groundedness_stats().stats()["judged"] == 0
+        print("✅ PASS - Unparseable reply falls back to the local estimate")
@@ -0,0 +1,161 @@
+"""
+Unit tests for hybrid retrieval (rag/retrieval.py, chunk store BM25 index).
+
+Tests cover:
+- Reciprocal rank fusion ordering
+- BM25 lexical index built at save time and kept in sync on updates
+- Lexical-only mode makes no embedding call
+- Hybrid mode falls back to lexical results when dense search fails
+- Vectors of retrieved chunks are read back from the index by vector id
+"""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.features.rag.retrieval import (
+    document_vectors,
+    hybrid_search,
+    reciprocal_rank_fusion,
+)
+from src.infrastructure.database.ann_index import load_search_index
+from src.infrastructure.database.chunk_store import (
+    open_vectorstore_for_update,
+    save_vectorstore,
+)
+
+TEXTS = [
+    "O Perceptron é um classificador linear binário.",
+    "O problema XOR não é linearmente separável.",
+    "A regra de aprendizado ajusta os pesos após cada erro.",
+    "Redes MLP resolvem o XOR com camadas ocultas.",
+    "A função degrau define a saída do neurônio.",
+    "O bias desloca a fronteira de decisão.",
+    "A taxa de aprendizado controla o tamanho do passo.",
+    "Rosenblatt propôs o modelo em 1958.",
+    "Os pesos são inicializados com valores pequenos.",
+    "O treinamento converge se os dados forem separáveis.",
+]
+
+
+class FailingQueryEmbeddings(DeterministicFakeEmbedding):
+    """Embeddings whose query path fails like an unreachable API."""
+
+    query_calls: int = 0
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls += 1
+        raise ConnectionError("embedding API unavailable")
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    """Saved vector store with the sample chunks."""
+    vectordb = FAISS.from_texts(
+        TEXTS,
+        DeterministicFakeEmbedding(size=16),
+        ids=[f"vid{i}" for i in range(len(TEXTS))],
+    )
+    save_vectorstore(vectordb, str(tmp_path))
+    return str(tmp_path)
+
+
+def _doc(doc_id: str) -> Document:
+    return Document(id=doc_id, page_content=doc_id)
+
+
+class TestReciprocalRankFusion:
+    """Test the fusion of ranked lists."""
+
+    def test_documents_in_both_lists_rank_first(self) -> None:
+        """Test that agreement between rankings is rewarded."""
+        dense = [_doc("a"), _doc("b"), _doc("c")]
+        lexical = [_doc("c"), _doc("d")]
+
+        fused = reciprocal_rank_fusion([dense, lexical], k=3, rrf_k=60)
+
+        # "c" is in both lists; "b" and "d" tie and keep first-seen order
+        assert [d.id for d in fused] == ["c", "a", "b"]
+        print("✅ PASS - RRF rewards agreement")
+
+    def test_single_ranking_preserved(self) -> None:
+        """Test that one ranking alone keeps its order."""
+        ranking = [_doc("x"), _doc("y")]
+
+        assert reciprocal_rank_fusion([ranking, []], k=5) == ranking
+        print("✅ PASS - Single ranking preserved")
+
+
+class TestLexicalIndex:
+    """Test the BM25 index of the chunk store."""
+
+    def test_exact_term_match(self, db_path: str) -> None:
+        """Test that lexical mode finds acronyms without embedding the query."""
+        embeddings = FailingQueryEmbeddings(size=16)
+        vectordb = load_search_index(db_path, embeddings)
+
+        docs = hybrid_search(vectordb, "O que é XOR?", k=2, mode="lexical")
+
+        assert embeddings.query_calls == 0
+        assert {d.id for d in docs} == {"vid1", "vid3"}
+        print("✅ PASS - Lexical-only mode, no embedding call")
+
+    def test_index_follows_updates(self, db_path: str) -> None:
+        """Test that deleted and replaced chunks leave the lexical index."""
+        embeddings = DeterministicFakeEmbedding(size=16)
+        vectordb = open_vectorstore_for_update(db_path, embeddings)
+        vectordb.delete(["vid1", "vid3"])
+        vectordb.add_texts(["Backpropagation treina MLPs."], ids=["vid4"])
+        save_vectorstore(vectordb, db_path)
+
+        reloaded = load_search_index(db_path, embeddings)
+
+        assert hybrid_search(reloaded, "XOR", k=5, mode="lexical") == []
+        found = hybrid_search(reloaded, "backpropagation", k=5, mode="lexical")
+        assert [d.id for d in found] == ["vid4"]
+        print("✅ PASS - Lexical index follows updates")
+
+
+class TestHybridSearch:
+    """Test hybrid retrieval and its fallback."""
+
+    def test_dense_failure_falls_back_to_lexical(self, db_path: str) -> None:
+        """Test that hybrid mode survives an unavailable embedding API."""
+        embeddings = FailingQueryEmbeddings(size=16)
+        vectordb = load_search_index(db_path, embeddings)
+
+        docs = hybrid_search(vectordb, "classificador linear", k=3, mode="hybrid")
+
+        assert embeddings.query_calls == 1
+        assert docs[0].id == "vid0"
+        print("✅ PASS - Hybrid falls back to lexical")
+
+    def test_hybrid_merges_both(self, db_path: str) -> None:
+        """Test that hybrid results include dense and lexical hits."""
+        vectordb = load_search_index(db_path, DeterministicFakeEmbedding(size=16))
+
+        docs = hybrid_search(vectordb, "XOR", k=4, mode="hybrid")
+
+        assert len(docs) == 4
+        assert {"vid1", "vid3"} <= {d.id for d in docs}
+        print("✅ PASS - Hybrid merges dense and lexical")
+
+    def test_document_vectors_from_index(self, db_path: str) -> None:
+        """Test that retrieved chunks get their stored vectors, not new ones."""
+        embeddings = DeterministicFakeEmbedding(size=16)
+        vectordb = load_search_index(db_path, FailingQueryEmbeddings(size=16))
+        docs = hybrid_search(vectordb, "XOR pesos", k=4, mode="lexical")
+
+        vectors = document_vectors(vectordb, [doc.id for doc in docs])
+
+        assert vectors is not None
+        expected = embeddings.embed_documents([doc.page_content for doc in docs])
+        np.testing.assert_allclose(vectors, np.array(expected), rtol=1e-6)
+        assert document_vectors(vectordb, ["vid0", "unknown"]) is None
+        assert document_vectors(vectordb, ["vid0", None]) is None
+        print("✅ PASS - Document vectors read from the index")
@@ -0,0 +1,162 @@
+"""
+Unit tests for incremental ingestion (ingestion/incremental.py).
+
+Tests cover:
+- First ingestion embeds every chunk and writes the manifest
+- Re-ingesting an unchanged corpus embeds nothing
+- Changed files embed only new chunks and drop removed ones
+- Pruning sources that are no longer part of the corpus
+- Each page window is embedded before the next one is parsed
+"""
+
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import patch
+
+import pytest
+from langchain.text_splitter import CharacterTextSplitter
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.features.ingestion import IngestionManifest, ingest_incremental
+from src.infrastructure.config.settings import settings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that count how many texts were embedded."""
+
+    embedded: int = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings() -> CountingEmbeddings:
+    """Deterministic embeddings with call counting."""
+    return CountingEmbeddings(size=8)
+
+
+@pytest.fixture
+def splitter() -> CharacterTextSplitter:
+    """Split on blank lines so each paragraph is one chunk."""
+    return CharacterTextSplitter(separator="\n\n", chunk_size=5, chunk_overlap=0)
+
+
+def _write(path: Path, paragraphs: List[str]) -> str:
+    path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+    return str(path)
+
+
+class TestIncrementalIngestion:
+    """Test manifest-driven incremental ingestion."""
+
+    def test_first_run_embeds_everything(
+        self, tmp_path: Path, embeddings: CountingEmbeddings, splitter
+    ) -> None:
+        """Test that the first ingestion embeds all chunks."""
+        source = _write(tmp_path / "a.md", ["alpha", "beta", "gamma"])
+        db_path = str(tmp_path / "db")
+
+        report = ingest_incremental([source], embeddings, db_path, splitter)
+
+        assert report.chunks_added == 3
+        assert embeddings.embedded == 3
+        assert IngestionManifest.exists(db_path)
+        print("✅ PASS - First run embeds all chunks")
+
+    def test_unchanged_corpus_embeds_nothing(
+        self, tmp_path: Path, embeddings: CountingEmbeddings, splitter
+    ) -> None:
+        """Test that re-ingesting unchanged files skips them entirely."""
+        source = _write(tmp_path / "a.md", ["alpha", "beta", "gamma"])
+        db_path = str(tmp_path / "db")
+        ingest_incremental([source], embeddings, db_path, splitter)
+        embeddings.embedded = 0
+
+        report = ingest_incremental([source], embeddings, db_path, splitter)
+
+        assert embeddings.embedded == 0
+        assert report.files_skipped == 1
+        assert report.chunks_skipped == 3
+        assert report.skipped_sources == [source]
+        assert not report.changed
+        print("✅ PASS - Unchanged corpus costs no embeddings")
+
+    def test_changed_file_embeds_only_new_chunks(
+        self, tmp_path: Path, embeddings: CountingEmbeddings, splitter
+    ) -> None:
+        """Test that only new chunks are embedded and removed ones dropped."""
+        from src.infrastructure.database.ann_index import load_search_index
+
+        source = _write(tmp_path / "a.md", ["alpha", "beta", "gamma"])
+        db_path = str(tmp_path / "db")
+        ingest_incremental([source], embeddings, db_path, splitter)
+        embeddings.embedded = 0
+
+        _write(tmp_path / "a.md", ["alpha", "beta", "delta"])
+        report = ingest_incremental([source], embeddings, db_path, splitter)
+
+        assert embeddings.embedded == 1
+        assert report.chunks_added == 1
+        assert report.chunks_skipped == 2
+        assert report.chunks_removed == 1
+
+        vectordb = load_search_index(db_path, embeddings)
+        contents = sorted(
+            vectordb.docstore.search(i).page_content
+            for i in vectordb.index_to_docstore_id
+        )
+        assert contents == ["alpha", "beta", "delta"]
+        print("✅ PASS - Only changed chunks re-embedded")
+
+    def test_prune_missing_sources(
+        self, tmp_path: Path, embeddings: CountingEmbeddings, splitter
+    ) -> None:
+        """Test that sources dropped from the corpus are removed."""
+        first = _write(tmp_path / "a.md", ["alpha", "beta"])
+        second = _write(tmp_path / "b.md", ["gamma"])
+        db_path = str(tmp_path / "db")
+        ingest_incremental([first, second], embeddings, db_path, splitter)
+
+        report = ingest_incremental(
+            [first], embeddings, db_path, splitter, prune_missing=True
+        )
+
+        assert report.files_removed == 1
+        assert report.chunks_removed == 1
+        assert len(IngestionManifest.load(db_path).vector_ids()) == 2
+        print("✅ PASS - Missing sources pruned")
+
+    def test_windows_embedded_as_parsed(
+        self, tmp_path: Path, embeddings: CountingEmbeddings, splitter
+    ) -> None:
+        """Test that each page window is indexed before the next is read."""
+        source = _write(tmp_path / "a.md", ["placeholder"])
+        pulled = 0
+        pulled_at_embed: List[int] = []
+
+        def page_stream(path: str) -> Iterator[Document]:
+            nonlocal pulled
+            for i in range(9):
+                pulled += 1
+                yield Document(page_content=f"page {i}")
+
+        class WindowEmbeddings(CountingEmbeddings):
+            def embed_documents(self, texts: List[str]) -> List[List[float]]:
+                pulled_at_embed.append(pulled)
+                return super().embed_documents(texts)
+
+        with patch.object(settings, "ingestion_page_window", 3):
+            report = ingest_incremental(
+                [source],
+                WindowEmbeddings(size=8),
+                str(tmp_path / "db"),
+                splitter,
+                loader=page_stream,
+            )
+
+        assert report.chunks_added == 9
+        assert pulled_at_embed == [3, 6, 9]
+        print("✅ PASS - Windows embedded as they are parsed")
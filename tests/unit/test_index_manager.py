@@ -0,0 +1,153 @@
+"""
+Unit tests for index_manager.py module.
+
+Tests cover:
+- Single load per process (cached index handle)
+- Hot reload when the on-disk index changes
+- Failed reloads keep serving the previous index
+- Shared manager registry
+"""
+
+import os
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.infrastructure.database.index_manager import (
+    FAISSIndexManager,
+    bump_index_version,
+    get_index_manager,
+    read_index_signature,
+    reset_index_managers,
+)
+
+
+@pytest.fixture
+def index_dir(tmp_path: Path) -> str:
+    """Index directory with placeholder index files."""
+    (tmp_path / "index.faiss").write_bytes(b"faiss")
+    (tmp_path / "chunks.sqlite").write_bytes(b"chunks")
+    return str(tmp_path)
+
+
+class TestIndexCaching:
+    """Test that the index is loaded once and reused."""
+
+    def test_index_loaded_once(self, index_dir: str) -> None:
+        """Test that repeated get() calls reuse the loaded index."""
+        loader = MagicMock(side_effect=lambda path, emb: object())
+        manager = FAISSIndexManager(
+            index_dir, MagicMock(), reload_interval_s=60.0, loader=loader
+        )
+
+        first = manager.get()
+        second = manager.get()
+
+        assert first is second
+        assert loader.call_count == 1
+        print("✅ PASS - Index loaded once and reused")
+
+    def test_concurrent_first_calls_load_once(self, index_dir: str) -> None:
+        """Test that concurrent first callers share a single load."""
+        loader = MagicMock(side_effect=lambda path, emb: object())
+        manager = FAISSIndexManager(
+            index_dir, MagicMock(), reload_interval_s=60.0, loader=loader
+        )
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(manager.get()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.call_count == 1
+        assert all(result is results[0] for result in results)
+        print("✅ PASS - Concurrent first calls load once")
+
+
+class TestHotReload:
+    """Test on-disk change detection and atomic swap."""
+
+    def test_reload_after_version_bump(self, index_dir: str) -> None:
+        """Test that bumping the version swaps in a new index."""
+        loader = MagicMock(side_effect=lambda path, emb: object())
+        manager = FAISSIndexManager(
+            index_dir, MagicMock(), reload_interval_s=0.0, loader=loader
+        )
+
+        first = manager.get()
+        bump_index_version(index_dir)
+        second = manager.get()
+
+        assert first is not second
+        assert loader.call_count == 2
+        assert manager.stats()["loads"] == 2
+        print("✅ PASS - Index reloaded after version bump")
+
+    def test_no_reload_without_changes(self, index_dir: str) -> None:
+        """Test that unchanged files do not trigger a reload."""
+        loader = MagicMock(side_effect=lambda path, emb: object())
+        manager = FAISSIndexManager(
+            index_dir, MagicMock(), reload_interval_s=0.0, loader=loader
+        )
+
+        manager.get()
+        manager.get()
+        manager.get()
+
+        assert loader.call_count == 1
+        print("✅ PASS - No reload without on-disk changes")
+
+    def test_failed_reload_keeps_previous_index(self, index_dir: str) -> None:
+        """Test that a failing reload keeps serving the old index."""
+        original = object()
+        loader = MagicMock(side_effect=[original, OSError("partial write")])
+        manager = FAISSIndexManager(
+            index_dir, MagicMock(), reload_interval_s=0.0, loader=loader
+        )
+
+        assert manager.get() is original
+        bump_index_version(index_dir)
+        assert manager.get() is original
+        assert manager.stats()["failed_reloads"] == 1
+        print("✅ PASS - Failed reload keeps previous index")
+
+    def test_signature_tracks_version_file(self, index_dir: str) -> None:
+        """Test that the VERSION marker changes the signature."""
+        before = read_index_signature(index_dir)
+        bump_index_version(index_dir)
+        after = read_index_signature(index_dir)
+
+        assert before != after
+        assert os.path.exists(os.path.join(index_dir, "VERSION"))
+        print("✅ PASS - VERSION marker changes signature")
+
+
+class TestManagerRegistry:
+    """Test the process-wide manager registry."""
+
+    def test_same_path_returns_same_manager(self, index_dir: str) -> None:
+        """Test that one manager is shared per index directory."""
+        reset_index_managers()
+        embeddings = MagicMock()
+
+        first = get_index_manager(index_dir, embeddings)
+        second = get_index_manager(index_dir)
+
+        assert first is second
+        reset_index_managers()
+        print("✅ PASS - Manager shared per directory")
+
+    def test_missing_embeddings_raises(self, index_dir: str) -> None:
+        """Test that creating a manager requires embeddings."""
+        reset_index_managers()
+
+        with pytest.raises(ValueError):
+            get_index_manager(index_dir)
+        print("✅ PASS - Missing embeddings rejected")
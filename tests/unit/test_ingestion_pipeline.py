@@ -0,0 +1,192 @@
+"""
+Unit tests for the parallel ingestion pipeline (ingestion/pipeline.py).
+
+Tests cover:
+- Directory discovery of supported files
+- Batched embedding with bounded concurrency
+- Manifest reuse (unchanged corpus is not re-embedded)
+- Per-stage throughput reporting
+- Parse workers stream chunk windows; worker failures propagate
+- Parse time leaves out time blocked on the window queue
+"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.features.ingestion.pipeline import (
+    discover_sources,
+    parse_and_split,
+    run_ingestion_pipeline,
+)
+from src.infrastructure.config.settings import settings
+
+# Guards the shared counters of BatchRecordingEmbeddings
+_LOCK = threading.Lock()
+
+
+class BatchRecordingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record batch sizes and peak concurrency."""
+
+    batches: List[int] = []
+    active: int = 0
+    peak: int = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with _LOCK:
+            self.batches.append(len(texts))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return super().embed_documents(texts)
+        finally:
+            with _LOCK:
+                self.active -= 1
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    """Directory with five small markdown files and one unsupported file."""
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    for i in range(3):
+        (docs / f"doc{i}.md").write_text(f"Documento {i} sobre Perceptron.")
+    for i in range(2):
+        (docs / "nested" / f"note{i}.txt").write_text(f"Nota {i} sobre pesos.")
+    (docs / "image.png").write_bytes(b"\x89PNG")
+    return docs
+
+
+class TestDiscovery:
+    """Test source discovery."""
+
+    def test_discovers_supported_files_recursively(self, corpus: Path) -> None:
+        """Test that directories are walked and unsupported files ignored."""
+        sources = discover_sources([str(corpus)])
+
+        assert len(sources) == 5
+        assert not any(path.endswith(".png") for path in sources)
+        print("✅ PASS - Supported files discovered recursively")
+
+
+class TestPipeline:
+    """Test pipeline batching, dedup and reporting."""
+
+    def test_batches_and_throughput(self, corpus: Path, tmp_path: Path) -> None:
+        """Test that chunks are embedded in batches and throughput reported."""
+        embeddings = BatchRecordingEmbeddings(size=8, batches=[])
+        db_path = str(tmp_path / "db")
+
+        report = run_ingestion_pipeline(
+            [str(corpus)],
+            embeddings,
+            db_path=db_path,
+            workers=2,
+            batch_size=2,
+            max_concurrency=2,
+        )
+
+        assert report.files_processed == 5
+        assert report.chunks_added == 5
+        assert report.embeddings_computed == 5
+        assert sorted(embeddings.batches) == [1, 2, 2]
+        assert embeddings.peak <= 2
+        assert set(report.throughput()) == {
+            "pages_per_s",
+            "chunks_per_s",
+            "embeddings_per_s",
+        }
+        print(f"✅ PASS - Batched ingestion: {report.throughput()}")
+
+    def test_rerun_on_unchanged_corpus_is_free(
+        self, corpus: Path, tmp_path: Path
+    ) -> None:
+        """Test that a second run skips every file."""
+        embeddings = BatchRecordingEmbeddings(size=8, batches=[])
+        db_path = str(tmp_path / "db")
+        run_ingestion_pipeline([str(corpus)], embeddings, db_path=db_path, workers=1)
+        embeddings.batches = []
+
+        report = run_ingestion_pipeline(
+            [str(corpus)], embeddings, db_path=db_path, workers=1
+        )
+
+        assert embeddings.batches == []
+        assert report.files_skipped == 5
+        assert report.chunks_added == 0
+        print("✅ PASS - Unchanged corpus skipped")
+
+
+class TestStreamedParsing:
+    """Test that parsed chunks are streamed window by window."""
+
+    def test_parse_streams_windows(self) -> None:
+        """Test that every page window is queued before the file is done."""
+
+        def pages(path: str) -> Iterator[Document]:
+            for i in range(7):
+                yield Document(page_content=f"Página {i} sobre Perceptron.")
+
+        windows: "queue.Queue" = queue.Queue()
+        with patch(
+            "src.features.ingestion.pipeline.lazy_load_source_documents", pages
+        ), patch.object(settings, "ingestion_page_window", 3):
+            page_count = parse_and_split("doc.pdf", 1000, 0, windows)
+
+        messages = [windows.get_nowait() for _ in range(windows.qsize())]
+        assert page_count == 7
+        assert [kind for kind, _path, _payload in messages] == [
+            "window",
+            "window",
+            "window",
+            "done",
+        ]
+        assert [len(payload) for _k, _p, payload in messages[:3]] == [3, 3, 1]
+        assert messages[-1][:2] == ("done", "doc.pdf")
+        assert messages[-1][2][0] == 7
+        print("✅ PASS - Chunks streamed in page windows")
+
+    def test_parse_time_excludes_blocked_puts(self) -> None:
+        """Test that waiting on a full queue is not counted as parse time."""
+
+        class SlowQueue(queue.Queue):
+            def put(
+                self, item: Any, block: bool = True, timeout: Optional[float] = None
+            ) -> None:
+                time.sleep(0.1)
+                super().put(item, block, timeout)
+
+        def pages(path: str) -> Iterator[Document]:
+            for i in range(6):
+                yield Document(page_content=f"Página {i} sobre Perceptron.")
+
+        windows = SlowQueue()
+        with patch(
+            "src.features.ingestion.pipeline.lazy_load_source_documents", pages
+        ), patch.object(settings, "ingestion_page_window", 2):
+            parse_and_split("doc.pdf", 1000, 0, windows)
+
+        messages = [windows.get_nowait() for _ in range(windows.qsize())]
+        page_count, parse_seconds = messages[-1][2]
+        assert page_count == 6
+        assert parse_seconds < 0.1
+        print(f"✅ PASS - Parse time {parse_seconds:.3f}s without blocked puts")
+
+    def test_worker_error_propagates(self, corpus: Path, tmp_path: Path) -> None:
+        """Test that a failing parse worker aborts the run instead of hanging."""
+        (corpus / "broken.pdf").write_bytes(b"not a pdf")
+        embeddings = BatchRecordingEmbeddings(size=8, batches=[])
+
+        with pytest.raises(Exception):
+            run_ingestion_pipeline(
+                [str(corpus)], embeddings, db_path=str(tmp_path / "db"), workers=2
+            )
+        assert not (tmp_path / "db" / "index.faiss").exists()
+        print("✅ PASS - Worker failure propagated")
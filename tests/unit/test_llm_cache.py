@@ -0,0 +1,205 @@
+"""
+Unit tests for the persistent LLM response cache (external/llm_cache.py).
+
+Tests cover:
+- Identical prompts are answered from the cache, across restarts
+- Cache keys include the model name
+- Per-node TTLs and per-node hit statistics inside a LangGraph graph
+- The async path and size-bounded eviction
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Generator, TypedDict
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.graph import END, START, StateGraph
+
+from src.infrastructure.config.settings import settings
+from src.infrastructure.external.llm_cache import (
+    LLMResponseCache,
+    get_llm_cache,
+    reset_llm_cache,
+)
+
+PROMPT = ChatPromptTemplate.from_template("Classifique: {question}")
+
+
+class QuestionState(TypedDict):
+    """Minimal graph state."""
+
+    question: str
+    answer: str
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> Generator[None, None, None]:
+    """Drop the shared cache around every test."""
+    reset_llm_cache()
+    yield
+    reset_llm_cache()
+
+
+def make_llm(cache: LLMResponseCache) -> FakeListChatModel:
+    """Fake model answering differently on every real call."""
+    return FakeListChatModel(responses=["simple", "complex", "other"], cache=cache)
+
+
+def generation(text: str) -> list:
+    """Generations as returned by a chat model."""
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class TestLLMResponseCache:
+    """Test lookups, persistence and keys."""
+
+    def test_repeat_prompt_hits(self, tmp_path: Path) -> None:
+        """Test that an identical prompt skips the model, even after a restart."""
+        path = str(tmp_path / "llm.sqlite")
+        llm = make_llm(LLMResponseCache(path))
+        chain = PROMPT | llm
+
+        first = chain.invoke({"question": "O que é XOR?"}).content
+        second = chain.invoke({"question": "O que é XOR?"}).content
+        other = chain.invoke({"question": "O que é MLP?"}).content
+
+        restarted = PROMPT | make_llm(LLMResponseCache(path))
+        persisted = restarted.invoke({"question": "O que é XOR?"}).content
+
+        assert first == second == persisted == "simple"
+        assert other == "complex"
+        stats = llm.cache.stats()  # type: ignore[union-attr]
+        assert stats["nodes"]["default"]["memory_hits"] == 1
+        assert stats["nodes"]["default"]["misses"] == 2
+        assert restarted.last.cache.stats()["nodes"]["default"]["disk_hits"] == 1
+        print("✅ PASS - Repeat prompt served from memory and disk")
+
+    def test_key_includes_model_name(self) -> None:
+        """Test that the same prompt to another model is a miss."""
+        cache = LLMResponseCache(":memory:")
+        strings = [
+            ChatGoogleGenerativeAI(
+                model=model, temperature=0, google_api_key="x"
+            )._get_llm_string()
+            for model in ("gemini-2.0-flash-exp", "gemini-1.5-pro")
+        ]
+        cache.update("prompt", strings[0], generation("simple"))
+
+        hit = cache.lookup("prompt", strings[0])
+        assert hit is not None and hit[0].text == "simple"
+        assert cache.lookup("prompt", strings[1]) is None
+        print("✅ PASS - Model name is part of the key")
+
+    def test_eviction_bound(self) -> None:
+        """Test that the disk store stays within max_entries."""
+        cache = LLMResponseCache(":memory:", memory_size=0, max_entries=10)
+        for i in range(25):
+            cache.update(f"prompt {i}", "llm", generation(str(i)))
+
+        assert cache.stats()["disk_entries"] <= 10
+        assert cache.lookup("prompt 24", "llm") is not None
+        assert cache.lookup("prompt 0", "llm") is None
+        print(f"✅ PASS - {cache.stats()['disk_entries']} entries after 25 inserts")
+
+
+class TestNodeTTLs:
+    """Test per-node TTLs and statistics inside a graph."""
+
+    @staticmethod
+    def build_graph(llm: Any) -> Any:
+        """Graph calling the LLM from a "classify" and a "validate" node."""
+
+        def classify(state: QuestionState) -> QuestionState:
+            (PROMPT | llm).invoke({"question": state["question"]})
+            return state
+
+        async def aclassify(state: QuestionState) -> QuestionState:
+            await (PROMPT | llm).ainvoke({"question": state["question"]})
+            return state
+
+        def validate(state: QuestionState) -> QuestionState:
+            response = (PROMPT | llm).invoke(
+                {"question": "valide " + state["question"]}
+            )
+            state["answer"] = str(response.content)
+            return state
+
+        async def avalidate(state: QuestionState) -> QuestionState:
+            response = await (PROMPT | llm).ainvoke(
+                {"question": "valide " + state["question"]}
+            )
+            state["answer"] = str(response.content)
+            return state
+
+        workflow = StateGraph(QuestionState)
+        workflow.add_node("classify", RunnableLambda(classify, afunc=aclassify))
+        workflow.add_node("validate", RunnableLambda(validate, afunc=avalidate))
+        workflow.add_edge(START, "classify")
+        workflow.add_edge("classify", "validate")
+        workflow.add_edge("validate", END)
+        return workflow.compile()
+
+    def test_ttl_and_stats_per_node(self) -> None:
+        """Test that each node expires on its own TTL and is counted apart."""
+        cache = LLMResponseCache(":memory:", ttl_s=1000.0, node_ttls={"validate": 10.0})
+        graph = self.build_graph(make_llm(cache))
+        state = {"question": "O que é XOR?", "answer": ""}
+
+        graph.invoke(state)
+        graph.invoke(state)
+        with patch(
+            "src.infrastructure.external.llm_cache.time.time",
+            return_value=time.time() + 100,
+        ):
+            graph.invoke(state)
+
+        nodes = cache.stats()["nodes"]
+        assert nodes["classify"]["misses"] == 1
+        assert nodes["classify"]["memory_hits"] == 2
+        assert nodes["validate"]["expired"] == 1
+        assert nodes["validate"]["misses"] == 2
+        assert nodes["classify"]["hit_ratio"] == pytest.approx(2 / 3)
+        assert nodes["validate"]["hit_ratio"] == pytest.approx(1 / 3)
+        print("✅ PASS - Per-node TTL and hit ratios")
+
+    def test_async_path(self) -> None:
+        """Test that ainvoke reads and writes the cache."""
+        cache = LLMResponseCache(":memory:")
+        graph = self.build_graph(make_llm(cache))
+        state = {"question": "O que é XOR?", "answer": ""}
+
+        first = asyncio.run(graph.ainvoke(state))
+        second = asyncio.run(graph.ainvoke(state))
+
+        assert first["answer"] == second["answer"]
+        assert cache.stats()["nodes"]["validate"]["memory_hits"] == 1
+        print("✅ PASS - Async calls cached")
+
+
+class TestSharedCache:
+    """Test the shared instance."""
+
+    def test_disabled_returns_none(self) -> None:
+        """Test that a disabled cache leaves models uncached."""
+        with patch.object(settings, "llm_cache_enabled", False):
+            assert get_llm_cache() is None
+        print("✅ PASS - Disabled cache")
+
+    def test_shared_instance(self, tmp_path: Path) -> None:
+        """Test that the shared cache is created once from settings."""
+        with patch.object(
+            settings, "llm_cache_path", str(tmp_path / "llm.sqlite")
+        ), patch.object(settings, "llm_cache_node_ttls", {"classify": 5.0}):
+            cache = get_llm_cache()
+            assert cache is get_llm_cache()
+        assert cache is not None and cache.ttl_for("classify") == 5.0
+        assert cache.ttl_for("generate") == settings.llm_cache_ttl_s
+        print("✅ PASS - Shared cache from settings")
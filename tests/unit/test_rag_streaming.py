@@ -0,0 +1,86 @@
+"""
+Unit tests for answer streaming (rag/streaming.py, graph_rag.stream_rag_query).
+
+Tests cover:
+- Generate tokens are yielded before the complete answer
+- A refinement replacing the answer yields a correction event
+- Graph errors are re-raised in the caller
+"""
+
+from contextlib import ExitStack, contextmanager
+from typing import Any, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.features.rag.graph_rag import stream_rag_query
+from src.infrastructure.config.settings import settings
+
+
+@contextmanager
+def stub_rag(responses: List[str], search: Any = None) -> Iterator[None]:
+    """Run the RAG graph against a fake LLM and a fixed retrieval result."""
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "src.features.rag.nodes.llm",
+                FakeListChatModel(responses=responses),
+            )
+        )
+        stack.enter_context(patch("src.features.rag.nodes.index_manager"))
+        stack.enter_context(patch("src.features.rag.nodes.tune_search"))
+        stack.enter_context(
+            patch(
+                "src.features.rag.nodes.hybrid_search",
+                search or MagicMock(return_value=[Document(page_content="doc")]),
+            )
+        )
+        stack.enter_context(patch.object(settings, "reranker_enabled", False))
+        stack.enter_context(
+            patch.object(settings, "complexity_classifier_enabled", False)
+        )
+        yield
+
+
+class TestStreamRagQuery:
+    """Test the streaming RAG API."""
+
+    def test_tokens_before_answer(self) -> None:
+        """Test that answer tokens arrive before the answer event."""
+        with stub_rag(["simple", "O Perceptron é um classificador.", "0.9"]):
+            events = list(stream_rag_query("O que é o Perceptron?"))
+
+        types = [event["type"] for event in events]
+        tokens = "".join(e["content"] for e in events if e["type"] == "token")
+        answer = events[types.index("answer")]
+        assert types.index("token") < types.index("answer")
+        assert tokens == answer["content"] == "O Perceptron é um classificador."
+        assert answer["time_to_first_token_ms"] <= answer["latency_ms"]
+        assert types[-1] == "final" and "correction" not in types
+        print("✅ PASS - Tokens before answer")
+
+    def test_correction_after_refinement(self) -> None:
+        """Test that a low quality score yields a correction event."""
+        responses = ["simple", "Resposta curta.", "0.3", "Resposta melhor.", "0.9"]
+        with stub_rag(responses):
+            events = list(stream_rag_query("O que é o Perceptron?"))
+
+        answer = next(e for e in events if e["type"] == "answer")
+        corrections = [e for e in events if e["type"] == "correction"]
+        final = events[-1]
+        assert answer["content"] == "Resposta curta."
+        assert [c["content"] for c in corrections] == ["Resposta melhor."]
+        assert corrections[0]["iteration"] == 1
+        assert final["content"] == "Resposta melhor."
+        assert final["quality_score"] == 0.9 and final["iterations"] == 1
+        print("✅ PASS - Correction after refinement")
+
+    def test_errors_reraised(self) -> None:
+        """Test that a failing node surfaces in the consuming thread."""
+        search = MagicMock(side_effect=RuntimeError("index offline"))
+        with stub_rag(["simple"], search=search):
+            with pytest.raises(RuntimeError, match="index offline"):
+                list(stream_rag_query("O que é o Perceptron?"))
+        print("✅ PASS - Errors re-raised")
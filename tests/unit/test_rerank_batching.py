@@ -0,0 +1,123 @@
+"""
+Unit tests for cross-request reranker batching (reranking/batching.py).
+
+Tests cover:
+- Concurrent callers share one predict call and get their own scores
+- Batches respect the pair limit
+- Model errors reach every caller of the batch
+- Queue-depth and batch-size metrics
+"""
+
+import threading
+import time
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.features.reranking.batching import RerankBatcher
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the length of its document; records batch sizes."""
+
+    def __init__(self, delay_s: float = 0.0, fail: bool = False) -> None:
+        self.batches: List[int] = []
+        self.delay_s = delay_s
+        self.fail = fail
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        if self.fail:
+            raise RuntimeError("model failure")
+        time.sleep(self.delay_s)
+        self.batches.append(len(pairs))
+        return np.array([float(len(doc)) for _, doc in pairs])
+
+
+def _run_concurrently(batcher: RerankBatcher, requests: List[List[tuple]]) -> list:
+    results: list = [None] * len(requests)
+
+    def call(i: int) -> None:
+        try:
+            results[i] = batcher.predict(requests[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestBatching:
+    """Test collecting and scattering pairs."""
+
+    def test_concurrent_requests_share_predict(self) -> None:
+        """Test that concurrent callers are scored in one forward pass."""
+        model = FakeCrossEncoder()
+        batcher = RerankBatcher(model, max_batch_pairs=100, max_wait_ms=200)
+        requests = [[("q", "x" * (i + j)) for j in range(3)] for i in range(5)]
+
+        results = _run_concurrently(batcher, requests)
+
+        assert model.batches == [15]
+        for i, scores in enumerate(results):
+            assert scores.tolist() == [float(i + j) for j in range(3)]
+        batcher.close()
+        print("✅ PASS - Concurrent requests share one predict")
+
+    def test_pair_limit_splits_batches(self) -> None:
+        """Test that no batch exceeds max pairs (requests are never split)."""
+        model = FakeCrossEncoder()
+        batcher = RerankBatcher(model, max_batch_pairs=6, max_wait_ms=100)
+        requests = [[("q", "d")] * 4 for _ in range(4)]
+
+        _run_concurrently(batcher, requests)
+
+        assert sum(model.batches) == 16
+        assert all(size <= 6 for size in model.batches)
+        batcher.close()
+        print("✅ PASS - Batches respect the pair limit")
+
+    def test_model_error_reaches_callers(self) -> None:
+        """Test that a failed batch raises in every waiting caller."""
+        batcher = RerankBatcher(FakeCrossEncoder(fail=True), max_wait_ms=50)
+
+        results = _run_concurrently(batcher, [[("q", "a")], [("q", "b")]])
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        batcher.close()
+        print("✅ PASS - Model errors delivered to callers")
+
+
+class TestMetrics:
+    """Test queue-depth and batch-size metrics."""
+
+    def test_stats(self) -> None:
+        """Test that metrics reflect the batches run."""
+        model = FakeCrossEncoder(delay_s=0.05)
+        batcher = RerankBatcher(model, max_batch_pairs=100, max_wait_ms=0)
+        requests = [[("q", "d")] * 2 for _ in range(6)]
+
+        _run_concurrently(batcher, requests)
+        stats = batcher.stats()
+
+        assert stats["requests"] == 6
+        assert stats["pairs"] == 12
+        assert stats["batches"] == len(model.batches)
+        assert stats["avg_batch_pairs"] == pytest.approx(12 / len(model.batches))
+        assert stats["max_queue_depth"] >= 1
+        assert stats["queue_depth"] == 0
+        batcher.close()
+        print("✅ PASS - Batching metrics")
+
+    def test_closed_batcher_rejects(self) -> None:
+        """Test that a closed batcher refuses new work."""
+        batcher = RerankBatcher(FakeCrossEncoder())
+        batcher.close()
+
+        with pytest.raises(RuntimeError):
+            batcher.predict([("q", "d")])
+        print("✅ PASS - Closed batcher rejects requests")
@@ -0,0 +1,146 @@
+"""
+Unit tests for precomputed reranker doc tokens (reranking/pretokenized.py).
+
+Tests cover:
+- Ingest-time token ids stored per chunk text and pruned with deleted chunks
+- Scores from stored token ids match CrossEncoder.predict
+- Long queries fall back to predict
+- Test doubles without a tokenizer are not wrapped
+
+A tiny randomly initialized BERT cross-encoder is built locally, so no model
+download is needed.
+"""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import torch
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from sentence_transformers import CrossEncoder
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+from src.features.reranking.pretokenized import (
+    PretokenizedScorer,
+    get_pretokenized_scorer,
+    precompute_doc_tokens,
+    tokenizer_id,
+)
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.chunk_store import (
+    CHUNK_STORE_FILE,
+    ChunkStore,
+    open_vectorstore_for_update,
+    save_vectorstore,
+)
+
+WORDS = "o a de que perceptron xor um classificador linear problema rede pesos bias"
+TEXTS = [
+    "o perceptron é um classificador linear",
+    "o problema xor não é linearmente separável",
+    "a rede ajusta os pesos e o bias " * 12,  # longer than the model input
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory: pytest.TempPathFactory) -> CrossEncoder:
+    """Randomly initialized two-layer BERT cross-encoder (64 tokens max)."""
+    path = tmp_path_factory.mktemp("tiny_reranker")
+    letters = "abcdefghijklmnopqrstuvwxyzéãçá"
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS.split()]
+    vocab += list(letters + "?.,") + [f"##{c}" for c in letters]
+    (path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(str(path / "vocab.txt"), model_max_length=64).save_pretrained(
+        path
+    )
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=64,
+        num_labels=1,
+    )
+    BertForSequenceClassification(config).save_pretrained(path)
+    return CrossEncoder(str(path), activation_fn=torch.nn.Sigmoid())
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, tiny_model: CrossEncoder) -> str:
+    """Saved vector store with precomputed token ids."""
+    vectordb = FAISS.from_texts(
+        TEXTS, DeterministicFakeEmbedding(size=8), ids=["v0", "v1", "v2"]
+    )
+    save_vectorstore(vectordb, str(tmp_path))
+    assert precompute_doc_tokens(str(tmp_path), tiny_model.tokenizer) == 3
+    return str(tmp_path)
+
+
+def _stored_count(db_path: str) -> int:
+    store = ChunkStore(str(Path(db_path) / CHUNK_STORE_FILE))
+    name = tokenizer_id(settings.reranker_model, 64)
+    return len(store.doc_token_hashes(name))
+
+
+class TestPrecompute:
+    """Test ingest-time token ids."""
+
+    def test_tokens_follow_chunk_updates(
+        self, db_path: str, tiny_model: CrossEncoder
+    ) -> None:
+        """Test that only new chunks are tokenized and deleted ones pruned."""
+        assert _stored_count(db_path) == 3
+
+        vectordb = open_vectorstore_for_update(
+            db_path, DeterministicFakeEmbedding(size=8)
+        )
+        vectordb.delete(["v0", "v1"])
+        vectordb.add_texts(["a rede perceptron"], ids=["v3"])
+        save_vectorstore(vectordb, db_path)
+
+        assert precompute_doc_tokens(db_path, tiny_model.tokenizer) == 1
+        assert _stored_count(db_path) == 2
+        print("✅ PASS - Token ids follow chunk updates")
+
+
+class TestPretokenizedScorer:
+    """Test scoring from stored token ids."""
+
+    def test_scores_match_predict(self, db_path: str, tiny_model: CrossEncoder) -> None:
+        """Test that assembled inputs score exactly like predict."""
+        scorer = PretokenizedScorer(tiny_model, db_path=db_path)
+        pairs = [
+            ("o que é xor?", TEXTS[1]),
+            ("o que é xor?", TEXTS[2]),
+            ("perceptron linear", TEXTS[0]),
+            ("perceptron linear", "texto fora do índice"),
+        ]
+
+        scores = scorer.predict(pairs, batch_size=2)
+
+        np.testing.assert_allclose(scores, tiny_model.predict(pairs), atol=1e-5)
+        assert scorer._tokenized_chars > 0  # only the unknown text was tokenized
+        print("✅ PASS - Pretokenized scores match predict")
+
+    def test_long_query_uses_predict(
+        self, db_path: str, tiny_model: CrossEncoder
+    ) -> None:
+        """Test that queries needing truncation are scored by predict."""
+        scorer = PretokenizedScorer(tiny_model, db_path=db_path)
+        pairs = [("o perceptron " * 20, TEXTS[2])]
+
+        scores = scorer.predict(pairs)
+
+        np.testing.assert_allclose(scores, tiny_model.predict(pairs), atol=1e-5)
+        print("✅ PASS - Long query falls back to predict")
+
+    def test_models_without_tokenizer_not_wrapped(self) -> None:
+        """Test that test doubles are returned unchanged."""
+        model = MagicMock()
+
+        assert get_pretokenized_scorer(model) is model
+        print("✅ PASS - Mocks not wrapped")
@@ -0,0 +1,123 @@
+"""
+Unit tests for the reranker score cache (reranking/score_cache.py).
+
+Tests cover:
+- Only cache misses reach the model; scores merged in input order
+- LRU eviction and TTL expiry
+- A reloaded model starts an empty cache
+- Hit ratio reported by rerank_documents
+"""
+
+import time
+from typing import List
+from unittest.mock import patch
+
+import numpy as np
+
+from src.features.reranking.reranker import rerank_documents
+from src.features.reranking.score_cache import (
+    RerankScoreCache,
+    get_score_cache,
+    reset_score_cache,
+    score_documents,
+    score_key,
+)
+
+
+class LengthScorer:
+    """Scores a pair by document length; records the documents scored."""
+
+    def __init__(self) -> None:
+        self.scored: List[List[str]] = []
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        self.scored.append([doc for _, doc in pairs])
+        return np.array([len(doc) / 100 for _, doc in pairs])
+
+
+def setup_function() -> None:
+    reset_score_cache()
+
+
+class TestScoreDocuments:
+    """Test cache lookups around the model."""
+
+    def test_only_misses_are_scored(self) -> None:
+        """Test that repeated pairs skip the model and scores keep input order."""
+        model = LengthScorer()
+        score_documents(model, "O que é XOR?", ["aa", "bbbb"])
+
+        scores, hits = score_documents(model, "O que é  XOR?", ["c", "bbbb", "aa", "c"])
+
+        assert hits == 2
+        assert model.scored[-1] == ["c"]
+        assert scores.tolist() == [0.01, 0.04, 0.02, 0.01]
+        print("✅ PASS - Only misses reach the model")
+
+    def test_new_model_starts_empty_cache(self) -> None:
+        """Test that a reloaded model does not reuse old scores."""
+        score_documents(LengthScorer(), "q", ["aa"])
+        model = LengthScorer()
+
+        _, hits = score_documents(model, "q", ["aa"])
+
+        assert hits == 0
+        assert model.scored == [["aa"]]
+        assert get_score_cache(model).stats()["entries"] == 1
+        print("✅ PASS - New model, new cache")
+
+
+class TestRerankScoreCache:
+    """Test bounds of the cache."""
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least-recently-used pair is evicted first."""
+        cache = RerankScoreCache(max_entries=2, ttl_s=0)
+        a, b, c = (score_key("m", "q", doc) for doc in "abc")
+        cache.put_many({a: 0.1, b: 0.2})
+        cache.get_many([a])
+
+        cache.put_many({c: 0.3})
+
+        assert set(cache.get_many([a, b, c])) == {a, c}
+        assert cache.stats()["evictions"] == 1
+        print("✅ PASS - LRU eviction")
+
+    def test_ttl_expiry(self) -> None:
+        """Test that expired scores count as misses."""
+        cache = RerankScoreCache(max_entries=10, ttl_s=0.05)
+        key = score_key("m", "q", "d")
+        cache.put_many({key: 0.5})
+        assert cache.get_many([key]) == {key: 0.5}
+
+        time.sleep(0.06)
+
+        assert cache.get_many([key]) == {}
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["hit_ratio"] == 0.5
+        print("✅ PASS - TTL expiry")
+
+
+class TestRerankDocumentsLogging:
+    """Test the hit ratio in the reranking_completed event."""
+
+    def test_hit_ratio_logged(self) -> None:
+        """Test that a repeated question reports a full cache hit."""
+        model = LengthScorer()
+        documents = ["a" * 10, "b" * 30, "c" * 20]
+        with patch(
+            "src.features.reranking.reranker.get_reranker", return_value=model
+        ), patch("src.features.reranking.reranker.logger") as mock_logger:
+            rerank_documents("q", documents, top_n=2)
+            result = rerank_documents("q", documents, top_n=2)
+
+        completed = [
+            call.kwargs
+            for call in mock_logger.info.call_args_list
+            if call.args == ("reranking_completed",)
+        ]
+        assert result == [documents[1], documents[2]]
+        assert [event["cache_hit_ratio"] for event in completed] == [0.0, 1.0]
+        assert len(model.scored) == 1
+        print("✅ PASS - Hit ratio logged")
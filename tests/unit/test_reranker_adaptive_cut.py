@@ -0,0 +1,140 @@
+"""
+Unit tests for the adaptive top-n cut (reranking/adaptive_cut.py).
+
+Tests cover:
+- Cut at a clear score gap (knee)
+- Cut by cumulative score mass
+- Flat distributions keep the upper bound; the lower bound always holds
+- rerank_documents logs the chosen cut and the tokens saved
+- The fixed top-n caps the adaptive cut and is the baseline for savings
+"""
+
+from typing import Generator, List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.features.rag.nodes import _rerank_top_n
+from src.features.reranking.adaptive_cut import adaptive_top_n
+from src.features.reranking.reranker import rerank_documents, reset_reranker
+from src.infrastructure.config.settings import settings
+
+
+class TableScorer:
+    """Scores each document from a fixed table."""
+
+    def __init__(self, scores: dict) -> None:
+        self.scores = scores
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        return np.array([self.scores[doc] for _, doc in pairs])
+
+
+@pytest.fixture(autouse=True)
+def fresh_reranker() -> Generator[None, None, None]:
+    """Start every test with empty score caches."""
+    reset_reranker()
+    yield
+    reset_reranker()
+
+
+class TestAdaptiveTopN:
+    """Test the cut rules."""
+
+    def test_cut_at_gap(self) -> None:
+        """Test that a large drop ends the kept set."""
+        scores = np.array([0.97, 0.94, 0.31, 0.22, 0.10])
+
+        assert adaptive_top_n(scores, 5, min_n=2, min_gap=0.2, mass=0.9) == (
+            2,
+            "gap",
+        )
+        print("✅ PASS - Cut at the score gap")
+
+    def test_cut_by_mass(self) -> None:
+        """Test that a decaying distribution is cut by score mass."""
+        scores = np.array([0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3])
+
+        assert adaptive_top_n(scores, 7, min_n=2, min_gap=0.2, mass=0.9) == (
+            6,
+            "mass",
+        )
+        print("✅ PASS - Cut by score mass")
+
+    def test_bounds(self) -> None:
+        """Test the upper bound on flat scores and the lower bound on a gap."""
+        flat = np.full(7, 0.6)
+        steep = np.array([0.99, 0.05, 0.04, 0.03])
+
+        assert adaptive_top_n(flat, 5, min_n=2, min_gap=0.2, mass=0.95) == (5, "max")
+        assert adaptive_top_n(steep, 4, min_n=2, min_gap=0.2, mass=0.9)[0] == 2
+        assert adaptive_top_n(steep, 1, min_n=2, min_gap=0.2, mass=0.9) == (1, "max")
+        print("✅ PASS - Bounds respected")
+
+
+class TestAdaptiveRerank:
+    """Test the adaptive mode inside rerank_documents."""
+
+    def test_cut_and_tokens_saved_logged(self) -> None:
+        """Test that fewer documents are returned and the saving is logged."""
+        documents: List[str] = ["a" * 40, "b" * 400, "c" * 80, "d" * 400]
+        model = TableScorer(
+            {
+                documents[0]: 0.2,
+                documents[1]: 0.95,
+                documents[2]: 0.9,
+                documents[3]: 0.1,
+            }
+        )
+        with patch(
+            "src.features.reranking.reranker.get_reranker", return_value=model
+        ), patch.object(settings, "reranker_top_n_mode", "adaptive"), patch.object(
+            settings, "reranker_score_threshold", 0.0
+        ), patch(
+            "src.features.reranking.adaptive_cut.logger"
+        ) as mock_logger:
+            result = rerank_documents("q", documents, top_n=4)
+
+        event = mock_logger.info.call_args.kwargs
+        assert result == [documents[1], documents[2]]
+        assert event["chosen_n"] == 2 and event["reason"] == "gap"
+        assert event["tokens_saved"] == (40 + 400) // 4
+        print("✅ PASS - Cut and tokens saved logged")
+
+    def test_fixed_top_n_caps_cut(self) -> None:
+        """Test that flat scores keep the fixed cut, not the adaptive maximum."""
+        documents: List[str] = [f"{i}" * 40 for i in range(9)]
+        model = TableScorer({doc: 0.6 for doc in documents})
+        with patch(
+            "src.features.reranking.reranker.get_reranker", return_value=model
+        ), patch.object(settings, "reranker_top_n_mode", "adaptive"), patch.object(
+            settings, "reranker_adaptive_max_n", 7
+        ), patch.object(
+            settings, "reranker_score_threshold", 0.0
+        ):
+            top_n = _rerank_top_n({"documents": documents, "complexity": "simple"})
+            result = rerank_documents("q", documents, top_n=top_n)
+
+        assert top_n == 5 and len(result) == 5
+        print("✅ PASS - Fixed top-n caps the adaptive cut")
+
+    def test_tokens_saved_against_fixed_cut(self) -> None:
+        """Test that savings count every document the fixed cut would keep."""
+        documents: List[str] = [f"{i}" * 40 for i in range(7)]
+        model = TableScorer({doc: 0.6 for doc in documents})
+        with patch(
+            "src.features.reranking.reranker.get_reranker", return_value=model
+        ), patch.object(settings, "reranker_top_n_mode", "adaptive"), patch.object(
+            settings, "reranker_adaptive_max_n", 3
+        ), patch.object(
+            settings, "reranker_score_threshold", 0.0
+        ), patch(
+            "src.features.reranking.adaptive_cut.logger"
+        ) as mock_logger:
+            result = rerank_documents("q", documents, top_n=5)
+
+        event = mock_logger.info.call_args.kwargs
+        assert len(result) == event["chosen_n"] == 3
+        assert event["tokens_saved"] == 2 * 40 // 4
+        print("✅ PASS - Tokens saved against the fixed cut")
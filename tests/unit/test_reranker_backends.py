@@ -0,0 +1,100 @@
+"""
+Unit tests for reranker inference backends (reranking/backends.py).
+
+Tests cover:
+- Agreement metrics between backend scores
+- Fallback to the torch backend when ONNX dependencies are missing
+- Export paths of the ONNX models
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.features.reranking import backends
+
+
+class TestScoreAgreement:
+    """Test the comparison of backend scores."""
+
+    def test_identical_scores(self) -> None:
+        """Test that identical scores agree perfectly."""
+        scores = np.array([0.9, 0.1, 0.5, 0.7, 0.3, 0.2])
+
+        agreement = backends.score_agreement(scores, scores.copy())
+
+        assert agreement["max_abs_diff"] == 0.0
+        assert agreement["top_k_overlap"] == 1.0
+        assert agreement["spearman"] == pytest.approx(1.0)
+        print("✅ PASS - Identical scores agree")
+
+    def test_small_noise_keeps_ranking(self) -> None:
+        """Test that quantization-sized noise is measured but keeps the top-k."""
+        reference = np.linspace(0.95, 0.05, 10)
+        candidate = reference + np.array([0.01, -0.01] * 5)
+
+        agreement = backends.score_agreement(reference, candidate, top_k=5)
+
+        assert agreement["max_abs_diff"] == pytest.approx(0.01)
+        assert agreement["top_k_overlap"] == 1.0
+        assert agreement["max_abs_diff"] <= backends.SCORE_TOLERANCE["onnx_int8"]
+        print("✅ PASS - Small noise within tolerance")
+
+    def test_reordered_top_k(self) -> None:
+        """Test that swapped rankings lower overlap and correlation."""
+        reference = np.array([0.9, 0.8, 0.2, 0.1])
+        candidate = np.array([0.1, 0.2, 0.8, 0.9])
+
+        agreement = backends.score_agreement(reference, candidate, top_k=2)
+
+        assert agreement["top_k_overlap"] == 0.0
+        assert agreement["spearman"] == pytest.approx(-1.0)
+        print("✅ PASS - Reordering detected")
+
+
+class TestLoadCrossEncoder:
+    """Test backend selection."""
+
+    def test_missing_onnx_falls_back_to_torch(self) -> None:
+        """Test that missing optimum/onnxruntime keeps the torch backend."""
+        with patch.object(
+            backends, "_load_onnx", side_effect=ImportError("no onnxruntime")
+        ), patch.object(backends, "CrossEncoder") as mock_cross_encoder:
+            model = backends.load_cross_encoder("some/model", "onnx_int8")
+
+        assert model is mock_cross_encoder.return_value
+        assert mock_cross_encoder.call_args.args == ("some/model",)
+        assert "backend" not in mock_cross_encoder.call_args.kwargs
+        print("✅ PASS - Fallback to torch")
+
+    def test_unknown_backend_rejected(self) -> None:
+        """Test that an unknown backend name raises."""
+        with pytest.raises(ValueError):
+            backends.load_cross_encoder("some/model", "tensorrt")
+        print("✅ PASS - Unknown backend rejected")
+
+    def test_int8_loads_quantized_file(self, tmp_path) -> None:
+        """Test that an existing int8 export is loaded without re-exporting."""
+        mock_settings = MagicMock(reranker_onnx_dir=str(tmp_path))
+        with patch.object(backends, "settings", mock_settings):
+            export_dir = backends.onnx_export_dir("BAAI/bge-reranker-base")
+        onnx_dir = tmp_path / "BAAI__bge-reranker-base" / "onnx"
+        onnx_dir.mkdir(parents=True)
+        (onnx_dir / "model.onnx").touch()
+        (onnx_dir / "model_qint8_avx2.onnx").touch()
+
+        with patch.object(backends, "settings", mock_settings), patch.object(
+            backends, "CrossEncoder"
+        ) as mock_cross_encoder, patch(
+            "sentence_transformers.export_dynamic_quantized_onnx_model"
+        ) as mock_export:
+            backends._load_onnx("BAAI/bge-reranker-base", "avx2")
+
+        mock_export.assert_not_called()
+        mock_cross_encoder.assert_called_once()
+        assert mock_cross_encoder.call_args.args == (export_dir,)
+        assert mock_cross_encoder.call_args.kwargs["model_kwargs"] == {
+            "file_name": "onnx/model_qint8_avx2.onnx"
+        }
+        print("✅ PASS - Quantized export reused")
@@ -0,0 +1,177 @@
+"""
+Unit tests for cascade reranking (reranking/cascade.py).
+
+Tests cover:
+- BM25 first stage ranks candidates sharing question terms first
+- Dense first stage uses cosine against index vectors, falling back to
+  lexical without vectors or on errors
+- Only the M prefiltered candidates reach the cross-encoder
+- Stage latencies and audited recall are logged
+- The rerank node reads candidate vectors back from the loaded index
+"""
+
+from pathlib import Path
+from typing import Generator, List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.features.rag.nodes import _rerank_vectors
+from src.features.reranking.cascade import (
+    lexical_scores,
+    prefilter,
+    top_n_recall,
+)
+from src.features.reranking.reranker import rerank_documents, reset_reranker
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import load_search_index
+from src.infrastructure.database.chunk_store import save_vectorstore
+
+CANDIDATES = [
+    "redes neurais profundas",
+    "o perceptron não resolve o problema xor",
+    "história da computação",
+    "xor é uma função lógica",
+    "o perceptron é um classificador linear",
+]
+
+
+class LengthScorer:
+    """Scores a pair by document length; records the documents scored."""
+
+    def __init__(self) -> None:
+        self.scored: List[List[str]] = []
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        self.scored.append([doc for _, doc in pairs])
+        return np.array([len(doc) / 100 for _, doc in pairs])
+
+
+class AxisEmbeddings:
+    """Embeds texts mentioning "xor" on one axis, everything else on another."""
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0, 0.0] if "xor" in text else [0.0, 1.0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def fresh_reranker() -> Generator[None, None, None]:
+    """Start every test with empty score caches."""
+    reset_reranker()
+    yield
+    reset_reranker()
+
+
+class TestFirstStage:
+    """Test the cheap prefilter."""
+
+    def test_lexical_stage_ranks_shared_terms(self) -> None:
+        """Test that candidates with more question terms are kept first."""
+        scores = lexical_scores("O perceptron resolve o XOR?", CANDIDATES)
+
+        kept = prefilter("O perceptron resolve o XOR?", CANDIDATES, keep=3)
+
+        assert scores[0] == scores[2] == 0.0  # no question terms
+        assert kept == [1, 3, 4]
+        print("✅ PASS - Lexical stage")
+
+    def test_ties_keep_retrieval_order(self) -> None:
+        """Test that candidates without signal are kept by retrieval rank."""
+        assert prefilter("quantum", CANDIDATES, keep=2) == [0, 1]
+        assert prefilter("quantum", CANDIDATES[:2], keep=5) == [0, 1]
+        print("✅ PASS - Ties keep retrieval order")
+
+    def test_dense_stage_and_fallback(self) -> None:
+        """Test cosine ranking and the lexical fallback on embedding errors."""
+        embeddings = AxisEmbeddings()
+        vectors = np.array(embeddings.embed_documents(CANDIDATES))
+        with patch(
+            "src.infrastructure.external.embedding_cache.get_embeddings",
+            return_value=embeddings,
+        ), patch.object(
+            embeddings, "embed_documents", side_effect=AssertionError("re-embedded")
+        ):
+            kept = prefilter("xor", CANDIDATES, keep=2, stage="dense", vectors=vectors)
+        with patch(
+            "src.features.reranking.cascade.dense_scores",
+            side_effect=RuntimeError("quota"),
+        ):
+            fallback = prefilter(
+                "perceptron", CANDIDATES, keep=2, stage="dense", vectors=vectors
+            )
+        without_vectors = prefilter("perceptron", CANDIDATES, keep=2, stage="dense")
+
+        assert kept == [1, 3]
+        assert fallback == without_vectors == [4, 1]  # BM25: shorter chunk first
+        print("✅ PASS - Dense stage and fallback")
+
+    def test_top_n_recall(self) -> None:
+        """Test the share of the full top-n kept by the prefilter."""
+        full_scores = np.array([0.9, 0.1, 0.8, 0.7])
+
+        assert top_n_recall(full_scores, kept=[0, 1, 2], top_n=2) == 1.0
+        assert top_n_recall(full_scores, kept=[0, 1], top_n=2) == 0.5
+        print("✅ PASS - Top-n recall")
+
+
+class TestCascadeRerank:
+    """Test the cascade inside rerank_documents."""
+
+    def test_only_kept_candidates_scored(self) -> None:
+        """Test that the cross-encoder scores M candidates and recall is logged."""
+        model = LengthScorer()
+        with patch(
+            "src.features.reranking.reranker.get_reranker", return_value=model
+        ), patch.object(settings, "reranker_cascade_enabled", True), patch.object(
+            settings, "reranker_cascade_keep", 3
+        ), patch.object(
+            settings, "reranker_cascade_audit_rate", 1.0
+        ), patch(
+            "src.features.reranking.reranker.logger"
+        ) as mock_logger:
+            result = rerank_documents("O perceptron resolve o XOR?", CANDIDATES, 2)
+
+        cascade = [
+            call.kwargs
+            for call in mock_logger.info.call_args_list
+            if call.args == ("cascade_rerank_completed",)
+        ]
+        assert model.scored[0] == [CANDIDATES[1], CANDIDATES[3], CANDIDATES[4]]
+        assert result == [CANDIDATES[1], CANDIDATES[4]]
+        assert cascade[0]["candidates"] == 5 and cascade[0]["kept"] == 3
+        assert cascade[0]["recall"] == 1.0
+        assert cascade[0]["prefilter_time_ms"] >= 0
+        print("✅ PASS - Only kept candidates scored")
+
+    def test_rerank_node_reads_index_vectors(self, tmp_path: Path) -> None:
+        """Test that the dense stage gets the stored vectors of the candidates."""
+        embeddings = DeterministicFakeEmbedding(size=8)
+        ids = [f"vid{i}" for i in range(len(CANDIDATES))]
+        save_vectorstore(
+            FAISS.from_texts(CANDIDATES, embeddings, ids=ids), str(tmp_path)
+        )
+        state = {
+            "question": "xor",
+            "documents": CANDIDATES[::-1],
+            "document_ids": ids[::-1],
+        }
+
+        with patch("src.features.rag.nodes.index_manager") as manager, patch.object(
+            settings, "reranker_cascade_enabled", True
+        ), patch.object(settings, "reranker_cascade_keep", 3), patch.object(
+            settings, "reranker_cascade_stage", "dense"
+        ):
+            manager.get.return_value = load_search_index(str(tmp_path), embeddings)
+            vectors = _rerank_vectors(state)  # type: ignore[arg-type]
+            with patch.object(settings, "reranker_cascade_stage", "lexical"):
+                assert _rerank_vectors(state) is None  # type: ignore[arg-type]
+
+        expected = embeddings.embed_documents(CANDIDATES[::-1])
+        np.testing.assert_allclose(vectors, np.array(expected), rtol=1e-6)
+        print("✅ PASS - Rerank node reads index vectors")
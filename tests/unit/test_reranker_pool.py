@@ -0,0 +1,205 @@
+"""
+Unit tests for the reranker replica pool (reranking/pool.py).
+
+Tests cover:
+- Pool sized from the CPU count when its size is 0
+- A replica is never used by two callers at once
+- Replicas of a CrossEncoder are independent and score like the original
+- The batcher runs one worker per replica
+- Test doubles and single-replica pools use the model directly
+- A configured pool is built (and torch threads set) by the warm-up thread
+"""
+
+import threading
+import time
+from typing import Generator, List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+from sentence_transformers import CrossEncoder
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+from src.features.reranking.batching import RerankBatcher
+from src.features.reranking.pool import (
+    RerankerPool,
+    build_reranker_pool,
+    get_reranker_pool,
+    pool_dimensions,
+    reset_reranker_pool,
+)
+from src.features.reranking.reranker import reset_reranker
+from src.features.reranking.warmup import start_reranker_warmup, wait_for_reranker
+from src.infrastructure.config.settings import settings
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory: pytest.TempPathFactory) -> CrossEncoder:
+    """Randomly initialized two-layer BERT cross-encoder (64 tokens max)."""
+    path = tmp_path_factory.mktemp("tiny_reranker")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += list("abcdefghijklmnopqrstuvwxyz") + [
+        f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz"
+    ]
+    (path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(str(path / "vocab.txt"), model_max_length=64).save_pretrained(
+        path
+    )
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=64,
+        num_labels=1,
+    )
+    BertForSequenceClassification(config).save_pretrained(path)
+    return CrossEncoder(str(path), activation_fn=torch.nn.Sigmoid())
+
+
+@pytest.fixture(autouse=True)
+def torch_threads() -> Generator[None, None, None]:
+    """Restore torch's thread count (pools set it process-wide)."""
+    threads = torch.get_num_threads()
+    yield
+    torch.set_num_threads(threads)
+
+
+class ExclusiveReplica:
+    """Fake replica that records whether two callers overlapped."""
+
+    def __init__(self) -> None:
+        self.in_use = threading.Lock()
+        self.overlapped = False
+        self.calls = 0
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        if not self.in_use.acquire(blocking=False):
+            self.overlapped = True
+            self.in_use.acquire()
+        try:
+            time.sleep(0.01)
+            self.calls += 1
+            return np.array([len(doc) / 100 for _, doc in pairs])
+        finally:
+            self.in_use.release()
+
+
+class TestPoolDimensions:
+    """Test pool sizing."""
+
+    def test_sized_from_cpu_count(self) -> None:
+        """Test that size 0 divides the cores by the threads per replica."""
+        with patch("src.features.reranking.pool.usable_cpus", return_value=16):
+            assert pool_dimensions(size=0, threads=4) == (4, 4)
+            assert pool_dimensions(size=0, threads=32) == (1, 32)
+            assert pool_dimensions(size=3, threads=2) == (3, 2)
+        print("✅ PASS - Pool sized from CPU count")
+
+
+class TestRerankerPool:
+    """Test replica checkout."""
+
+    def test_replicas_never_shared(self) -> None:
+        """Test that concurrent callers each get their own replica."""
+        replicas = [ExclusiveReplica(), ExclusiveReplica()]
+        pool = RerankerPool(replicas, threads=1)
+        results: List[np.ndarray] = []
+
+        def call() -> None:
+            results.append(pool.predict([("q", "abcd")]))
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        assert not any(replica.overlapped for replica in replicas)
+        assert sum(replica.calls for replica in replicas) == 8
+        assert [r.tolist() for r in results] == [[0.04]] * 8
+        assert stats["checkouts"] == 8 and stats["idle"] == 2
+        print("✅ PASS - Replicas never shared")
+
+    def test_replicas_score_like_original(self, tiny_model: CrossEncoder) -> None:
+        """Test that built replicas are independent copies with equal scores."""
+        pairs = [("abc", "abc def"), ("xyz", "uvw")]
+        with patch.object(settings, "reranker_pretokenize_enabled", False):
+            pool = build_reranker_pool(tiny_model, size=2, threads=1)
+
+        first, second = pool.replicas
+        assert first is tiny_model and second is not tiny_model
+        assert second.tokenizer is not tiny_model.tokenizer
+        np.testing.assert_allclose(
+            second.predict(pairs), tiny_model.predict(pairs), atol=1e-6
+        )
+        batcher = RerankBatcher(pool)
+        assert batcher.workers == 2
+        batcher.close()
+        print("✅ PASS - Replicas score like the original")
+
+
+class TestGetRerankerPool:
+    """Test the shared pool."""
+
+    def setup_method(self) -> None:
+        reset_reranker_pool()
+
+    def teardown_method(self) -> None:
+        reset_reranker_pool()
+
+    def test_single_replica_uses_model(self, tiny_model: CrossEncoder) -> None:
+        """Test that one replica (or a test double) is not pooled."""
+        model = ExclusiveReplica()
+        with patch.object(settings, "reranker_pool_size", 1), patch.object(
+            settings, "reranker_pretokenize_enabled", False
+        ):
+            assert get_reranker_pool(tiny_model) is tiny_model
+        assert get_reranker_pool(model) is model
+        print("✅ PASS - Single replica not pooled")
+
+    def test_pool_reused_per_model(self, tiny_model: CrossEncoder) -> None:
+        """Test that the pool is built once per loaded model."""
+        with patch.object(settings, "reranker_pool_size", 2), patch.object(
+            settings, "reranker_pool_threads", 1
+        ):
+            pool = get_reranker_pool(tiny_model)
+
+            assert isinstance(pool, RerankerPool) and pool.size == 2
+            assert get_reranker_pool(tiny_model) is pool
+        print("✅ PASS - Pool reused per model")
+
+    def test_warmup_builds_pool(self, tiny_model: CrossEncoder) -> None:
+        """Test that the warm-up thread builds the pool before any request."""
+        threads: List[str] = []
+
+        def build(*args, **kwargs) -> RerankerPool:
+            threads.append(threading.current_thread().name)
+            return build_reranker_pool(*args, **kwargs)
+
+        reset_reranker()
+        try:
+            with patch(
+                "src.features.reranking.reranker.get_reranker",
+                return_value=tiny_model,
+            ), patch(
+                "src.features.reranking.pool.build_reranker_pool", side_effect=build
+            ), patch.object(
+                settings, "reranker_pool_size", 2
+            ), patch.object(
+                settings, "reranker_pool_threads", 1
+            ):
+                assert start_reranker_warmup() is True
+                assert wait_for_reranker(30) is True
+                pool = get_reranker_pool(tiny_model)
+        finally:
+            reset_reranker()
+
+        assert isinstance(pool, RerankerPool) and pool.size == 2
+        assert threads == ["reranker-warmup"]
+        assert torch.get_num_threads() == 1
+        print("✅ PASS - Pool built by the warm-up thread")
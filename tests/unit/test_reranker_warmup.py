@@ -0,0 +1,157 @@
+"""
+Unit tests for the background reranker warm-up (reranking/warmup.py).
+
+Tests cover:
+- Readiness transitions (idle -> loading -> ready) and the dummy forward pass
+- Policy "skip": requests before ready keep the retrieval order
+- Policy "wait": requests wait for warm-up, or skip after the timeout
+- A failed warm-up is reported by the probe and skips reranking
+"""
+
+import threading
+from typing import Generator, List
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.features.reranking.reranker import rerank_documents, reset_reranker
+from src.features.reranking.warmup import (
+    WARMUP_PAIR,
+    reranker_readiness,
+    reranker_ready,
+    start_reranker_warmup,
+    wait_for_reranker,
+)
+from src.infrastructure.config.settings import settings
+
+DOCUMENTS = ["a" * 10, "b" * 30, "c" * 20]
+
+
+class LengthScorer:
+    """Scores a pair by document length; records the pairs scored."""
+
+    def __init__(self) -> None:
+        self.scored: List[list] = []
+
+    def predict(self, pairs, batch_size: int = 32) -> np.ndarray:
+        self.scored.append(list(pairs))
+        return np.array([len(doc) / 100 for _, doc in pairs])
+
+
+class SlowLoader:
+    """Stands in for get_reranker; blocks until released."""
+
+    def __init__(self, model: LengthScorer) -> None:
+        self.model = model
+        self.release = threading.Event()
+
+    def __call__(self) -> LengthScorer:
+        self.release.wait(5)
+        return self.model
+
+
+@pytest.fixture(autouse=True)
+def fresh_reranker() -> Generator[None, None, None]:
+    """Start every test without a loaded model or warm-up state."""
+    reset_reranker()
+    yield
+    reset_reranker()
+
+
+class TestReadiness:
+    """Test the readiness flag and probe."""
+
+    def test_transitions_to_ready(self) -> None:
+        """Test idle -> loading -> ready, with one dummy forward pass."""
+        model = LengthScorer()
+        loader = SlowLoader(model)
+        assert reranker_readiness()["state"] == "idle"
+
+        with patch("src.features.reranking.reranker.get_reranker", loader):
+            assert start_reranker_warmup() is True
+            assert start_reranker_warmup() is False  # idempotent
+            assert reranker_readiness()["state"] == "loading"
+            assert not reranker_ready()
+
+            loader.release.set()
+            assert wait_for_reranker(5) is True
+
+        probe = reranker_readiness()
+        assert probe["ready"] is True
+        assert probe["load_time_ms"] is not None
+        assert model.scored == [[WARMUP_PAIR]]
+        print("✅ PASS - Readiness transitions")
+
+    def test_failed_warmup(self) -> None:
+        """Test that a load error is reported and reranking is skipped."""
+        with patch(
+            "src.features.reranking.reranker.get_reranker",
+            side_effect=OSError("model not found"),
+        ):
+            start_reranker_warmup()
+            assert wait_for_reranker(5) is False
+
+            result = rerank_documents("q", DOCUMENTS, top_n=2)
+
+        probe = reranker_readiness()
+        assert probe["state"] == "failed"
+        assert "model not found" in probe["error"]
+        assert result == DOCUMENTS[:2]
+        print("✅ PASS - Failed warm-up reported")
+
+
+class TestWarmupPolicy:
+    """Test requests that arrive before the reranker is ready."""
+
+    def test_skip_policy_keeps_retrieval_order(self) -> None:
+        """Test that policy skip returns immediately without scoring."""
+        model = LengthScorer()
+        loader = SlowLoader(model)
+        with patch(
+            "src.features.reranking.reranker.get_reranker", loader
+        ), patch.object(settings, "reranker_warmup_policy", "skip"):
+            start_reranker_warmup()
+            result = rerank_documents("q", DOCUMENTS, top_n=2)
+            loader.release.set()
+            wait_for_reranker(5)
+
+            reranked = rerank_documents("q", DOCUMENTS, top_n=2)
+
+        assert result == DOCUMENTS[:2]
+        assert reranked == [DOCUMENTS[1], DOCUMENTS[2]]
+        print("✅ PASS - Skip policy")
+
+    def test_wait_policy_times_out(self) -> None:
+        """Test that policy wait skips reranking after the timeout."""
+        loader = SlowLoader(LengthScorer())
+        with patch(
+            "src.features.reranking.reranker.get_reranker", loader
+        ), patch.object(settings, "reranker_warmup_timeout_s", 0.05), patch(
+            "src.features.reranking.reranker.logger"
+        ) as mock_logger:
+            start_reranker_warmup()
+            result = rerank_documents("q", DOCUMENTS, top_n=2)
+            loader.release.set()
+
+        skipped = [
+            call.kwargs
+            for call in mock_logger.warning.call_args_list
+            if call.args == ("reranker_not_ready",)
+        ]
+        assert result == DOCUMENTS[:2]
+        assert skipped[0]["policy"] == "wait"
+        assert skipped[0]["waited_ms"] >= 40
+        print("✅ PASS - Wait policy times out")
+
+    def test_wait_policy_reranks_once_ready(self) -> None:
+        """Test that a waiting request is reranked when warm-up completes."""
+        loader = SlowLoader(LengthScorer())
+        with patch("src.features.reranking.reranker.get_reranker", loader):
+            start_reranker_warmup()
+            threading.Timer(0.05, loader.release.set).start()
+
+            result = rerank_documents("q", DOCUMENTS, top_n=2)
+
+        assert result == [DOCUMENTS[1], DOCUMENTS[2]]
+        print("✅ PASS - Wait policy reranks once ready")
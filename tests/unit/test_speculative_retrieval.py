@@ -0,0 +1,200 @@
+"""
+Unit tests for speculative retrieval (classify and retrieve in parallel).
+
+Tests cover:
+- hybrid_search_ks returns exactly hybrid_search's result for every k,
+  searching an ANN index once per k
+- The speculative graph retrieves the same documents and answer as the
+  sequential graph, for both complexity labels
+- The speculative graph overlaps classification with retrieval
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from scripts.benchmark_async_rag import StubChatModel, stubbed_rag
+from src.core.domain.state import RAGState
+from src.features.rag.graph_rag import get_rag_graph
+from src.features.rag.graph_registry import reset_graph_registry
+from src.features.rag.retrieval import hybrid_search, hybrid_search_ks
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.ann_index import load_search_index
+from src.infrastructure.database.chunk_store import save_vectorstore
+
+# Dense and BM25 rankings whose fusion depends on where they are cut: "b" is
+# only in the fused top 3 at k=7 once its lexical rank 4 counts
+DENSE = ["a", "b", "c", "d", "h", "i", "j"]
+LEXICAL = ["e", "f", "g", "b", "k", "l", "m"]
+
+
+class FakeVectorStore:
+    """Vector store returning fixed dense and lexical rankings."""
+
+    def __init__(self, search_s: float = 0.0) -> None:
+        self.search_s = search_s
+        self.index = None
+        self.docstore = MagicMock()
+        self.docstore.store.search_lexical = self._lexical
+        self.calls: List[int] = []
+
+    def similarity_search(self, question: str, k: int) -> List[Document]:
+        self.calls.append(k)
+        time.sleep(self.search_s)
+        return [Document(page_content=c, id=c) for c in DENSE[:k]]
+
+    def _lexical(self, text: str, k: int) -> List[Document]:
+        return [Document(page_content=c, id=c) for c in LEXICAL[:k]]
+
+
+class ComplexStub(StubChatModel):
+    """Stub LLM classifying every question as complex."""
+
+    @staticmethod
+    def _answer(messages: List[Any]) -> Any:
+        result = StubChatModel._answer(messages)
+        if "Classifique" in str(messages[-1].content):
+            result.generations[0].message.content = "complex"
+        return result
+
+
+@pytest.fixture(autouse=True)
+def fresh_graphs() -> Generator[None, None, None]:
+    """Compile graphs for each test's settings."""
+    reset_graph_registry()
+    yield
+    reset_graph_registry()
+
+
+@contextmanager
+def fake_rag(store: FakeVectorStore, speculative: bool, llm: Any) -> Iterator[None]:
+    """Stub LLM + fake vector store, with or without speculative retrieval."""
+    with stubbed_rag(latency_s=0.0), patch(
+        "src.features.rag.nodes.hybrid_search", hybrid_search
+    ), patch("src.features.rag.nodes.index_manager") as index_manager, patch(
+        "src.features.rag.nodes.llm", llm
+    ), patch.object(
+        settings, "retrieval_speculative_enabled", speculative
+    ), patch.object(
+        settings, "retrieval_mode", "hybrid"
+    ):
+        index_manager.get.return_value = store
+        yield
+
+
+def initial_state(question: str) -> RAGState:
+    """Fresh graph input."""
+    return {
+        "question": question,
+        "complexity": "simple",
+        "documents": [],
+        "generation": "",
+        "quality_score": 0.0,
+        "iterations": 0,
+    }
+
+
+class TestHybridSearchKs:
+    """Test hybrid_search_ks."""
+
+    @pytest.mark.parametrize("mode", ["dense", "hybrid", "lexical"])
+    def test_matches_hybrid_search(self, mode: str) -> None:
+        """Test that every k gets exactly hybrid_search's documents."""
+        store = FakeVectorStore()
+        by_k = hybrid_search_ks(store, "q", [3, 7], mode=mode)  # type: ignore[arg-type]
+
+        for k in (3, 7):
+            expected = hybrid_search(store, "q", k, mode=mode)  # type: ignore[arg-type]
+            assert [d.id for d in by_k[k]] == [d.id for d in expected]
+        print(f"✅ PASS - {mode}: same documents as hybrid_search")
+
+    def test_not_a_prefix_of_max_k(self) -> None:
+        """Test that fusion is redone per k (a max-k prefix would differ)."""
+        store = FakeVectorStore()
+        by_k = hybrid_search_ks(store, "q", [3, 7], mode="hybrid")  # type: ignore[arg-type]
+
+        assert [d.id for d in by_k[3]] == ["a", "e", "b"]
+        assert [d.id for d in by_k[7][:3]] == ["b", "a", "e"]
+        assert store.calls == [7]
+        print("✅ PASS - One search, fused per k")
+
+    @pytest.mark.parametrize("mode", ["dense", "hybrid"])
+    def test_ann_index_searched_per_k(self, tmp_path: Path, mode: str) -> None:
+        """Test that an HNSW index matches hybrid_search by searching each k."""
+        embeddings = DeterministicFakeEmbedding(size=16)
+        texts = [f"documento {i} rede neural" for i in range(300)]
+        with patch.object(settings, "vectorstore_index_type", "hnsw"), patch.object(
+            settings, "vectorstore_mmap", False
+        ):
+            save_vectorstore(FAISS.from_texts(texts, embeddings), str(tmp_path))
+            vectordb = load_search_index(str(tmp_path), embeddings)
+
+        with patch.object(
+            vectordb,
+            "similarity_search_by_vector",
+            wraps=vectordb.similarity_search_by_vector,
+        ) as by_vector:
+            by_k = hybrid_search_ks(vectordb, "rede neural", [3, 7], mode=mode)
+        assert [call.kwargs["k"] for call in by_vector.call_args_list] == [3, 7]
+
+        for k in (3, 7):
+            expected = hybrid_search(vectordb, "rede neural", k, mode=mode)
+            assert [d.page_content for d in by_k[k]] == [
+                d.page_content for d in expected
+            ]
+        print(f"✅ PASS - {mode}: ANN index searched at each k")
+
+
+class TestSpeculativeGraph:
+    """Test the speculative RAG graph variant."""
+
+    @pytest.mark.parametrize("llm", [StubChatModel(), ComplexStub()])
+    def test_same_result_as_sequential(self, llm: Any) -> None:
+        """Test identical documents and answer for both labels."""
+        results = {}
+        for speculative in (False, True):
+            with fake_rag(FakeVectorStore(), speculative, llm):
+                results[speculative] = get_rag_graph().invoke(initial_state("q"))
+
+        for key in ("complexity", "documents", "generation", "quality_score"):
+            assert results[True][key] == results[False][key]
+        print(
+            f"✅ PASS - {results[True]['complexity']}: "
+            f"{results[True]['documents']} in both graphs"
+        )
+
+    def test_async_same_result(self) -> None:
+        """Test the async path of the speculative graph."""
+        with fake_rag(FakeVectorStore(), True, ComplexStub()):
+            result = asyncio.run(get_rag_graph().ainvoke(initial_state("q")))
+
+        assert result["complexity"] == "complex"
+        assert result["documents"] == ["b", "a", "e", "f", "c", "g", "d"]
+        print("✅ PASS - Async speculative graph")
+
+    def test_overlaps_classification(self) -> None:
+        """Test that retrieval no longer waits for the classification call."""
+        latency_s = 0.3
+        elapsed = {}
+        for speculative in (False, True):
+            store = FakeVectorStore(search_s=latency_s)
+            with fake_rag(store, speculative, StubChatModel(latency_s=latency_s)):
+                graph = get_rag_graph()
+                start = time.perf_counter()
+                graph.invoke(initial_state("q"))
+                elapsed[speculative] = time.perf_counter() - start
+
+        # classify + search + generate + validate vs max(classify, search) + ...
+        assert elapsed[True] < elapsed[False] - latency_s / 2
+        print(
+            f"✅ PASS - {elapsed[False]:.2f}s sequential → "
+            f"{elapsed[True]:.2f}s speculative"
+        )